@@ -0,0 +1,142 @@
+# QA/bench_atlas_bleed.py
+# Benchmark + check: legacy per-sprite 8-pass RGB bleed vs core.pixel_fill
+# bleed_sprites_rgb over the sprites of a 4K atlas (exact nearest-visible fill
+# on NumPy, same result with or without scipy), plus the exact EDT / dilation
+# helpers.
+#   python QA/bench_atlas_bleed.py            (needs only NumPy)
+#   blender --background --python QA/bench_atlas_bleed.py
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core import pixel_fill  # noqa: E402
+from core.pixel_fill import bleed_sprites_rgb, dilate_rgba, nearest_visible_indices  # noqa: E402
+
+
+def legacy_bleed(pixels, iterations=8, alpha_threshold=1.0 / 255.0):
+    """Copy of the old atlas_algo._bleed_transparent_rgb loop (reference)."""
+    out = np.array(pixels, copy=True, dtype=np.float32)
+    filled = out[..., 3] > alpha_threshold
+    h, w = filled.shape
+    for _ in range(iterations):
+        new_rgb = out[..., :3].copy()
+        new_filled = filled.copy()
+        if h > 1:
+            c = (~filled[1:, :]) & filled[:-1, :]
+            new_rgb[1:, :][c] = out[:-1, :, :3][c]
+            new_filled[1:, :][c] = True
+            c = (~filled[:-1, :]) & filled[1:, :]
+            new_rgb[:-1, :][c] = out[1:, :, :3][c]
+            new_filled[:-1, :][c] = True
+        if w > 1:
+            c = (~filled[:, 1:]) & filled[:, :-1]
+            new_rgb[:, 1:][c] = out[:, :-1, :3][c]
+            new_filled[:, 1:][c] = True
+            c = (~filled[:, :-1]) & filled[:, 1:]
+            new_rgb[:, :-1][c] = out[:, 1:, :3][c]
+            new_filled[:, :-1][c] = True
+        if np.array_equal(new_filled, filled):
+            break
+        out[..., :3] = new_rgb
+        filled = new_filled
+    return out
+
+
+def make_atlas(size=4096, seed=0):
+    """Grid of round sprites with transparent corners, like a typical icon atlas."""
+    rng = np.random.default_rng(seed)
+    atlas = np.zeros((size, size, 4), dtype=np.float32)
+    sprites = []
+    y = 4
+    while y < size - 132:
+        x = 4
+        while x < size - 132:
+            s = int(rng.integers(32, 128))
+            yy, xx = np.mgrid[0:s, 0:s]
+            r = s / 2.0
+            alpha = (((yy - r) ** 2 + (xx - r) ** 2) < (r * 0.8) ** 2).astype(np.float32)
+            sprite = np.concatenate([rng.random((s, s, 3), dtype=np.float32), alpha[..., None]], axis=-1)
+            sprites.append((x, y, sprite))
+            atlas[y:y + s, x:x + s] = sprite
+            x += s + 8
+        y += 136
+    return atlas, sprites
+
+
+def check_exact_small():
+    """Nearest-pixel indices must match brute force on small random masks."""
+    rng = np.random.default_rng(7)
+    for h, w in ((37, 53), (64, 31)):
+        visible = rng.random((h, w)) < 0.02
+        visible[0, 0] = True
+        ny, nx = nearest_visible_indices(visible)
+        vy, vx = np.nonzero(visible)
+        yy, xx = np.mgrid[0:h, 0:w]
+        brute = ((yy[..., None] - vy) ** 2 + (xx[..., None] - vx) ** 2).min(axis=-1)
+        assert np.array_equal(brute, (ny - yy) ** 2 + (nx - xx) ** 2), (h, w)
+
+
+def check_dilate_small():
+    """Holes within radius get RGBA of a nearest visible pixel, the rest stays empty."""
+    rng = np.random.default_rng(11)
+    h, w, radius = 41, 29, 3
+    pixels = np.zeros((h, w, 4), dtype=np.float32)
+    visible = rng.random((h, w)) < 0.03
+    pixels[visible] = rng.random((int(visible.sum()), 4), dtype=np.float32) * 0.9 + 0.1
+    out = dilate_rgba(pixels, radius)
+    vy, vx = np.nonzero(visible)
+    for y in range(h):
+        for x in range(w):
+            if visible[y, x]:
+                assert np.array_equal(out[y, x], pixels[y, x])
+                continue
+            d2 = (vy - y) ** 2 + (vx - x) ** 2
+            if d2.min() > radius * radius:
+                assert not out[y, x].any(), (y, x)
+                continue
+            nearest = [tuple(pixels[vy[i], vx[i]]) for i in np.flatnonzero(d2 == d2.min())]
+            assert tuple(out[y, x]) in nearest, (y, x)
+
+
+if __name__ == "__main__":
+    check_exact_small()
+    check_dilate_small()
+    backend = "scipy present" if pixel_fill._ndimage is not None else "no scipy"
+    atlas, sprites = make_atlas()
+    visible = atlas[..., 3] > 1.0 / 255.0
+
+    start = time.perf_counter()
+    legacy = atlas.copy()
+    for x, y, sprite in sprites:
+        h, w = sprite.shape[:2]
+        legacy[y:y + h, x:x + w] = legacy_bleed(sprite)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    current = atlas.copy()
+    bleed_sprites_rgb([current[y:y + s.shape[0], x:x + s.shape[1]] for x, y, s in sprites])
+    current_time = time.perf_counter() - start
+
+    # Alpha and visible RGB are kept; the fill stays inside each sprite, gaps
+    # between sprites are untouched (the atlas extrudes edges into padding).
+    assert np.array_equal(legacy[..., 3], current[..., 3])
+    assert np.array_equal(legacy[visible], current[visible])
+    inside = np.zeros_like(visible)
+    for x, y, sprite in sprites:
+        inside[y:y + sprite.shape[0], x:x + sprite.shape[1]] = True
+    assert not current[~inside, :3].any()
+    holes = ~visible & inside
+    legacy_black = np.count_nonzero(holes & ~legacy[..., :3].any(axis=-1))
+    current_black = np.count_nonzero(holes & ~current[..., :3].any(axis=-1))
+
+    print(f"--- 4096x4096 atlas, {len(sprites)} sprites ({backend}) ---")
+    print(f"legacy per-sprite loop : {legacy_time:7.2f} s, black transparent px in sprites: {legacy_black}")
+    print(f"bleed_sprites_rgb      : {current_time:7.2f} s, black transparent px in sprites: {current_black}")
@@ -0,0 +1,107 @@
+# QA/bench_atlas_packer.py
+# Benchmark: legacy PackerNode tree vs MaxRects / Skyline atlas packers.
+# Run with Blender's Python (core.atlas_algo imports bpy):
+#   blender --background --python QA/bench_atlas_packer.py
+
+import random
+import sys
+import time
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core.atlas_algo import ATLAS_MARGIN, calculate_atlas_layout  # noqa: E402
+
+ENGINES = ("TREE", "MAXRECTS", "SKYLINE")
+
+
+def make_icon_set(count, seed=1):
+    """Typical menu: mostly square icons, some wide labels, a few big panels."""
+    rng = random.Random(seed)
+    sizes = {}
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.6:
+            side = rng.choice((32, 48, 64, 96, 128))
+            sizes[f"icon_{i:05d}"] = (side, side)
+        elif roll < 0.9:
+            sizes[f"label_{i:05d}"] = (rng.randint(96, 384), rng.randint(24, 64))
+        else:
+            sizes[f"panel_{i:05d}"] = (rng.randint(192, 512), rng.randint(192, 512))
+    return sizes
+
+
+def make_anim_set(clips, frames, seed=2):
+    """Animated sources: many equal-size frames per clip."""
+    rng = random.Random(seed)
+    sizes = {}
+    for c in range(clips):
+        w, h = rng.choice(((64, 64), (128, 128), (160, 90), (256, 144)))
+        for n in range(frames):
+            sizes[f"clip{c:03d}_anim_{n:04d}"] = (w, h)
+    return sizes
+
+
+def _check_no_overlap(uv_data, atlas_w, atlas_h, margin):
+    rects = []
+    for name, data in uv_data.items():
+        x, y = data["uv_coords"]
+        w, h = data["uv_size"]
+        x0, y0 = x - margin // 2, y - margin // 2
+        assert x0 >= 0 and y0 >= 0, name
+        assert x0 + w + margin <= atlas_w and y0 + h + margin <= atlas_h, name
+        rects.append((x0, y0, x0 + w + margin, y0 + h + margin))
+    rects.sort()
+    for i, a in enumerate(rects):
+        for b in rects[i + 1:]:
+            if b[0] >= a[2]:
+                break
+            assert a[3] <= b[1] or b[3] <= a[1], (a, b)
+
+
+def _next_pot(value):
+    pot = 1
+    while pot < value:
+        pot *= 2
+    return pot
+
+
+def bench(label, sizes, engines=ENGINES, verify=True):
+    used_area = sum(w * h for w, h in sizes.values())
+    rows = []
+    for engine in engines:
+        start = time.perf_counter()
+        (atlas_w, atlas_h), uv_data = calculate_atlas_layout(sizes, engine=engine)
+        elapsed = time.perf_counter() - start
+        assert len(uv_data) == len(sizes), engine
+        if verify:
+            _check_no_overlap(uv_data, atlas_w, atlas_h, ATLAS_MARGIN)
+        fill = used_area / float(atlas_w * atlas_h)
+        rows.append((engine, atlas_w, atlas_h, fill, elapsed))
+
+    lines = [f"--- {label}: {len(sizes)} sprites ---"]
+    for engine, atlas_w, atlas_h, fill, elapsed in rows:
+        # TREE returns multiple-of-4 sizes; mip/BC chains round them up to
+        # POT anyway, so report the POT-equivalent footprint as well.
+        pot_w, pot_h = _next_pot(atlas_w), _next_pot(atlas_h)
+        pot_fill = used_area / float(pot_w * pot_h)
+        mb = pot_w * pot_h * 4 / (1024 * 1024)
+        lines.append(
+            f"{engine:<9} {atlas_w:>6}x{atlas_h:<6} fill {fill * 100:5.1f}%  "
+            f"POT {pot_w:>5}x{pot_h:<5} fill {pot_fill * 100:5.1f}% RGBA8 {mb:7.1f} MB  "
+            f"{elapsed * 1000:9.1f} ms"
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    report = [
+        bench("icons", make_icon_set(200)),
+        bench("icons", make_icon_set(1000)),
+        bench("icons", make_icon_set(2500), verify=False),
+        bench("animated", make_anim_set(12, 60)),
+    ]
+    print("\n\n".join(report))
@@ -0,0 +1,200 @@
+# QA/bench_serialization.py
+# Benchmark + check: legacy reflective rzm_to_dict/dict_to_rzm vs the
+# schema-compiled serializer (core/serialization.py). JSON must be byte-identical
+# on save, and loading must restore the same data.
+#   blender --background --python QA/bench_serialization.py
+
+import json
+import random
+import sys
+import time
+import types
+from pathlib import Path
+
+import bpy
+from bpy.props import (BoolProperty, CollectionProperty, EnumProperty, FloatProperty,
+                       FloatVectorProperty, IntProperty, IntVectorProperty, PointerProperty, StringProperty)
+from mathutils import Color, Euler, Quaternion, Vector
+
+
+ROOT = Path(__file__).resolve().parents[1]
+# serialization imports .element_index: load it as a submodule of the add-on
+# folder without running the add-on __init__ (registration)
+_addon = types.ModuleType("rzm_addon")
+_addon.__path__ = [str(ROOT)]
+sys.modules.setdefault("rzm_addon", _addon)
+
+from rzm_addon.core import serialization  # noqa: E402
+
+
+def legacy_rzm_to_dict(val):
+    """Copy of the old reflective rzm_to_dict (reference)."""
+    if isinstance(val, (int, float, str, bool, type(None))):
+        return val
+    if callable(val):
+        return str(val)
+    if isinstance(val, bpy.types.PropertyGroup):
+        res = {}
+        for prop_def in val.bl_rna.properties:
+            key = prop_def.identifier
+            if key in {'rna_type'}: continue
+            if isinstance(prop_def, bpy.types.PointerProperty):
+                attr = getattr(val, key)
+                if not isinstance(attr, bpy.types.PropertyGroup):
+                    continue
+            res[key] = legacy_rzm_to_dict(getattr(val, key))
+        if hasattr(val, "keys"):
+            for k in val.keys():
+                if k not in res:
+                    res[k] = legacy_rzm_to_dict(val[k])
+        return res
+    if isinstance(val, (list, tuple, bpy.types.bpy_prop_collection, bpy.types.bpy_prop_array)):
+        return [legacy_rzm_to_dict(item) for item in val]
+    if hasattr(val, "keys") and hasattr(val, "items"):
+        return {k: legacy_rzm_to_dict(v) for k, v in val.items()}
+    if isinstance(val, (Vector, Color, Euler, Quaternion)):
+        return list(val)
+    if hasattr(val, "to_list"):
+        return val.to_list()
+    if hasattr(val, "bl_rna"):
+        return str(val)
+    return val
+
+
+def legacy_dict_to_rzm(data_dict, blender_prop):
+    """Copy of the old reflective dict_to_rzm (reference)."""
+    if not isinstance(data_dict, dict):
+        return
+    for key, value in data_dict.items():
+        if not hasattr(blender_prop, key) and hasattr(blender_prop, "__setitem__"):
+            try:
+                blender_prop[key] = value
+                continue
+            except: pass
+        if not hasattr(blender_prop, key):
+            continue
+        target_prop = getattr(blender_prop, key)
+        if isinstance(target_prop, bpy.types.bpy_prop_collection) and isinstance(value, list):
+            target_prop.clear()
+            for item_dict in value:
+                legacy_dict_to_rzm(item_dict, target_prop.add())
+        elif isinstance(target_prop, bpy.types.PropertyGroup) and isinstance(value, dict):
+            legacy_dict_to_rzm(value, target_prop)
+        else:
+            try:
+                setattr(blender_prop, key, value)
+            except Exception as e:
+                print(f"RZ-Constructor Warning: Could not set property '{key}'. Reason: {e}")
+
+
+def _touch(self, context):
+    pass
+
+
+class BenchRef(bpy.types.PropertyGroup):
+    preset_id: IntProperty()
+
+
+class BenchLink(bpy.types.PropertyGroup):
+    value_name: StringProperty()
+    value_min: FloatProperty()
+    value_max: FloatProperty(default=1.0)
+    inverse: BoolProperty()
+
+
+class BenchStyle(bpy.types.PropertyGroup):
+    mode: EnumProperty(items=[('A', "A", ""), ('B', "B", "")])
+    scale: FloatVectorProperty(size=2, default=(1.0, 1.0))
+
+
+class BenchElement(bpy.types.PropertyGroup):
+    id: IntProperty()
+    parent_id: IntProperty(default=-1)
+    element_name: StringProperty()
+    text_id: StringProperty()
+    position: IntVectorProperty(size=2)
+    size: IntVectorProperty(size=2, default=(100, 100))
+    color: FloatVectorProperty(size=4, subtype='COLOR', min=0, max=1, default=(1.0, 1.0, 1.0, 1.0), update=_touch)
+    rotation: FloatProperty()
+    image_id: IntProperty(default=-1, update=_touch)
+    is_helper: BoolProperty()
+    is_preset: BoolProperty()
+    image: PointerProperty(type=bpy.types.Image)
+    style: PointerProperty(type=BenchStyle)
+    preset_ids: CollectionProperty(type=BenchRef)
+    value_link: CollectionProperty(type=BenchLink)
+
+
+class BenchRoot(bpy.types.PropertyGroup):
+    title: StringProperty()
+    elements: CollectionProperty(type=BenchElement)
+
+
+CLASSES = (BenchRef, BenchLink, BenchStyle, BenchElement, BenchRoot)
+
+
+def fill(root, count, seed=0):
+    rng = random.Random(seed)
+    root.title = "Bench"
+    for i in range(count):
+        elem = root.elements.add()
+        elem.id = i + 1
+        elem.parent_id = rng.randint(0, i)
+        elem.element_name = f"Element_{i}"
+        elem.text_id = "Текст" if i % 7 == 0 else ""
+        elem.position = (rng.randint(-500, 500), rng.randint(-500, 500))
+        elem.color = (rng.random(), rng.random(), rng.random(), 1.0)
+        elem.rotation = rng.random() * 360.0
+        elem.is_helper = rng.random() < 0.2
+        elem.style.mode = rng.choice(('A', 'B'))
+        if i % 11 == 0:
+            elem["custom_key"] = i
+        for _ in range(rng.randint(0, 6)):
+            elem.preset_ids.add().preset_id = rng.randint(1, count)
+        for _ in range(rng.randint(0, 4)):
+            link = elem.value_link.add()
+            link.value_name = f"$var_{rng.randint(0, 50)}"
+            link.value_min = rng.random()
+            link.inverse = rng.random() < 0.5
+
+
+if __name__ == "__main__":
+    for cls in CLASSES:
+        bpy.utils.register_class(cls)
+    bpy.types.Scene.rzm_bench = PointerProperty(type=BenchRoot)
+    bpy.types.Scene.rzm_bench_load = PointerProperty(type=BenchRoot)
+    try:
+        scene = bpy.context.scene
+        fill(scene.rzm_bench, 2000)
+
+        start = time.perf_counter()
+        legacy_json = json.dumps(legacy_rzm_to_dict(scene.rzm_bench), indent=2, ensure_ascii=False)
+        legacy_save = time.perf_counter() - start
+
+        start = time.perf_counter()
+        compiled_json = json.dumps(serialization.rzm_to_dict(scene.rzm_bench), indent=2, ensure_ascii=False)
+        compiled_save = time.perf_counter() - start
+        assert legacy_json == compiled_json, "compiled serializer output differs"
+
+        data = json.loads(legacy_json)
+        start = time.perf_counter()
+        legacy_dict_to_rzm(data, scene.rzm_bench_load)
+        legacy_load = time.perf_counter() - start
+        reloaded_legacy = json.dumps(legacy_rzm_to_dict(scene.rzm_bench_load), indent=2, ensure_ascii=False)
+
+        start = time.perf_counter()
+        serialization.dict_to_rzm(data, scene.rzm_bench_load)
+        compiled_load = time.perf_counter() - start
+        reloaded = json.dumps(legacy_rzm_to_dict(scene.rzm_bench_load), indent=2, ensure_ascii=False)
+        assert reloaded == reloaded_legacy == legacy_json, "compiled loader restores different data"
+
+        print("--- 2000 elements ---")
+        print(f"save legacy   : {legacy_save:7.3f} s")
+        print(f"save compiled : {compiled_save:7.3f} s (byte-identical JSON)")
+        print(f"load legacy   : {legacy_load:7.3f} s")
+        print(f"load compiled : {compiled_load:7.3f} s (same data)")
+    finally:
+        del bpy.types.Scene.rzm_bench
+        del bpy.types.Scene.rzm_bench_load
+        for cls in reversed(CLASSES):
+            bpy.utils.unregister_class(cls)
@@ -0,0 +1,117 @@
+# QA/bench_texworks_raster.py
+# Benchmark + check: legacy per-triangle meshgrid bake vs the banded batch
+# rasterizer (texworks_mc.bake_slot_image_numpy). Output must be bit-identical.
+#   blender --background --python QA/bench_texworks_raster.py
+
+import math
+import random
+import sys
+import time
+import types
+from array import array
+from pathlib import Path
+
+import numpy as np
+
+
+ROOT = Path(__file__).resolve().parents[1]
+# texworks_mc imports ..core: load it as a submodule of the add-on folder
+# without running the add-on __init__ (registration)
+_addon = types.ModuleType("rzm_addon")
+_addon.__path__ = [str(ROOT)]
+sys.modules.setdefault("rzm_addon", _addon)
+
+from rzm_addon.utils import texworks_mc as tw  # noqa: E402
+
+
+def legacy_bake(faces, face_to_group, layout_groups, atlas_w, atlas_h, ref_w, ref_h, margin, src_pixels, src_w, src_h):
+    """Copy of the old per-triangle bake_slot_image_numpy loop (reference)."""
+    group_by_index = {group["index"]: group for group in layout_groups}
+    buffer = array("f", [0.0]) * (atlas_w * atlas_h * 4)
+    dest = np.frombuffer(buffer, dtype=np.float32).reshape(atlas_h, atlas_w, 4)
+    src = np.frombuffer(src_pixels, dtype=np.float32).reshape(src_h, src_w, 4)
+    for face_index, face in enumerate(faces):
+        base_group = face_to_group.get(face_index)
+        if not base_group:
+            continue
+        group = group_by_index.get(base_group["index"])
+        src_triangles = list(tw.face_triangles(face.get("source_uvs") or face["uvs"]))
+        for tri_index, (uv_a, uv_b, uv_c) in enumerate(tw.face_triangles(face["uvs"])):
+            src_a, src_b, src_c = src_triangles[tri_index] if tri_index < len(src_triangles) else (uv_a, uv_b, uv_c)
+            pa = tw.dest_uv_to_pixel(uv_a, group, ref_w, ref_h, margin)
+            pb = tw.dest_uv_to_pixel(uv_b, group, ref_w, ref_h, margin)
+            pc = tw.dest_uv_to_pixel(uv_c, group, ref_w, ref_h, margin)
+            min_x = max(0, int(math.floor(min(pa[0], pb[0], pc[0]))) - margin)
+            max_x = min(atlas_w - 1, int(math.ceil(max(pa[0], pb[0], pc[0]))) + margin)
+            min_y = max(0, int(math.floor(min(pa[1], pb[1], pc[1]))) - margin)
+            max_y = min(atlas_h - 1, int(math.ceil(max(pa[1], pb[1], pc[1]))) + margin)
+            if max_x < min_x or max_y < min_y:
+                continue
+            denom = ((pb[1] - pc[1]) * (pa[0] - pc[0]) + (pc[0] - pb[0]) * (pa[1] - pc[1]))
+            if abs(denom) < 1.0e-8:
+                continue
+            xs = np.arange(min_x, max_x + 1, dtype=np.float32) + 0.5
+            ys = np.arange(min_y, max_y + 1, dtype=np.float32) + 0.5
+            grid_x, grid_y = np.meshgrid(xs, ys)
+            w0 = ((pb[1] - pc[1]) * (grid_x - pc[0]) + (pc[0] - pb[0]) * (grid_y - pc[1])) / denom
+            w1 = ((pc[1] - pa[1]) * (grid_x - pc[0]) + (pa[0] - pc[0]) * (grid_y - pc[1])) / denom
+            w2 = 1.0 - w0 - w1
+            mask = (w0 >= -1.0e-5) & (w1 >= -1.0e-5) & (w2 >= -1.0e-5)
+            if not mask.any():
+                continue
+            src_u = src_a[0] * w0[mask] + src_b[0] * w1[mask] + src_c[0] * w2[mask]
+            src_v = src_a[1] * w0[mask] + src_b[1] * w1[mask] + src_c[1] * w2[mask]
+            colors = tw.sample_bilinear_np(src, src_w, src_h, src_u.astype(np.float32), src_v.astype(np.float32))
+            dest[min_y:max_y + 1, min_x:max_x + 1][mask] = colors
+    return tw.dilate_alpha(buffer, atlas_w, atlas_h, margin)
+
+
+def make_cluster(face_count, atlas_w, atlas_h, feature=0.004, seed=0):
+    """Random n-gons (mostly small, some overlapping) in four groups with rotation and flips."""
+    rng = random.Random(seed)
+    groups = []
+    for index in range(4):
+        group = {
+            "index": index,
+            "u_min": rng.random() * 0.3, "v_min": rng.random() * 0.3,
+            "u_max": 0.6 + rng.random() * 0.4, "v_max": 0.6 + rng.random() * 0.4,
+            "x": (index % 2) * atlas_w // 2, "y": (index // 2) * atlas_h // 2,
+            "content_w": atlas_w // 2 - 8, "content_h": atlas_h // 2 - 8,
+            "margin_px": rng.choice((0, 2, 4)),
+        }
+        groups.append(group)
+    groups[1]["rotation"] = 90
+    groups[2]["flip_x"] = True
+    groups[3]["flip_y"] = True
+    faces = []
+    face_to_group = {}
+    for face_index in range(face_count):
+        sides = rng.choice((3, 4, 5))
+        cu, cv = rng.random(), rng.random()
+        size = feature * rng.choice((1, 1, 1, 5))
+        uvs = [(cu + size * math.cos(2 * math.pi * k / sides), cv + size * math.sin(2 * math.pi * k / sides)) for k in range(sides)]
+        faces.append({"uvs": uvs, "source_uvs": [(rng.random(), rng.random()) for _ in uvs]})
+        face_to_group[face_index] = groups[rng.randrange(4)]
+    return faces, face_to_group, groups
+
+
+if __name__ == "__main__":
+    src_w, src_h = 256, 256
+    src_pixels = array("f", np.random.default_rng(0).random(src_w * src_h * 4, dtype=np.float32).tobytes())
+    for face_count, size in ((2000, 512), (30000, 2048)):
+        faces, face_to_group, groups = make_cluster(face_count, size, size, seed=face_count)
+        args = (faces, face_to_group, groups, size, size, 128, 128, 2, src_pixels, src_w, src_h)
+
+        start = time.perf_counter()
+        legacy = legacy_bake(*args)
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batched = tw.bake_slot_image_numpy("Diffuse", {}, faces, face_to_group, groups, size, size, 128, 128, 2,
+                                           src_pixels, src_w, src_h, (0.0, 0.0, 0.0, 1.0))
+        batched_time = time.perf_counter() - start
+
+        assert legacy.tobytes() == batched.tobytes(), "batched rasterizer output differs"
+        print(f"--- {face_count} faces, {size}x{size} atlas ---")
+        print(f"legacy per-triangle loop : {legacy_time:7.2f} s")
+        print(f"banded batch rasterizer  : {batched_time:7.2f} s (bit-identical)")
@@ -0,0 +1,153 @@
+# QA/bench_twaa_texcoord_patch.py
+# Benchmark + check: legacy per-vertex struct loops of the TWAA post-export
+# Texcoord patcher vs the NumPy strided-view path. Buffers must be byte-identical.
+#   blender --background --python QA/bench_twaa_texcoord_patch.py
+
+import math
+import random
+import struct
+import sys
+import time
+import types
+from pathlib import Path
+
+import numpy as np
+
+
+ROOT = Path(__file__).resolve().parents[1]
+# Load the patcher as a submodule of the add-on folder without running the
+# add-on __init__ (registration)
+_addon = types.ModuleType("rzm_addon")
+_addon.__path__ = [str(ROOT)]
+sys.modules.setdefault("rzm_addon", _addon)
+
+from rzm_addon.utils import twaa_texcoord_patcher as tp  # noqa: E402
+
+
+def legacy_read_pair(data, offset, storage):
+    return struct.unpack_from("<ee" if storage == "f16" else "<ff", data, offset)
+
+
+def legacy_write_pair(data, offset, u, v, storage):
+    struct.pack_into("<ee" if storage == "f16" else "<ff", data, offset, float(u), float(v))
+
+
+def legacy_patch(data, stride, layout, vertices, pos_size, invert_x, invert_y):
+    """Copy of the old per-vertex _patch_vertex_indices loop (reference)."""
+    patched = 0
+    total_vertices = len(data) // stride
+    for vertex in vertices:
+        if vertex < 0 or vertex >= total_vertices:
+            continue
+        base = vertex * stride + layout["offset"]
+        u, v = legacy_read_pair(data, base, layout["storage"])
+        if not (math.isfinite(u) and math.isfinite(v)):
+            continue
+        out_u, out_v = tp._affine_cluster_to_buffer_uv(float(u), float(v), pos_size, invert_x, invert_y)
+        if not (math.isfinite(out_u) and math.isfinite(out_v)):
+            continue
+        legacy_write_pair(data, base, out_u, out_v, layout["storage"])
+        patched += 1
+    return patched
+
+
+def legacy_slices(data, stride, layout, start, end, vertex_map, by_vertex_uv, by_vertex, by_vertex_points, keys):
+    """Copy of the old per-vertex classification loop of _build_material_vertex_slices (reference)."""
+    slices = {key: [] for key in keys}
+    ambiguous = unmapped = 0
+    for vertex in range(start, end):
+        local_index = vertex - start
+        blender_vertex = int(vertex_map[local_index]) if local_index < len(vertex_map) else local_index
+        u, v = legacy_read_pair(data, vertex * stride + layout["offset"], layout["storage"])
+        if not (math.isfinite(u) and math.isfinite(v)):
+            unmapped += 1
+            continue
+        key, source = tp._classify_vertex_material_from_lookup(blender_vertex, u, v, by_vertex_uv, by_vertex, by_vertex_points)
+        if key:
+            slices[key].append(vertex)
+        elif source.startswith("ambiguous"):
+            ambiguous += 1
+        else:
+            unmapped += 1
+    return {key: sorted(set(indices)) for key, indices in slices.items() if indices}, ambiguous, unmapped
+
+
+def make_buffer(count, stride, layout, seed=0):
+    rng = np.random.default_rng(seed)
+    data = bytearray(rng.integers(0, 256, count * stride, dtype=np.uint8).tobytes())
+    view = tp._texcoord_view(data, stride, layout)
+    view[:] = rng.random((count, 2)).astype(view.dtype)
+    view[rng.integers(0, count, count // 1000)] = np.nan  # broken vertices are skipped
+    view[rng.integers(0, count, count // 1000), 1] = np.inf
+    return data
+
+
+def make_lookup(vertex_count, keys, seed=0):
+    """Loop lookup like _build_loop_material_lookup: one material per vertex, a few seam vertices."""
+    rng = random.Random(seed)
+    by_vertex_uv, by_vertex, by_vertex_points = {}, {}, {}
+    for vertex in range(vertex_count):
+        owners = [rng.choice(keys)] if rng.random() > 0.02 else list(keys)
+        for key in owners:
+            u, v = rng.random(), rng.random()
+            by_vertex.setdefault(vertex, set()).add(key)
+            by_vertex_uv.setdefault((vertex, tp._uv_key(u, v)), set()).add(key)
+            by_vertex_points.setdefault(vertex, []).append((u, v, key))
+    return by_vertex_uv, by_vertex, by_vertex_points
+
+
+def check_patch(count=1_000_000, stride=12):
+    pos_size = (0.25, 0.5, 0.125, 0.375)
+    for layout in ({"storage": "f16", "offset": 4}, {"storage": "f32", "offset": 4}):
+        for invert in ((False, True), (True, False)):
+            data = make_buffer(count, stride, layout)
+            legacy = bytearray(data)
+
+            start = time.perf_counter()
+            legacy_count = legacy_patch(legacy, stride, layout, range(100, count - 100), pos_size, *invert)
+            legacy_time = time.perf_counter() - start
+            start = time.perf_counter()
+            new_count = tp._patch_vertex_range(data, stride, layout, 100, count - 100, pos_size, *invert)
+            new_time = time.perf_counter() - start
+            assert legacy == data and legacy_count == new_count, ("range", layout, invert)
+
+            indices = sorted(random.Random(1).sample(range(count), count // 3))
+            legacy_count = legacy_patch(legacy, stride, layout, indices, pos_size, *invert)
+            new_count = tp._patch_vertex_indices(data, stride, layout, indices, pos_size, *invert)
+            assert legacy == data and legacy_count == new_count, ("indices", layout, invert)
+        print(f"--- {count} vertices, {layout['storage']} ---")
+        print(f"legacy struct loop : {legacy_time:7.2f} s")
+        print(f"strided NumPy view : {new_time:7.2f} s (byte-identical)")
+
+
+def check_slices(count=200_000, stride=12):
+    layout = {"storage": "f32", "offset": 4}
+    keys = ["mat_a", "mat_b", "mat_c"]
+    data = make_buffer(count, stride, layout, seed=2)
+    vertex_count = count // 2
+    vertex_map = np.random.default_rng(3).integers(0, vertex_count, count - 500).astype(np.uint32)
+    lookup = make_lookup(vertex_count + 600, keys)
+    start, end = 0, count
+
+    t0 = time.perf_counter()
+    expected, ambiguous, unmapped = legacy_slices(data, stride, layout, start, end, vertex_map, *lookup, keys)
+    legacy_time = time.perf_counter() - t0
+
+    tp._object_twaa_material_keys = lambda context, obj: {index: key for index, key in enumerate(keys)}
+    tp._build_loop_material_lookup = lambda obj, keys_by_slot: (*lookup, 1)
+    t0 = time.perf_counter()
+    result, diag = tp._build_material_vertex_slices(None, None, {"vertex_map": vertex_map}, data, stride, layout, start, end)
+    new_time = time.perf_counter() - t0
+
+    assert {item["material_key"]: item["indices"].tolist() for item in result} == expected
+    assert (diag["ambiguous"], diag["unmapped"]) == (ambiguous, unmapped)
+    for item in result:
+        assert item["ranges"] == tp._compact_ranges(expected[item["material_key"]])
+    print(f"--- material slices, {count} vertices ---")
+    print(f"legacy per-vertex classify : {legacy_time:7.2f} s")
+    print(f"bulk owner + seam classify : {new_time:7.2f} s (identical)")
+
+
+if __name__ == "__main__":
+    check_patch()
+    check_slices()
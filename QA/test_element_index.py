@@ -0,0 +1,133 @@
+# QA/test_element_index.py
+# Tests for the shared element index: it must answer exactly what the old
+# linear scans over rzm.elements answered (first match wins on duplicate ids,
+# collection order for children and helpers), for RNA-like objects and for
+# manifest dicts alike.
+
+import random
+import sys
+import traceback
+from pathlib import Path
+from types import SimpleNamespace
+
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core import element_index as ei  # noqa: E402
+
+
+def _make_elements(count, seed=0):
+    rng = random.Random(seed)
+    elements = []
+    for i in range(count):
+        eid = i + 1 if rng.random() > 0.02 else rng.randint(1, count)  # a few duplicate ids
+        parent = rng.choice([-1] + [e.id for e in elements[-20:]]) if elements else -1
+        elements.append(SimpleNamespace(
+            id=eid,
+            parent_id=parent,
+            preset_ids=[SimpleNamespace(preset_id=rng.randint(1, count)) for _ in range(rng.randint(0, 2))],
+            underlayer_preset_ids=[SimpleNamespace(preset_id=rng.randint(1, count)) for _ in range(rng.randint(0, 1))],
+            helper_ids=[SimpleNamespace(helper_id=rng.randint(1, count + 5)) for _ in range(rng.randint(0, 2))],
+        ))
+    return elements
+
+
+def _legacy_hierarchy(elements, root_ids):
+    process_queue = [e for e in elements if e.id in root_ids]
+    collected, processed_ids = [], set()
+    while process_queue:
+        elem = process_queue.pop(0)
+        if elem.id in processed_ids: continue
+        processed_ids.add(elem.id)
+        collected.append(elem)
+        process_queue.extend(e for e in elements if getattr(e, "parent_id", -1) == elem.id)
+    return collected
+
+
+def test_lookups_match_linear_scans():
+    elements = _make_elements(600)
+    index = ei.ElementIndex(elements)
+    for target in range(-1, 610):
+        assert index.get(target) is next((e for e in elements if e.id == target), None)
+        assert index.children_of(target) == [e for e in elements if e.parent_id == target]
+    legacy_pairs = []
+    for host in elements:
+        for ref in host.helper_ids:
+            helper = next((e for e in elements if e.id == ref.helper_id), None)
+            if helper: legacy_pairs.append((host, helper))
+    assert list(index.helper_pairs()) == legacy_pairs
+    users = [e for e in elements if any(r.preset_id == 7 for r in e.preset_ids)]
+    assert index.preset_users.get(7, []) == users
+
+
+def test_subtree_matches_legacy_bfs():
+    elements = _make_elements(400, seed=1)
+    index = ei.ElementIndex(elements)
+    for roots in ({1}, {1, 5, 40}, {-3}, {e.id for e in elements[::7]}):
+        assert index.subtree(roots) == _legacy_hierarchy(elements, roots)
+
+
+def test_topological_order():
+    elements = _make_elements(300, seed=2)
+    elements.append(SimpleNamespace(id=9001, parent_id=9002, preset_ids=[], underlayer_preset_ids=[], helper_ids=[]))
+    elements.append(SimpleNamespace(id=9002, parent_id=9001, preset_ids=[], underlayer_preset_ids=[], helper_ids=[]))
+    index = ei.ElementIndex(elements)
+    order = index.order
+    assert sorted(map(id, order)) == sorted(map(id, elements))
+    position = {}
+    for pos, elem in enumerate(order):
+        position.setdefault(elem.id, pos)
+    for pos, elem in enumerate(order):
+        if elem.parent_id in position and elem.id < 9000:
+            assert position[elem.parent_id] < pos
+
+
+def test_manifest_dicts_and_id_pool():
+    manifest = [
+        {"id": 3, "parent_id": -1, "helper_ids": [{"helper_id": 4}]},
+        {"id": 4, "parent_id": 3},
+        {"id": 8, "parent_id": 3, "preset_ids": [{"preset_id": 4}]},
+    ]
+    index = ei.ElementIndex(manifest)
+    assert [d["id"] for d in index.children_of(3)] == [4, 8]
+    assert index.preset_users[4] == [manifest[2]]
+    assert [(h["id"], x["id"]) for h, x in index.helper_pairs()] == [(3, 4)]
+
+    pool = ei.ElementIdPool([1, 2, 4, 7])
+    assert [pool.take() for _ in range(4)] == [3, 5, 6, 8]
+
+
+def test_shared_scope():
+    rzm = SimpleNamespace(elements=_make_elements(50, seed=3))
+    other = SimpleNamespace(elements=_make_elements(10, seed=4))
+    assert ei.element_index(rzm) is not ei.element_index(rzm)
+    with ei.shared_element_index(rzm) as shared:
+        assert ei.element_index(rzm) is shared
+        assert ei.element_index(other) is not shared
+    assert ei.element_index(rzm) is not shared
+
+
+TESTS = [
+    test_lookups_match_linear_scans,
+    test_subtree_matches_legacy_bfs,
+    test_topological_order,
+    test_manifest_dicts_and_id_pool,
+    test_shared_scope,
+]
+
+
+if __name__ == "__main__":
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"[PASS] {test.__name__}")
+        except Exception:
+            failed += 1
+            print(f"[FAIL] {test.__name__}")
+            traceback.print_exc()
+    print(f"Results: {len(TESTS) - failed} passed, {failed} failed / {len(TESTS)} total")
+    if failed:
+        raise SystemExit(1)
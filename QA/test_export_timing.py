@@ -0,0 +1,90 @@
+# QA/test_export_timing.py
+# Tests for the export profiler history and the rolling-median regression check.
+
+import os
+import sys
+import tempfile
+import traceback
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from utils import export_timing  # noqa: E402
+
+
+def _run(title, **stages):
+    return {"title": title, "stages": [{"name": name, "wall": wall} for name, wall in stages.items()]}
+
+
+def test_profiler_records_nested_stages_and_bytes():
+    with tempfile.TemporaryDirectory() as mod_root:
+        profiler = export_timing.ExportProfiler("Test Export", output_root=mod_root, trace_memory=True)
+        export_timing.set_current_profiler(profiler)
+        try:
+            with profiler.measure("outer"):
+                with profiler.measure("inner"):
+                    blob = bytearray(1 << 20)
+                    with open(os.path.join(mod_root, "out.buf"), "wb") as f:
+                        f.write(bytes(4096))
+                    export_timing.count_written(4096)
+                del blob
+                # Not reported by its writer: only the per-run walk sees it
+                with open(os.path.join(mod_root, "external.buf"), "wb") as f:
+                    f.write(bytes(100))
+        finally:
+            export_timing.set_current_profiler(None)
+        export_timing.count_written(1 << 30)  # no current profiler: ignored
+        profiler.finish()
+        record = profiler.record()
+        inner, outer = record["stages"]
+        assert (inner["name"], inner["depth"]) == ("inner", 1)
+        assert (outer["name"], outer["depth"]) == ("outer", 0)
+        assert inner["bytes_written"] == outer["bytes_written"] == record["bytes_written"] == 4096
+        assert record["output_bytes"] == 4196
+        assert inner["peak_mem"] >= 1 << 20
+        assert outer["peak_mem"] >= inner["peak_mem"]
+
+
+def test_history_roundtrip_and_limit():
+    with tempfile.TemporaryDirectory() as mod_root:
+        for i in range(5):
+            profiler = export_timing.ExportProfiler(f"Run {i}")
+            profiler.add("stage", i)
+            assert export_timing.save_history(profiler, mod_root, limit=3)
+        runs = export_timing.load_history(mod_root)
+        assert [run["title"] for run in runs] == ["Run 2", "Run 3", "Run 4"]
+        assert runs[-1]["stages"][0]["wall"] == 4.0
+
+
+def test_regressions_against_rolling_median():
+    history = [_run("Full", a=1.0, b=0.2) for _ in range(4)]
+    history.append(_run("Quick", a=9.0))
+    history.append(_run("Full", a=1.1, b=0.5, c=3.0))
+    regressions = export_timing.find_regressions(history)
+    assert [r["name"] for r in regressions] == ["b"]
+    assert abs(regressions[0]["median"] - 0.2) < 1e-9
+
+
+TESTS = [
+    test_profiler_records_nested_stages_and_bytes,
+    test_history_roundtrip_and_limit,
+    test_regressions_against_rolling_median,
+]
+
+
+if __name__ == "__main__":
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"[PASS] {test.__name__}")
+        except Exception:
+            failed += 1
+            print(f"[FAIL] {test.__name__}")
+            traceback.print_exc()
+    print(f"Results: {len(TESTS) - failed} passed, {failed} failed / {len(TESTS)} total")
+    if failed:
+        raise SystemExit(1)
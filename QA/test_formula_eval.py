@@ -0,0 +1,78 @@
+# QA/test_formula_eval.py
+# Tests for the compiled safe_eval used by inspector spin boxes and formula previews.
+# evaluation.py is loaded by path: importing the qt_editor package needs Blender.
+
+import importlib.util
+import traceback
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+_spec = importlib.util.spec_from_file_location("rzm_evaluation", ROOT / "qt_editor" / "utils" / "evaluation.py")
+evaluation = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(evaluation)
+
+
+def test_arithmetic_and_power_alias():
+    assert evaluation.safe_eval("500 - 100") == 400
+    assert evaluation.safe_eval("2^3") == 8
+    assert evaluation.safe_eval("10/4") == 2.5
+    assert evaluation.safe_eval("max(1, sqrt(16)) + math.floor(2.7)") == 6.0
+
+
+def test_context_variables():
+    ctx = {"$Width": 200, "$WindowWidth": 1920, "Gap": 5}
+    assert evaluation.safe_eval("$WindowWidth - $Width", ctx) == 1720
+    assert evaluation.safe_eval("$Width + Gap + unknown", ctx) == 205.0
+    # Sigil variables must be provided
+    assert evaluation.safe_eval("$Missing + 1", ctx) is None
+
+
+def test_rejects_unsafe_expressions():
+    for expr in ("__import__('os')", "().__class__", "'a' * 3", "[1, 2]", "x if 1 else 2",
+                 "math.__dict__", "abs(x=1)", "1 < 2", "lambda: 1"):
+        assert evaluation.compile_expression(expr) is None, expr
+    assert evaluation.safe_eval("1/0") is None
+
+
+def test_compiled_once_and_cached():
+    a = evaluation.compile_expression("  $Value * 2 ")
+    b = evaluation.compile_expression("$Value * 2")
+    assert a is b
+    assert [s[1] for s in a.slots] == ["$Value"]
+
+
+def test_batch_evaluation():
+    contexts = [{"$Value": v} for v in (1, 2.5, 10)]
+    assert evaluation.safe_eval_many("$Value * 2 + 1", contexts) == [3, 6.0, 21]
+    assert evaluation.safe_eval_many("bad (", contexts) == [None, None, None]
+
+
+def test_formula_preview():
+    assert evaluation.get_formula_preview("$Width / 3", {"width": 100}) == "33.33"
+    assert evaluation.get_formula_preview("$Nope") == ""
+
+
+TESTS = [
+    test_arithmetic_and_power_alias,
+    test_context_variables,
+    test_rejects_unsafe_expressions,
+    test_compiled_once_and_cached,
+    test_batch_evaluation,
+    test_formula_preview,
+]
+
+
+if __name__ == "__main__":
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"[PASS] {test.__name__}")
+        except Exception:
+            failed += 1
+            print(f"[FAIL] {test.__name__}")
+            traceback.print_exc()
+    print(f"Results: {len(TESTS) - failed} passed, {failed} failed / {len(TESTS)} total")
+    if failed:
+        raise SystemExit(1)
@@ -0,0 +1,120 @@
+# QA/test_pixel_fill.py
+# Tests for core.pixel_fill on the NumPy path (scipy disabled): the batched
+# sprite bleed must equal an exact brute-force nearest-visible fill inside each
+# sprite, and dilation must respect its radius.
+
+import sys
+import traceback
+from pathlib import Path
+
+import numpy as np
+
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core import pixel_fill  # noqa: E402
+
+pixel_fill._ndimage = None  # the exact NumPy transform is what stock Blender runs
+
+
+def _sprite(rng, h, w, density):
+    pixels = np.zeros((h, w, 4), dtype=np.float32)
+    visible = rng.random((h, w)) < density
+    visible[rng.integers(h), rng.integers(w)] = True
+    pixels[visible] = rng.random((int(visible.sum()), 4), dtype=np.float32) * 0.9 + 0.1
+    pixels[~visible, :3] = rng.random((int((~visible).sum()), 3), dtype=np.float32)  # garbage RGB
+    return pixels, visible
+
+
+def _assert_exact_fill(before, after, visible):
+    """Every hole takes the RGB of one of its nearest visible pixels; the rest is untouched."""
+    assert np.array_equal(after[..., 3], before[..., 3])
+    assert np.array_equal(after[visible], before[visible])
+    vy, vx = np.nonzero(visible)
+    for y, x in zip(*np.nonzero(~visible)):
+        d2 = (vy - y) ** 2 + (vx - x) ** 2
+        nearest = {tuple(before[vy[i], vx[i], :3]) for i in np.flatnonzero(d2 == d2.min())}
+        assert tuple(after[y, x, :3]) in nearest, (y, x)
+
+
+def test_bleed_sprites_matches_exact_fill():
+    rng = np.random.default_rng(1)
+    shapes = [(23, 17), (5, 60), (60, 4), (1, 9), (31, 31), (2, 2)]
+    sprites = [_sprite(rng, h, w, 0.03) for h, w in shapes]
+    before = [pixels.copy() for pixels, _ in sprites]
+    pixel_fill.bleed_sprites_rgb([pixels for pixels, _ in sprites])
+    for (after, visible), orig in zip(sprites, before):
+        _assert_exact_fill(orig, after, visible)
+
+
+def test_bleed_small_batches_and_views():
+    rng = np.random.default_rng(2)
+    atlas = np.zeros((80, 80, 4), dtype=np.float32)
+    rects = [(0, 0, 30, 20), (40, 0, 25, 35), (0, 45, 70, 12)]
+    masks = []
+    for x, y, w, h in rects:
+        pixels, visible = _sprite(rng, h, w, 0.02)
+        atlas[y:y + h, x:x + w] = pixels
+        masks.append(visible)
+    before = atlas.copy()
+    limit = pixel_fill.BLEED_BATCH_CELLS
+    pixel_fill.BLEED_BATCH_CELLS = 600  # one sprite per batch
+    try:
+        pixel_fill.bleed_sprites_rgb([atlas[y:y + h, x:x + w] for x, y, w, h in rects])
+    finally:
+        pixel_fill.BLEED_BATCH_CELLS = limit
+    outside = np.ones((80, 80), dtype=bool)
+    for (x, y, w, h), visible in zip(rects, masks):
+        _assert_exact_fill(before[y:y + h, x:x + w], atlas[y:y + h, x:x + w], visible)
+        outside[y:y + h, x:x + w] = False
+    assert np.array_equal(atlas[outside], before[outside])
+
+
+def test_bleed_transparent_rgb_copy_and_edge_cases():
+    rng = np.random.default_rng(3)
+    pixels, visible = _sprite(rng, 19, 27, 0.05)
+    out = pixel_fill.bleed_transparent_rgb(pixels)
+    assert out is not pixels
+    _assert_exact_fill(pixels, out, visible)
+    empty = np.zeros((4, 4, 4), dtype=np.float32)
+    assert np.array_equal(pixel_fill.bleed_transparent_rgb(empty), empty)
+
+
+def test_dilate_radius():
+    rng = np.random.default_rng(4)
+    pixels, visible = _sprite(rng, 41, 29, 0.03)
+    pixels[~visible] = 0.0
+    out = pixel_fill.dilate_rgba(pixels, 3)
+    vy, vx = np.nonzero(visible)
+    for y, x in zip(*np.nonzero(~visible)):
+        d2 = (vy - y) ** 2 + (vx - x) ** 2
+        if d2.min() > 9:
+            assert not out[y, x].any(), (y, x)
+        else:
+            nearest = {tuple(pixels[vy[i], vx[i]]) for i in np.flatnonzero(d2 == d2.min())}
+            assert tuple(out[y, x]) in nearest, (y, x)
+
+
+TESTS = [
+    test_bleed_sprites_matches_exact_fill,
+    test_bleed_small_batches_and_views,
+    test_bleed_transparent_rgb_copy_and_edge_cases,
+    test_dilate_radius,
+]
+
+
+if __name__ == "__main__":
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"[PASS] {test.__name__}")
+        except Exception:
+            failed += 1
+            print(f"[FAIL] {test.__name__}")
+            traceback.print_exc()
+    print(f"Results: {len(TESTS) - failed} passed, {failed} failed / {len(TESTS)} total")
+    if failed:
+        raise SystemExit(1)
@@ -0,0 +1,141 @@
+# QA/test_png_encoder.py
+# Tests for the streaming PNG encoder: banded multi-IDAT zlib stream, adaptive
+# row filters, float quantization. Files are decoded here with zlib only.
+
+import os
+import struct
+import sys
+import tempfile
+import traceback
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core import png_encoder  # noqa: E402
+
+
+def _read_png(path):
+    """Minimal RGBA8 decoder: checks chunk CRCs, inflates the IDAT stream, undoes filters."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    assert data[:8] == png_encoder.PNG_SIGNATURE
+    pos, idat, idat_count = 8, b'', 0
+    while pos < len(data):
+        length, kind = struct.unpack('>I4s', data[pos:pos + 8])
+        payload = data[pos + 8:pos + 8 + length]
+        crc, = struct.unpack('>I', data[pos + 8 + length:pos + 12 + length])
+        assert crc == zlib.crc32(kind + payload) & 0xFFFFFFFF, kind
+        if kind == b'IHDR':
+            width, height = struct.unpack('>II', payload[:8])
+        elif kind == b'IDAT':
+            idat += payload
+            idat_count += 1
+        pos += 12 + length
+    raw = zlib.decompress(idat)  # verifies the combined Adler-32 too
+    stride = width * 4
+    rows = np.frombuffer(raw, dtype=np.uint8).reshape(height, stride + 1)
+    out = np.zeros((height, stride), dtype=np.int32)
+    prev = np.zeros(stride, dtype=np.int32)
+    for y in range(height):
+        kind, line = rows[y, 0], rows[y, 1:].astype(np.int32)
+        cur = np.zeros(stride, dtype=np.int32)
+        for i in range(stride):
+            a = cur[i - 4] if i >= 4 else 0
+            b = prev[i]
+            c = prev[i - 4] if i >= 4 else 0
+            if kind == 0:
+                pred = 0
+            elif kind == 1:
+                pred = a
+            elif kind == 2:
+                pred = b
+            elif kind == 3:
+                pred = (a + b) // 2
+            else:
+                p = a + b - c
+                pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+                pred = a if pa <= pb and pa <= pc else (b if pb <= pc else c)
+            cur[i] = (line[i] + pred) & 0xFF
+        out[y] = cur
+        prev = cur
+    return out.astype(np.uint8).reshape(height, width, 4), idat_count
+
+
+def _test_image(height, width, seed=0):
+    yy, xx = np.mgrid[0:height, 0:width]
+    img = np.stack(((xx * 3) % 256, (yy * 2) % 256, (xx + yy) % 256, np.full_like(xx, 255)), axis=-1)
+    noise = np.random.default_rng(seed).integers(0, 256, (height, width // 3, 4))
+    img[:, :width // 3] = noise  # incompressible strip
+    return img.astype(np.uint8)
+
+
+def test_roundtrip_levels_and_workers():
+    img = _test_image(150, 37)
+    with tempfile.TemporaryDirectory() as tmp:
+        for level in (0, 1, 6, 9):
+            for workers in (1, 4):
+                path = os.path.join(tmp, f"{level}_{workers}.png")
+                png_encoder.write_png_rgba8(path, img, level=level, workers=workers)
+                decoded, idat_count = _read_png(path)
+                assert np.array_equal(decoded, img), (level, workers)
+                assert idat_count >= 3  # one IDAT per band (150 rows / 64)
+
+
+def test_float_quantization():
+    floats = np.random.default_rng(3).random((70, 20, 4), dtype=np.float32) * 1.2 - 0.1
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "f.png")
+        png_encoder.write_png_rgba8(path, floats, workers=2)
+        decoded, _ = _read_png(path)
+    expected = np.clip(floats * 255.0 + 0.5, 0.0, 255.0).astype(np.uint8)
+    assert np.array_equal(decoded, expected)
+
+
+def test_adler32_combine():
+    rng = np.random.default_rng(5)
+    a = rng.integers(0, 256, 100_003, dtype=np.uint8).tobytes()
+    b = rng.integers(0, 256, 70_001, dtype=np.uint8).tobytes()
+    combined = png_encoder.adler32_combine(zlib.adler32(a), zlib.adler32(b), len(b))
+    assert combined == zlib.adler32(a + b)
+    assert png_encoder.adler32_combine(1, zlib.adler32(b), len(b)) == zlib.adler32(b)
+
+
+def test_filters_shrink_smooth_images():
+    yy, xx = np.mgrid[0:256, 0:256]
+    img = np.stack((xx, yy, (xx + yy) // 2, 255 - xx), axis=-1).astype(np.uint8)
+    with tempfile.TemporaryDirectory() as tmp:
+        fast = os.path.join(tmp, "fast.png")
+        small = os.path.join(tmp, "small.png")
+        png_encoder.write_png_rgba8(fast, img, level=png_encoder.LEVEL_FAST)
+        png_encoder.write_png_rgba8(small, img, level=png_encoder.LEVEL_DEFAULT)
+        assert os.path.getsize(small) * 4 < os.path.getsize(fast)
+        assert np.array_equal(_read_png(small)[0], img)
+
+
+TESTS = [
+    test_roundtrip_levels_and_workers,
+    test_float_quantization,
+    test_adler32_combine,
+    test_filters_shrink_smooth_images,
+]
+
+
+if __name__ == "__main__":
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"[PASS] {test.__name__}")
+        except Exception:
+            failed += 1
+            print(f"[FAIL] {test.__name__}")
+            traceback.print_exc()
+    print(f"Results: {len(TESTS) - failed} passed, {failed} failed / {len(TESTS)} total")
+    if failed:
+        raise SystemExit(1)
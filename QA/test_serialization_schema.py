@@ -0,0 +1,204 @@
+# QA/test_serialization_schema.py
+# Tests for the schema-compiled serializer helpers (core/serialization.py)
+# that don't need Blender: _compile_schema on a fake bl_rna and _write_columns
+# on a fake collection. The full byte-identical save/load check against the
+# old reflective code is QA/bench_serialization.py (runs inside Blender).
+
+import sys
+import traceback
+import types
+from pathlib import Path
+from types import SimpleNamespace
+
+
+ROOT = Path(__file__).resolve().parents[1]
+try:
+    import bpy  # noqa: F401
+except ImportError:
+    # Outside Blender: serialization only needs these names to import
+    _types = SimpleNamespace(**{name: type(name, (), {}) for name in (
+        "PropertyGroup", "bpy_prop_collection", "bpy_prop_array")})
+    sys.modules["bpy"] = types.ModuleType("bpy")
+    sys.modules["bpy"].types = _types
+    sys.modules["mathutils"] = types.ModuleType("mathutils")
+    for _name in ("Vector", "Color", "Euler", "Quaternion"):
+        setattr(sys.modules["mathutils"], _name, type(_name, (), {}))
+
+# serialization imports .element_index: load it as a submodule of the add-on
+# folder without running the add-on __init__ (registration)
+_addon = types.ModuleType("rzm_addon")
+_addon.__path__ = [str(ROOT)]
+sys.modules.setdefault("rzm_addon", _addon)
+
+from rzm_addon.core import serialization as ser  # noqa: E402
+
+
+def _prop(identifier, prop_type, length=0, dims=None, enum_flag=False):
+    return SimpleNamespace(
+        identifier=identifier,
+        type=prop_type,
+        array_length=length,
+        array_dimensions=dims or (length, 0, 0),
+        is_enum_flag=enum_flag,
+    )
+
+
+def _annotation(**keywords):
+    """Stand-in for a bpy.props deferred property: only .keywords is read."""
+    return SimpleNamespace(keywords=keywords)
+
+
+class _Base:
+    __annotations__ = {"inherited": _annotation()}
+
+
+class _Group(_Base):
+    __annotations__ = {
+        "count": _annotation(),
+        "name": _annotation(),
+        "color": _annotation(update=print),
+        "position": _annotation(size=2),
+        "locked": _annotation(set=print),
+        "flags": _annotation(),
+        "matrix": _annotation(),
+        "image": _annotation(),
+        "items": _annotation(),
+        "weight": _annotation(),
+    }
+
+
+_RNA = SimpleNamespace(properties=[
+    _prop("rna_type", "POINTER"),
+    _prop("count", "INT"),
+    _prop("name", "STRING"),
+    _prop("color", "FLOAT", 4),
+    _prop("position", "INT", 2),
+    _prop("locked", "BOOLEAN"),
+    _prop("mode", "ENUM"),
+    _prop("flags", "ENUM", enum_flag=True),
+    _prop("matrix", "FLOAT", 4, dims=(2, 2, 0)),
+    _prop("image", "POINTER"),
+    _prop("items", "COLLECTION"),
+    _prop("inherited", "FLOAT"),
+    _prop("weight", "FLOAT"),
+    _prop("no_annotation", "INT"),
+])
+
+
+class _Collection:
+    """Records foreach_set calls; raises for keys listed in reject."""
+
+    def __init__(self, reject=()):
+        self.reject = set(reject)
+        self.columns = {}
+
+    def foreach_set(self, key, flat):
+        if key in self.reject:
+            raise TypeError(key)
+        self.columns[key] = list(flat)
+
+
+def test_compile_schema_kinds_and_order():
+    schema = ser._compile_schema(_Group, _RNA)
+    assert schema.fields == [
+        ("count", ser.FIELD_SCALAR),
+        ("name", ser.FIELD_SCALAR),
+        ("color", ser.FIELD_ARRAY),
+        ("position", ser.FIELD_ARRAY),
+        ("locked", ser.FIELD_SCALAR),
+        ("mode", ser.FIELD_SCALAR),
+        ("flags", ser.FIELD_GENERIC),
+        ("matrix", ser.FIELD_GENERIC),
+        ("image", ser.FIELD_POINTER),
+        ("items", ser.FIELD_COLLECTION),
+        ("inherited", ser.FIELD_SCALAR),
+        ("weight", ser.FIELD_SCALAR),
+        ("no_annotation", ser.FIELD_SCALAR),
+    ]
+    assert schema.kinds["matrix"] == ser.FIELD_GENERIC
+
+
+def test_compile_schema_bulk_fields():
+    schema = ser._compile_schema(_Group, _RNA)
+    # Every numeric scalar / 1-D array is read in columns
+    assert schema.bulk_get == [
+        ("count", "INT", 0),
+        ("color", "FLOAT", 4),
+        ("position", "INT", 2),
+        ("locked", "BOOLEAN", 0),
+        ("inherited", "FLOAT", 0),
+        ("weight", "FLOAT", 0),
+        ("no_annotation", "INT", 0),
+    ]
+    # update/set callbacks and unknown annotations are written through setattr
+    assert schema.bulk_set == [
+        ("count", "INT", 0),
+        ("position", "INT", 2),
+        ("inherited", "FLOAT", 0),
+        ("weight", "FLOAT", 0),
+    ]
+
+
+def test_write_columns_full_columns_only():
+    schema = ser._compile_schema(_Group, _RNA)
+    items = [
+        {"count": 1, "position": [1, 2], "inherited": 0.5, "weight": 1},
+        {"count": 2, "position": [3, 4], "inherited": 1.5},
+        {"count": 3, "position": [5, 6], "inherited": 2.5, "weight": 2.0},
+    ]
+    coll = _Collection()
+    written = ser._write_columns(coll, schema, items)
+    # weight is missing in one record: left to the per-item path
+    assert written == {"count", "position", "inherited"}
+    assert coll.columns == {
+        "count": [1, 2, 3],
+        "position": [1, 2, 3, 4, 5, 6],
+        "inherited": [0.5, 1.5, 2.5],
+    }
+
+
+def test_write_columns_rejects_mismatched_values():
+    schema = ser._compile_schema(_Group, _RNA)
+    cases = [
+        ("count", [{"count": 1}, {"count": 2.0}]),              # float into INT
+        ("count", [{"count": 1}, {"count": True}]),             # bool into INT
+        ("position", [{"position": [1, 2]}, {"position": [1]}]),  # wrong length
+        ("position", [{"position": [1, 2]}, {"position": (1, 2)}]),  # not a list
+        ("position", [{"position": [1, 2]}, {"position": [1, 2.5]}]),
+        ("weight", [{"weight": 1.0}, {"weight": "1"}]),
+    ]
+    for key, items in cases:
+        coll = _Collection()
+        assert key not in ser._write_columns(coll, schema, items), (key, items)
+        assert key not in coll.columns
+
+
+def test_write_columns_foreach_set_failure():
+    schema = ser._compile_schema(_Group, _RNA)
+    items = [{"count": i, "weight": float(i)} for i in range(4)]
+    coll = _Collection(reject={"count"})
+    assert ser._write_columns(coll, schema, items) == {"weight"}
+
+
+TESTS = [
+    test_compile_schema_kinds_and_order,
+    test_compile_schema_bulk_fields,
+    test_write_columns_full_columns_only,
+    test_write_columns_rejects_mismatched_values,
+    test_write_columns_foreach_set_failure,
+]
+
+
+if __name__ == "__main__":
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"[PASS] {test.__name__}")
+        except Exception:
+            failed += 1
+            print(f"[FAIL] {test.__name__}")
+            traceback.print_exc()
+    print(f"Results: {len(TESTS) - failed} passed, {failed} failed / {len(TESTS)} total")
+    if failed:
+        raise SystemExit(1)
@@ -0,0 +1,81 @@
+# QA/test_spatial_index.py
+# Tests for the batched vertex search used by the XXMI/EFMI cache builders.
+# The NumPy grid path is forced so the result does not depend on SciPy.
+
+import sys
+import traceback
+from pathlib import Path
+
+import numpy as np
+
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from utils import spatial_index  # noqa: E402
+
+
+def _grid_nearest(points, queries, max_dist=None):
+    saved = spatial_index._cKDTree
+    spatial_index._cKDTree = None
+    try:
+        return spatial_index.nearest_indices(points, queries, max_dist=max_dist)
+    finally:
+        spatial_index._cKDTree = saved
+
+
+def _brute(points, queries):
+    d = np.sqrt(((queries[:, None, :] - points[None, :, :]) ** 2).sum(axis=2))
+    return d.min(axis=1)
+
+
+def test_matches_brute_force_distances():
+    rng = np.random.default_rng(3)
+    points = rng.normal(size=(1500, 3)) * (1.0, 2.0, 0.3)
+    queries = points[rng.integers(0, len(points), 900)] + rng.normal(size=(900, 3)) * 0.05
+    queries[:20] += 4.0
+    idx, dist = _grid_nearest(points, queries)
+    assert np.allclose(dist, _brute(points, queries))
+    assert np.allclose(np.linalg.norm(points[idx] - queries, axis=1), dist)
+
+
+def test_max_dist_marks_far_queries():
+    rng = np.random.default_rng(4)
+    points = rng.uniform(-1.0, 1.0, size=(800, 3))
+    queries = np.concatenate([points[:300] + 1e-5, points[:50] + (0.0, 0.0, 5.0)])
+    idx, dist = _grid_nearest(points, queries, max_dist=0.5)
+    ref = _brute(points, queries)
+    assert np.array_equal(idx < 0, ref > 0.5)
+    assert np.allclose(dist[idx >= 0], ref[ref <= 0.5])
+    assert np.all(np.isinf(dist[idx < 0]))
+
+
+def test_duplicate_buffer_vertices_map_many_to_one():
+    points = np.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0]])
+    queries = points[[2, 0, 0, 1, 2]]
+    idx, dist = _grid_nearest(points, queries, max_dist=0.5)
+    assert idx.tolist() == [2, 0, 0, 1, 2]
+    assert np.all(dist == 0.0)
+
+
+TESTS = [
+    test_matches_brute_force_distances,
+    test_max_dist_marks_far_queries,
+    test_duplicate_buffer_vertices_map_many_to_one,
+]
+
+
+if __name__ == "__main__":
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"[PASS] {test.__name__}")
+        except Exception:
+            failed += 1
+            print(f"[FAIL] {test.__name__}")
+            traceback.print_exc()
+    print(f"Results: {len(TESTS) - failed} passed, {failed} failed / {len(TESTS)} total")
+    if failed:
+        raise SystemExit(1)
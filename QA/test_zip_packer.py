@@ -0,0 +1,129 @@
+# QA/test_zip_packer.py
+# Tests for the Mod Producer zip packaging: per-file method choice, content-hash
+# reuse across archives and runs, and archives readable by the stdlib zipfile.
+
+import os
+import sys
+import tempfile
+import traceback
+import zipfile
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from utils import zip_packer  # noqa: E402
+
+
+def _write(root, rel, data):
+    path = os.path.join(root, rel)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def _make_mod(root, tag=b''):
+    _write(root, "mod.ini", b"[TextureOverride]\nhash = 1234\n" * 200 + tag)
+    _write(root, "Meshes/body.buf", bytes(range(256)) * 2000)
+    _write(root, "Textures/atlas.png", os.urandom(3000))
+    _write(root, "Textures/noise.dds", os.urandom(400_000))
+    _write(root, "empty.txt", b"")
+    _write(root, "Текстуры/имя.txt", "ünïcode".encode('utf-8') * 50)
+
+
+def _read_back(zip_path, folder, prefix):
+    with zipfile.ZipFile(zip_path) as z:
+        assert z.testzip() is None
+        infos = {info.filename: info for info in z.infolist()}
+        for root, _, files in os.walk(folder):
+            for name in files:
+                full = os.path.join(root, name)
+                arcname = prefix + "/" + os.path.relpath(full, folder).replace(os.sep, "/")
+                with open(full, 'rb') as f:
+                    assert z.read(arcname) == f.read(), arcname
+        return infos
+
+
+def test_methods_and_roundtrip():
+    with tempfile.TemporaryDirectory() as tmp:
+        mod = os.path.join(tmp, "mod")
+        _make_mod(mod)
+        with zip_packer.ZipPacker(os.path.join(tmp, "cache")) as packer:
+            packer.pack_folder(mod, os.path.join(tmp, "out.zip"), "@Mod")
+        infos = _read_back(os.path.join(tmp, "out.zip"), mod, "@Mod")
+        assert infos["@Mod/mod.ini"].compress_type == zipfile.ZIP_DEFLATED
+        assert infos["@Mod/Meshes/body.buf"].compress_type == zipfile.ZIP_DEFLATED
+        assert infos["@Mod/Textures/atlas.png"].compress_type == zipfile.ZIP_STORED
+        # Incompressible data is detected by the probe, not by extension
+        assert infos["@Mod/Textures/noise.dds"].compress_type == zipfile.ZIP_STORED
+
+
+def test_shared_content_is_compressed_once():
+    with tempfile.TemporaryDirectory() as tmp:
+        a, b = os.path.join(tmp, "a"), os.path.join(tmp, "b")
+        _make_mod(a, b"tier a")
+        _make_mod(b, b"tier b")
+        os.replace(os.path.join(b, "Textures/noise.dds"), os.path.join(b, "Textures/other.dds"))
+        with zip_packer.ZipPacker(os.path.join(tmp, "cache")) as packer:
+            packer.pack_folder(a, os.path.join(tmp, "a.zip"), "A")
+            first = dict(packer.stats)
+            packer.pack_folder(b, os.path.join(tmp, "b.zip"), "B")
+            # Only the INI differs; body.buf and the unicode file are reused
+            assert packer.stats["compressed"] == first["compressed"] + 1
+        _read_back(os.path.join(tmp, "b.zip"), b, "B")
+
+
+def test_cache_survives_runs_and_is_pruned():
+    with tempfile.TemporaryDirectory() as tmp:
+        mod = os.path.join(tmp, "mod")
+        cache = os.path.join(tmp, "cache")
+        _make_mod(mod)
+        _write(mod, "old.txt", b"stale " * 1000)
+        with zip_packer.ZipPacker(cache) as packer:
+            packer.pack_folder(mod, os.path.join(tmp, "1.zip"), "M")
+        os.remove(os.path.join(mod, "old.txt"))
+        with zip_packer.ZipPacker(cache) as packer:
+            packer.pack_folder(mod, os.path.join(tmp, "2.zip"), "M")
+            assert packer.stats["compressed"] == 0
+        _read_back(os.path.join(tmp, "2.zip"), mod, "M")
+        payloads = [n for n in os.listdir(cache) if n.endswith(".deflate")]
+        assert len(payloads) == 3  # mod.ini, body.buf, unicode txt; old.txt pruned
+
+
+def test_zip64_fields():
+    saved = zip_packer._ZIP64_LIMIT, zip_packer._ZIP16_LIMIT
+    zip_packer._ZIP64_LIMIT, zip_packer._ZIP16_LIMIT = 1000, 3
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            mod = os.path.join(tmp, "mod")
+            _make_mod(mod)
+            with zip_packer.ZipPacker() as packer:
+                packer.pack_folder(mod, os.path.join(tmp, "big.zip"), "M")
+            _read_back(os.path.join(tmp, "big.zip"), mod, "M")
+    finally:
+        zip_packer._ZIP64_LIMIT, zip_packer._ZIP16_LIMIT = saved
+
+
+TESTS = [
+    test_methods_and_roundtrip,
+    test_shared_content_is_compressed_once,
+    test_cache_survives_runs_and_is_pruned,
+    test_zip64_fields,
+]
+
+
+if __name__ == "__main__":
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"[PASS] {test.__name__}")
+        except Exception:
+            failed += 1
+            print(f"[FAIL] {test.__name__}")
+            traceback.print_exc()
+    print(f"Results: {len(TESTS) - failed} passed, {failed} failed / {len(TESTS)} total")
+    if failed:
+        raise SystemExit(1)
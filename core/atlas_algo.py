@@ -1,9 +1,12 @@
 # RZMenu/core/atlas_algo.py (ex rzm_atlas.py)
 import bpy
+import hashlib
+import os
 import numpy as np
 import struct
 import zlib
 from pathlib import Path
+from .pixel_fill import bleed_sprites_rgb
 
 # 'SRGB'   -> Добавляет чанк sRGB и gAMA (стандарт для Paint.NET/Web, цвета "как есть")
 # 'LINEAR' -> Добавляет только gAMA 1.0 (говорит софту, что это линейное пространство)
@@ -23,59 +26,149 @@ class PackerNode:
         self.down = PackerNode(x=self.x, y=self.y + h, w=self.w, h=self.h - h)
         return self
 
-# Зазор между элементами атласа в пикселях (предотвращает texture bleeding).
-ATLAS_MARGIN = 8
-
-def _bleed_transparent_rgb(pixels: np.ndarray, iterations: int = 8, alpha_threshold: float = 1.0 / 255.0) -> np.ndarray:
+class MaxRectsPacker:
+    """
+    MaxRects bin (best-short-side-fit) фиксированного размера.
+    Хранит список максимальных свободных прямоугольников. Поворот спрайтов
+    по умолчанию выключен: повёрнутый спрайт ломает UV в шейдере.
     """
-    Fill RGB in fully transparent pixels from nearby visible pixels while
-    preserving alpha. This keeps transparent black/garbage RGB out of filtering
-    and DDS encoding.
+    def __init__(self, w, h, allow_rotation=False):
+        self.w, self.h = w, h
+        self.allow_rotation = allow_rotation
+        self.free = [(0, 0, w, h)]
+
+    def insert(self, w, h):
+        best = None
+        best_score = None
+        for fx, fy, fw, fh in self.free:
+            if w <= fw and h <= fh:
+                dw, dh = fw - w, fh - h
+                score = (min(dw, dh), max(dw, dh), fy, fx)
+                if best_score is None or score < best_score:
+                    best_score, best = score, (fx, fy, w, h)
+            if self.allow_rotation and h <= fw and w <= fh:
+                dw, dh = fw - h, fh - w
+                score = (min(dw, dh), max(dw, dh), fy, fx)
+                if best_score is None or score < best_score:
+                    best_score, best = score, (fx, fy, h, w)
+        if best is None:
+            return None
+        self._place(*best)
+        return best
+
+    def _place(self, x, y, w, h):
+        x1, y1 = x + w, y + h
+        kept = []
+        created = []
+        for rect in self.free:
+            fx, fy, fw, fh = rect
+            fx1, fy1 = fx + fw, fy + fh
+            if x >= fx1 or x1 <= fx or y >= fy1 or y1 <= fy:
+                kept.append(rect)
+                continue
+            if x > fx: created.append((fx, fy, x - fx, fh))
+            if x1 < fx1: created.append((x1, fy, fx1 - x1, fh))
+            if y > fy: created.append((fx, fy, fw, y - fy))
+            if y1 < fy1: created.append((fx, y1, fw, fy1 - y1))
+
+        # Новые куски — подмножества старых свободных прямоугольников, поэтому
+        # старые внутри новых оказаться не могут. Чистим только новые.
+        for i, a in enumerate(created):
+            ax, ay, aw, ah = a
+            contained = False
+            for j, b in enumerate(created):
+                if i == j: continue
+                bx, by, bw, bh = b
+                if bx <= ax and by <= ay and ax + aw <= bx + bw and ay + ah <= by + bh:
+                    # Из точных дубликатов оставляем первый
+                    if a != b or j < i:
+                        contained = True
+                        break
+            if not contained:
+                for bx, by, bw, bh in kept:
+                    if bx <= ax and by <= ay and ax + aw <= bx + bw and ay + ah <= by + bh:
+                        contained = True
+                        break
+            if not contained:
+                kept.append(a)
+        self.free = kept
+
+class SkylinePacker:
     """
-    if pixels.size == 0:
-        return pixels
-
-    out = np.array(pixels, copy=True, dtype=np.float32)
-    filled = out[..., 3] > alpha_threshold
-    h, w = filled.shape
-
-    for _ in range(iterations):
-        new_rgb = out[..., :3].copy()
-        new_filled = filled.copy()
-
-        if h > 1:
-            candidates = (~filled[1:, :]) & filled[:-1, :]
-            target_rgb = new_rgb[1:, :]
-            target_filled = new_filled[1:, :]
-            target_rgb[candidates] = out[:-1, :, :3][candidates]
-            target_filled[candidates] = True
-
-            candidates = (~filled[:-1, :]) & filled[1:, :]
-            target_rgb = new_rgb[:-1, :]
-            target_filled = new_filled[:-1, :]
-            target_rgb[candidates] = out[1:, :, :3][candidates]
-            target_filled[candidates] = True
-
-        if w > 1:
-            candidates = (~filled[:, 1:]) & filled[:, :-1]
-            target_rgb = new_rgb[:, 1:]
-            target_filled = new_filled[:, 1:]
-            target_rgb[candidates] = out[:, :-1, :3][candidates]
-            target_filled[candidates] = True
-
-            candidates = (~filled[:, :-1]) & filled[:, 1:]
-            target_rgb = new_rgb[:, :-1]
-            target_filled = new_filled[:, :-1]
-            target_rgb[candidates] = out[:, 1:, :3][candidates]
-            target_filled[candidates] = True
-
-        if np.array_equal(new_filled, filled):
-            break
-
-        out[..., :3] = new_rgb
-        filled = new_filled
-
-    return out
+    Skyline bottom-left фиксированного размера. Дешевле MaxRects на тысячах
+    спрайтов, но чуть хуже по заполнению (дыры под линией горизонта теряются).
+    """
+    def __init__(self, w, h, allow_rotation=False):
+        self.w, self.h = w, h
+        self.allow_rotation = allow_rotation
+        self.skyline = [[0, 0, w]]  # [x, y, width]
+
+    def _fit(self, index, w, h):
+        x = self.skyline[index][0]
+        if x + w > self.w:
+            return None
+        remaining = w
+        y = 0
+        i = index
+        while remaining > 0:
+            y = max(y, self.skyline[i][1])
+            if y + h > self.h:
+                return None
+            remaining -= self.skyline[i][2]
+            i += 1
+        return y
+
+    def insert(self, w, h):
+        best = None
+        best_score = None
+        sizes = [(w, h)]
+        if self.allow_rotation and w != h:
+            sizes.append((h, w))
+        for i, (sx, _sy, sw_seg) in enumerate(self.skyline):
+            for sw, sh in sizes:
+                y = self._fit(i, sw, sh)
+                if y is None: continue
+                score = (y + sh, sw_seg, sx)
+                if best_score is None or score < best_score:
+                    best_score, best = score, (i, sx, y, sw, sh)
+        if best is None:
+            return None
+        i, x, y, w, h = best
+        self._place(i, x, y, w, h)
+        return x, y, w, h
+
+    def _place(self, index, x, y, w, h):
+        self.skyline.insert(index, [x, y + h, w])
+        i = index + 1
+        while i < len(self.skyline):
+            seg = self.skyline[i]
+            prev = self.skyline[i - 1]
+            overlap = prev[0] + prev[2] - seg[0]
+            if overlap <= 0:
+                break
+            seg[0] += overlap
+            seg[2] -= overlap
+            if seg[2] > 0:
+                break
+            self.skyline.pop(i)
+        # Склеиваем соседние сегменты одной высоты
+        i = 0
+        while i < len(self.skyline) - 1:
+            if self.skyline[i][1] == self.skyline[i + 1][1]:
+                self.skyline[i][2] += self.skyline[i + 1][2]
+                self.skyline.pop(i + 1)
+            else:
+                i += 1
+
+ATLAS_PACKERS = {
+    'MAXRECTS': MaxRectsPacker,
+    'SKYLINE': SkylinePacker,
+}
+
+# Зазор между элементами атласа в пикселях (предотвращает texture bleeding).
+ATLAS_MARGIN = 8
+# Максимальная сторона атласа для bin-пакеров (лимит текстуры DX11).
+ATLAS_MAX_SIZE = 16384
 
 def _write_if_free(atlas_pixels: np.ndarray, occupied: np.ndarray, y_slice, x_slice, src: np.ndarray):
     region_occupied = occupied[y_slice, x_slice]
@@ -128,7 +221,53 @@ def _extrude_sprite_padding(atlas_pixels: np.ndarray, occupied: np.ndarray, x: i
             atlas_pixels[top, right] = img_pixels[-1, -1]
             occupied[top, right] = True
 
-def calculate_atlas_layout(image_sizes_dict: dict, margin: int = ATLAS_MARGIN):
+def _pot_bin_candidates(total_area: int, min_w: int, min_h: int, max_size: int = ATLAS_MAX_SIZE):
+    """Power-of-two размеры, в которые теоретически влезает набор, от меньшей площади к большей."""
+    sides = []
+    side = 4
+    while side <= max_size:
+        sides.append(side)
+        side *= 2
+    candidates = [
+        (w, h) for w in sides for h in sides
+        if w >= min_w and h >= min_h and w * h >= total_area
+    ]
+    # При равной площади предпочитаем квадрат, затем широкий атлас
+    candidates.sort(key=lambda wh: (wh[0] * wh[1], abs(wh[0] - wh[1]), -wh[0]))
+    return candidates
+
+def _calculate_bin_layout(images: list, margin: int, packer_cls, allow_rotation: bool = False):
+    """
+    Пакует отсортированный список [(name, (w, h))] в минимальный POT-атлас.
+    Возвращает ((atlas_w, atlas_h), uv_data) или None, если ничего не влезло.
+    """
+    padded = [(name, w, h, w + margin, h + margin) for name, (w, h) in images]
+    total_area = sum(pw * ph for _name, _w, _h, pw, ph in padded)
+    if allow_rotation:
+        min_w = min_h = max(min(pw, ph) for _name, _w, _h, pw, ph in padded)
+    else:
+        min_w = max(pw for _name, _w, _h, pw, _ph in padded)
+        min_h = max(ph for _name, _w, _h, _pw, ph in padded)
+
+    for atlas_w, atlas_h in _pot_bin_candidates(total_area, min_w, min_h):
+        packer = packer_cls(atlas_w, atlas_h, allow_rotation=allow_rotation)
+        uv_data = {}
+        for name, w, h, pw, ph in padded:
+            placed = packer.insert(pw, ph)
+            if placed is None:
+                break
+            x, y, placed_w, _placed_h = placed
+            if placed_w != pw:
+                w, h = h, w
+            uv_data[name] = {
+                'uv_coords': [x + margin // 2, y + margin // 2],
+                'uv_size': [w, h]
+            }
+        else:
+            return (atlas_w, atlas_h), uv_data
+    return None
+
+def calculate_atlas_layout(image_sizes_dict: dict, margin: int = ATLAS_MARGIN, engine: str = 'TREE', allow_rotation: bool = False):
     """
     БЫСТРАЯ ЧАСТЬ: Только рассчитывает геометрию атласа без обработки пикселей.
     Принимает словарь {name: (width, height)}.
@@ -138,13 +277,32 @@ def calculate_atlas_layout(image_sizes_dict: dict, margin: int = ATLAS_MARGIN):
     Каждый блок резервирует (w+margin, h+margin) в атласе.
     UV-координаты уже включают отступ margin//2 внутрь, поэтому
     пиксели изображения окружены прозрачной окантовкой со всех сторон.
+
+    engine: 'TREE' (растущий бинарный PackerNode, размер кратен 4),
+    'MAXRECTS' или 'SKYLINE' (POT-атлас минимальной площади).
+    allow_rotation: только для bin-пакеров. Повёрнутый спрайт возвращается
+    с переставленным uv_size, шейдеры RZM поворот НЕ понимают — держите False.
     """
     if not image_sizes_dict:
         print("DEBUG LAYOUT: No image sizes provided.")
         return (0, 0), {}
 
-    print(f"DEBUG LAYOUT: Calculating layout for {len(image_sizes_dict)} images with margin {margin}.")
-    
+    print(f"DEBUG LAYOUT: Calculating layout for {len(image_sizes_dict)} images with margin {margin} (engine: {engine}).")
+
+    packer_cls = ATLAS_PACKERS.get(engine)
+    if packer_cls is not None:
+        images = sorted(
+            image_sizes_dict.items(),
+            key=lambda item: (max(item[1]), min(item[1]), item[0]),
+            reverse=True
+        )
+        result = _calculate_bin_layout(images, margin, packer_cls, allow_rotation=allow_rotation)
+        if result is not None:
+            (atlas_w, atlas_h), uv_data = result
+            print(f"DEBUG LAYOUT: Calculated atlas size: {atlas_w}x{atlas_h}")
+            return result
+        print(f"DEBUG LAYOUT: {engine} could not fit into {ATLAS_MAX_SIZE}px, falling back to TREE.")
+
     images = sorted(image_sizes_dict.items(), key=lambda item: item[1][1], reverse=True)
 
     # Первый слот с учётом зазора
@@ -314,12 +472,62 @@ def inject_metadata_profile(filepath, profile='LINEAR'):
     except Exception as e:
         print(f"Injection Failed: {e}")
 
-def create_atlas_pixels(image_dict: dict, atlas_w: int, atlas_h: int, uv_data: dict):
+def _read_sprite_pixels(name: str, img, w: int, h: int):
+    """
+    Читает пиксели одного источника атласа в (h, w, 4) float32 bottom-up.
+    Возвращает None, если источник битый. Bleed - пачкой по всем спрайтам
+    (bleed_sprites_rgb) после расстановки.
+    """
+    if isinstance(img, np.ndarray):
+        # Direct NumPy support (for SVG renders)
+        # Input is (H, W, 4) float32, top-down.
+        # We must flip it to bottom-up to match the atlas/Blender orientation.
+        return np.ascontiguousarray(np.flipud(img), dtype=np.float32)
+
+    if hasattr(img, 'pixels'):
+        # Blender Image support (for Raster icons / Animated frames)
+        # Ensure bits are read as-is without Blender's linearization
+        old_colorspace = img.colorspace_settings.name
+        if old_colorspace != 'Non-Color':
+            img.colorspace_settings.name = 'Non-Color'
+
+        try:
+            # Security check: ensure img.pixels matches w*h*4
+            expected_len = w * h * 4
+            actual_len = len(img.pixels)
+
+            if actual_len != expected_len:
+                print(f"[RZM Atlas] ERROR: Buffer size mismatch for '{name}'. Expected {expected_len}, got {actual_len}. Skipping.")
+                return None
+
+            img_pixels = np.empty(expected_len, dtype=np.float32)
+            img.pixels.foreach_get(img_pixels)
+            return img_pixels.reshape((h, w, 4))
+        finally:
+            if old_colorspace != 'Non-Color':
+                img.colorspace_settings.name = old_colorspace
+
+    return None
+
+def _sprite_in_bounds(name: str, x: int, y: int, w: int, h: int, atlas_w: int, atlas_h: int) -> bool:
+    # Bounds check to prevent out-of-bounds slicing/broadcasting errors
+    if x < 0 or y < 0 or x + w > atlas_w or y + h > atlas_h:
+        print(f"[RZM Atlas] WARNING: Image '{name}' is out of atlas bounds (pos: {x},{y}, size: {w}x{h}, atlas: {atlas_w}x{atlas_h}). Please run 'Update Atlas Layout' in Blender to re-pack!")
+        return False
+    return True
+
+def create_atlas_pixels(image_dict: dict, atlas_w: int, atlas_h: int, uv_data: dict, cache=None, source_keys: dict = None):
     """
     Создает буфер пикселей атласа. 
     Никакая гамма-коррекция не применяется к пикселям. 
     Пиксели всегда идентичны источнику в Blender.
+
+    cache/source_keys: см. AtlasPixelCache. С кэшем image_dict может
+    содержать только грязные спрайты — чистые берутся из прошлого экспорта.
     """
+    if cache is not None and source_keys is not None:
+        return cache.update(image_dict, atlas_w, atlas_h, uv_data, source_keys)
+
     if not image_dict or atlas_w == 0 or atlas_h == 0:
         return np.array([])
         
@@ -334,57 +542,165 @@ def create_atlas_pixels(image_dict: dict, atlas_w: int, atlas_h: int, uv_data: d
         x, y = uv_data[name]['uv_coords']
         w, h = uv_data[name]['uv_size']
         
-        # Bounds check to prevent out-of-bounds slicing/broadcasting errors
-        if x < 0 or y < 0 or x + w > atlas_w or y + h > atlas_h:
-            print(f"[RZM Atlas] WARNING: Image '{name}' is out of atlas bounds (pos: {x},{y}, size: {w}x{h}, atlas: {atlas_w}x{atlas_h}). Please run 'Update Atlas Layout' in Blender to re-pack!")
+        if not _sprite_in_bounds(name, x, y, w, h, atlas_w, atlas_h):
             continue
-            
-        if isinstance(img, np.ndarray):
-            # Direct NumPy support (for SVG renders)
-            # Input is (H, W, 4) float32, top-down.
-            # We must flip it to bottom-up to match the atlas/Blender orientation.
-            img_pixels = np.ascontiguousarray(np.flipud(img), dtype=np.float32)
-            img_pixels = _bleed_transparent_rgb(img_pixels)
-            atlas_pixels[y:y+h, x:x+w] = img_pixels
-            occupied[y:y+h, x:x+w] = True
-            placements.append((x, y, img_pixels))
-            
-        elif hasattr(img, 'pixels'):
-            # Blender Image support (for Raster icons / Animated frames)
-            # Ensure bits are read as-is without Blender's linearization
-            old_colorspace = img.colorspace_settings.name
-            if old_colorspace != 'Non-Color':
-                img.colorspace_settings.name = 'Non-Color'
-            
-            try:
-                # Security check: ensure img.pixels matches w*h*4
-                expected_len = w * h * 4
-                actual_len = len(img.pixels)
-                
-                if actual_len != expected_len:
-                    print(f"[RZM Atlas] ERROR: Buffer size mismatch for '{name}'. Expected {expected_len}, got {actual_len}. Skipping.")
-                    continue
-                
-                img_pixels = np.empty(expected_len, dtype=np.float32)
-                img.pixels.foreach_get(img_pixels)
-                
-                # Check if we actually got non-zero pixels (debug)
-                if np.max(img_pixels) == 0.0:
-                    # If alpha is also 0, it's fully transparent. 
-                    # But if RGB are 0 and Alpha is 1, it's solid black.
-                    # We print a warning only if it looks suspiciously empty.
-                    pass 
-
-                img_pixels = img_pixels.reshape((h, w, 4))
-                img_pixels = _bleed_transparent_rgb(img_pixels)
-                atlas_pixels[y:y+h, x:x+w] = img_pixels
-                occupied[y:y+h, x:x+w] = True
-                placements.append((x, y, img_pixels))
-            finally:
-                if old_colorspace != 'Non-Color':
-                    img.colorspace_settings.name = old_colorspace
 
+        img_pixels = _read_sprite_pixels(name, img, w, h)
+        if img_pixels is None:
+            continue
+        atlas_pixels[y:y+h, x:x+w] = img_pixels
+        occupied[y:y+h, x:x+w] = True
+        placements.append((x, y, atlas_pixels[y:y+h, x:x+w]))
+
+    # Bleed на месте, в пределах каждого спрайта; поля затем берут уже залитые края
+    bleed_sprites_rgb([sprite for _, _, sprite in placements])
     for x, y, img_pixels in placements:
         _extrude_sprite_padding(atlas_pixels, occupied, x, y, img_pixels, ATLAS_MARGIN // 2)
     
     return atlas_pixels.flatten()
+
+# --- ИНКРЕМЕНТАЛЬНЫЙ АТЛАС ---
+
+def hash_source_key(*parts) -> str:
+    """Короткий стабильный хэш из произвольных (repr-сериализуемых) частей ключа."""
+    return hashlib.blake2s(repr(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+def file_source_key(path: str, *params) -> str:
+    """Ключ файла-источника (SVG, анимация): путь + mtime + размер + параметры рендера."""
+    try:
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        stamp = None
+    return hash_source_key(os.path.normcase(os.path.abspath(path)) if path else "", stamp, params)
+
+def blender_image_source_key(img) -> str:
+    """
+    Ключ Blender Image по содержимому. Упакованные картинки хэшируются по
+    сжатым байтам packed_file, сохранённые на диск — по mtime файла.
+    Несохранённые правки (is_dirty / generated) хэшируют сами пиксели.
+    """
+    size = tuple(img.size)
+    packed = getattr(img, 'packed_file', None)
+    if getattr(img, 'is_dirty', False) or packed is None and (img.source != 'FILE' or not img.filepath):
+        pixels = np.empty(len(img.pixels), dtype=np.float32)
+        img.pixels.foreach_get(pixels)
+        digest = hashlib.blake2s(pixels.tobytes(), digest_size=16).hexdigest()
+        return hash_source_key('PIXELS', size, digest)
+    if packed is not None:
+        digest = hashlib.blake2s(packed.data, digest_size=16).hexdigest()
+        return hash_source_key('PACKED', size, digest)
+    return file_source_key(bpy.path.abspath(img.filepath), 'FILE', size)
+
+class AtlasPixelCache:
+    """
+    Атлас прошлого экспорта + ключи источников каждого спрайта.
+    На повторном экспорте перерисовываются только слоты, у которых сменился
+    ключ источника или прямоугольник; остальные пиксели переиспользуются.
+    Слоты атласа не пересекаются (каждый спрайт владеет своим margin),
+    поэтому результат совпадает с полной пересборкой.
+    """
+    def __init__(self, owner: str = ""):
+        self.owner = owner
+        self.size = (0, 0)
+        self.margin = ATLAS_MARGIN
+        self.pixels = None
+        self.occupied = None
+        self.entries = {}  # name -> (source_key, (x, y, w, h))
+
+    def reset(self, atlas_w: int = 0, atlas_h: int = 0):
+        self.size = (atlas_w, atlas_h)
+        self.margin = ATLAS_MARGIN
+        self.pixels = None
+        self.occupied = None
+        self.entries = {}
+
+    def _is_valid_for(self, atlas_w: int, atlas_h: int) -> bool:
+        return self.pixels is not None and self.size == (atlas_w, atlas_h) and self.margin == ATLAS_MARGIN
+
+    def dirty_names(self, source_keys: dict, uv_data: dict, atlas_w: int, atlas_h: int) -> set:
+        """Имена спрайтов, пиксели которых нужно прочитать заново."""
+        if not self._is_valid_for(atlas_w, atlas_h):
+            return set(source_keys)
+        dirty = set()
+        for name, key in source_keys.items():
+            data = uv_data.get(name)
+            if data is None:
+                continue
+            rect = (*data['uv_coords'], *data['uv_size'])
+            if self.entries.get(name) != (key, tuple(rect)):
+                dirty.add(name)
+        return dirty
+
+    def _clear_slot(self, x: int, y: int, w: int, h: int):
+        pad = self.margin // 2
+        atlas_w, atlas_h = self.size
+        x0, y0 = max(x - pad, 0), max(y - pad, 0)
+        x1, y1 = min(x + w + pad, atlas_w), min(y + h + pad, atlas_h)
+        self.pixels[y0:y1, x0:x1] = 0.0
+        self.occupied[y0:y1, x0:x1] = False
+
+    def update(self, image_dict: dict, atlas_w: int, atlas_h: int, uv_data: dict, source_keys: dict):
+        if atlas_w == 0 or atlas_h == 0:
+            self.reset()
+            return np.array([])
+
+        if not self._is_valid_for(atlas_w, atlas_h):
+            print(f"DEBUG EXPORT: Atlas cache miss, creating {atlas_w}x{atlas_h} pixel buffer.")
+            self.reset(atlas_w, atlas_h)
+            self.pixels = np.zeros((atlas_h, atlas_w, 4), dtype=np.float32)
+            self.occupied = np.zeros((atlas_h, atlas_w), dtype=bool)
+
+        wanted = {}
+        for name, key in source_keys.items():
+            data = uv_data.get(name)
+            if data is None:
+                continue
+            wanted[name] = (key, (*data['uv_coords'], *data['uv_size']))
+
+        # 1. Освобождаем слоты удалённых, сдвинутых и изменённых спрайтов
+        stale = [name for name, entry in self.entries.items() if wanted.get(name) != entry]
+        for name in stale:
+            self._clear_slot(*self.entries.pop(name)[1])
+
+        # 2. Рисуем грязные спрайты в их слоты
+        placements = []
+        for name, (key, rect) in wanted.items():
+            if name in self.entries:
+                continue
+            img = image_dict.get(name)
+            if img is None:
+                continue
+            x, y, w, h = rect
+            if not _sprite_in_bounds(name, x, y, w, h, atlas_w, atlas_h):
+                continue
+            img_pixels = _read_sprite_pixels(name, img, w, h)
+            if img_pixels is None:
+                continue
+            self._clear_slot(x, y, w, h)
+            self.pixels[y:y+h, x:x+w] = img_pixels
+            self.occupied[y:y+h, x:x+w] = True
+            placements.append((x, y, self.pixels[y:y+h, x:x+w]))
+            self.entries[name] = (key, rect)
+
+        # Заливаются только перерисованные спрайты: у остальных RGB уже залит
+        bleed_sprites_rgb([sprite for _, _, sprite in placements])
+        for x, y, img_pixels in placements:
+            _extrude_sprite_padding(self.pixels, self.occupied, x, y, img_pixels, self.margin // 2)
+
+        print(f"DEBUG EXPORT: Atlas cache reused {len(self.entries) - len(placements)} sprites, redrew {len(placements)}, cleared {len(stale)}.")
+        return self.pixels.reshape(-1)
+
+# Один кэш на сессию: float32-атлас большой, держать несколько в памяти дорого.
+_atlas_cache = None
+
+def get_atlas_cache(owner: str) -> AtlasPixelCache:
+    """Кэш атласа для папки экспорта owner. Смена папки сбрасывает кэш."""
+    global _atlas_cache
+    if _atlas_cache is None or _atlas_cache.owner != owner:
+        _atlas_cache = AtlasPixelCache(owner)
+    return _atlas_cache
+
+def clear_atlas_cache():
+    global _atlas_cache
+    _atlas_cache = None
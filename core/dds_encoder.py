@@ -0,0 +1,344 @@
+# RZMenu/core/dds_encoder.py
+# Нативный (NumPy) DDS-энкодер: заголовок + блоки пишутся прямо из массива,
+# без временного TGA и texconv.exe. Работает на любой ОС.
+#
+# Поддержка: R8G8B8A8 (без потерь), BC1, BC3, BC4, BC5 (range fit) и быстрый
+# BC7 (только mode 6: один subset, RGBA 7777+pbit, 4-битные индексы).
+# Качество BC7 ниже texconv (тот перебирает все 8 режимов), но для UI-атласа
+# с заранее "забленженными" краями разница обычно незаметна.
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# --- DDS / DXGI КОНСТАНТЫ ---
+DDS_MAGIC = b'DDS '
+
+DDSD_CAPS = 0x1
+DDSD_HEIGHT = 0x2
+DDSD_WIDTH = 0x4
+DDSD_PITCH = 0x8
+DDSD_PIXELFORMAT = 0x1000
+DDSD_MIPMAPCOUNT = 0x20000
+DDSD_LINEARSIZE = 0x80000
+
+DDPF_ALPHAPIXELS = 0x1
+DDPF_FOURCC = 0x4
+DDPF_RGB = 0x40
+
+DDSCAPS_TEXTURE = 0x1000
+D3D10_RESOURCE_DIMENSION_TEXTURE2D = 3
+
+# name -> (dxgi_format, bytes_per_block или None для несжатых, legacy FourCC или None)
+DXGI_FORMATS = {
+    'R8G8B8A8_UNORM': (28, None, None),
+    'R8G8B8A8_UNORM_SRGB': (29, None, None),
+    'BC1_UNORM': (71, 8, b'DXT1'),
+    'BC1_UNORM_SRGB': (72, 8, None),
+    'BC3_UNORM': (77, 16, b'DXT5'),
+    'BC3_UNORM_SRGB': (78, 16, None),
+    'BC4_UNORM': (80, 8, b'BC4U'),
+    'BC5_UNORM': (83, 16, b'BC5U'),
+    'BC7_UNORM': (98, 16, None),
+    'BC7_UNORM_SRGB': (99, 16, None),
+}
+
+# Блоков на одну задачу пула: ограничивает пиковую память промежуточных массивов
+CHUNK_BLOCKS = 8192
+
+
+def is_supported(dds_format: str) -> bool:
+    return dds_format.upper() in DXGI_FORMATS
+
+
+def float_pixels_to_rgba8(pixels, width: int, height: int) -> np.ndarray:
+    """
+    Blender float32 RGBA (bottom-up) -> uint8 (height, width, 4) top-down.
+    Квантование такое же, как у старого TGA-пути (clip * 255, отбрасывание дроби),
+    чтобы несжатый вывод был побайтно идентичен texconv.
+    """
+    arr = np.asarray(pixels, dtype=np.float32).reshape((height, width, 4))
+    arr = np.flipud(arr)
+    return (np.clip(arr, 0.0, 1.0) * 255.0).astype(np.uint8)
+
+
+# --- ЗАГОЛОВОК ---
+
+def build_dds_header(width: int, height: int, dds_format: str) -> bytes:
+    dxgi, block_bytes, fourcc = DXGI_FORMATS[dds_format]
+
+    flags = DDSD_CAPS | DDSD_HEIGHT | DDSD_WIDTH | DDSD_PIXELFORMAT | DDSD_MIPMAPCOUNT
+    if block_bytes is None:
+        flags |= DDSD_PITCH
+        pitch_or_linear = width * 4
+    else:
+        flags |= DDSD_LINEARSIZE
+        pitch_or_linear = max(1, (width + 3) // 4) * max(1, (height + 3) // 4) * block_bytes
+
+    is_legacy_rgba = dxgi == 28
+    if is_legacy_rgba:
+        pixel_format = struct.pack(
+            '<8I', 32, DDPF_RGB | DDPF_ALPHAPIXELS, 0, 32,
+            0x000000FF, 0x0000FF00, 0x00FF0000, 0xFF000000
+        )
+    else:
+        pixel_format = struct.pack('<2I4s5I', 32, DDPF_FOURCC, fourcc or b'DX10', 0, 0, 0, 0, 0)
+
+    header = struct.pack(
+        '<7I44x32s5I',
+        124, flags, height, width, pitch_or_linear, 0, 1,
+        pixel_format,
+        DDSCAPS_TEXTURE, 0, 0, 0, 0
+    )
+
+    data = DDS_MAGIC + header
+    if not is_legacy_rgba and fourcc is None:
+        data += struct.pack('<5I', dxgi, D3D10_RESOURCE_DIMENSION_TEXTURE2D, 0, 1, 0)
+    return data
+
+
+# --- БЛОКИ ---
+
+def _to_blocks(rgba8: np.ndarray) -> np.ndarray:
+    """(h, w, 4) -> (by, bx, 16, 4) int32; неполные блоки добиваются повтором края."""
+    h, w = rgba8.shape[:2]
+    pad_h, pad_w = (-h) % 4, (-w) % 4
+    if pad_h or pad_w:
+        rgba8 = np.pad(rgba8, ((0, pad_h), (0, pad_w), (0, 0)), mode='edge')
+    by, bx = rgba8.shape[0] // 4, rgba8.shape[1] // 4
+    blocks = rgba8.reshape(by, 4, bx, 4, 4).transpose(0, 2, 1, 3, 4)
+    return blocks.reshape(by, bx, 16, 4).astype(np.int32)
+
+
+def _pack_indices(indices: np.ndarray, bits: int) -> np.ndarray:
+    """(..., 16) индексов -> uint64, пиксель 0 в младших битах."""
+    shifts = (np.arange(indices.shape[-1], dtype=np.uint64) * np.uint64(bits))
+    return np.bitwise_or.reduce(indices.astype(np.uint64) << shifts, axis=-1)
+
+
+def _nearest_index(values: np.ndarray, palette: np.ndarray) -> np.ndarray:
+    """values (..., 16, C), palette (..., P, C) -> (..., 16) индекс ближайшего цвета."""
+    diff = values[..., :, None, :] - palette[..., None, :, :]
+    return np.argmin(np.einsum('...c,...c->...', diff, diff), axis=-1)
+
+
+def _encode_bc4_channel(values: np.ndarray) -> np.ndarray:
+    """values (..., 16) 0..255 -> (..., 8) uint8 блок BC4 (8-значный режим)."""
+    a0 = values.max(axis=-1)
+    a1 = values.min(axis=-1)
+    # 8-значный режим требует a0 > a1; плоский блок кодируется индексом 0
+    flat = a0 == a1
+    a1_safe = np.where(flat, a0, a1)
+
+    weights = np.array([0, 7, 1, 2, 3, 4, 5, 6], dtype=np.int32)  # позиция в палитре -> доля a1
+    palette = ((7 - weights) * a0[..., None] + weights * a1_safe[..., None] + 3) // 7
+    palette = np.where(flat[..., None], a0[..., None], palette)
+
+    diff = np.abs(values[..., :, None] - palette[..., None, :])
+    indices = np.argmin(diff, axis=-1)
+    bits = _pack_indices(indices, 3)
+
+    out = np.empty(values.shape[:-1] + (8,), dtype=np.uint8)
+    out[..., 0] = a0
+    out[..., 1] = a1_safe
+    for i in range(6):
+        out[..., 2 + i] = (bits >> np.uint64(8 * i)) & np.uint64(0xFF)
+    return out
+
+
+def _to_565(rgb: np.ndarray) -> np.ndarray:
+    r = (rgb[..., 0] * 31 + 127) // 255
+    g = (rgb[..., 1] * 63 + 127) // 255
+    b = (rgb[..., 2] * 31 + 127) // 255
+    return (r << 11) | (g << 5) | b
+
+
+def _from_565(c: np.ndarray) -> np.ndarray:
+    r = (c >> 11) & 31
+    g = (c >> 5) & 63
+    b = c & 31
+    return np.stack([(r << 3) | (r >> 2), (g << 2) | (g >> 4), (b << 3) | (b >> 2)], axis=-1)
+
+
+def _encode_bc1_color(rgba: np.ndarray, allow_transparent: bool) -> np.ndarray:
+    """rgba (..., 16, 4) -> (..., 8) uint8 цветовой блок BC1."""
+    rgb = rgba[..., :3]
+    lo = rgb.min(axis=-2)
+    hi = rgb.max(axis=-2)
+    # Inset на 1/16 диапазона уменьшает ошибку на краях bounding box
+    inset = (hi - lo) >> 4
+    c0 = _to_565(np.minimum(hi - inset, 255))
+    c1 = _to_565(np.maximum(lo + inset, 0))
+
+    transparent = rgba[..., 3] < 128
+    three_color = transparent.any(axis=-1) if allow_transparent else np.zeros(c0.shape, dtype=bool)
+
+    # 4-цветный режим: c0 > c1; 3-цветный (с прозрачным): c0 <= c1
+    swap4 = ~three_color & (c0 < c1)
+    swap3 = three_color & (c0 > c1)
+    swap = swap4 | swap3
+    c0, c1 = np.where(swap, c1, c0), np.where(swap, c0, c1)
+    equal4 = ~three_color & (c0 == c1)
+
+    e0 = _from_565(c0)
+    e1 = _from_565(c1)
+    p4 = np.stack([e0, e1, (2 * e0 + e1) // 3, (e0 + 2 * e1) // 3], axis=-2)
+    p3 = np.stack([e0, e1, (e0 + e1) // 2, np.full_like(e0, -1024)], axis=-2)
+    palette = np.where(three_color[..., None, None], p3, p4)
+
+    indices = _nearest_index(rgb, palette)
+    indices = np.where(three_color[..., None] & transparent, 3, indices)
+    indices = np.where(equal4[..., None], 0, indices)
+    bits = _pack_indices(indices, 2)
+
+    out = np.empty(c0.shape + (8,), dtype=np.uint8)
+    out[..., 0] = c0 & 0xFF
+    out[..., 1] = c0 >> 8
+    out[..., 2] = c1 & 0xFF
+    out[..., 3] = c1 >> 8
+    for i in range(4):
+        out[..., 4 + i] = (bits >> np.uint64(8 * i)) & np.uint64(0xFF)
+    return out
+
+
+BC7_WEIGHTS4 = np.array([0, 4, 9, 13, 17, 21, 26, 30, 34, 38, 43, 47, 51, 55, 60, 64], dtype=np.int32)
+BC7_WEIGHT_MIDPOINTS = (BC7_WEIGHTS4[1:] + BC7_WEIGHTS4[:-1]) / 2.0
+
+
+def _bc7_quantize_endpoint(endpoint: np.ndarray):
+    """endpoint (..., 4) 0..255 -> (7-битные значения (..., 4), p-бит (...,)) с лучшей ошибкой."""
+    best_q = None
+    best_p = None
+    best_err = None
+    for p in (0, 1):
+        q = np.clip((endpoint - p + 1) >> 1, 0, 127)
+        recon = (q << 1) | p
+        err = ((recon - endpoint) ** 2).sum(axis=-1)
+        if best_err is None:
+            best_q, best_p, best_err = q, np.zeros(err.shape, dtype=np.int32), err
+        else:
+            better = err < best_err
+            best_q = np.where(better[..., None], q, best_q)
+            best_p = np.where(better, 1, best_p)
+            best_err = np.minimum(err, best_err)
+    return best_q, best_p
+
+
+def _encode_bc7_mode6(rgba: np.ndarray) -> np.ndarray:
+    """rgba (..., 16, 4) -> (..., 16) uint8 блок BC7 mode 6."""
+    lo = rgba.min(axis=-2)
+    hi = rgba.max(axis=-2)
+    q0, p0 = _bc7_quantize_endpoint(lo)
+    q1, p1 = _bc7_quantize_endpoint(hi)
+    e0 = (q0 << 1) | p0[..., None]
+    e1 = (q1 << 1) | p1[..., None]
+
+    # Проекция на ось e0->e1 вместо перебора 16 цветов палитры
+    axis = e1 - e0
+    length_sq = np.maximum((axis * axis).sum(axis=-1), 1)
+    t = ((rgba - e0[..., None, :]) * axis[..., None, :]).sum(axis=-1) * 64.0 / length_sq[..., None]
+    indices = np.searchsorted(BC7_WEIGHT_MIDPOINTS, t)
+
+    # Anchor-индекс (пиксель 0) хранится в 3 битах: старший бит обязан быть 0
+    flip = indices[..., 0] >= 8
+    q0, q1 = np.where(flip[..., None], q1, q0), np.where(flip[..., None], q0, q1)
+    p0, p1 = np.where(flip, p1, p0), np.where(flip, p0, p1)
+    indices = np.where(flip[..., None], 15 - indices, indices)
+
+    u64 = np.uint64
+    lo_bits = np.full(q0.shape[:-1], 1 << 6, dtype=np.uint64)
+    pos = 7
+    hi_bits = np.zeros_like(lo_bits)
+
+    def put(value, nbits):
+        nonlocal lo_bits, hi_bits, pos
+        value = value.astype(np.uint64)
+        if pos >= 64:
+            hi_bits |= value << u64(pos - 64)
+        elif pos + nbits <= 64:
+            lo_bits |= value << u64(pos)
+        else:
+            low_count = 64 - pos
+            lo_bits |= (value & u64((1 << low_count) - 1)) << u64(pos)
+            hi_bits |= value >> u64(low_count)
+        pos += nbits
+
+    for c in range(4):
+        put(q0[..., c], 7)
+        put(q1[..., c], 7)
+    put(p0, 1)
+    put(p1, 1)
+    put(indices[..., 0], 3)
+    for i in range(1, 16):
+        put(indices[..., i], 4)
+
+    out = np.empty(lo_bits.shape + (16,), dtype=np.uint8)
+    for i in range(8):
+        out[..., i] = (lo_bits >> u64(8 * i)) & u64(0xFF)
+        out[..., 8 + i] = (hi_bits >> u64(8 * i)) & u64(0xFF)
+    return out
+
+
+def _encode_chunk(blocks: np.ndarray, base_format: str) -> bytes:
+    if base_format == 'BC1':
+        encoded = _encode_bc1_color(blocks, allow_transparent=True)
+    elif base_format == 'BC3':
+        encoded = np.concatenate([
+            _encode_bc4_channel(blocks[..., 3]),
+            _encode_bc1_color(blocks, allow_transparent=False),
+        ], axis=-1)
+    elif base_format == 'BC4':
+        encoded = _encode_bc4_channel(blocks[..., 0])
+    elif base_format == 'BC5':
+        encoded = np.concatenate([
+            _encode_bc4_channel(blocks[..., 0]),
+            _encode_bc4_channel(blocks[..., 1]),
+        ], axis=-1)
+    elif base_format == 'BC7':
+        encoded = _encode_bc7_mode6(blocks)
+    else:
+        raise ValueError(f"Unsupported block format: {base_format}")
+    return np.ascontiguousarray(encoded).tobytes()
+
+
+def encode_blocks(rgba8: np.ndarray, dds_format: str, workers: int = None) -> bytes:
+    """
+    Сжимает (h, w, 4) uint8 в поток блоков. Блоки режутся на куски по
+    CHUNK_BLOCKS и кодируются в пуле потоков: NumPy отпускает GIL на крупных
+    операциях, а поднимать процессы изнутри Blender небезопасно.
+    """
+    base_format = dds_format.upper().split('_')[0]
+    blocks = _to_blocks(rgba8).reshape(-1, 16, 4)
+    chunks = [blocks[i:i + CHUNK_BLOCKS] for i in range(0, len(blocks), CHUNK_BLOCKS)]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(chunks) < 2:
+        return b''.join(_encode_chunk(chunk, base_format) for chunk in chunks)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return b''.join(pool.map(lambda chunk: _encode_chunk(chunk, base_format), chunks))
+
+
+def encode_dds(rgba8: np.ndarray, dds_format: str, workers: int = None) -> bytes:
+    """(h, w, 4) uint8 top-down -> полный DDS-файл в памяти."""
+    dds_format = dds_format.upper()
+    if dds_format not in DXGI_FORMATS:
+        raise ValueError(f"Native DDS encoder does not support {dds_format}")
+    height, width = rgba8.shape[:2]
+    header = build_dds_header(width, height, dds_format)
+    if DXGI_FORMATS[dds_format][1] is None:
+        return header + np.ascontiguousarray(rgba8, dtype=np.uint8).tobytes()
+    return header + encode_blocks(rgba8, dds_format, workers=workers)
+
+
+def write_dds(pixels, width: int, height: int, output_path: str, dds_format: str, workers: int = None):
+    """Blender float32 пиксели -> DDS-файл. Пишет через .tmp и атомарно заменяет."""
+    rgba8 = float_pixels_to_rgba8(pixels, width, height)
+    data = encode_dds(rgba8, dds_format, workers=workers)
+    temp_path = output_path + ".tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, output_path)
+    return len(data)
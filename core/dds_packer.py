@@ -5,6 +5,8 @@ import subprocess
 import tempfile
 import numpy as np
 
+from ..utils.export_timing import count_written
+
 def get_texconv_path():
     """Returns the path to texconv.exe if found in libs/tools or system PATH."""
     addon_dir = os.path.dirname(os.path.dirname(__file__))
@@ -26,11 +28,45 @@ def get_texconv_path():
         
     return None
 
-def pack_to_dds(pixels, width, height, output_path, dds_format='BC7_UNORM'):
+# Бэкенды кодирования DDS. AUTO: несжатые форматы всегда нативно (без потерь,
+# побайтно как texconv), BC-форматы через texconv если он есть, иначе нативно.
+DDS_BACKENDS = ('AUTO', 'NATIVE', 'TEXCONV')
+
+def pack_to_dds(pixels, width, height, output_path, dds_format='BC7_UNORM', backend='AUTO'):
     """
-    Packs a numpy pixel buffer (RGBA float32) to a DDS file using texconv.exe.
+    Packs a numpy pixel buffer (RGBA float32) to a DDS file.
+    backend: 'AUTO', 'NATIVE' (in-process NumPy encoder) or 'TEXCONV'.
     Returns (bool, message).
     """
+    from . import dds_encoder
+
+    backend = (backend or 'AUTO').upper()
+    native_ok = dds_encoder.is_supported(dds_format)
+
+    if backend == 'AUTO':
+        is_block_format = dds_format.upper().startswith('BC')
+        if native_ok and (not is_block_format or not get_texconv_path()):
+            backend = 'NATIVE'
+        else:
+            backend = 'TEXCONV'
+
+    if backend == 'NATIVE':
+        if not native_ok:
+            return False, f"Native DDS encoder does not support {dds_format}"
+        return _pack_native(pixels, width, height, output_path, dds_format)
+    return _pack_texconv(pixels, width, height, output_path, dds_format)
+
+def _pack_native(pixels, width, height, output_path, dds_format):
+    from . import dds_encoder
+    try:
+        size = dds_encoder.write_dds(pixels, width, height, output_path, dds_format)
+        count_written(size)
+        return True, f"Successfully exported DDS ({dds_format}, native, {size} bytes)"
+    except Exception as e:
+        return False, f"Native DDS encoder error: {str(e)}"
+
+def _pack_texconv(pixels, width, height, output_path, dds_format):
+    """Packs via texconv.exe round-trip (temporary TGA). Highest BC7 quality."""
     texconv = get_texconv_path()
     if not texconv:
         return False, "texconv.exe not found. Please place it in RZMenu/libs/tools/"
@@ -80,6 +116,7 @@ def pack_to_dds(pixels, width, height, output_path, dds_format='BC7_UNORM'):
             if os.path.exists(output_path):
                 os.remove(output_path)
             os.rename(generated_dds, output_path)
+            count_written(os.path.getsize(output_path))
             
             # Clean up temp input
             if os.path.exists(temp_input):
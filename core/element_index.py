@@ -0,0 +1,153 @@
+# RZMenu/core/element_index.py
+# Общий индекс элементов меню, строится одним проходом по rzm.elements (или по
+# списку словарей элементов из манифеста шаблона):
+#   id -> элемент, parent_id -> дети, обратные рёбра пресетов/подложек/хелперов
+#   и топологический порядок (родители раньше детей).
+# Индекс - снимок: после add()/remove()/смены id элементов его надо строить
+# заново. Внутри shared_element_index(rzm) все экспортёры и упаковщики одной
+# операции получают один и тот же индекс через element_index(rzm).
+from contextlib import contextmanager
+
+# (коллекция ссылок, поле id в элементе ссылки)
+PRESET_REFS = ('preset_ids', 'preset_id')
+UNDERLAYER_REFS = ('underlayer_preset_ids', 'preset_id')
+HELPER_REFS = ('helper_ids', 'helper_id')
+
+_current_index = None  # (ключ rzm, ElementIndex)
+
+
+def _field(item, name, default=None):
+    if isinstance(item, dict):
+        return item.get(name, default)
+    return getattr(item, name, default)
+
+
+def _ref_ids(elem, refs):
+    coll_name, attr = refs
+    return [_field(ref, attr, -1) for ref in (_field(elem, coll_name) or ())]
+
+
+class ElementIndex:
+    """Снимок связей элементов: все поиски по id за O(1) вместо обхода коллекции."""
+
+    def __init__(self, elements):
+        self.elements = list(elements)
+        self.by_id = {}
+        self.children = {}
+        self.presets = {}
+        self.underlayers = {}
+        self.helpers = {}
+        self.preset_users = {}
+        self.underlayer_users = {}
+        self.helper_hosts = {}
+        self._helper_links = []  # (хост, [helper_id]) в порядке коллекции
+        self._order = None
+
+        for elem in self.elements:
+            eid = _field(elem, 'id')
+            # Как next(e for e in elements if e.id == x): при дублях побеждает первый
+            self.by_id.setdefault(eid, elem)
+            self.children.setdefault(_field(elem, 'parent_id', -1), []).append(elem)
+            for refs, forward, reverse in (
+                (PRESET_REFS, self.presets, self.preset_users),
+                (UNDERLAYER_REFS, self.underlayers, self.underlayer_users),
+                (HELPER_REFS, self.helpers, self.helper_hosts),
+            ):
+                target_ids = _ref_ids(elem, refs)
+                if not target_ids:
+                    continue
+                forward.setdefault(eid, []).extend(target_ids)
+                for target_id in target_ids:
+                    reverse.setdefault(target_id, []).append(elem)
+                if refs is HELPER_REFS:
+                    self._helper_links.append((elem, target_ids))
+
+    def __len__(self):
+        return len(self.elements)
+
+    def get(self, elem_id, default=None):
+        return self.by_id.get(elem_id, default)
+
+    def children_of(self, elem_id):
+        """Прямые дети в порядке коллекции."""
+        return self.children.get(elem_id, [])
+
+    def helper_pairs(self):
+        """(хост, хелпер) в порядке коллекции и helper_ids; ненайденные хелперы пропускаются."""
+        for host, helper_ids in self._helper_links:
+            for helper_id in helper_ids:
+                helper = self.by_id.get(helper_id)
+                if helper is not None:
+                    yield host, helper
+
+    def subtree(self, root_ids):
+        """Корни и все их потомки по parent_id, обход в ширину (корни - в порядке коллекции)."""
+        queue = [elem for elem in self.elements if _field(elem, 'id') in root_ids]
+        collected = []
+        processed_ids = set()
+        pos = 0
+        while pos < len(queue):
+            elem = queue[pos]
+            pos += 1
+            eid = _field(elem, 'id')
+            if eid in processed_ids:
+                continue
+            processed_ids.add(eid)
+            collected.append(elem)
+            queue.extend(self.children_of(eid))
+        return collected
+
+    @property
+    def order(self):
+        """Топологический порядок: каждый элемент после своего родителя. Элементы
+        из циклов parent_id (битые данные) идут в конце в порядке коллекции."""
+        if self._order is None:
+            roots = [elem for elem in self.elements if _field(elem, 'parent_id', -1) not in self.by_id]
+            order = self.subtree({_field(elem, 'id') for elem in roots})
+            if len(order) < len(self.elements):
+                seen = {id(elem) for elem in order}
+                order.extend(elem for elem in self.elements if id(elem) not in seen)
+            self._order = order
+        return self._order
+
+
+class ElementIdPool:
+    """Наименьший свободный id (как цикл `while new_id in existing_ids`), без
+    пересканирования коллекции на каждое добавление."""
+
+    def __init__(self, used_ids=()):
+        self.used = set(used_ids)
+        self._next = 1
+
+    def take(self):
+        while self._next in self.used:
+            self._next += 1
+        new_id = self._next
+        self.used.add(new_id)
+        return new_id
+
+
+def _rzm_key(rzm):
+    as_pointer = getattr(rzm, 'as_pointer', None)
+    return as_pointer() if as_pointer else id(rzm)
+
+
+@contextmanager
+def shared_element_index(rzm):
+    """Один индекс rzm.elements на всю операцию (экспорт, упаковка шаблона).
+    Внутри блока коллекцию элементов менять нельзя."""
+    global _current_index
+    previous = _current_index
+    index = ElementIndex(rzm.elements)
+    _current_index = (_rzm_key(rzm), index)
+    try:
+        yield index
+    finally:
+        _current_index = previous
+
+
+def element_index(rzm):
+    """Индекс текущей операции для этого rzm или свежий снимок вне shared_element_index."""
+    if _current_index is not None and _current_index[0] == _rzm_key(rzm):
+        return _current_index[1]
+    return ElementIndex(rzm.elements)
@@ -5,6 +5,7 @@ import zipfile
 import re
 from pathlib import Path
 from .serialization import rzm_to_dict, dict_to_rzm
+from .element_index import ElementIndex, ElementIdPool
 from ..data.p_settings import log_amc
 
 # Gitignore-like system for prefabs
@@ -149,16 +150,20 @@ def format_toggle_label(name):
         res = res[0].upper() + res[1:]
     return res
 
-def apply_button_logic(context, btn_el, toggle_name, settings):
-    """Handles renaming of text elements and assignment of icons based on UI settings."""
+def apply_button_logic(context, btn_el, toggle_name, settings, index=None):
+    """
+    Handles renaming of text elements and assignment of icons based on UI settings.
+    index: ElementIndex that covers the button branch (defaults to the whole scene).
+    """
     rzm = context.scene.rzm
     
     # 1. Rename Text Children
     if settings.button_rename_text:
         formatted_label = format_toggle_label(toggle_name)
         # Search for TEXT elements that are DIRECT children of this button
-        for child in rzm.elements:
-            if child.parent_id == btn_el.id and child.elem_class == 'TEXT':
+        index = index or ElementIndex(rzm.elements)
+        for child in index.children_of(btn_el.id):
+            if child.elem_class == 'TEXT':
                 child.text_id = formatted_label
                 log_amc(context, f"    - Renamed text child to '{formatted_label}'")
     
@@ -223,20 +228,24 @@ def execute_data_zones(context, manifest):
             new_t = rzm.toggle_definitions.add()
             dict_to_rzm(t_dict, new_t)
 
-def reconstruct_branch(context, old_root_id, manifest, new_parent_id, global_id_map, prefab_type=None, current_prefix=""):
+def reconstruct_branch(context, old_root_id, manifest, new_parent_id, global_id_map, prefab_type=None, current_prefix="",
+                       index=None, id_pool=None):
     """
     v4.1: Recursively clones branch and returns a local id_map to maintain reference integrity within clones.
+    index: ElementIndex of manifest['elements']; id_pool: ElementIdPool of scene ids.
+    Both are built on demand, generate_menu shares them across all branches.
     """
     rzm = context.scene.rzm
-    elements_data = manifest.get('elements', [])
-    source_data = next((e for e in elements_data if e.get('id') == old_root_id), None)
+    if index is None:
+        index = ElementIndex(manifest.get('elements', []))
+    source_data = index.get(old_root_id)
     if not source_data: return None, {}
     
     # Create element
     new_el = rzm.elements.add()
-    existing_ids = {e.id for e in rzm.elements if e != new_el}
-    new_id = 1
-    while new_id in existing_ids: new_id += 1
+    if id_pool is None:
+        id_pool = ElementIdPool(e.id for e in rzm.elements if e != new_el)
+    new_id = id_pool.take()
     new_el.id = new_id
     new_el.parent_id = new_parent_id
     
@@ -270,26 +279,36 @@ def reconstruct_branch(context, old_root_id, manifest, new_parent_id, global_id_
         new_el.qt_hide = True
 
     # --- RECURSION ---
-    for child_data in elements_data:
-        if child_data.get('parent_id') == old_root_id:
-            _, sub_map = reconstruct_branch(context, child_data.get('id'), manifest, new_id, global_id_map, current_prefix=current_prefix)
-            local_map.update(sub_map)
+    for child_data in index.children_of(old_root_id):
+        _, sub_map = reconstruct_branch(context, child_data.get('id'), manifest, new_id, global_id_map, current_prefix=current_prefix,
+                                        index=index, id_pool=id_pool)
+        local_map.update(sub_map)
             
     return new_el, local_map
 
-def finalize_references_v4(context, elements_and_maps, global_id_map, manifest):
+def finalize_references_v4(context, elements_and_maps, global_id_map, manifest, index=None):
     """
     Sophisticated remapping: For each element, prioritize its LOCAL branch map, then GLOBAL map.
     """
     rzm = context.scene.rzm
     log_amc(context, "Finalizing all ID references (v4.1)...")
+    if index is None:
+        index = ElementIndex(manifest.get('elements', []))
+    # new id -> old id per local map (first match, as the linear scan did)
+    reverse_maps = {}
     
     for element, local_map in elements_and_maps:
         # Get original template data for this element
-        old_id = next((oid for oid, nid in local_map.items() if nid == element.id), None)
+        reverse = reverse_maps.get(id(local_map))
+        if reverse is None:
+            reverse = {}
+            for oid, nid in local_map.items():
+                reverse.setdefault(nid, oid)
+            reverse_maps[id(local_map)] = reverse
+        old_id = reverse.get(element.id)
         if not old_id: continue # Should not happen
         
-        old_data = next((e for e in manifest.get('elements', []) if e.get('id') == old_id), None)
+        old_data = index.get(old_id)
         if not old_data: continue
         
         # Helper: Try Local, then Global
@@ -355,9 +374,13 @@ def generate_menu(context):
         
     global_id_map = {} 
     elements_mapping_registry = [] # List of (new_element, local_id_map)
+    # One index of the template elements and one id pool of the (cleared) scene for every branch
+    manifest_index = ElementIndex(prefabs)
+    id_pool = ElementIdPool()
     
     # 5. Build Global Main/Page
-    main_el, m_map = reconstruct_branch(context, main_root_data['id'], manifest, -1, global_id_map, 'MAIN_BLOCK')
+    main_el, m_map = reconstruct_branch(context, main_root_data['id'], manifest, -1, global_id_map, 'MAIN_BLOCK',
+                                       index=manifest_index, id_pool=id_pool)
     global_id_map.update(m_map)
     elements_mapping_registry.append((main_el, m_map))
     main_el.position = tuple(auto_menu.main_pos)
@@ -365,7 +388,8 @@ def generate_menu(context):
     
     page_el = None
     if page_root_data:
-        page_el, p_map = reconstruct_branch(context, page_root_data['id'], manifest, main_el.id, global_id_map, 'PAGE_BLOCK')
+        page_el, p_map = reconstruct_branch(context, page_root_data['id'], manifest, main_el.id, global_id_map, 'PAGE_BLOCK',
+                                           index=manifest_index, id_pool=id_pool)
         global_id_map.update(p_map)
         elements_mapping_registry.append((page_el, p_map))
         page_el.position = tuple(auto_menu.page_pos)
@@ -377,7 +401,8 @@ def generate_menu(context):
         old_id = elem_data.get('id')
         # If it wasn't part of Main/Page branches
         if old_id not in global_id_map:
-            sup_el, s_map = reconstruct_branch(context, old_id, manifest, -1, global_id_map)
+            sup_el, s_map = reconstruct_branch(context, old_id, manifest, -1, global_id_map,
+                                               index=manifest_index, id_pool=id_pool)
             global_id_map.update(s_map)
             elements_mapping_registry.append((sup_el, s_map))
 
@@ -387,7 +412,9 @@ def generate_menu(context):
         log_amc(context, f"Building {len(active_toggles)} clones of button prefab...")
         for toggle_name in active_toggles:
             btn_name = f"BUTTON_{toggle_name}"
-            btn_el, b_map = reconstruct_branch(context, button_root_data['id'], manifest, page_el.id, global_id_map, btn_name)
+            branch_start = len(rzm.elements)
+            btn_el, b_map = reconstruct_branch(context, button_root_data['id'], manifest, page_el.id, global_id_map, btn_name,
+                                               index=manifest_index, id_pool=id_pool)
             # Add to registry (so its internal elements keep their links)
             elements_mapping_registry.append((btn_el, b_map))
             # Also need to add children of this button clone to registry
@@ -395,19 +422,21 @@ def generate_menu(context):
             # We need to add every single NEW element in the clone to the registry.
             # Let's fix that.
             
-            apply_button_logic(context, btn_el, toggle_name, auto_menu)
+            # The clone occupies the tail of the collection: index only that
+            apply_button_logic(context, btn_el, toggle_name, auto_menu, index=ElementIndex(rzm.elements[branch_start:]))
             generated_buttons.append(btn_el)
     
     # [PATCH] Register every element found in local maps to the registry for remapping
     # Since reconstruct_branch currently returns the ROOT only, we'll re-scan added elements.
     final_registry = []
+    scene_index = ElementIndex(rzm.elements)
     for _, l_map in elements_mapping_registry:
         for old_id, new_id in l_map.items():
-            new_el = next((e for e in rzm.elements if e.id == new_id), None)
+            new_el = scene_index.get(new_id)
             if new_el: final_registry.append((new_el, l_map))
 
     # 11. Finalize references (Now with global/local priority)
-    finalize_references_v4(context, final_registry, global_id_map, manifest)
+    finalize_references_v4(context, final_registry, global_id_map, manifest, index=manifest_index)
     
     # 12. Layout
     calculate_grid_layout(context, generated_buttons, auto_menu)
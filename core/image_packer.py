@@ -4,6 +4,8 @@ import struct
 import bpy
 import json
 
+from ..utils.export_timing import count_written
+
 def pack_project_images(scene, export_dir):
     rzm = scene.rzm
     print(f"\n--- [Image Packer] Direct Element Packing: {scene.name} ---")
@@ -303,6 +305,7 @@ def pack_project_images(scene, export_dir):
         with open(bin_path, 'wb') as f:
             for record in instances:
                 f.write(struct.pack('<HHHH', *record))
+            count_written(f.tell())
         n_inst = len(instances) // 3
         print(f"  [Image Packer] images.bin: {n_inst} instances ({len(instances)} records) → {bin_path}")
     except Exception as e:
@@ -314,6 +317,7 @@ def pack_project_images(scene, export_dir):
         with open(anim_path, 'wb') as f:
             for inst_id in anim_frames:
                 f.write(struct.pack('<H', inst_id))
+            count_written(f.tell())
         print(f"  [Image Packer] anim_frames.bin: {len(anim_frames)} frame refs → {anim_path}")
     except Exception as e:
         print(f"  [Image Packer] ERROR writing anim_frames.bin: {e}")
@@ -352,7 +352,7 @@ def _validate_component_cache(
             )
 
         vertex_map = obj_data.get("vertex_map")
-        if require_vertex_maps and count > 0 and not vertex_map:
+        if require_vertex_maps and count > 0 and (vertex_map is None or len(vertex_map) == 0):
             issues.append(
                 IniValidationIssue(
                     "ERROR",
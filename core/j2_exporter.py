@@ -9,6 +9,7 @@ from .element_static_map import export_element_static_map
 from .element_blacklist import export_element_blacklist
 from .element_default_props import export_element_default_props
 from .element_draw_data import build_element_draw_data, export_element_draw_data
+from .element_index import shared_element_index
 
 # Add libs to sys.path so we can import jinja2
 ADDON_DIR = Path(__file__).parent.parent
@@ -58,6 +59,8 @@ class RZMenuJ2Exporter:
 
     def render(self, template_name="rz_uni.j2", menu_only=False) -> str:
         """Renders the specified template with the current scene context."""
+        from ..utils.export_timing import measure
+
         if not self.env:
             return "; ERROR: Jinja2 Environment not initialized!"
             
@@ -93,38 +96,44 @@ class RZMenuJ2Exporter:
             from ..operators.export_manager import get_target_path
             export_path = get_target_path(self.context)
             if export_path:
-                # This now updates scene.rzm.text_mapping_json internally
-                text_mapping = get_text_mapping_for_j2(scene, export_path)
-                image_mapping = get_image_mapping_for_j2(scene, export_path)
-                pack_styles(scene, export_path)
-                # Phase 0.5/0.5.5: Export ElementStaticMap and BlackList buffers
-                if scene.rzm and scene.rzm.elements:
-                    draw_data = build_element_draw_data(
-                        scene.rzm.elements,
-                        text_mapping,
-                        image_mapping,
-                    )
-                    export_element_draw_data(draw_data, Path(export_path) / 'res')
-                    static_map_path = str(Path(export_path) / 'res' / 'element_static_map.buf')
-                    elem_static_flags = export_element_static_map(
-                        scene.rzm.elements,
-                        static_map_path,
-                        image_mapping,
-                        text_mapping,
-                        draw_data,
-                    )
-                    blacklist_path = str(Path(export_path) / 'res' / 'element_blacklist.buf')
-                    export_element_blacklist(
-                        scene.rzm.elements,
-                        blacklist_path,
-                        image_mapping,
-                        text_mapping,
-                        draw_data,
-                    )
-                    default_props_path = str(Path(export_path) / 'res' / 'element_default_props.buf')
-                    elem_default_flags = export_element_default_props(
-                        scene.rzm.elements, default_props_path
-                    )
+                # Один индекс элементов на упаковку текстов и буферов элементов
+                with shared_element_index(scene.rzm) as element_idx:
+                    # This now updates scene.rzm.text_mapping_json internally
+                    with measure("ini.pack_project_text"):
+                        text_mapping = get_text_mapping_for_j2(scene, export_path)
+                    with measure("ini.pack_project_images"):
+                        image_mapping = get_image_mapping_for_j2(scene, export_path)
+                    with measure("ini.pack_styles"):
+                        pack_styles(scene, export_path)
+                    # Phase 0.5/0.5.5: Export ElementStaticMap and BlackList buffers
+                    if scene.rzm and scene.rzm.elements:
+                        with measure("ini.export_element_buffers"):
+                            draw_data = build_element_draw_data(
+                                element_idx.elements,
+                                text_mapping,
+                                image_mapping,
+                            )
+                            export_element_draw_data(draw_data, Path(export_path) / 'res')
+                            static_map_path = str(Path(export_path) / 'res' / 'element_static_map.buf')
+                            elem_static_flags = export_element_static_map(
+                                element_idx.elements,
+                                static_map_path,
+                                image_mapping,
+                                text_mapping,
+                                draw_data,
+                            )
+                            blacklist_path = str(Path(export_path) / 'res' / 'element_blacklist.buf')
+                            export_element_blacklist(
+                                element_idx.elements,
+                                blacklist_path,
+                                image_mapping,
+                                text_mapping,
+                                draw_data,
+                            )
+                            default_props_path = str(Path(export_path) / 'res' / 'element_default_props.buf')
+                            elem_default_flags = export_element_default_props(
+                                element_idx.elements, default_props_path
+                            )
                 print(f"RZMenu: All resource buffers (text, images, styles, static_map) packed to {export_path}")
         except Exception as e:
             print(f"RZMenu Text Packing Error: {e}")
@@ -146,5 +155,6 @@ class RZMenuJ2Exporter:
             'textures': [],
             'cfg': None,
         }
-        
-        return template.render(ctx)
+
+        with measure("ini.render_template"):
+            return template.render(ctx)
@@ -0,0 +1,225 @@
+# RZMenu/core/pixel_fill.py
+# Заливка прозрачных пикселей цветом ближайшего видимого пикселя.
+# Точный евклидов distance transform с возвратом индексов ближайшего пикселя:
+# собственная NumPy-реализация (вертикальный проход + нижняя огибающая парабол
+# Felzenszwalb-Huttenlocher, векторизованная по всем строкам сразу). Радиус не
+# ограничен. Один и тот же проход даёт:
+#   - bleed атласа (bleed_sprites_rgb): спрайты ставятся друг под друга в один
+#     массив, граница спрайта - граница сегмента, цвет не переходит между ними;
+#   - дилатацию с радиусом (dilate_rgba, TexWorks); там при наличии scipy
+#     берётся scipy.ndimage.
+# Bleed всегда идёт через NumPy-проход, поэтому результат не зависит от scipy.
+import numpy as np
+
+# Ячеек в одной пачке спрайтов bleed_sprites_rgb (сумма высот x макс. ширина)
+BLEED_BATCH_CELLS = 1 << 22
+
+try:
+    from scipy import ndimage as _ndimage
+except ImportError:
+    _ndimage = None
+
+
+def _nearest_visible_numpy(visible: np.ndarray, seg_first: np.ndarray = None, seg_last: np.ndarray = None):
+    """
+    Точный EDT на NumPy. Python-цикл идёт по столбцам, векторизация — по строкам.
+    seg_first/seg_last: (h,) первая/последняя строка сегмента каждой строки;
+    ближайший пиксель ищется только внутри своего сегмента (в каждом сегменте
+    должен быть хотя бы один видимый пиксель).
+    """
+    h, w = visible.shape
+    yidx = np.arange(h, dtype=np.int32)[:, None]
+
+    # 1. Ближайший видимый пиксель в том же столбце (сверху/снизу). «Нет
+    # пикселя» - строка far: дальше любого настоящего соседа в пределах (h, w)
+    far = 2 * h + w
+    above = np.where(visible, yidx, np.int32(-1))
+    np.maximum.accumulate(above, axis=0, out=above)
+    below = np.where(visible, yidx, np.int32(far))[::-1]
+    below = np.minimum.accumulate(below, axis=0)[::-1]
+    if seg_first is not None:
+        # Найденное в соседнем сегменте - как «не найдено»
+        above[above < seg_first[:, None]] = -1
+        below[below > seg_last[:, None]] = far
+    column_ny = np.where((below - yidx) < np.where(above >= 0, yidx - above, 2 * far), below, above)
+    col_has = visible.any(axis=0)
+    g_sq = np.ascontiguousarray(((column_ny - yidx).astype(np.float64) ** 2).T)  # (w, h)
+
+    # 2. Нижняя огибающая парабол g(x')^2 + (x - x')^2 для каждой строки.
+    # Стек огибающей: env_*[k, r], плоский индекс k * h + r. Глубина стека
+    # обычно мала, поэтому буферы растут по требованию.
+    rows = np.arange(h, dtype=np.int64)
+    capacity = 64
+    env_v = np.zeros(capacity * h, dtype=np.float64)
+    env_f = np.zeros(capacity * h, dtype=np.float64)
+    env_z = np.zeros(capacity * h, dtype=np.float64)
+    top = rows - h  # пустой стек: k = -1
+
+    first = True
+    for q in np.nonzero(col_has)[0]:
+        fq = g_sq[q] + float(q * q)
+        if first:
+            s = np.full(h, -np.inf)
+            first = False
+        else:
+            s = (fq - env_f[top]) / (2.0 * (q - env_v[top]))
+            idx = np.nonzero(s <= env_z[top])[0]
+            while idx.size:
+                t = top[idx] - h
+                top[idx] = t
+                alive = t >= 0
+                s[idx[~alive]] = -np.inf
+                idx, t = idx[alive], t[alive]
+                sk = (fq[idx] - env_f[t]) / (2.0 * (q - env_v[t]))
+                s[idx] = sk
+                idx = idx[sk <= env_z[t]]
+        top += h
+        if top.max() >= capacity * h:
+            env_v, env_f, env_z = (np.concatenate((a, np.zeros_like(a))) for a in (env_v, env_f, env_z))
+            capacity *= 2
+        env_v[top] = q
+        env_f[top] = fq
+        env_z[top] = s
+
+    # 3. Проход по x: для каждого пикселя — парабола огибающей над ним
+    env_v = env_v.astype(np.int32)
+    k = rows.copy()
+    nx_t = np.empty((w, h), dtype=np.int32)
+    for q in range(w):
+        advance = k < top
+        advance[advance] = env_z[k[advance] + h] < q
+        while advance.any():
+            k[advance] += h
+            advance = k < top
+            advance[advance] = env_z[k[advance] + h] < q
+        nx_t[q] = env_v[k]
+
+    nx = np.ascontiguousarray(nx_t.T)
+    ny = column_ny.reshape(-1)[nx + (rows * w)[:, None]]
+    return ny, nx
+
+
+def nearest_visible_indices(visible: np.ndarray):
+    """
+    Для маски (h, w) возвращает (ny, nx) — координаты ближайшего (евклидово)
+    True-пикселя для каждого пикселя. Маска должна содержать хотя бы один True.
+    """
+    if _ndimage is not None:
+        _dist, (ny, nx) = _ndimage.distance_transform_edt(~visible, return_indices=True)
+        return ny, nx
+
+    h, w = visible.shape
+    # Python-цикл идёт по ширине: для широких картинок выгоднее транспонировать
+    if w > h:
+        nx, ny = _nearest_visible_numpy(visible.T)
+        return ny.T, nx.T
+    return _nearest_visible_numpy(visible)
+
+
+def _fill_from_nearest(out: np.ndarray, visible: np.ndarray, channels, radius=None):
+    """Копирует channels ближайшего видимого пикселя в невидимые (в пределах radius, если задан)."""
+    ny, nx = nearest_visible_indices(visible)
+    h, w = visible.shape
+    holes = np.flatnonzero(~visible)
+    hole_ny = ny.reshape(-1)[holes]
+    hole_nx = nx.reshape(-1)[holes]
+    if radius is not None:
+        dy = hole_ny - holes // w
+        dx = hole_nx - holes % w
+        near = dy.astype(np.int64) ** 2 + dx.astype(np.int64) ** 2 <= int(radius) ** 2
+        holes, hole_ny, hole_nx = holes[near], hole_ny[near], hole_nx[near]
+    flat = out.reshape(h * w, -1)
+    flat[holes, channels] = flat[hole_ny * w + hole_nx, channels]
+
+
+def bleed_sprites_rgb(sprites, alpha_threshold: float = 1.0 / 255.0):
+    """
+    Заливает на месте RGB прозрачных пикселей (alpha <= threshold) каждого
+    спрайта из (h, w, C>=4) списка цветом ближайшего видимого пикселя того же
+    спрайта; alpha не меняется, радиус не ограничен. Спрайты (можно view в
+    атлас) ставятся друг под друга пачками по BLEED_BATCH_CELLS, на пачку один
+    проход EDT: Python-цикл идёт по максимальной ширине спрайта, а не по числу
+    спрайтов.
+    """
+    todo = []
+    for sprite in sprites:
+        if sprite.size == 0:
+            continue
+        visible = sprite[..., 3] > alpha_threshold
+        if visible.all() or not visible.any():
+            continue
+        todo.append((sprite, visible))
+    # Узкие рядом с узкими: меньше пустых ячеек до ширины пачки
+    todo.sort(key=lambda item: item[0].shape[1])
+
+    batch, rows, width = [], 0, 0
+    for sprite, visible in todo:
+        h, w = visible.shape
+        if batch and (rows + h) * max(width, w) > BLEED_BATCH_CELLS:
+            _bleed_batch(batch, rows, width)
+            batch, rows, width = [], 0, 0
+        batch.append((sprite, visible))
+        rows += h
+        width = max(width, w)
+    if batch:
+        _bleed_batch(batch, rows, width)
+
+
+def _bleed_batch(batch, rows: int, width: int):
+    stacked = np.zeros((rows, width), dtype=bool)
+    seg_first = np.empty(rows, dtype=np.int32)
+    seg_last = np.empty(rows, dtype=np.int32)
+    offsets = []
+    top = 0
+    for sprite, visible in batch:
+        h, w = visible.shape
+        stacked[top:top + h, :w] = visible
+        seg_first[top:top + h] = top
+        seg_last[top:top + h] = top + h - 1
+        offsets.append(top)
+        top += h
+
+    ny, nx = _nearest_visible_numpy(stacked, seg_first, seg_last)
+    for (sprite, visible), top in zip(batch, offsets):
+        h, w = visible.shape
+        hy, hx = np.nonzero(~visible)
+        src_y = ny[top + hy, hx] - top
+        src_x = nx[top + hy, hx]
+        sprite[hy, hx, :3] = sprite[src_y, src_x, :3]
+
+
+def bleed_transparent_rgb(pixels: np.ndarray, alpha_threshold: float = 1.0 / 255.0, out: np.ndarray = None) -> np.ndarray:
+    """
+    Fill RGB in transparent pixels (alpha <= threshold) from the nearest
+    visible pixel while preserving alpha. Single pass, unlimited radius.
+    pixels: (h, w, 4) или (h, w, C>=4). out=pixels заливает на месте.
+    Для многих спрайтов сразу - bleed_sprites_rgb.
+    """
+    if out is None:
+        out = np.array(pixels, copy=True, dtype=np.float32)
+    elif out is not pixels:
+        out[...] = pixels
+    bleed_sprites_rgb([out], alpha_threshold)
+    return out
+
+
+def dilate_rgba(pixels: np.ndarray, radius: int = None, alpha_threshold: float = 0.0, out: np.ndarray = None) -> np.ndarray:
+    """
+    Дилатация: пустые пиксели (alpha <= threshold) не дальше radius (евклидово)
+    от видимых получают все каналы ближайшего видимого, включая alpha.
+    radius=None — без ограничения. Один distance transform: число проходов не
+    зависит от радиуса. out=pixels заливает на месте.
+    """
+    if out is None:
+        out = np.array(pixels, copy=True, dtype=np.float32)
+    elif out is not pixels:
+        out[...] = pixels
+    if out.size == 0 or (radius is not None and radius <= 0):
+        return out
+
+    visible = out[..., 3] > alpha_threshold
+    if visible.all() or not visible.any():
+        return out
+
+    _fill_from_nearest(out, visible, slice(None), radius)
+    return out
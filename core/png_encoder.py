@@ -0,0 +1,196 @@
+# RZMenu/core/png_encoder.py
+# Потоковый PNG-энкодер (RGBA8) на NumPy.
+# Картинка режется на полосы по BAND_ROWS строк. Для каждой строки фильтр
+# (None/Sub/Up/Paeth) выбирается эвристикой минимальной суммы |байт| (как у
+# libpng), полосы сжимаются в пуле потоков (zlib отпускает GIL) и пишутся в
+# файл отдельными IDAT-чанками по мере готовности. Все полосы образуют один
+# zlib-поток: каждая полоса - raw deflate с SYNC_FLUSH, словарь - хвост
+# предыдущей полосы, Adler-32 собирается из частей. В памяти одновременно
+# лежат только полосы в работе, а не весь отфильтрованный массив.
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Уровень: 1 - быстро (только фильтр None, как старый писатель), 6 - по
+# умолчанию, 9 - минимальный размер. Фильтры подбираются при level >= 2.
+LEVEL_FAST = 1
+LEVEL_DEFAULT = 6
+LEVEL_SMALLEST = 9
+
+BAND_ROWS = 64
+# Полос в работе на один поток пула: ограничивает пиковую память
+BANDS_IN_FLIGHT_PER_WORKER = 2
+
+_WINDOW = 32 * 1024
+_ADLER_BASE = 65521
+
+FILTER_NONE, FILTER_SUB, FILTER_UP, FILTER_AVERAGE, FILTER_PAETH = range(5)
+
+
+def float_rows_to_rgba8(rows: np.ndarray) -> np.ndarray:
+    """float32 RGBA 0..1 -> uint8 с округлением (clip(v * 255 + 0.5))."""
+    return np.clip(rows * 255.0 + 0.5, 0.0, 255.0).astype(np.uint8)
+
+
+def _png_chunk(kind: bytes, payload: bytes) -> bytes:
+    crc = zlib.crc32(payload, zlib.crc32(kind)) & 0xFFFFFFFF
+    return struct.pack('>I', len(payload)) + kind + payload + struct.pack('>I', crc)
+
+
+def adler32_combine(adler1: int, adler2: int, len2: int) -> int:
+    """Adler-32 склейки A+B по Adler-32 частей (zlib adler32_combine)."""
+    rem = len2 % _ADLER_BASE
+    sum1 = adler1 & 0xFFFF
+    sum2 = (rem * sum1) % _ADLER_BASE
+    sum1 = (sum1 + (adler2 & 0xFFFF) + _ADLER_BASE - 1) % _ADLER_BASE
+    sum2 = (sum2 + ((adler1 >> 16) & 0xFFFF) + ((adler2 >> 16) & 0xFFFF) + _ADLER_BASE - rem) % _ADLER_BASE
+    return sum1 | (sum2 << 16)
+
+
+def _abs_sum(filtered: np.ndarray) -> np.ndarray:
+    """Сумма |байт| каждой строки, байты как signed (эвристика libpng)."""
+    return np.abs(filtered.view(np.int8)).view(np.uint8).sum(axis=1, dtype=np.uint32)
+
+
+def filter_rows(rows: np.ndarray, prev: np.ndarray, adaptive: bool = True) -> np.ndarray:
+    """
+    (n, stride) uint8 строки + предыдущая строка (stride,) -> (n, stride + 1)
+    отфильтрованных байт с байтом типа фильтра в начале каждой строки.
+    """
+    n, stride = rows.shape
+    out = np.empty((n, stride + 1), dtype=np.uint8)
+    if not adaptive:
+        out[:, 0] = FILTER_NONE
+        out[:, 1:] = rows
+        return out
+
+    up = np.empty_like(rows)
+    up[0] = prev
+    up[1:] = rows[:-1]
+    left = np.zeros_like(rows)
+    left[:, 4:] = rows[:, :-4]
+    up_left = np.zeros_like(rows)
+    up_left[:, 4:] = up[:, :-4]
+
+    # Paeth: сравнения в int16, сами разности - в uint8 с переполнением, как в PNG
+    a = left.astype(np.int16)
+    b = up.astype(np.int16)
+    c = up_left.astype(np.int16)
+    pa = np.abs(b - c)
+    pb = np.abs(a - c)
+    pc = np.abs(a + b - 2 * c)
+    predictor = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, up, up_left))
+
+    candidates = (
+        (FILTER_NONE, rows),
+        (FILTER_SUB, rows - left),
+        (FILTER_UP, rows - up),
+        (FILTER_PAETH, rows - predictor),
+    )
+    best = np.stack([_abs_sum(filtered) for _, filtered in candidates]).argmin(axis=0)
+    for k, (kind, filtered) in enumerate(candidates):
+        chosen = best == k
+        out[chosen, 0] = kind
+        out[chosen, 1:] = filtered[chosen]
+    return out
+
+
+class _BandSource:
+    """Строки картинки в uint8: float-источник конвертируется по полосам."""
+
+    def __init__(self, pixels: np.ndarray):
+        self.pixels = pixels
+        self.height, width = pixels.shape[:2]
+        self.stride = width * 4
+
+    def rows(self, y0: int, y1: int) -> np.ndarray:
+        rows = self.pixels[y0:y1].reshape(y1 - y0, self.stride)
+        if rows.dtype != np.uint8:
+            rows = float_rows_to_rgba8(rows)
+        return rows
+
+    def filtered(self, y0: int, y1: int, adaptive: bool) -> np.ndarray:
+        prev = self.rows(y0 - 1, y0)[0] if y0 > 0 else np.zeros(self.stride, dtype=np.uint8)
+        return filter_rows(self.rows(y0, y1), prev, adaptive)
+
+
+def _encode_band(source: _BandSource, y0: int, y1: int, level: int, adaptive: bool):
+    """
+    Одна полоса -> (deflate-данные, adler32, длина сырых данных). Словарь -
+    последние 32 КБ отфильтрованного потока перед полосой: строки перед y0
+    фильтруются заново, выбор фильтра детерминирован, байты те же.
+    """
+    raw = source.filtered(y0, y1, adaptive).tobytes()
+    options = {}
+    if y0 > 0:
+        back = min(y0, -(-_WINDOW // (source.stride + 1)))
+        options['zdict'] = source.filtered(y0 - back, y0, adaptive).tobytes()[-_WINDOW:]
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15, 9, zlib.Z_DEFAULT_STRATEGY, **options)
+    last = y1 >= source.height
+    data = compressor.compress(raw) + compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+    return data, zlib.adler32(raw), len(raw)
+
+
+def write_png_rgba8(path: str, pixels: np.ndarray, level: int = LEVEL_DEFAULT, workers: int = None):
+    """
+    Пишет (h, w, 4) RGBA в PNG (8 бит на канал, строки в порядке массива).
+    pixels: uint8 или float 0..1 (квантуется по полосам, без полной копии).
+    """
+    if pixels.ndim != 3 or pixels.shape[2] != 4:
+        raise ValueError(f"Expected (h, w, 4) pixels, got {pixels.shape}")
+    height, width = pixels.shape[:2]
+    source = _BandSource(pixels)
+    level = max(0, min(9, int(level)))
+    adaptive = level >= 2
+    bands = [(y0, min(height, y0 + BAND_ROWS)) for y0 in range(0, height, BAND_ROWS)]
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    def encode(band):
+        return _encode_band(source, band[0], band[1], level, adaptive)
+
+    with open(path, 'wb') as fp:
+        fp.write(PNG_SIGNATURE)
+        fp.write(_png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)))
+        # Заголовок zlib-потока (тот же, что даёт zlib для этого уровня) идёт в первый IDAT
+        head = zlib.compress(b'', level)[:2]
+        adler = 1
+        if workers <= 1 or len(bands) < 2:
+            results = map(encode, bands)
+            pool = None
+        else:
+            pool = ThreadPoolExecutor(max_workers=workers)
+            results = _ordered_window(pool, encode, bands, workers * BANDS_IN_FLIGHT_PER_WORKER)
+        try:
+            for data, band_adler, band_len in results:
+                adler = adler32_combine(adler, band_adler, band_len)
+                if data:
+                    fp.write(_png_chunk(b'IDAT', head + data))
+                    head = b''
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+        fp.write(_png_chunk(b'IDAT', head + struct.pack('>I', adler)))
+        fp.write(_png_chunk(b'IEND', b''))
+
+
+def _ordered_window(pool, fn, items, window):
+    """pool.map по порядку, но не больше window задач одновременно."""
+    pending = []
+    items = iter(items)
+    for item in items:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= window:
+            break
+    while pending:
+        result = pending.pop(0).result()
+        for item in items:
+            pending.append(pool.submit(fn, item))
+            break
+        yield result
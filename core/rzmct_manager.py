@@ -5,6 +5,7 @@ import zipfile
 from pathlib import Path
 
 from .serialization import rzm_to_dict
+from .element_index import element_index
 
 class RZMCTPacker:
     def __init__(self, context):
@@ -16,13 +17,15 @@ class RZMCTPacker:
         self.referenced_images = set() # ids
         self.referenced_fonts = set() # slots
         self.referenced_variables = set() # names
+        self.index = None # ElementIndex, built in gather_dependencies
         
     def gather_dependencies(self):
         """Recursive gather of all elements starting from prefabs."""
         # 1. Start with prefabs
         prefab_counts = {'MAIN_BLOCK': 0, 'PAGE_BLOCK': 0, 'BUTTONS': 0}
+        self.index = element_index(self.rzm)
         
-        for elem in self.rzm.elements:
+        for elem in self.index.elements:
             if getattr(elem, "is_template_prefab", False):
                 ptype = getattr(elem, "template_prefab", "UNKNOWN")
                 if ptype in prefab_counts:
@@ -49,9 +52,8 @@ class RZMCTPacker:
         
         # A. Find Children (Recursive)
         # In RZMenu, children are linked via parent_id
-        for child in self.rzm.elements:
-            if child.parent_id == elem.id:
-                self._add_element_recursive(child)
+        for child in self.index.children_of(elem.id):
+            self._add_element_recursive(child)
                 
         # B. Find Presets
         for p_ref in elem.preset_ids:
@@ -69,9 +71,7 @@ class RZMCTPacker:
             if h_elem: self._add_element_recursive(h_elem)
 
     def _get_element_by_id(self, target_id):
-        for e in self.rzm.elements:
-            if e.id == target_id: return e
-        return None
+        return self.index.get(target_id)
 
     def collect_resources(self):
         """Scan whitelisted elements for assets and variables."""
@@ -5,6 +5,7 @@ import os
 import zipfile
 import tempfile
 from mathutils import Vector, Color, Euler, Quaternion
+from .element_index import element_index
 
 def rzm_to_dict(val):
     """
@@ -19,31 +20,15 @@ def rzm_to_dict(val):
     if callable(val):
         return str(val)
 
-    # 2. Обработка PropertyGroup (зарегистрированные свойства через bpy.props)
+    # 2. Обработка PropertyGroup (зарегистрированные свойства через bpy.props):
+    # поля по скомпилированной схеме типа, см. _compile_schema
     if isinstance(val, bpy.types.PropertyGroup):
-        res = {}
-        for prop_def in val.bl_rna.properties:
-            key = prop_def.identifier
-            if key in {'rna_type'}: continue
-            
-            # Пропускаем указатели на объекты данных (Mesh, Image и т.д.), 
-            # но оставляем указатели на вложенные группы настроек
-            if isinstance(prop_def, bpy.types.PointerProperty):
-                attr = getattr(val, key)
-                if not isinstance(attr, bpy.types.PropertyGroup):
-                    continue
-            
-            res[key] = rzm_to_dict(getattr(val, key))
-            
-        # Дополнительно проверяем ID-properties внутри PropertyGroup (те самые "кастомные" ключи)
-        if hasattr(val, "keys"):
-            for k in val.keys():
-                if k not in res:
-                    res[k] = rzm_to_dict(val[k])
-        return res
+        return _group_to_dict(val, _group_schema(val))
 
     # 3. Обработка коллекций и списков (bpy_prop_collection, IDPropertyArray, list, tuple)
-    if isinstance(val, (list, tuple, bpy.types.bpy_prop_collection, bpy.types.bpy_prop_array)):
+    if isinstance(val, bpy.types.bpy_prop_collection):
+        return _collection_to_list(val)
+    if isinstance(val, (list, tuple, bpy.types.bpy_prop_array)):
         return [rzm_to_dict(item) for item in val]
 
     # 4. Обработка ID-свойств (IDPropertyGroup), которые ведут себя как словари
@@ -70,36 +55,258 @@ def dict_to_rzm(data_dict, blender_prop):
     if not isinstance(data_dict, dict):
         return
 
+    if isinstance(blender_prop, bpy.types.PropertyGroup):
+        _dict_to_group(data_dict, blender_prop, _group_schema(blender_prop))
+        return
+
     for key, value in data_dict.items():
-        # Если это ID-property (через квадратные скобки), а не зарегистрированное свойство
-        if not hasattr(blender_prop, key) and hasattr(blender_prop, "__setitem__"):
-            try:
-                blender_prop[key] = value
-                continue
-            except: pass
+        _apply_key(blender_prop, key, value)
 
-        if not hasattr(blender_prop, key):
-            continue
 
-        target_prop = getattr(blender_prop, key)
+# --- Схемы PropertyGroup ---
+# Для каждого типа PropertyGroup один раз компилируется плоский список полей
+# (ключ, вид) вместо обхода bl_rna.properties и isinstance на каждом
+# экземпляре. Числовые поля коллекций читаются/пишутся столбцами через
+# foreach_get/foreach_set. Порядок ключей и значения - как у обхода bl_rna.
+FIELD_SCALAR = 0      # str/int/float/bool/enum - getattr уже JSON-совместим
+FIELD_ARRAY = 1       # одномерный числовой массив -> list
+FIELD_POINTER = 2     # только вложенные PropertyGroup, указатели на ID пропускаются
+FIELD_COLLECTION = 3
+FIELD_GENERIC = 4     # всё остальное (enum-флаги, многомерные массивы) - через rzm_to_dict
 
-        # Коллекции
-        if isinstance(target_prop, bpy.types.bpy_prop_collection) and isinstance(value, list):
-            target_prop.clear()
-            for item_dict in value:
-                new_item = target_prop.add()
-                dict_to_rzm(item_dict, new_item)
+# Коллекции короче этого читаются поштучно: на 1-3 элементах столбцы не окупаются
+BULK_MIN_ITEMS = 4
 
-        # Вложенные группы
-        elif isinstance(target_prop, bpy.types.PropertyGroup) and isinstance(value, dict):
-            dict_to_rzm(value, target_prop)
-            
-        # Простые типы
+_NUMERIC_TYPES = {'BOOLEAN', 'INT', 'FLOAT'}
+_MISSING = object()
+_schemas = {}
+
+
+class _GroupSchema:
+    __slots__ = ('fields', 'kinds', 'bulk_get', 'bulk_set')
+
+    def __init__(self, fields, bulk_get, bulk_set):
+        self.fields = fields                          # [(ключ, вид)] в порядке bl_rna
+        self.kinds = {key: kind for key, kind in fields}
+        self.bulk_get = bulk_get                      # [(ключ, тип RNA, длина массива или 0)]
+        self.bulk_set = bulk_set                      # то же, без update/set-колбэков
+
+
+def _prop_keywords(cls, key):
+    """keywords из аннотации bpy.props (update/set/get...) или None, если её нет."""
+    for klass in cls.__mro__:
+        annotation = klass.__dict__.get('__annotations__', {}).get(key)
+        if annotation is not None:
+            return getattr(annotation, 'keywords', None)
+    return None
+
+
+def _compile_schema(cls, bl_rna):
+    fields, bulk_get, bulk_set = [], [], []
+    for prop_def in bl_rna.properties:
+        key = prop_def.identifier
+        if key == 'rna_type':
+            continue
+        prop_type = prop_def.type
+        length = 0
+        if prop_type == 'POINTER':
+            kind = FIELD_POINTER
+        elif prop_type == 'COLLECTION':
+            kind = FIELD_COLLECTION
+        elif prop_type == 'STRING' or (prop_type == 'ENUM' and not prop_def.is_enum_flag):
+            kind = FIELD_SCALAR
+        elif prop_type in _NUMERIC_TYPES:
+            length = prop_def.array_length
+            if length == 0:
+                kind = FIELD_SCALAR
+            elif prop_def.array_dimensions[1] == 0:
+                kind = FIELD_ARRAY
+            else:
+                kind = FIELD_GENERIC
+        else:
+            kind = FIELD_GENERIC
+        fields.append((key, kind))
+
+        if prop_type in _NUMERIC_TYPES and kind in (FIELD_SCALAR, FIELD_ARRAY):
+            bulk_get.append((key, prop_type, length))
+            # foreach_set не вызывает update/set: такие поля пишутся только через setattr
+            keywords = _prop_keywords(cls, key)
+            if keywords is not None and not {'update', 'set'} & keywords.keys():
+                bulk_set.append((key, prop_type, length))
+    return _GroupSchema(fields, bulk_get, bulk_set)
+
+
+def _group_schema(val):
+    cls = type(val)
+    schema = _schemas.get(cls)
+    if schema is None:
+        schema = _schemas[cls] = _compile_schema(cls, val.bl_rna)
+    return schema
+
+
+def _group_to_dict(val, schema, columns=None, row=0):
+    res = {}
+    for key, kind in schema.fields:
+        if columns is not None and key in columns:
+            res[key] = columns[key][row]
+        elif kind == FIELD_SCALAR:
+            res[key] = getattr(val, key)
+        elif kind == FIELD_ARRAY:
+            res[key] = list(getattr(val, key))
+        elif kind == FIELD_COLLECTION:
+            res[key] = _collection_to_list(getattr(val, key))
+        elif kind == FIELD_POINTER:
+            # Пропускаем указатели на объекты данных (Mesh, Image и т.д.),
+            # но оставляем указатели на вложенные группы настроек
+            attr = getattr(val, key)
+            if isinstance(attr, bpy.types.PropertyGroup):
+                res[key] = _group_to_dict(attr, _group_schema(attr))
+        else:
+            res[key] = rzm_to_dict(getattr(val, key))
+
+    # Дополнительно проверяем ID-properties внутри PropertyGroup (те самые "кастомные" ключи)
+    for k in val.keys():
+        if k not in res:
+            res[k] = rzm_to_dict(val[k])
+    return res
+
+
+def _read_columns(coll, schema, count):
+    columns = {}
+    for key, prop_type, length in schema.bulk_get:
+        buf = [0] * (count * (length or 1))
+        coll.foreach_get(key, buf)
+        if prop_type == 'BOOLEAN':
+            buf = [bool(v) for v in buf]
+        elif prop_type == 'FLOAT':
+            buf = [float(v) for v in buf]
+        if length:
+            buf = [buf[i:i + length] for i in range(0, count * length, length)]
+        columns[key] = buf
+    return columns
+
+
+def _collection_to_list(coll):
+    count = len(coll)
+    if count >= BULK_MIN_ITEMS:
+        first = coll[0]
+        if isinstance(first, bpy.types.PropertyGroup):
+            schema = _group_schema(first)
+            try:
+                columns = _read_columns(coll, schema, count) if schema.bulk_get else None
+            except Exception:
+                columns = None
+            return [_group_to_dict(item, schema, columns, row) for row, item in enumerate(coll)]
+    return [rzm_to_dict(item) for item in coll]
+
+
+def _column_value_ok(prop_type, value):
+    if prop_type == 'BOOLEAN':
+        return type(value) is bool
+    if prop_type == 'INT':
+        return type(value) is int
+    return type(value) in (float, int)
+
+
+def _write_columns(coll, schema, items):
+    """foreach_set для числовых полей, которые есть во всех записях; возвращает записанные ключи."""
+    written = set()
+    for key, prop_type, length in schema.bulk_set:
+        flat = []
+        for item_dict in items:
+            value = item_dict.get(key, _MISSING)
+            if length:
+                if not isinstance(value, list) or len(value) != length:
+                    break
+                if not all(_column_value_ok(prop_type, v) for v in value):
+                    break
+                flat.extend(value)
+            else:
+                if value is _MISSING or not _column_value_ok(prop_type, value):
+                    break
+                flat.append(value)
         else:
             try:
-                setattr(blender_prop, key, value)
-            except Exception as e:
-                print(f"RZ-Constructor Warning: Could not set property '{key}'. Reason: {e}")
+                coll.foreach_set(key, flat)
+                written.add(key)
+            except Exception:
+                pass
+    return written
+
+
+def _list_to_collection(coll, items):
+    coll.clear()
+    if len(items) >= BULK_MIN_ITEMS and all(isinstance(item_dict, dict) for item_dict in items):
+        # Сначала все add(): ссылки на элементы после add() могут стать невалидными
+        for _ in items:
+            coll.add()
+        first = coll[0]
+        if isinstance(first, bpy.types.PropertyGroup):
+            schema = _group_schema(first)
+            skip = _write_columns(coll, schema, items) if schema.bulk_set else set()
+            for item, item_dict in zip(coll, items):
+                _dict_to_group(item_dict, item, schema, skip)
+            return
+        for item, item_dict in zip(coll, items):
+            dict_to_rzm(item_dict, item)
+        return
+    for item_dict in items:
+        new_item = coll.add()
+        dict_to_rzm(item_dict, new_item)
+
+
+def _set_value(blender_prop, key, value):
+    try:
+        setattr(blender_prop, key, value)
+    except Exception as e:
+        print(f"RZ-Constructor Warning: Could not set property '{key}'. Reason: {e}")
+
+
+def _dict_to_group(data_dict, group, schema, skip=()):
+    kinds = schema.kinds
+    for key, value in data_dict.items():
+        if key in skip:
+            continue
+        kind = kinds.get(key)
+        if kind is None:
+            _apply_key(group, key, value)
+        elif kind == FIELD_COLLECTION and isinstance(value, list):
+            _list_to_collection(getattr(group, key), value)
+        elif kind == FIELD_POINTER and isinstance(value, dict):
+            target_prop = getattr(group, key)
+            if isinstance(target_prop, bpy.types.PropertyGroup):
+                _dict_to_group(value, target_prop, _group_schema(target_prop))
+            else:
+                _set_value(group, key, value)
+        else:
+            _set_value(group, key, value)
+
+
+def _apply_key(blender_prop, key, value):
+    # Если это ID-property (через квадратные скобки), а не зарегистрированное свойство
+    if not hasattr(blender_prop, key) and hasattr(blender_prop, "__setitem__"):
+        try:
+            blender_prop[key] = value
+            return
+        except: pass
+
+    if not hasattr(blender_prop, key):
+        return
+
+    target_prop = getattr(blender_prop, key)
+
+    # Коллекции
+    if isinstance(target_prop, bpy.types.bpy_prop_collection) and isinstance(value, list):
+        _list_to_collection(target_prop, value)
+
+    # Вложенные группы
+    elif isinstance(target_prop, bpy.types.PropertyGroup) and isinstance(value, dict):
+        dict_to_rzm(value, target_prop)
+        
+    # Простые типы
+    else:
+        _set_value(blender_prop, key, value)
+
 
 class RZTemplateEngine:
     def __init__(self, context):
@@ -108,17 +315,8 @@ class RZTemplateEngine:
         self.rzm = self.scene.rzm
 
     def get_element_hierarchy(self, root_ids):
-        process_queue = [e for e in self.rzm.elements if e.id in root_ids]
-        collected = []
-        processed_ids = set()
-        while process_queue:
-            elem = process_queue.pop(0)
-            if elem.id in processed_ids: continue
-            processed_ids.add(elem.id)
-            collected.append(elem)
-            children = [e for e in self.rzm.elements if getattr(e, "parent_id", -1) == elem.id]
-            process_queue.extend(children)
-        return collected
+        # Корни и потомки по parent_id (BFS) через общий индекс элементов
+        return element_index(self.rzm).subtree(root_ids)
 
     def export_template(self, root_ids, filepath, meta_name="Template"):
         print(f"[RZM] Exporting Template '{meta_name}' to {filepath}...")
@@ -1,6 +1,8 @@
 import os
 import struct
 
+from ..utils.export_timing import count_written
+
 STYLE_SLOT_COUNT = 12
 
 def pack_styles(scene, export_dir):
@@ -92,5 +94,6 @@ def pack_styles(scene, export_dir):
     bin_path = os.path.join(res_dir, "styles.bin")
     with open(bin_path, 'wb') as f:
         f.write(style_buffer)
+    count_written(len(style_buffer))
 
     return True
@@ -3,15 +3,19 @@ import os
 import struct
 import bpy
 
+from .element_index import element_index
+from ..utils.export_timing import count_written
+
 import struct
 
 class RZMTextMapCache:
     custom_chars = []
     
-def resolve_meta_text(text, scene, element, host=None):
+def resolve_meta_text(text, scene, element, host=None, index=None):
     """
     Replicates the logic of resolve_meta_var from utils.j2 in Python.
     Handles ~PT, ~PN, and other system meta-variables.
+    index: ElementIndex of scene.rzm for parent lookups (built on demand).
     """
     if not text or not isinstance(text, str) or "~" not in text:
         return str(text) if text is not None else ""
@@ -38,7 +42,7 @@ def resolve_meta_text(text, scene, element, host=None):
     parent = host
     # If no explicit host, try to find parent by ID (for nested elements)
     if not parent and hasattr(element, 'parent_id') and element.parent_id:
-        parent = next((e for e in rzm.elements if e.id == element.parent_id), None)
+        parent = (index or element_index(rzm)).get(element.parent_id)
         
     if parent:
         p_name = getattr(parent, 'element_name', "")
@@ -103,6 +107,7 @@ def pack_project_text(scene, export_dir):
     binary buffers (texts.bin, texts_1.bin, etc.), and returns mapping.
     """
     rzm = scene.rzm
+    index = element_index(rzm)
     
     ALIGN_MAP = {
         'LEFT': 0, 'CENTER': 1, 'RIGHT': 2,
@@ -115,7 +120,7 @@ def pack_project_text(scene, export_dir):
     
     def survey_text(text, element, host=None):
         if not text: return
-        resolved = resolve_meta_text(text, scene, element, host)
+        resolved = resolve_meta_text(text, scene, element, host, index)
         for c in resolved:
             ord_c = ord(c)
             if ord_c < 32 or ord_c > 126:
@@ -137,14 +142,11 @@ def pack_project_text(scene, export_dir):
                 if lt.text_id: survey_text(lt.text_id, item if not host else host, host)
                 if lt.hover_text_id: survey_text(lt.hover_text_id, item if not host else host, host)
 
-    for element in rzm.elements:
+    for element in index.elements:
         if not element.is_helper:
             survey_all(element)
-    for host in rzm.elements:
-        if host.helper_ids:
-            for ref in host.helper_ids:
-                helper = next((e for e in rzm.elements if e.id == ref.helper_id), None)
-                if helper: survey_all(helper, host)
+    for host, helper in index.helper_pairs():
+        survey_all(helper, host)
 
     custom_chars.sort()
     char_to_code = {chr(i): i for i in range(32, 128)}
@@ -176,7 +178,7 @@ def pack_project_text(scene, export_dir):
         
         def collect(text, align, key, subgroup, element, host=None):
             if not text: return
-            resolved = resolve_meta_text(text, scene, element, host)
+            resolved = resolve_meta_text(text, scene, element, host, index)
             collected_items.append({
                 'resolved': resolved, 
                 'align': ALIGN_MAP.get(align, 0),
@@ -184,7 +186,7 @@ def pack_project_text(scene, export_dir):
                 'subgroup': subgroup
             })
 
-        for element in rzm.elements:
+        for element in index.elements:
             if not element.is_helper:
                 t = get_loc_text(element, 'text_id', lang_idx)
                 if t: collect(t, element.text_align, (element.id, -1), 'single', element)
@@ -197,21 +199,17 @@ def pack_project_text(scene, export_dir):
                 hov = get_loc_text(element, 'hover_text_id', lang_idx)
                 if hov: collect(hov, element.text_align, (element.id, -1, 'hover'), 'single', element)
 
-        for host in rzm.elements:
-            if host.helper_ids:
-                for ref in host.helper_ids:
-                    helper = next((e for e in rzm.elements if e.id == ref.helper_id), None)
-                    if helper:
-                        t = get_loc_text(helper, 'text_id', lang_idx)
-                        if t: collect(t, helper.text_align, (helper.id, host.id), 'single', helper, host)
-                        
-                        if helper.text_mode == 'CONDITIONAL_LIST':
-                            for i, cond in enumerate(helper.conditional_texts):
-                                ct = get_loc_text(cond, 'text_id', lang_idx)
-                                if ct: collect(ct, helper.text_align, (helper.id, host.id, i), 'conditional', helper, host)
-                        
-                        hov = get_loc_text(helper, 'hover_text_id', lang_idx)
-                        if hov: collect(hov, helper.text_align, (helper.id, host.id, 'hover'), 'single', helper, host)
+        for host, helper in index.helper_pairs():
+            t = get_loc_text(helper, 'text_id', lang_idx)
+            if t: collect(t, helper.text_align, (helper.id, host.id), 'single', helper, host)
+            
+            if helper.text_mode == 'CONDITIONAL_LIST':
+                for i, cond in enumerate(helper.conditional_texts):
+                    ct = get_loc_text(cond, 'text_id', lang_idx)
+                    if ct: collect(ct, helper.text_align, (helper.id, host.id, i), 'conditional', helper, host)
+            
+            hov = get_loc_text(helper, 'hover_text_id', lang_idx)
+            if hov: collect(hov, helper.text_align, (helper.id, host.id, 'hover'), 'single', helper, host)
 
         # Build binary memory mapping
         mapping = {'single': {}, 'conditional': {}}
@@ -243,6 +241,7 @@ def pack_project_text(scene, export_dir):
         file_name = "texts.bin" if lang_idx is None else f"texts_{lang_idx}.bin"
         with open(os.path.join(res_dir, file_name), 'wb') as f:
             f.write(text_buffer)
+        count_written(len(text_buffer))
             
         return mapping
 
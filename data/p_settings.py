@@ -27,6 +27,10 @@ def log_amc(context, message, reset=False):
         lines.append(message)
         auto_menu.auto_menu_log = '\n'.join(lines)
 
+def mark_atlas_layout_dirty(self, context):
+    """Forces a layout recalculation on the next atlas export."""
+    self.atlas_is_dirty = True
+
 def update_rzm_game_name(self, context):
     """Обновляет строковое имя при выборе из списка"""
     self.name = self.selection
@@ -194,7 +198,7 @@ class RZMExportSettings(bpy.types.PropertyGroup):
         description="Select the output format for the texture atlas",
         items=[
             ('PNG', "PNG", "Portable Network Graphics (.png)"),
-            ('DDS', "DDS (Beta)", "DirectDraw Surface (.dds) - requires texconv"),
+            ('DDS', "DDS (Beta)", "DirectDraw Surface (.dds)"),
         ],
         default='DDS'
     )
@@ -207,10 +211,38 @@ class RZMExportSettings(bpy.types.PropertyGroup):
             ('R8G8B8A8_UNORM_SRGB', "RGBA8 UNORM SRGB", "Lossless UI atlas format (SRGB)"),
             ('BC7_UNORM', "BC7 UNORM", "BC7 High Quality Compression"),
             ('BC7_UNORM_SRGB', "BC7 UNORM SRGB", "BC7 High Quality Compression (SRGB)"),
+            ('BC3_UNORM', "BC3 UNORM", "BC3/DXT5 Compression (RGB + smooth alpha)"),
+            ('BC3_UNORM_SRGB', "BC3 UNORM SRGB", "BC3/DXT5 Compression (SRGB)"),
+            ('BC1_UNORM', "BC1 UNORM", "BC1/DXT1 Compression (RGB + 1-bit alpha)"),
+            ('BC4_UNORM', "BC4 UNORM", "BC4 single channel (R) Compression"),
+            ('BC5_UNORM', "BC5 UNORM", "BC5 two channel (RG) Compression"),
         ],
         default='R8G8B8A8_UNORM'
     )
 
+    dds_encoder: EnumProperty(
+        name="DDS Encoder",
+        description="Select the backend that writes DDS atlases",
+        items=[
+            ('AUTO', "Auto", "Native for uncompressed formats, texconv for BC formats when available"),
+            ('NATIVE', "Native", "In-process NumPy encoder, works on any OS (fast single-mode BC7)"),
+            ('TEXCONV', "texconv", "texconv.exe round-trip (Windows only, highest BC7 quality)"),
+        ],
+        default='AUTO'
+    )
+
+    atlas_packer: EnumProperty(
+        name="Atlas Packer",
+        description="Select the packing algorithm used by Update Atlas Layout",
+        items=[
+            ('TREE', "Binary Tree", "Growing binary tree packer, atlas size rounded to a multiple of 4"),
+            ('MAXRECTS', "MaxRects (POT)", "Best-short-side-fit MaxRects into the smallest power-of-two atlas"),
+            ('SKYLINE', "Skyline (POT)", "Bottom-left skyline into the smallest power-of-two atlas (fastest on huge sets)"),
+        ],
+        default='TREE',
+        update=mark_atlas_layout_dirty
+    )
+
     icc_profile: EnumProperty(
         name="ICC Profile",
         description="Select the color profile for the exported Atlas (PNG only)",
@@ -290,6 +322,11 @@ class RZMenuAddonSettings(bpy.types.PropertyGroup):
         default=False,
         description="Export detailed per-vertex mapping and evolution data to ./debug/ folder"
     )
+    export_profile_memory: BoolProperty(
+        name="Profile Export Memory",
+        default=False,
+        description="Track peak Python memory per export stage with tracemalloc (slows the export down; timings are saved to .rzm_cache/export_timing.jsonl)"
+    )
     puppet_master_per_component: BoolProperty(
         name="Per-Component Export",
         default=False,
@@ -8,14 +8,11 @@ from .export_manager import get_target_path
 
 # --- INQUISITOR Logic (from test.py) ---
 
-def inquisitor_cleanup_logic(target_path, operator=None, create_backup=True):
-    if not os.path.exists(target_path):
-        if operator: operator.report({'ERROR'}, f"File not found: {target_path}")
-        return False
-
-    with open(target_path, 'r', encoding='utf-8', errors='ignore') as f:
-        lines = f.readlines()
-
+def inquisitor_cleanup_lines(lines):
+    """
+    Removes unused CommandList blocks, comments and empty lines after the mod-block trigger.
+    Returns (new_lines, (removed_empty, removed_comments, removed_blocks)).
+    """
     section_pattern = re.compile(r'^\[(.+)\]')
     run_pattern = re.compile(r'run\s*=\s*(CommandList(?:Element)?)(.+)', re.IGNORECASE)
     trigger_phrase = ";[META-INFO] [START] [MOD-BLOCK]"
@@ -95,6 +92,18 @@ def inquisitor_cleanup_logic(target_path, operator=None, create_backup=True):
         new_lines.append(line)
         i += 1
 
+    return new_lines, (removed_empty, removed_comments, removed_blocks)
+
+def inquisitor_cleanup_logic(target_path, operator=None, create_backup=True):
+    if not os.path.exists(target_path):
+        if operator: operator.report({'ERROR'}, f"File not found: {target_path}")
+        return False
+
+    with open(target_path, 'r', encoding='utf-8', errors='ignore') as f:
+        lines = f.readlines()
+
+    new_lines, (removed_empty, removed_comments, removed_blocks) = inquisitor_cleanup_lines(lines)
+
     if removed_blocks + removed_empty + removed_comments > 0:
         if create_backup:
             directory = os.path.dirname(target_path)
@@ -122,14 +131,12 @@ BLACKLIST_VARS = {'$positionx', '$positiony', '$sizex', '$sizey'}
 def get_all_vars(line):
     return re.findall(r'\$[a-zA-Z0-9_.]+', line)
 
-def real_compression_logic(target_path, operator=None, create_backup=True):
-    if not os.path.exists(target_path):
-        if operator: operator.report({'ERROR'}, f"File not found: {target_path}")
-        return False
-
-    with open(target_path, 'r', encoding='utf-8', errors='ignore') as f:
-        lines = f.readlines()
-
+def real_compression_lines(lines):
+    """
+    Moves repeated attribute/command sequences of CommandListElement blocks into shared
+    CommandListGetDeduplicated* blocks. Returns (new_lines, number of created blocks);
+    lines are returned unchanged when there is nothing to compress.
+    """
     # 1. Collect Globals
     global_vars = set()
     in_constants = False
@@ -194,8 +201,10 @@ def real_compression_logic(target_path, operator=None, create_backup=True):
             valid_replacements[block] = new_name
 
     if not valid_replacements:
-        if operator: operator.report({'INFO'}, "Nothing to compress.")
-        return False
+        return lines, 0
+
+    # Longest blocks are tried first
+    replacements_by_length = sorted(valid_replacements.items(), key=lambda x: len(x[0]), reverse=True)
 
     # 4. Generate content
     new_lines = []
@@ -212,7 +221,7 @@ def real_compression_logic(target_path, operator=None, create_backup=True):
             j = 0
             while j < len(content):
                 found_match = False
-                for block, new_name in sorted(valid_replacements.items(), key=lambda x: len(x[0]), reverse=True):
+                for block, new_name in replacements_by_length:
                     if tuple(content[j:j+len(block)]) == block:
                         new_lines.append(f"    run = {new_name}\n")
                         j += len(block)
@@ -236,6 +245,21 @@ def real_compression_logic(target_path, operator=None, create_backup=True):
         for bl in block:
             new_lines.append(f"    {bl}\n")
 
+    return new_lines, len(valid_replacements)
+
+def real_compression_logic(target_path, operator=None, create_backup=True):
+    if not os.path.exists(target_path):
+        if operator: operator.report({'ERROR'}, f"File not found: {target_path}")
+        return False
+
+    with open(target_path, 'r', encoding='utf-8', errors='ignore') as f:
+        lines = f.readlines()
+
+    new_lines, created = real_compression_lines(lines)
+    if not created:
+        if operator: operator.report({'INFO'}, "Nothing to compress.")
+        return False
+
     # 5. Write
     if create_backup:
         directory = os.path.dirname(target_path)
@@ -245,7 +269,7 @@ def real_compression_logic(target_path, operator=None, create_backup=True):
     with open(target_path, 'w', encoding='utf-8') as f: f.writelines(new_lines)
     
     if operator:
-        operator.report({'INFO'}, f"Compressed: Created {len(valid_replacements)} deduplicated blocks.")
+        operator.report({'INFO'}, f"Compressed: Created {created} deduplicated blocks.")
     return True
 
 def combined_cleanup_compression(target_path, operator=None, create_backup=True):
@@ -253,10 +277,12 @@ def combined_cleanup_compression(target_path, operator=None, create_backup=True)
         if operator: operator.report({'ERROR'}, f"File not found: {target_path}")
         return False
 
-    # 1. Create backup once if requested
+    # 1. Read once; both stages run over the lines in memory
+    with open(target_path, 'r', encoding='utf-8', errors='ignore') as f:
+        lines = f.readlines()
+
+    # 2. Create backup once if requested
     if create_backup:
-        with open(target_path, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = f.readlines()
         directory = os.path.dirname(target_path)
         filename = os.path.basename(target_path)
         backup_name = os.path.join(directory, "DISABLED_RZM_BACKUP_" + filename)
@@ -265,11 +291,28 @@ def combined_cleanup_compression(target_path, operator=None, create_backup=True)
         if operator:
             operator.report({'INFO'}, f"Backup created: {backup_name}")
 
-    # 2. Run Clean Up (without backup)
-    cleanup_done = inquisitor_cleanup_logic(target_path, operator, create_backup=False)
+    # 3. Clean Up
+    new_lines, (removed_empty, removed_comments, removed_blocks) = inquisitor_cleanup_lines(lines)
+    cleanup_done = removed_blocks + removed_empty + removed_comments > 0
+    if operator:
+        if cleanup_done:
+            operator.report({'INFO'}, f"Cleanup Done: -{removed_empty} empty, -{removed_comments} comments, -{removed_blocks} blocks.")
+        else:
+            operator.report({'INFO'}, "File is already clean.")
+
+    # 4. Compression
+    new_lines, created = real_compression_lines(new_lines)
+    compression_done = created > 0
+    if operator:
+        if compression_done:
+            operator.report({'INFO'}, f"Compressed: Created {created} deduplicated blocks.")
+        else:
+            operator.report({'INFO'}, "Nothing to compress.")
 
-    # 3. Run Compression (without backup)
-    compression_done = real_compression_logic(target_path, operator, create_backup=False)
+    # 5. Write once
+    if cleanup_done or compression_done:
+        with open(target_path, 'w', encoding='utf-8') as f:
+            f.writelines(new_lines)
 
     return cleanup_done or compression_done
 
@@ -1,27 +1,58 @@
 # RZMenu/operators/export_cache.py
 import bpy
 import os
+import json
 import time
+import struct
 import collections
 import numpy as np
 import mathutils
 
+from ..utils.export_timing import count_written
+
 CACHE_KEY = 'rzm_export_cache'
+# Путь к JSON-индексу бинарного кэша сохраняется в сцене, чтобы кэш пережил перезапуск
+CACHE_INDEX_PROP = 'RZM_EXPORT_CACHE_INDEX'
+
+# Бинарный кэш рядом с модом: JSON-индекс + файл с uint32 vertex_map подряд
+BINARY_CACHE_DIR   = '.rzm_cache'
+BINARY_CACHE_INDEX = 'export_cache.json'
+VMAP_MAGIC   = b'RZVM'
+VMAP_VERSION = 1
+VMAP_HEADER  = struct.Struct('<4sIIQ')  # magic, version, map count, total entries
+VMAP_DATA_OFFSET = 32                   # заголовок выровнен до 32 байт
+
+_restore_failed: set[str] = set()
 
 # ── Public API ────────────────────────────────────────────────────────────────
 
 def get_cache() -> dict | None:
-    return bpy.app.driver_namespace.get(CACHE_KEY)
-
-def set_cache(data: dict) -> None:
+    cache = bpy.app.driver_namespace.get(CACHE_KEY)
+    if cache is None:
+        cache = _restore_cache_from_scene()
+    return cache
+
+def set_cache(data: dict) -> dict:
+    """Сохраняет кэш в памяти и на диске. Возвращает версию кэша с vertex_map на np.memmap
+    (или исходный dict, если запись на диск не удалась) — её и нужно отдавать патчерам."""
+    index_path = save_binary_cache(data)
+    if index_path:
+        data = load_binary_cache(index_path) or data
     bpy.app.driver_namespace[CACHE_KEY] = data
+    _remember_index_path(index_path)
     stamp_export_ranges_to_objects(data)
+    return data
 
 def clear_cache() -> None:
     bpy.app.driver_namespace.pop(CACHE_KEY, None)
+    _remember_index_path(None)
 
 def has_cache() -> bool:
-    return CACHE_KEY in bpy.app.driver_namespace
+    return get_cache() is not None
+
+def has_vertex_map(v_map) -> bool:
+    """vertex_map может быть списком или NumPy-массивом — bool() на массиве не работает."""
+    return v_map is not None and len(v_map) > 0
 
 def component_cache(comp_name: str) -> dict | None:
     c = get_cache()
@@ -29,6 +60,150 @@ def component_cache(comp_name: str) -> dict | None:
     return c.get('components', {}).get(comp_name)
 
 
+# ── Binary vertex-map cache ──────────────────────────────────────────────────
+
+def _remember_index_path(index_path: str | None) -> None:
+    try:
+        scene = bpy.context.scene
+        if index_path:
+            scene[CACHE_INDEX_PROP] = index_path
+        elif CACHE_INDEX_PROP in scene:
+            del scene[CACHE_INDEX_PROP]
+    except Exception:
+        pass  # restricted context (draw/register) — путь просто не запоминаем
+
+def _restore_cache_from_scene() -> dict | None:
+    """После перезапуска Blender поднимает кэш последнего экспорта с диска (один раз)."""
+    try:
+        index_path = bpy.context.scene.get(CACHE_INDEX_PROP)
+    except Exception:
+        return None
+    if not index_path or index_path in _restore_failed:
+        return None
+    cache = load_binary_cache(index_path)
+    if cache is None:
+        _restore_failed.add(index_path)
+        return None
+    bpy.app.driver_namespace[CACHE_KEY] = cache
+    print(f"[RZM] [CACHE] Restored export cache from {index_path}")
+    return cache
+
+def _buf_stamp(path: str) -> int | None:
+    # Только размер: патчеры после экспорта переписывают буферы на месте (mtime меняется),
+    # но раскладка вершин, на которую ссылаются vertex_map, остаётся прежней
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+def save_binary_cache(cache: dict) -> str | None:
+    """Пишет vertex_map всех объектов одним uint32-файлом и JSON-индекс рядом с модом.
+
+    Файл данных получает уникальное имя на каждый экспорт: старый может быть ещё открыт
+    через np.memmap (на Windows его нельзя перезаписать), поэтому старые файлы удаляются
+    по возможности, а не перезаписываются.
+    """
+    mod_root = cache.get('mod_root') if cache else None
+    if not mod_root or not os.path.isdir(mod_root):
+        return None
+    try:
+        cache_dir = os.path.join(mod_root, BINARY_CACHE_DIR)
+        os.makedirs(cache_dir, exist_ok=True)
+        data_name = f"vertex_maps_{time.time_ns():x}.bin"
+        data_path = os.path.join(cache_dir, data_name)
+
+        index = {k: v for k, v in cache.items() if k != 'components'}
+        index['vmap_file'] = data_name
+        index['components'] = {}
+        maps = []
+        total = 0
+        for comp_name, comp_data in cache.get('components', {}).items():
+            comp_index = {k: v for k, v in comp_data.items() if k != 'objects'}
+            comp_index['buf_stamp'] = _buf_stamp(comp_data.get('buf_path', ''))
+            comp_index['objects'] = []
+            for obj_data in comp_data.get('objects', []):
+                obj_index = {k: v for k, v in obj_data.items() if k != 'vertex_map'}
+                v_map = obj_data.get('vertex_map')
+                if v_map is not None:
+                    arr = np.asarray(v_map, dtype=np.uint32)
+                    obj_index['vertex_map'] = [total, len(arr)]
+                    maps.append(arr)
+                    total += len(arr)
+                else:
+                    obj_index['vertex_map'] = None
+                comp_index['objects'].append(obj_index)
+            index['components'][comp_name] = comp_index
+
+        tmp_path = data_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            header = VMAP_HEADER.pack(VMAP_MAGIC, VMAP_VERSION, len(maps), total)
+            f.write(header.ljust(VMAP_DATA_OFFSET, b'\0'))
+            for arr in maps:
+                f.write(arr.astype('<u4', copy=False).tobytes())
+            count_written(f.tell())
+        os.replace(tmp_path, data_path)
+
+        index_path = os.path.join(cache_dir, BINARY_CACHE_INDEX)
+        with open(index_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(index, f, default=_json_default)
+            count_written(f.tell())
+        os.replace(index_path + '.tmp', index_path)
+
+        for name in os.listdir(cache_dir):
+            if name.startswith('vertex_maps_') and name != data_name:
+                try: os.remove(os.path.join(cache_dir, name))
+                except OSError: pass  # ещё открыт через memmap — удалим в следующий раз
+
+        _restore_failed.discard(index_path)
+        print(f"[RZM] [CACHE] Binary cache saved: {len(maps)} vertex maps, {total} entries")
+        return index_path
+    except Exception as e:
+        print(f"[RZM] [CACHE] Failed to save binary cache: {e}")
+        return None
+
+def load_binary_cache(index_path: str) -> dict | None:
+    """Открывает кэш с диска: vertex_map каждого объекта — срез np.memmap (uint32, read-only).
+
+    Возвращает None, если файлы повреждены или буферы мода изменились после экспорта.
+    """
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        data_path = os.path.join(os.path.dirname(index_path), index.pop('vmap_file'))
+        with open(data_path, 'rb') as f:
+            magic, version, n_maps, total = VMAP_HEADER.unpack(f.read(VMAP_HEADER.size))
+        if magic != VMAP_MAGIC or version != VMAP_VERSION:
+            print(f"[RZM] [CACHE] Binary cache has unknown format: {data_path}")
+            return None
+        if os.path.getsize(data_path) != VMAP_DATA_OFFSET + total * 4:
+            print(f"[RZM] [CACHE] Binary cache is truncated: {data_path}")
+            return None
+        vmaps = np.memmap(data_path, dtype='<u4', mode='r', offset=VMAP_DATA_OFFSET, shape=(total,)) if total else np.empty(0, dtype=np.uint32)
+
+        for comp_name, comp_data in index.get('components', {}).items():
+            stamp = comp_data.pop('buf_stamp', None)
+            if stamp is not None and _buf_stamp(comp_data.get('buf_path', '')) != stamp:
+                print(f"[RZM] [CACHE] Binary cache is stale ({comp_name} buffer size changed since export)")
+                return None
+            for obj_data in comp_data.get('objects', []):
+                span = obj_data.get('vertex_map')
+                if span is not None:
+                    start, count = span
+                    obj_data['vertex_map'] = vmaps[start:start + count]
+        index['binary_index'] = index_path
+        return index
+    except Exception as e:
+        print(f"[RZM] [CACHE] Failed to load binary cache {index_path}: {e}")
+        return None
+
+
 def stamp_export_ranges_to_objects(cache: dict | None) -> None:
     """Store best-effort export range metadata on Blender objects for QA/debug tools.
 
@@ -73,7 +248,7 @@ def stamp_export_ranges_to_objects(cache: dict | None) -> None:
                     'mat_idx': int(obj_data.get('mat_idx', -1) or -1),
                     'is_absolute': bool(obj_data.get('is_absolute', False)),
                     'is_robust': bool(obj_data.get('is_robust', False)),
-                    'has_vertex_map': bool(obj_data.get('vertex_map')),
+                    'has_vertex_map': has_vertex_map(obj_data.get('vertex_map')),
                     'timestamp': timestamp,
                 }
 
@@ -144,14 +319,14 @@ def save_export_logs(cache: dict):
                     'applied_v_count': obj.get('applied_v_count'),
                     'mapping_type': 'Absolute' if obj.get('is_absolute') else 'Relative',
                     'is_robust': obj.get('is_robust', False),
-                    'status': 'OK' if obj.get('vertex_map') else 'FAILED'
+                    'status': 'OK' if has_vertex_map(obj.get('vertex_map')) else 'FAILED'
                 }
                 comp_log['objects'].append(obj_log)
                 
                 # Raw mapping
                 v_map = obj.get('vertex_map')
-                if v_map:
-                    raw_log_data[obj.get('name')] = v_map
+                if has_vertex_map(v_map):
+                    raw_log_data[obj.get('name')] = np.asarray(v_map).tolist()
             
             log_data['components'][comp_name] = comp_log
             
@@ -174,8 +349,9 @@ def export_vertex_evolution_debug(obj_name, mod_root, comp_name,
                                   v_map, buf_xyz, matrix_world):
     """Exports detailed per-vertex mapping data to ./debug/ folder."""
     print(f"[RZM] [DEBUG] Entering evolution export for {obj_name}...")
-    if not v_map:
+    if not has_vertex_map(v_map):
         return
+    v_map = np.asarray(v_map).tolist()
         
     try:
         import json
@@ -249,13 +425,27 @@ def export_vertex_evolution_debug(obj_name, mod_root, comp_name,
 
 # ── Builder: XXMI (SPATIAL MAPPING) ───────────────────────────────────────────
 
-def _build_spatial_map_xxmi(obj_name: str, blender_source, mat: mathutils.Matrix, buf_xyz: np.ndarray, max_dist_threshold: float = 0.5) -> tuple[list[int] | None, int]:
+def _mesh_coords(blender_mesh) -> np.ndarray:
+    """Локальные координаты вершин меша одним foreach_get: (N, 3) float64."""
+    co = np.empty(len(blender_mesh.vertices) * 3, dtype=np.float32)
+    blender_mesh.vertices.foreach_get('co', co)
+    return co.reshape(-1, 3).astype(np.float64)
+
+def _build_spatial_map_xxmi(obj_name: str, blender_source, candidates: list[tuple[int, mathutils.Matrix]], buf_xyz: np.ndarray, max_dist_threshold: float = 0.5) -> tuple[np.ndarray | None, int]:
     """Robust Many-to-1 Mapping for XXMI: Blender-centric search with quality validation.
-    
+
+    candidates: [(mat_idx, matrix), ...] in order of preference. All matrices are applied
+    in one batched multiply; each candidate is first checked against the buffer bounds,
+    then the buffer vertices are matched in bulk (utils.spatial_index).
+
     max_dist_threshold: maximum allowed distance between a buffer vertex and its mapped
-    Blender vertex. If any match exceeds this, the mapping is considered wrong-space
-    and None is returned so the caller can retry with a different matrix.
+    Blender vertex. If any match exceeds this, the candidate is considered wrong-space
+    and the next one is tried.
+
+    Returns (vertex_map as int32 array, mat_idx) or (None, -1).
     """
+    from ..utils.spatial_index import nearest_indices
+
     eval_obj = None
     try:
         if hasattr(blender_source, "evaluated_get"):
@@ -265,23 +455,27 @@ def _build_spatial_map_xxmi(obj_name: str, blender_source, mat: mathutils.Matrix
         else:
             blender_mesh = blender_source
 
-        v_cnt = len(blender_mesh.vertices)
-        if v_cnt == 0: return None, -1
-        blender_tree = mathutils.kdtree.KDTree(v_cnt)
-        for idx, v in enumerate(blender_mesh.vertices):
-            blender_tree.insert(mat @ v.co, idx)
-        blender_tree.balance()
-        v_map = []
-        max_dist = 0.0
-        for pos in buf_xyz:
-            _, idx, dist = blender_tree.find(pos)
-            v_map.append(idx)
-            if dist > max_dist:
-                max_dist = dist
-        if max_dist > max_dist_threshold:
-            return None, -1  # Quality too low — likely wrong coordinate space
-        print(f"[RZM] [CACHE] {obj_name}: XXMI spatial map OK (dist {max_dist:.6f})")
-        return v_map, 0
+        if len(blender_mesh.vertices) == 0 or not candidates: return None, -1
+        co = _mesh_coords(blender_mesh)
+        buf = np.asarray(buf_xyz, dtype=np.float64).reshape(-1, 3)
+        if len(buf) == 0: return None, -1
+
+        # Все кандидаты разом: (M, 4, 4) @ вершины -> (M, N, 3)
+        mats = np.array([np.array(mat, dtype=np.float64) for _, mat in candidates])
+        spaces = np.einsum('mij,nj->mni', mats[:, :3, :3], co) + mats[:, None, :3, 3]
+
+        # Необходимое условие: каждая вершина буфера лежит в bbox меша +- порог
+        buf_lo, buf_hi = buf.min(axis=0), buf.max(axis=0)
+        fits = np.all((spaces.min(axis=1) - max_dist_threshold <= buf_lo) &
+                      (spaces.max(axis=1) + max_dist_threshold >= buf_hi), axis=1)
+
+        for (m_idx, _), space, ok in zip(candidates, spaces, fits):
+            if not ok: continue
+            v_map, dist = nearest_indices(space, buf, max_dist=max_dist_threshold)
+            if np.any(v_map < 0): continue  # Quality too low — likely wrong coordinate space
+            print(f"[RZM] [CACHE] {obj_name}: XXMI spatial map OK (dist {float(dist.max()):.6f})")
+            return v_map, m_idx
+        return None, -1
     except Exception as e:
         print(f"[RZM] [CACHE] XXMI spatial map exception for {obj_name}: {e}")
         return None, -1
@@ -289,47 +483,6 @@ def _build_spatial_map_xxmi(obj_name: str, blender_source, mat: mathutils.Matrix
         if eval_obj is not None:
             eval_obj.to_mesh_clear()
 
-def _build_spatial_map_efmi(obj_name: str, blender_mesh: bpy.types.Mesh, mat: mathutils.Matrix, tree: mathutils.kdtree.KDTree, coord_hash: dict, v_map_input: list[int] | None = None) -> tuple[list[int] | None, int]:
-    """Legacy 1-to-1 Mapping for EFMI fallback: Buffer-centric search."""
-    try:
-        coords_basis = [v.co for v in blender_mesh.vertices]
-        ba_co_np = np.array([np.array(mat @ co, dtype=np.float32) for co in coords_basis], dtype=np.float32)
-        current_idx = []
-        max_d = 0
-        for pos in ba_co_np:
-            t_pos = tuple(pos)
-            if t_pos in coord_hash:
-                index = coord_hash[t_pos]
-                dist = 0.0
-            else:
-                _, index, dist = tree.find(pos)
-            current_idx.append(index)
-            if dist > max_d: max_d = dist
-        if max_d <= 0.2: return current_idx, 0
-        return None, -1
-    except Exception as e:
-        print(f"[RZM] [CACHE] EFMI spatial map exception for {obj_name}: {e}")
-        return None, -1
-
-def _prepare_component_search_data(buf_path: str, stride: int):
-    """Builds a shared KD-Tree and Coordinate Hash for an entire buffer (EFMI fallback)."""
-    if not os.path.exists(buf_path): return None, None
-    try:
-        with open(buf_path, 'rb') as f: buf_bytes = f.read()
-        stride_f32 = stride // 4
-        buf_f32    = np.frombuffer(buf_bytes, dtype=np.float32).reshape(-1, stride_f32)
-        tree = mathutils.kdtree.KDTree(len(buf_f32))
-        coord_hash = {}
-        for idx, pos in enumerate(buf_f32[:, :3]):
-            p_tuple = (float(pos[0]), float(pos[1]), float(pos[2]))
-            tree.insert(pos, idx)
-            if p_tuple not in coord_hash: coord_hash[p_tuple] = idx
-        tree.balance()
-        return tree, coord_hash
-    except Exception as e:
-        print(f"[RZM] [CACHE] Failed to prepare search data: {e}")
-        return None, None
-
 def build_cache_from_xxmi(mod_exporter) -> dict | None:
     try:
         mod_name   = mod_exporter.mod_name
@@ -407,18 +560,11 @@ def build_cache_from_xxmi(mod_exporter) -> dict | None:
 
                     # XXMI/GIMI authority is the exported Position.buf order.
                     # Signature parity may have the right count but wrong slot order.
-                    v_map, m_idx = _build_spatial_map_xxmi(sub.name, sub.obj, sub.obj.matrix_world, buf_slice)
-                    if v_map is not None:
-                        m_idx = 1
-                    else:
-                        v_map, m_idx = _build_spatial_map_xxmi(sub.name, sub.obj, mathutils.Matrix.Identity(4), buf_slice)
-                        if v_map is not None:
-                            m_idx = 0
-                        elif root_obj and root_obj != sub.obj:
-                            root_mat = root_obj.matrix_world.inverted() @ sub.obj.matrix_world
-                            v_map, m_idx = _build_spatial_map_xxmi(sub.name, sub.obj, root_mat, buf_slice)
-                            if v_map is not None:
-                                m_idx = 2
+                    # Candidates in order of preference: world, identity, root-relative.
+                    candidates = [(1, sub.obj.matrix_world), (0, mathutils.Matrix.Identity(4))]
+                    if root_obj and root_obj != sub.obj:
+                        candidates.append((2, root_obj.matrix_world.inverted() @ sub.obj.matrix_world))
+                    v_map, m_idx = _build_spatial_map_xxmi(sub.name, eval_mesh if eval_mesh else sub.obj, candidates, buf_slice)
 
                     # Fallback to signature mapping only if spatial mapping failed.
                     if v_map is None:
@@ -427,7 +573,7 @@ def build_cache_from_xxmi(mod_exporter) -> dict | None:
                             if res:
                                 v_map, eval_v_count, has_id = res
                     
-                    if v_map:
+                    if has_vertex_map(v_map):
                         is_debug_enabled = getattr(bpy.context.scene.rzm.addons, 'export_vertex_debug', False)
                         if is_debug_enabled:
                             print(f"[RZM] [DEBUG] Triggering evolution export for {sub.name} to {dest}")
@@ -697,9 +843,9 @@ def build_cache_from_efmi(mod_exporter) -> dict | None:
                 if calc_stride in (16, 32, 40):
                     stride = calc_stride
 
-            # PREPARE SHARED DATA ONCE PER COMPONENT
-            tree, coord_hash = _prepare_component_search_data(buf_path, stride)
-            if not tree: continue
+            # EFMI maps vertices topologically (reconstruct_vertex_map_from_mesh);
+            # the buffer itself is not searched, it only has to exist
+            if not os.path.exists(buf_path): continue
 
             flip_winding = getattr(mod_exporter.cfg, 'mirror_mesh', False)
 
@@ -840,21 +986,11 @@ def build_cache_from_efmi(mod_exporter) -> dict | None:
                     print(f"[RZM] [CACHE] {tmp.name}: Parity mapping failed -> Baked Path")
 
                 if v_map_topology and getattr(bpy.context.scene.rzm.addons, 'export_vertex_debug', False):
-                    # For EFMI, the buffer is local/relative. 
-                    # We pass None for buf_xyz here unless we want to load it from buf_path.
-                    # But we already have tree/coord_hash if we wanted to.
-                    # Let's try to pass the actual buffer positions if available.
-                    obj_buf_xyz = None
-                    if tree and v_map_topology:
-                        try:
-                            # Reconstruct from tree if needed, or just skip pos_buf for now
-                            # Actually, we can just not pass it and let evolution show Blender stages.
-                            pass
-                        except: pass
-                    
+                    # For EFMI, the buffer is local/relative: no buffer positions,
+                    # the evolution debug shows the Blender stages only.
                     export_vertex_evolution_debug(tmp.name, dest, f'Component{comp_id}', 
                                                   eval_mesh, efmi_obj.data, 
-                                                  v_map_topology, obj_buf_xyz, efmi_obj.matrix_world)
+                                                  v_map_topology, None, efmi_obj.matrix_world)
 
                 if eval_mesh:
                     efmi_obj.to_mesh_clear()
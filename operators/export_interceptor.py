@@ -64,7 +64,7 @@ def _xxmi_hook(self, *args, **kwargs):
             cache = build_cache_from_xxmi(self)
         if cache:
             with measure("xxmi.set_cache"):
-                set_cache(cache)
+                cache = set_cache(cache)
             with measure("xxmi.save_export_logs"):
                 save_export_logs(cache)
             print(f'[RZM] [CACHE] XXMI export cached: '
@@ -170,7 +170,7 @@ def _efmi_hook(self, *args, **kwargs):
             cache = build_cache_from_efmi(self)
         if cache:
             with measure("efmi.set_cache"):
-                set_cache(cache)
+                cache = set_cache(cache)
             with measure("efmi.save_export_logs"):
                 save_export_logs(cache)
             print(f'[RZM] [CACHE] EFMI export cached: '
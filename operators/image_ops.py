@@ -266,7 +266,7 @@ class RZM_OT_UpdateAtlasLayout(bpy.types.Operator):
             return {'CANCELLED'}
 
         print(f"[RZM] Packing {len(image_sizes_to_pack)} items into atlas...")
-        (atlas_w, atlas_h), uv_data = calculate_atlas_layout(image_sizes_to_pack)
+        (atlas_w, atlas_h), uv_data = calculate_atlas_layout(image_sizes_to_pack, engine=rzm.export_settings.atlas_packer)
 
         rzm.atlas_size = (atlas_w, atlas_h)
 
@@ -434,7 +434,62 @@ class RZM_OT_ExportAtlas(bpy.types.Operator):
                 else:
                     used_image_ids.add(img_id)
 
-        # Собираем все изображения, которые нужно отрендерить в атлас
+        atlas_w, atlas_h = rzm.atlas_size
+
+        # 1. Собираем UV-данные всех элементов (включая кадры анимации)
+        uv_data = {}
+        for img in rzm.images:
+            if img.source_type == 'ANIMATED':
+                # Повторяем логику формирования ключей:
+                for n, frame in enumerate(img.anim_frames):
+                    frame_key = f"{img.display_name}_anim_{n:04d}"
+                    uv_data[frame_key] = {
+                        'uv_coords': [frame.x, frame.y],
+                        'uv_size': [frame.w, frame.h]
+                    }
+            elif any(img.uv_size):
+                uv_data[img.display_name] = {
+                    'uv_coords': list(img.uv_coords),
+                    'uv_size': list(img.uv_size)
+                }
+        
+        # UV for unique SVGs (from any element in that config group)
+        for config_key, cfg in svg_render_configs.items():
+            elem = cfg['elem']
+            uv_data[config_key] = {
+                'uv_coords': list(elem.uv_coords),
+                'uv_size': list(elem.uv_size)
+            }
+
+        # 2. Ключи источников: по ним кэш атласа решает, какие спрайты перерисовать
+        from ..core.atlas_algo import get_atlas_cache, file_source_key, blender_image_source_key
+
+        source_keys = {}
+        for img in rzm.images:
+            if img.id not in used_image_ids: continue
+            if img.source_type == 'ANIMATED':
+                clip_key = file_source_key(
+                    bpy.path.abspath(img.anim_source_path), img.anim_export_preset,
+                    img.anim_start_frame, img.anim_end_frame, img.anim_max_frames
+                )
+                for n in range(len(img.anim_frames)):
+                    source_keys[f"{img.display_name}_anim_{n:04d}"] = f"{clip_key}:{n}"
+            elif img.source_type == 'VECTOR':
+                pass
+            elif img.image_pointer and any(img.uv_size):
+                source_keys[img.display_name] = blender_image_source_key(img.image_pointer)
+
+        for config_key, cfg in svg_render_configs.items():
+            source_keys[config_key] = file_source_key(
+                cfg['path'], cfg['res'], cfg['tint'], cfg['scale'], cfg['offset'],
+                getattr(cfg['image'].image_pointer, 'name', "")
+            )
+
+        atlas_cache = get_atlas_cache(export_path)
+        dirty_names = atlas_cache.dirty_names(source_keys, uv_data, atlas_w, atlas_h)
+        print(f"[RZM] Atlas cache: {len(dirty_names)}/{len(source_keys)} sprites need re-rasterizing.")
+
+        # Собираем изображения, которые нужно отрендерить в атлас (только грязные)
         from ..core.animated_loader import load_animated_advanced, frames_to_blender_images
 
         images_to_render = {} # Key: unique_frame_key, Value: bpy.data.Image (temporary)
@@ -444,6 +499,9 @@ class RZM_OT_ExportAtlas(bpy.types.Operator):
             if img.id not in used_image_ids: continue
 
             if img.source_type == 'ANIMATED':
+                frame_keys = [f"{img.display_name}_anim_{n:04d}" for n in range(len(img.anim_frames))]
+                if frame_keys and not dirty_names.intersection(frame_keys):
+                    continue
                 try:
                     # Снова извлекаем на лету
                     unique_frames, _ = load_animated_advanced(
@@ -470,7 +528,7 @@ class RZM_OT_ExportAtlas(bpy.types.Operator):
                 # SVG are now handled via svg_render_configs
                 pass
 
-            elif img.image_pointer and any(img.uv_size):
+            elif img.image_pointer and any(img.uv_size) and img.display_name in dirty_names:
                 images_to_render[img.display_name] = img.image_pointer
         
         # Render Unique SVGs
@@ -478,6 +536,7 @@ class RZM_OT_ExportAtlas(bpy.types.Operator):
         from ..core.animated_loader import frames_to_blender_images
         
         for config_key, cfg in svg_render_configs.items():
+            if config_key not in dirty_names: continue
             res_w, res_h = cfg['res']
             render_w = int(min(res_w, 1024))
             render_h = int(min(res_h, 1024))
@@ -508,35 +567,8 @@ class RZM_OT_ExportAtlas(bpy.types.Operator):
                 # Direct pixel ingestion bypassing Blender temporary image overhead
                 images_to_render[config_key] = pixels
         
-        if not images_to_render:
+        if not source_keys:
             return {'CANCELLED'}
-            
-        atlas_w, atlas_h = rzm.atlas_size
-        
-        # 2. Собираем UV-данные всех элементов (включая кадры анимации)
-        uv_data = {}
-        for img in rzm.images:
-            if img.source_type == 'ANIMATED':
-                # Повторяем логику формирования ключей:
-                for n, frame in enumerate(img.anim_frames):
-                    frame_key = f"{img.display_name}_anim_{n:04d}"
-                    uv_data[frame_key] = {
-                        'uv_coords': [frame.x, frame.y],
-                        'uv_size': [frame.w, frame.h]
-                    }
-            elif any(img.uv_size):
-                uv_data[img.display_name] = {
-                    'uv_coords': list(img.uv_coords),
-                    'uv_size': list(img.uv_size)
-                }
-        
-        # UV for unique SVGs (from any element in that config group)
-        for config_key, cfg in svg_render_configs.items():
-            elem = cfg['elem']
-            uv_data[config_key] = {
-                'uv_coords': list(elem.uv_coords),
-                'uv_size': list(elem.uv_size)
-            }
 
         # 3. Determine effective profiles based on game presets
         # Genshin/ZZZ/HSR -> Forced sRGB
@@ -570,7 +602,9 @@ class RZM_OT_ExportAtlas(bpy.types.Operator):
                 images_to_render,
                 atlas_w,
                 atlas_h,
-                uv_data
+                uv_data,
+                cache=atlas_cache,
+                source_keys=source_keys
             )
 
         if atlas_pixels.size > 0:
@@ -583,7 +617,7 @@ class RZM_OT_ExportAtlas(bpy.types.Operator):
                 from ..core.dds_packer import pack_to_dds
                 final_filepath = os.path.join(export_path, "icons.dds")
                 with measure("atlas.write_dds"):
-                    success, msg = pack_to_dds(atlas_pixels, atlas_w, atlas_h, final_filepath, dds_format=effective_dds)
+                    success, msg = pack_to_dds(atlas_pixels, atlas_w, atlas_h, final_filepath, dds_format=effective_dds, backend=export_settings.dds_encoder)
                 if success:
                     exported_success = True
                     export_settings.last_exported_format = "DDS"
@@ -2,20 +2,17 @@ import bpy
 import os
 import shutil
 import re
-import zipfile
+import fnmatch
+import concurrent.futures
 from pathlib import Path
 from bpy.props import StringProperty, BoolProperty
 from bpy.types import Operator
 from .export_manager import get_target_path
+from ..utils.zip_packer import ZipPacker
 
-def parse_ini_file(ini_path, active_tiers):
-    if not os.path.exists(ini_path):
-        return
-        
-    print(f"[Mod Producer] Filtering tiers in INI: {os.path.basename(ini_path)}")
-    with open(ini_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-        
+def filter_tier_lines(lines, active_tiers):
+    """Applies the [META-INFO] tier tags for active_tiers; returns the filtered lines (input is not modified)."""
+    lines = list(lines)  # [EDIT] / [META-TAG-VAR] rewrite lines ahead of the cursor
     out_lines = []
     skip_mode = False # Can be False, True (delete all), or "MESH_KEEP" / "MESH_DELETE"
     deleted_sections = set()
@@ -160,7 +157,18 @@ def parse_ini_file(ini_path, active_tiers):
             else:
                 final_lines.append(line)
         out_lines = final_lines
+
+    return out_lines
+
+def parse_ini_file(ini_path, active_tiers):
+    if not os.path.exists(ini_path):
+        return
         
+    print(f"[Mod Producer] Filtering tiers in INI: {os.path.basename(ini_path)}")
+    with open(ini_path, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+
+    out_lines = filter_tier_lines(lines, active_tiers)
     with open(ini_path, 'w', encoding='utf-8') as f:
         f.writelines(out_lines)
 
@@ -179,8 +187,6 @@ def delete_disabled_inis(target_path):
                     print(f"[Mod Producer] Failed to delete disabled INI {ini_full}: {e}")
     print(f"[Mod Producer] Deleted {deleted_count} disabled INI files.")
 
-import fnmatch
-
 def extract_path_from_line(line, ini_path, target_path):
     stripped = line.strip()
     if not stripped or stripped.startswith(';'):
@@ -224,23 +230,26 @@ def extract_path_from_line(line, ini_path, target_path):
     rel_path = os.path.relpath(full_path, target_path)
     return rel_path.replace('\\', '/').lower()
 
-def destructive_cleanup(target_path):
-    print(f"[Mod Producer] Starting destructive cleanup in: {target_path}")
-    
-    # 1. Build ignore patterns
-    ignore_patterns = {
-        '*.ini',
-        '.deleteignore',
-        'deleteignore.txt',
-        'deleteignore',
-        'readme.txt',
-        'readme.md'
-    }
-    
-    # Check for deleteignore files
+# Batch zip entry cache, kept inside the mod folder
+ZIP_CACHE_DIR = '.rzm_cache'
+# Never part of a build (same rules the folder copy used)
+BUILD_IGNORE_PATTERNS = ('*.py', '*.bak', '__pycache__', ZIP_CACHE_DIR)
+
+DEFAULT_KEEP_PATTERNS = {
+    '*.ini',
+    '.deleteignore',
+    'deleteignore.txt',
+    'deleteignore',
+    'readme.txt',
+    'readme.md'
+}
+
+def load_ignore_patterns(mod_root):
+    """Keep-patterns for the cleanup: defaults plus lines of .deleteignore / deleteignore(.txt) in mod_root."""
+    ignore_patterns = set(DEFAULT_KEEP_PATTERNS)
     ignore_filenames = ['.deleteignore', 'deleteignore.txt', 'deleteignore']
     for fname in ignore_filenames:
-        p = os.path.join(target_path, fname)
+        p = os.path.join(mod_root, fname)
         if os.path.exists(p):
             try:
                 with open(p, 'r', encoding='utf-8', errors='ignore') as f:
@@ -251,10 +260,34 @@ def destructive_cleanup(target_path):
                 print(f"[Mod Producer] Loaded patterns from {fname}: {ignore_patterns}")
             except Exception as e:
                 print(f"[Mod Producer] Failed to read ignore file {fname}: {e}")
-                
-    # 2. Extract referenced files from all active INI files
+    return ignore_patterns
+
+def matches_ignore_pattern(rel_path, pattern):
+    rel_path_norm = rel_path.replace('\\', '/').lower()
+    pattern_norm = pattern.replace('\\', '/').strip().lower()
+    
+    if pattern_norm.endswith('/'):
+        dir_pattern = pattern_norm.rstrip('/')
+        return rel_path_norm == dir_pattern or rel_path_norm.startswith(dir_pattern + '/')
+        
+    if '*' in pattern_norm or '?' in pattern_norm:
+        return fnmatch.fnmatch(rel_path_norm, pattern_norm) or fnmatch.fnmatch(os.path.basename(rel_path_norm), pattern_norm)
+    else:
+        return rel_path_norm == pattern_norm or os.path.basename(rel_path_norm) == pattern_norm
+
+def extract_references(lines, ini_path, mod_root):
+    """Set of normalized relative paths (see extract_path_from_line) referenced by lines of ini_path."""
     used_files = set()
-    for root, _, files in os.walk(target_path):
+    for line in lines:
+        rel_path_norm = extract_path_from_line(line, ini_path, mod_root)
+        if rel_path_norm:
+            used_files.add(rel_path_norm)
+    return used_files
+
+def collect_referenced_files(mod_root):
+    """Normalized relative paths (see extract_path_from_line) referenced by the active INI files under mod_root."""
+    used_files = set()
+    for root, _, files in os.walk(mod_root):
         for file in files:
             if file.lower().endswith(".ini"):
                 ini_path = os.path.join(root, file)
@@ -262,28 +295,20 @@ def destructive_cleanup(target_path):
                     continue
                 try:
                     with open(ini_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        for line in f:
-                            rel_path_norm = extract_path_from_line(line, ini_path, target_path)
-                            if rel_path_norm:
-                                used_files.add(rel_path_norm)
+                        used_files |= extract_references(f, ini_path, mod_root)
                 except Exception as e:
                     print(f"[Mod Producer] Failed to parse references in {file}: {e}")
-                    
-    print(f"[Mod Producer] Found {len(used_files)} active file references in INI files.")
+    return used_files
+
+def destructive_cleanup(target_path):
+    print(f"[Mod Producer] Starting destructive cleanup in: {target_path}")
     
-    # Helper for matching ignore patterns
-    def matches_pattern(rel_path, pattern):
-        rel_path_norm = rel_path.replace('\\', '/').lower()
-        pattern_norm = pattern.replace('\\', '/').strip().lower()
-        
-        if pattern_norm.endswith('/'):
-            dir_pattern = pattern_norm.rstrip('/')
-            return rel_path_norm == dir_pattern or rel_path_norm.startswith(dir_pattern + '/')
-            
-        if '*' in pattern_norm or '?' in pattern_norm:
-            return fnmatch.fnmatch(rel_path_norm, pattern_norm) or fnmatch.fnmatch(os.path.basename(rel_path_norm), pattern_norm)
-        else:
-            return rel_path_norm == pattern_norm or os.path.basename(rel_path_norm) == pattern_norm
+    # 1. Build ignore patterns
+    ignore_patterns = load_ignore_patterns(target_path)
+                
+    # 2. Extract referenced files from all active INI files
+    used_files = collect_referenced_files(target_path)
+    print(f"[Mod Producer] Found {len(used_files)} active file references in INI files.")
 
     # 3. Scan and delete unreferenced/unignored files
     deleted_files_count = 0
@@ -298,11 +323,7 @@ def destructive_cleanup(target_path):
                 continue
                 
             # Check if matches any deleteignore pattern
-            keep = False
-            for pat in ignore_patterns:
-                if matches_pattern(rel_path_norm, pat):
-                    keep = True
-                    break
+            keep = any(matches_ignore_pattern(rel_path_norm, pat) for pat in ignore_patterns)
                     
             if not keep:
                 try:
@@ -325,6 +346,120 @@ def destructive_cleanup(target_path):
                 except Exception as e:
                     print(f"[Mod Producer] Failed to remove empty directory {dir_path}: {e}")
 
+def list_build_sources(mod_root):
+    """Relative paths of every file a build may take from mod_root (.py, .bak and caches skipped)."""
+    def ignored(name):
+        return any(fnmatch.fnmatch(name, pat) for pat in BUILD_IGNORE_PATTERNS)
+
+    rel_files = []
+    for root, dirs, files in os.walk(mod_root):
+        dirs[:] = [d for d in dirs if not ignored(d)]
+        for file in files:
+            if not ignored(file):
+                rel_files.append(os.path.relpath(os.path.join(root, file), mod_root))
+    return rel_files
+
+def _stage_file(src, dst, link):
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    if link:
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            pass  # Other drive, FAT32, no permission: fall back to a copy
+    shutil.copy2(src, dst)
+
+def process_build_ini(src_path, dst_path, build_path, active_tiers):
+    """
+    Single-pass build of one INI: the source is read once, tier filtering, reference
+    extraction, Inquisitor cleanup and Real Compression run as chained stages over the
+    lines in memory, and the result is written to dst_path once.
+    Returns the references of the tier-filtered INI (relative to build_path, as
+    collect_referenced_files would report them for the build folder).
+    """
+    from .cleanup_ops import inquisitor_cleanup_lines, real_compression_lines
+
+    print(f"[Mod Producer] Processing INI: {os.path.basename(dst_path)}")
+    with open(src_path, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+
+    lines = filter_tier_lines(lines, active_tiers)
+    # References are taken before cleanup: files of blocks the cleanup drops stay in the build
+    used_files = extract_references(lines, dst_path, build_path)
+    lines, _ = inquisitor_cleanup_lines(lines)
+    lines, _ = real_compression_lines(lines)
+
+    os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+    with open(dst_path, 'w', encoding='utf-8') as f:
+        f.writelines(lines)
+    return used_files
+
+def stage_build(mod_root, build_path, source_files, active_tiers, link_files=False):
+    """
+    Builds one tier version of the mod into build_path without copying the whole folder.
+    INI files are built first (see process_build_ini), then only the files the filtered
+    INIs reference (plus deleteignore matches) are staged: the same result as copy +
+    destructive_cleanup. Other files are hardlinked when link_files is set (the folder
+    is zipped and removed right after), copied otherwise: a hardlinked build folder
+    would let in-place edits leak back into the source mod.
+    Returns the number of processed INI files.
+    """
+    if os.path.exists(build_path):
+        print(f"[Mod Producer] Removing existing build folder: {build_path}")
+        shutil.rmtree(build_path)
+    os.makedirs(build_path)
+
+    # 1. Build active INI files (disabled ones never reach the build)
+    inis = [rel for rel in source_files
+            if rel.lower().endswith(".ini") and not os.path.basename(rel).lower().startswith("disabled")]
+    used_files = set()
+    for rel in inis:
+        used_files |= process_build_ini(os.path.join(mod_root, rel), os.path.join(build_path, rel),
+                                        build_path, active_tiers)
+
+    # 2. Stage only what the filtered INIs still reference
+    ignore_patterns = load_ignore_patterns(mod_root)
+    staged = 0
+    for rel in source_files:
+        if rel.lower().endswith(".ini"):
+            continue
+        rel_norm = rel.replace('\\', '/').lower()
+        if rel_norm not in used_files and not any(matches_ignore_pattern(rel_norm, pat) for pat in ignore_patterns):
+            continue
+        _stage_file(os.path.join(mod_root, rel), os.path.join(build_path, rel), link_files)
+        staged += 1
+    print(f"[Mod Producer] Staged {staged} of {len(source_files) - len(inis)} files into {os.path.basename(build_path)} ({'links' if link_files else 'copies'}).")
+    return len(inis)
+
+def zip_build_folder(build_path, folder_name, packer=None):
+    """
+    Zips build_path as <build_path>.zip with folder_name as the root entry.
+    Pass a shared ZipPacker to reuse compressed entries across profiles and runs.
+    """
+    zip_name = f"{build_path}.zip"
+    print(f"[Mod Producer] Zipping folder to: {zip_name}")
+    if packer is not None:
+        packer.pack_folder(build_path, zip_name, folder_name)
+    else:
+        with ZipPacker() as own_packer:
+            own_packer.pack_folder(build_path, zip_name, folder_name)
+    return zip_name
+
+def build_profile(job, packer=None):
+    """
+    One batch profile, run on a worker thread. job is a plain dict (no bpy data):
+    mod_root, source_files, version_path, folder_name, active_tiers, zip_output.
+    """
+    version_path = job['version_path']
+    folder_name = job['folder_name']
+    stage_build(job['mod_root'], version_path, job['source_files'], job['active_tiers'],
+                link_files=job['zip_output'])
+    if job['zip_output']:
+        zip_build_folder(version_path, folder_name, packer)
+        shutil.rmtree(version_path)
+        return f"Zipped {folder_name}.zip"
+    return f"Created {folder_name}"
+
 def process_directories(new_folder_path):
     """Legacy wrapper, delegates to destructive_cleanup"""
     destructive_cleanup(new_folder_path)
@@ -372,45 +507,14 @@ class RZM_OT_ModProducerBuild(bpy.types.Operator):
             return {'CANCELLED'}
 
         print(f"\n[Mod Producer] ================= START BUILD: {folder_name} =================")
+        active_tiers = [t.strip() for t in mp.active_tiers.split(",") if t.strip()]
         try:
-            if os.path.exists(target_path):
-                print(f"[Mod Producer] Removing existing build folder: {target_path}")
-                shutil.rmtree(target_path)
-            
-            # Clean copy: Ignore .py, .bak, and cache
-            print(f"[Mod Producer] Copying from '{base_target}' to '{target_path}'...")
-            ignore_func = shutil.ignore_patterns('*.py', '*.bak', '__pycache__')
-            shutil.copytree(base_target, target_path, ignore=ignore_func)
+            print(f"[Mod Producer] Staging from '{base_target}' to '{target_path}'...")
+            processed_count = stage_build(base_target, target_path, list_build_sources(base_target), active_tiers)
         except Exception as e:
-            self.report({'ERROR'}, f"Copying failed: {e}")
+            self.report({'ERROR'}, f"Build failed: {e}")
             return {'CANCELLED'}
 
-        # 1. Delete disabled INI files in the copy
-        delete_disabled_inis(target_path)
-
-        # 2. Filter tiers in active INI files
-        active_tiers = [t.strip() for t in mp.active_tiers.split(",") if t.strip()]
-        processed_count = 0
-        for root, _, files in os.walk(target_path):
-            for file in files:
-                if file.lower().endswith(".ini"):
-                    ini_full = os.path.join(root, file)
-                    parse_ini_file(ini_full, active_tiers)
-                    processed_count += 1
-
-        # 3. Perform destructive cleanup
-        destructive_cleanup(target_path)
-
-        # 4. Perform Inquisitor Cleanup & Real Compression on remaining INI files
-        from .cleanup_ops import inquisitor_cleanup_logic, real_compression_logic
-        for root, _, files in os.walk(target_path):
-            for file in files:
-                if file.lower().endswith(".ini"):
-                    ini_full = os.path.join(root, file)
-                    print(f"[Mod Producer] Running post-build optimizations on: {file}")
-                    inquisitor_cleanup_logic(ini_full, operator=None, create_backup=False)
-                    real_compression_logic(ini_full, operator=None, create_backup=False)
-
         print(f"[Mod Producer] ================= BUILD FINISHED: {folder_name} =================\n")
         self.report({'INFO'}, f"Build complete: '{folder_name}' ({processed_count} files processed)")
         return {'FINISHED'}
@@ -451,6 +555,10 @@ class RZM_OT_ModProducerBatchBuild(bpy.types.Operator):
         if not base_name:
             base_name = os.path.basename(os.path.normpath(target_path))
             
+        # Profiles are resolved on the main thread; workers only get plain data
+        source_files = list_build_sources(target_path)
+        jobs = []
+        seen_paths = set()
         for profile in prefs.build_profiles:
             # Strip only OS-invalid characters, keep things like @ or spaces
             clean_profile_id = re.sub(r'[\\/:*?"<>|]', '', profile.name).strip()
@@ -482,62 +590,55 @@ class RZM_OT_ModProducerBatchBuild(bpy.types.Operator):
                 self.report({'WARNING'}, f"Skipping nested build path: {version_path}")
                 continue
 
-            print(f"\n[Mod Producer] --- Processing profile: {profile.name} -> {folder_name} ---")
-            try:
-                if os.path.exists(version_path):
-                    print(f"[Mod Producer] Removing existing build folder: {version_path}")
-                    shutil.rmtree(version_path)
-                
-                # Clean copy: Ignore .py, .bak, and cache
-                print(f"[Mod Producer] Copying from '{target_path}' to '{version_path}'...")
-                ignore_func = shutil.ignore_patterns('*.py', '*.bak', '__pycache__')
-                shutil.copytree(target_path, version_path, ignore=ignore_func)
-                
-                # 1. Delete disabled INI files in the copy
-                delete_disabled_inis(version_path)
-
-                # 2. Filter tiers in active INI files
-                active_tiers = {t.strip() for t in profile.active_tiers.split(",") if t.strip()}
-                for root, _, files in os.walk(version_path):
-                    for file in files:
-                        if file.lower().endswith(".ini"):
-                            ini_full = os.path.join(root, file)
-                            parse_ini_file(ini_full, active_tiers)
-                
-                # 3. Perform destructive cleanup
-                destructive_cleanup(version_path)
-                
-                # 4. Perform Inquisitor Cleanup & Real Compression on remaining INI files
-                from .cleanup_ops import inquisitor_cleanup_logic, real_compression_logic
-                for root, _, files in os.walk(version_path):
-                    for file in files:
-                        if file.lower().endswith(".ini"):
-                            ini_full = os.path.join(root, file)
-                            print(f"[Mod Producer] Running post-build optimizations on: {file}")
-                            inquisitor_cleanup_logic(ini_full, operator=None, create_backup=False)
-                            real_compression_logic(ini_full, operator=None, create_backup=False)
-                
-                # --- PACKAGING ---
-                if profile.zip_output:
-                    zip_name = f"{version_path}.zip"
-                    print(f"[Mod Producer] Zipping folder to: {zip_name}")
-                    with zipfile.ZipFile(zip_name, 'w', zipfile.ZIP_DEFLATED) as z:
-                        for root, _, files in os.walk(version_path):
-                            for file in files:
-                                f_path = os.path.join(root, file)
-                                arcname = os.path.join(folder_name, os.path.relpath(f_path, version_path))
-                                z.write(f_path, arcname)
-                    shutil.rmtree(version_path)
-                    batch_log.append(f"Zipped {folder_name}.zip")
-                else:
-                    batch_log.append(f"Created {folder_name}")
-                    
-            except Exception as e:
-                msg = f"Failed profile '{profile.name}': {e}"
-                print(f"[Mod Producer] {msg}")
-                self.report({'ERROR'}, msg)
-                batch_log.append(f"Failed {profile.name}")
+            # Two profiles writing the same folder at once would corrupt each other
+            norm_path = os.path.normcase(os.path.abspath(version_path))
+            if norm_path in seen_paths:
+                self.report({'WARNING'}, f"Skipping profile '{profile.name}': build path already used by another profile")
                 continue
+            seen_paths.add(norm_path)
+
+            jobs.append({
+                'name': profile.name,
+                'mod_root': target_path,
+                'source_files': source_files,
+                'version_path': version_path,
+                'folder_name': folder_name,
+                'active_tiers': {t.strip() for t in profile.active_tiers.split(",") if t.strip()},
+                'zip_output': bool(profile.zip_output),
+            })
+
+        # Profiles are independent folders: build them in parallel.
+        # Threads, not processes: workers could not import this bpy-bound add-on,
+        # and the heavy parts (file I/O, zlib) release the GIL.
+        # Zip entries are cached by content hash: buffers shared by every tier and
+        # files unchanged since the last batch are compressed once.
+        packer = None
+        if any(job['zip_output'] for job in jobs):
+            packer = ZipPacker(cache_dir=os.path.join(target_path, ZIP_CACHE_DIR, 'zip_entries'))
+        wm = context.window_manager
+        wm.progress_begin(0, max(len(jobs), 1))
+        try:
+            workers = max(1, min(len(jobs), os.cpu_count() or 1))
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(build_profile, job, packer): job for job in jobs}
+                for done, future in enumerate(concurrent.futures.as_completed(futures), 1):
+                    job = futures[future]
+                    try:
+                        batch_log.append(future.result())
+                    except Exception as e:
+                        msg = f"Failed profile '{job['name']}': {e}"
+                        print(f"[Mod Producer] {msg}")
+                        self.report({'ERROR'}, msg)
+                        batch_log.append(f"Failed {job['name']}")
+                    print(f"[Mod Producer] Profiles done: {done}/{len(jobs)} ({job['folder_name']})")
+                    wm.progress_update(done)
+        finally:
+            wm.progress_end()
+            if packer is not None:
+                stats = packer.stats
+                print(f"[Mod Producer] Zip entries: {stats['compressed']} compressed, "
+                      f"{stats['reused']} reused, {stats['stored']} stored")
+                packer.close()
 
         print(f"[Mod Producer] ================= BATCH BUILD FINISHED: {target_path} =================\n")
         if not batch_log:
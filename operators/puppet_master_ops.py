@@ -17,6 +17,10 @@
 #     - Спасательный круг. Включается автоматически, если Exact Match 
 #       не сработал (сбои, новая игра без кэша и т.д.).
 #
+#   Потоки: всё, что читает bpy (depsgraph, foreach_get), выполняется в главном
+#   потоке; ремап v_map, дельты, sparse-упаковка и запись файлов уходят в
+#   ShapeBakePool, общий для всех компонентов одного запуска.
+#
 import bpy
 import os
 import re
@@ -24,6 +28,7 @@ import json
 import time
 import struct
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from math import radians
 from mathutils import Vector, Matrix
 from mathutils.bvhtree import BVHTree
@@ -246,17 +251,6 @@ def _component_shape_key_names(active_configs, affected_names, single_shape_name
         if shape_config_matches_component(config, affected_names)
     }
 
-def _write_noop_shape_buffers(output_dir, base_name, shape_names, is_xxmi, dump_name, original_bytes):
-    written = 0
-    for sk_name in sorted(shape_names):
-        out_name = _get_shape_buffer_name(base_name, sk_name, is_xxmi, dump_name)
-        with open(os.path.join(output_dir, out_name), "wb") as f:
-            f.write(original_bytes)
-        written += 1
-
-    if written:
-        print(f"  [NO-OP] Wrote {written} full-size base shape buffer(s) for {base_name}.")
-
 def _validate_shape_buffer_sizes(output_dir, base_name, shape_names, is_xxmi, dump_name, stride):
     for sk_name in sorted(shape_names):
         out_name = _get_shape_buffer_name(base_name, sk_name, is_xxmi, dump_name)
@@ -271,59 +265,154 @@ def _validate_shape_buffer_sizes(output_dir, base_name, shape_names, is_xxmi, du
                 f"size={actual_size}"
             )
 
-def _convert_shape_buffers_to_sparse(output_dir, base_name, shape_names, is_xxmi, dump_name, original_bytes, stride):
-    import struct
-    stride_f32 = stride // 4
+def _original_positions(original_bytes, stride):
+    """(vertices, 3) float32 view of the POSITION xyz of the original VB0 bytes."""
     buf_v_count = len(original_bytes) // stride
-    orig_f32 = np.frombuffer(original_bytes, dtype=np.float32).reshape(buf_v_count, stride_f32)
+    raw = np.frombuffer(original_bytes, dtype=np.uint8, count=buf_v_count * stride)
+    return raw.reshape(buf_v_count, stride).view(np.float32)[:, :3]
+
+def _sparse_record_dtype(stride):
+    # <Ifff (vertex index + xyz delta), запись дополнена нулями до stride буфера
+    return np.dtype({'names': ['index', 'delta'], 'formats': ['<u4', ('<f4', 3)], 'offsets': [0, 4], 'itemsize': stride})
+
+class ShapeBakePool:
+    """
+    Пул потоков для тяжёлой NumPy-части бейка шейпкеев (ремап, дельты,
+    sparse-упаковка, запись файлов). Воркеры не трогают bpy: всё из Blender
+    снимается в главном потоке заранее, а обратная запись в свойства сцены
+    идёт через on_done-колбэки, которые выполняет drain() в главном потоке.
+    Отмена - только Ctrl+C в консоли (KeyboardInterrupt в главном потоке):
+    execute() блокирует UI, Esc до него не доходит.
+    """
+
+    def __init__(self, max_workers=None):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 1)
+        self._pending = []  # (future | None, on_done) в порядке постановки
+        self.submitted = 0
+        self.completed = 0
+
+    def submit(self, fn, *args, on_done=None):
+        future = self._executor.submit(fn, *args)
+        self._pending.append((future, on_done))
+        self.submitted += 1
+        return future
+
+    def defer(self, callback):
+        """callback() в главном потоке после всех поставленных ранее задач."""
+        self._pending.append((None, callback))
+
+    def wait(self, futures):
+        for future in futures:
+            future.result()
+
+    def drain(self, progress=None):
+        while self._pending:
+            future, on_done = self._pending.pop(0)
+            if future is None:
+                on_done()
+                continue
+            result = future.result()
+            self.completed += 1
+            if on_done is not None:
+                on_done(result)
+            if progress is not None:
+                progress(self.completed, self.submitted)
+
+    def cancel(self):
+        """Снимает задачи из очереди; уже запущенные дорабатывают."""
+        self._pending = []
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+def _object_shape_deltas(sk_co, ba_co, mat_rot, mirror_enabled, invert_x_enabled):
+    deltas = ((sk_co - ba_co) @ mat_rot.T).astype(np.float32)
+
+    if mirror_enabled:
+        # Mirror Path (Deltas must be standard space for standard buffer)
+        deltas[:, 0] *= -1
+
+    if invert_x_enabled:
+        deltas[:, 0] *= -1
+    return deltas
+
+def _warn_zero_deltas(obj_name, sk_name, deltas):
+    if not np.any(np.abs(deltas) > 1e-7):
+        # RAYVICH EDIT: expose baked shape keys that survived by name but lost all deformation.
+        print(
+            f"    [WARN] {obj_name}: shape '{sk_name}' has zero deltas after bake/export prep; "
+            "buffer slice will remain unchanged."
+        )
+
+def _apply_vmap_jobs(buf_xyz, jobs, sk_name, mirror_enabled, invert_x_enabled):
+    # Срезы объектов в буфере не пересекаются, порядок как в последовательной версии
+    for job in jobs:
+        deltas = _object_shape_deltas(job['sk_co'], job['ba_co'], job['mat_rot'], mirror_enabled, invert_x_enabled)
+        _warn_zero_deltas(job['name'], sk_name, deltas)
+        sl = slice(job['vb_off'], job['vb_off'] + job['vb_cnt'])
+        buf_xyz[sl] = (buf_xyz[sl] + deltas[job['v_map']]).astype(np.float32)
+
+def _bake_vmap_positions(shape_positions, sk_name, buf_xyz, jobs, mirror_enabled, invert_x_enabled):
+    _apply_vmap_jobs(buf_xyz, jobs, sk_name, mirror_enabled, invert_x_enabled)
+    shape_positions[sk_name] = buf_xyz
+
+def _pack_sparse_shape_buffer(out_path, positions, orig_xyz, record_dtype):
+    """Упаковывает и пишет sparse-буфер одного ключа, возвращает число записей."""
+    changed_indices = np.empty(0, dtype=np.intp)
+    if positions is not None:
+        deltas = positions - orig_xyz
+        changed_indices = np.flatnonzero(np.linalg.norm(deltas, axis=1) > 1e-7)
+
+    if len(changed_indices) > 0:
+        records = np.zeros(len(changed_indices), dtype=record_dtype)
+        records['index'] = changed_indices
+        records['delta'] = deltas[changed_indices]
+        sparse_count = len(changed_indices)
+    else:
+        records = np.zeros(1, dtype=record_dtype)  # 1-element dummy buffer of size stride filled with zeros
+        sparse_count = 1
+
+    with open(out_path, 'wb') as f:
+        f.write(records.tobytes())
+    return sparse_count
+
+def _store_sparse_count(sk_name, component_aliases, sparse_count):
+    # Save sparse vertex count to Blender property
+    try:
+        rzm = bpy.context.scene.rzm
+        _set_shape_sparse_count(rzm, sk_name, component_aliases, sparse_count)
+    except Exception as e:
+        print(f"[RZM] [SPARSE] Failed to save sparse vertex count for {sk_name}: {e}")
+
+def _write_sparse_shape_buffers(output_dir, base_name, shape_names, is_xxmi, dump_name, original_bytes, stride, shape_positions,
+                                pool=None):
+    """
+    Пишет sparse-буферы шейпкеев прямо из позиций в памяти (shape_positions:
+    имя -> (vertices, 3) float32). Ключи без запечённых позиций получают
+    одну нулевую запись (no-op), как и раньше. С пулом упаковка и запись
+    идут в воркерах, счётчики в свойства сцены пишутся при pool.drain().
+    """
+    orig_xyz = _original_positions(original_bytes, stride)
+    record_dtype = _sparse_record_dtype(stride)
     component_aliases = _component_sparse_aliases(base_name, is_xxmi, dump_name)
-    
-    converted = 0
-    for sk_name in shape_names:
-        out_name = _get_shape_buffer_name(base_name, sk_name, is_xxmi, dump_name)
-        out_path = os.path.join(output_dir, out_name)
-        
-        if not os.path.exists(out_path):
-            continue
-            
-        actual_size = os.path.getsize(out_path)
-        # Only convert if the file size matches the full buffer size (not yet converted)
-        if actual_size != len(original_bytes):
-            continue
-            
-        with open(out_path, 'rb') as f:
-            file_data = f.read()
-            
-        buf_f32 = np.frombuffer(file_data, dtype=np.float32).reshape(buf_v_count, stride_f32)
-        
-        # Calculate deltas for position (first 3 floats)
-        deltas = buf_f32[:, :3] - orig_f32[:, :3]
-        delta_lengths = np.linalg.norm(deltas, axis=1)
-        changed_indices = np.where(delta_lengths > 1e-7)[0]
-        
-        if len(changed_indices) > 0:
-            packed_bytes = bytearray(len(changed_indices) * stride)
-            for idx, v_idx in enumerate(changed_indices):
-                offset = idx * stride
-                struct.pack_into('<Ifff', packed_bytes, offset, v_idx, deltas[v_idx, 0], deltas[v_idx, 1], deltas[v_idx, 2])
-            sparse_count = len(changed_indices)
+
+    written = 0
+    for sk_name in sorted(shape_names):
+        out_path = os.path.join(output_dir, _get_shape_buffer_name(base_name, sk_name, is_xxmi, dump_name))
+        positions = shape_positions.get(sk_name)
+        if pool is None:
+            _store_sparse_count(sk_name, component_aliases, _pack_sparse_shape_buffer(out_path, positions, orig_xyz, record_dtype))
         else:
-            packed_bytes = bytearray(stride)  # 1-element dummy buffer of size stride filled with zeros
-            sparse_count = 1
-            
-        with open(out_path, 'wb') as f:
-            f.write(packed_bytes)
-        converted += 1
+            pool.submit(
+                _pack_sparse_shape_buffer, out_path, positions, orig_xyz, record_dtype,
+                on_done=lambda count, name=sk_name: _store_sparse_count(name, component_aliases, count),
+            )
+        written += 1
 
-        # Save sparse vertex count to Blender property
-        try:
-            rzm = bpy.context.scene.rzm
-            _set_shape_sparse_count(rzm, sk_name, component_aliases, sparse_count)
-        except Exception as e:
-            print(f"[RZM] [SPARSE] Failed to save sparse vertex count for {sk_name}: {e}")
-        
-    if converted:
-        print(f"  [SPARSE] Converted {converted} shape buffer(s) to sparse format for {base_name} (stride={stride}).")
+    if written:
+        verb = "Queued" if pool is not None else "Wrote"
+        print(f"  [SPARSE] {verb} {written} sparse shape buffer(s) for {base_name} (stride={stride}, baked={len(shape_positions)}).")
 
 def _scan_sk_owners(comp_objects, all_keys):
     """Классифицирует объекты по способу их деформации."""
@@ -463,10 +552,11 @@ def _resolve_component_transform(context, is_xxmi, game_name, mod_name, comp_nam
 # ---------------------------------------------------------------------------
 
 def _process_exact_matches(context, sk_owner_map, ready_map, comp_cache, original_bytes,
-                           stride, buf_v_count, output_dir, base_name, dump_name, is_xxmi, game_name,
-                           orient_mat=None, mirror_enabled=None):
+                           stride, buf_v_count, shape_positions, base_name, dump_name, is_xxmi, game_name,
+                           orient_mat=None, mirror_enabled=None, pool=None):
     import mathutils as mu
-    stride_f32 = stride // 4
+    orig_xyz = _original_positions(original_bytes, stride)
+    futures = []
     cache_objects = {entry['name']: entry for entry in comp_cache.get('objects', [])} if comp_cache else {}
 
     fast_path_slots_per_sk = {}
@@ -478,7 +568,7 @@ def _process_exact_matches(context, sk_owner_map, ready_map, comp_cache, origina
     invert_x_enabled = should_invert_shape_key_x(context)
 
     for sk_name, owners in sk_owner_map.items():
-        buf_f32 = np.frombuffer(bytes(original_bytes), dtype=np.float32).reshape(buf_v_count, stride_f32).copy()
+        buf_xyz = orig_xyz.copy()
         sk_fast_slots = np.zeros(buf_v_count, dtype=bool)
         
         objs_to_process = []
@@ -501,6 +591,10 @@ def _process_exact_matches(context, sk_owner_map, ready_map, comp_cache, origina
                 else: failed_objects[sk_name]['direct'].append(obj)
 
         matched_for_sk = 0
+        # Координаты снимаются здесь (Blender-поток); ремап v_map и дельты
+        # считаются в пуле. KD-путь идёт по текущему буферу ключа, поэтому
+        # перед ним накопленные задачи v_map применяются синхронно.
+        vmap_jobs = []
 
         for orig_obj, target_obj in objs_to_process:
             sk_blk = target_obj.data.shape_keys.key_blocks.get(sk_name)
@@ -534,21 +628,6 @@ def _process_exact_matches(context, sk_owner_map, ready_map, comp_cache, origina
             ba_co = ba_co.reshape(-1, 3)
 
             mat_rot = np.array(mat.to_3x3(), dtype=np.float32)
-            deltas_all = ((sk_co - ba_co) @ mat_rot.T).astype(np.float32)
-            
-            if mirror_enabled:
-                # Mirror Path (Deltas must be standard space for standard buffer)
-                deltas_all[:, 0] *= -1
-
-            if invert_x_enabled:
-                deltas_all[:, 0] *= -1
-
-            if not np.any(np.abs(deltas_all) > 1e-7):
-                # RAYVICH EDIT: expose baked shape keys that survived by name but lost all deformation.
-                print(
-                    f"    [WARN] {orig_obj.name}: shape '{sk_name}' has zero deltas after bake/export prep; "
-                    "buffer slice will remain unchanged."
-                )
 
             if vb_off + vb_cnt > buf_v_count:
                 print(f"    [ERROR] {orig_obj.name}: Buffer bounds exceeded. Forwarding to Slow Path.")
@@ -556,19 +635,26 @@ def _process_exact_matches(context, sk_owner_map, ready_map, comp_cache, origina
                 else: failed_objects[sk_name]['direct'].append(orig_obj)
                 continue
 
-            obj_slice = buf_f32[vb_off: vb_off + vb_cnt, :3]
             matched_count = 0
 
             # 1: Идеальный маппинг по v_map
-            if v_map and len(v_map) == vb_cnt and max(v_map) < v_count:
-                v_map_np = np.array(v_map, dtype=np.int32)
-                buf_f32[vb_off: vb_off + vb_cnt, :3] = (obj_slice + deltas_all[v_map_np]).astype(np.float32)
+            if v_map is not None and len(v_map) == vb_cnt and vb_cnt > 0 and int(np.max(v_map)) < v_count:
+                vmap_jobs.append({
+                    'name': orig_obj.name, 'sk_co': sk_co, 'ba_co': ba_co, 'mat_rot': mat_rot,
+                    'vb_off': vb_off, 'vb_cnt': vb_cnt, 'v_map': np.asarray(v_map, dtype=np.int32),
+                })
                 matched_count = vb_cnt
                 print(f"    [EXACT/VMAP] {orig_obj.name}: {matched_count} slots matched.")
                 stats['vmap_matched'] += 1
             
             # 2: Пространственный маппинг (KD-Tree)
             else:
+                if vmap_jobs:
+                    _apply_vmap_jobs(buf_xyz, vmap_jobs, sk_name, mirror_enabled, invert_x_enabled)
+                    vmap_jobs = []
+                deltas_all = _object_shape_deltas(sk_co, ba_co, mat_rot, mirror_enabled, invert_x_enabled)
+                _warn_zero_deltas(orig_obj.name, sk_name, deltas_all)
+
                 mwt = np.array(mat.translation, dtype=np.float32)
                 ba_world = ba_co @ mat_rot.T + mwt
                 
@@ -580,7 +666,7 @@ def _process_exact_matches(context, sk_owner_map, ready_map, comp_cache, origina
                 DIST_THRESHOLD = 0.005
                 for idx in range(vb_cnt):
                     buf_idx = vb_off + idx
-                    buf_pos = mu.Vector(buf_f32[buf_idx, :3])
+                    buf_pos = mu.Vector(buf_xyz[buf_idx])
                     
                     search_pos = buf_pos.copy()
                     if mirror_enabled:
@@ -592,9 +678,9 @@ def _process_exact_matches(context, sk_owner_map, ready_map, comp_cache, origina
                     if dist <= DIST_THRESHOLD:
                         d = deltas_all[best_idx]
                         if np.linalg.norm(d) > 1e-7:
-                            buf_f32[buf_idx, 0] += d[0]
-                            buf_f32[buf_idx, 1] += d[1]
-                            buf_f32[buf_idx, 2] += d[2]
+                            buf_xyz[buf_idx, 0] += d[0]
+                            buf_xyz[buf_idx, 1] += d[1]
+                            buf_xyz[buf_idx, 2] += d[2]
                         matched_count += 1
 
                 if matched_count > 0:
@@ -613,13 +699,19 @@ def _process_exact_matches(context, sk_owner_map, ready_map, comp_cache, origina
 
         if matched_for_sk > 0:
             out_name = _get_shape_buffer_name(base_name, sk_name, is_xxmi, dump_name)
-            with open(os.path.join(output_dir, out_name), 'wb') as f:
-                f.write(buf_f32.tobytes())
+            if vmap_jobs and pool is not None:
+                futures.append(pool.submit(
+                    _bake_vmap_positions, shape_positions, sk_name, buf_xyz, vmap_jobs, mirror_enabled, invert_x_enabled,
+                ))
+            elif vmap_jobs:
+                _bake_vmap_positions(shape_positions, sk_name, buf_xyz, vmap_jobs, mirror_enabled, invert_x_enabled)
+            else:
+                shape_positions[sk_name] = buf_xyz
             print(f"    -> [DONE] {out_name} ({matched_for_sk} verts via Exact Match)")
 
         fast_path_slots_per_sk[sk_name] = sk_fast_slots
 
-    return fast_path_slots_per_sk, stats, failed_objects
+    return fast_path_slots_per_sk, stats, failed_objects, futures
 
 # ---------------------------------------------------------------------------
 # BARYCENTRIC DELTA INTERPOLATION (Slow Path Fallback)
@@ -725,14 +817,12 @@ def _assign_owners_bulk_bvh(buf_xyz, base_cache, limit):
     return owner_map, dist_map
 
 def _run_slow_path(context, sk_owner_map_slow, comp_cache, original_bytes,
-                   stride, buf_v_count, output_dir, base_name, dump_name,
+                   stride, buf_v_count, shape_positions, base_name, dump_name,
                    is_xxmi, limit, t_start, game_name, fast_path_slots=None,
                    orient_mat=None, mirror_enabled=None):
 
-    stride_f32 = stride // 4
-    raw_np     = np.frombuffer(original_bytes, dtype=np.uint8)
-    float_view = raw_np.reshape(buf_v_count, stride).view(np.float32).reshape(buf_v_count, stride // 4)
-    buf_xyz    = float_view[:, :3].astype(np.float64)
+    orig_xyz   = _original_positions(original_bytes, stride)
+    buf_xyz    = orig_xyz.astype(np.float64)
 
     active_objects_set = set()
     for owners in sk_owner_map_slow.values():
@@ -836,13 +926,9 @@ def _run_slow_path(context, sk_owner_map_slow, comp_cache, original_bytes,
             if not target_cache: continue
 
             out_name = _get_shape_buffer_name(base_name, sk_name, is_xxmi, dump_name)
-            out_path = os.path.join(output_dir, out_name)
-
-            if os.path.exists(out_path):
-                with open(out_path, 'rb') as f:
-                    buf_f32 = np.frombuffer(f.read(), dtype=np.float32).reshape(buf_v_count, stride_f32).copy()
-            else:
-                buf_f32 = np.frombuffer(bytes(original_bytes), dtype=np.float32).reshape(buf_v_count, stride_f32).copy()
+            # Поверх результата Exact Match для этого ключа, если он был
+            sk_xyz = shape_positions.get(sk_name)
+            sk_xyz = orig_xyz.copy() if sk_xyz is None else sk_xyz.copy()
 
             matched_count = 0
             for obj, t_coords in target_cache.items():
@@ -866,14 +952,11 @@ def _run_slow_path(context, sk_owner_map_slow, comp_cache, original_bytes,
 
                 new_xyz = (buf_xyz[indices] + valid_deltas).astype(np.float32)
 
-                buf_f32[indices, 0] = new_xyz[:, 0]
-                buf_f32[indices, 1] = new_xyz[:, 1]
-                buf_f32[indices, 2] = new_xyz[:, 2]
+                sk_xyz[indices] = new_xyz
                 matched_count += len(indices)
 
             if matched_count > 0:
-                with open(out_path, 'wb') as f:
-                    f.write(buf_f32.tobytes())
+                shape_positions[sk_name] = sk_xyz
                 print(f"    -> [DONE] {out_name} ({matched_count} verts via Slow Path [Barycentric])")
                 stats += 1
 
@@ -1051,9 +1134,9 @@ def _bake_weights_layer(context, base_name, comp_objects, mod_root, all_keys, or
             eval_obj.to_mesh_clear()
 
             # Строим v_map из deformed координат → буферные слоты
-            if v_map and len(v_map) == vb_cnt:
+            if v_map is not None and len(v_map) == vb_cnt:
                 # Используем v_map: для каждого буферного слота берём координату из eval_co[v_map[i]]
-                v_map_np = np.array(v_map, dtype=np.int32)
+                v_map_np = np.asarray(v_map, dtype=np.int32)
                 valid_mask = v_map_np < n_eval
                 obj_buf_xyz = np.zeros((vb_cnt, 3), dtype=np.float32)
                 obj_buf_xyz[valid_mask] = eval_co[v_map_np[valid_mask]]
@@ -1124,7 +1207,22 @@ def _bake_weights_layer(context, base_name, comp_objects, mod_root, all_keys, or
 
 def bake_component_shapes(context, base_name, comp_objects, mod_root, limit,
                            single_shape_name=None, full_export_mode=False,
-                           orient_mat=None, mirror_enabled=None):
+                           orient_mat=None, mirror_enabled=None, pool=None):
+    # Без общего пула компонент печётся со своим и дожидается всех записей
+    if pool is not None:
+        return _bake_component_shapes(context, base_name, comp_objects, mod_root, limit, single_shape_name,
+                                      full_export_mode, orient_mat, mirror_enabled, pool)
+    pool = ShapeBakePool()
+    try:
+        result = _bake_component_shapes(context, base_name, comp_objects, mod_root, limit, single_shape_name,
+                                        full_export_mode, orient_mat, mirror_enabled, pool)
+        pool.drain()
+        return result
+    finally:
+        pool.close()
+
+def _bake_component_shapes(context, base_name, comp_objects, mod_root, limit, single_shape_name,
+                           full_export_mode, orient_mat, mirror_enabled, pool):
     from ..utils.export_timing import measure
 
     t_start   = time.time()
@@ -1206,9 +1304,9 @@ def bake_component_shapes(context, base_name, comp_objects, mod_root, limit,
 
     stride = 40 if is_xxmi else 16 if game in {'ArknightsEndfield', 'WutheringWaves'} else 32
 
-    # Создаем заглушки-буферы
-    with measure(f"puppet.component.{base_name}.write_noop_buffers"):
-        _write_noop_shape_buffers(output_dir, base_name, all_keys, is_xxmi, dump_name, original_bytes)
+    # Запечённые позиции ключей живут в памяти (имя -> (vertices, 3) float32);
+    # на диск сразу пишутся sparse-буферы, без полноразмерных промежуточных файлов
+    shape_positions = {}
 
     with measure(f"puppet.component.{base_name}.scan_shape_owners"):
         sk_owner_map = _scan_sk_owners(comp_objects, all_keys)
@@ -1218,15 +1316,9 @@ def bake_component_shapes(context, base_name, comp_objects, mod_root, limit,
         weight_keys = [c for c in active_weight_shape_configs(rzm) if c.shape_name in all_keys]
 
     if not sk_owner_map and not weight_keys:
-        _convert_shape_buffers_to_sparse(output_dir, base_name, all_keys, is_xxmi, dump_name, original_bytes, stride)
-        _validate_shape_buffer_sizes(
-            output_dir,
-            base_name,
-            all_keys,
-            is_xxmi,
-            dump_name,
-            stride,
-        )
+        _write_sparse_shape_buffers(output_dir, base_name, all_keys, is_xxmi, dump_name, original_bytes, stride, shape_positions,
+                                    pool=pool)
+        pool.defer(lambda: _validate_shape_buffer_sizes(output_dir, base_name, all_keys, is_xxmi, dump_name, stride))
         return True
 
     buf_v_count = len(original_data) // stride
@@ -1247,15 +1339,9 @@ def bake_component_shapes(context, base_name, comp_objects, mod_root, limit,
             dump_name=dump_name,
             comp_cache=comp_cache,
         )
-        _convert_shape_buffers_to_sparse(output_dir, base_name, all_keys, is_xxmi, dump_name, original_bytes, stride)
-        _validate_shape_buffer_sizes(
-            output_dir,
-            base_name,
-            all_keys,
-            is_xxmi,
-            dump_name,
-            stride,
-        )
+        _write_sparse_shape_buffers(output_dir, base_name, all_keys, is_xxmi, dump_name, original_bytes, stride, shape_positions,
+                                    pool=pool)
+        pool.defer(lambda: _validate_shape_buffer_sizes(output_dir, base_name, all_keys, is_xxmi, dump_name, stride))
         return True
 
     # ── 1. ФАЗА ПОДГОТОВКИ (Pre-Processing) ────────────────────────────────
@@ -1376,11 +1462,11 @@ def bake_component_shapes(context, base_name, comp_objects, mod_root, limit,
 
         # ── 2. EXACT MATCH PATH (Выгрузка) ─────────────────────────────────────
         with measure(f"puppet.component.{base_name}.exact_match"):
-            fast_path_slots, stats_exact, failed_exact = _process_exact_matches(
+            fast_path_slots, stats_exact, failed_exact, exact_futures = _process_exact_matches(
                 context, sk_owner_map, ready_map, comp_cache,
                 original_bytes, stride, buf_v_count,
-                output_dir, base_name, dump_name, is_xxmi, game_name=game,
-                orient_mat=orient_mat, mirror_enabled=mirror_enabled
+                shape_positions, base_name, dump_name, is_xxmi, game_name=game,
+                orient_mat=orient_mat, mirror_enabled=mirror_enabled, pool=pool
             )
 
         # ── 3. SLOW PATH (Fallback) ────────────────────────────────────────────
@@ -1390,10 +1476,12 @@ def bake_component_shapes(context, base_name, comp_objects, mod_root, limit,
         if sk_owner_map_slow:
             print(f"  [SLOW PATH] Spatial Barycentric Fallback")
             with measure(f"puppet.component.{base_name}.slow_path"):
+                # Slow Path дописывает поверх результата Exact Match
+                pool.wait(exact_futures)
                 stats_slow = _run_slow_path(
                     context, sk_owner_map_slow, comp_cache,
                     original_bytes, stride, buf_v_count,
-                    output_dir, base_name, dump_name, is_xxmi, limit, t_start,
+                    shape_positions, base_name, dump_name, is_xxmi, limit, t_start,
                     game_name=game, fast_path_slots=fast_path_slots,
                     orient_mat=orient_mat, mirror_enabled=mirror_enabled
                 )
@@ -1402,10 +1490,12 @@ def bake_component_shapes(context, base_name, comp_objects, mod_root, limit,
         # [NEW] Проверка и запуск слоя весов
         with measure(f"puppet.component.{base_name}.bake_weights"):
             _bake_weights_layer(context, base_name, comp_objects, mod_root, all_keys, original_bytes, stride, is_xxmi, dump_name=dump_name, comp_cache=comp_cache)
-        with measure(f"puppet.component.{base_name}.convert_sparse"):
-            _convert_shape_buffers_to_sparse(output_dir, base_name, all_keys, is_xxmi, dump_name, original_bytes, stride)
-        with measure(f"puppet.component.{base_name}.validate_buffers"):
-            _validate_shape_buffer_sizes(output_dir, base_name, all_keys, is_xxmi, dump_name, stride)
+        with measure(f"puppet.component.{base_name}.write_sparse"):
+            pool.wait(exact_futures)
+            _write_sparse_shape_buffers(output_dir, base_name, all_keys, is_xxmi, dump_name, original_bytes, stride, shape_positions,
+                                        pool=pool)
+        # Проверка размеров - после того, как воркеры допишут файлы компонента
+        pool.defer(lambda: _validate_shape_buffer_sizes(output_dir, base_name, all_keys, is_xxmi, dump_name, stride))
 
         # ── SUMMARY ──
         print(f"\n  [SUMMARY] {base_name} component finished in {time.time() - t_start:.3f}s")
@@ -1428,6 +1518,10 @@ def bake_component_shapes(context, base_name, comp_objects, mod_root, limit,
 
     return True
 
+def _print_write_progress(done, total):
+    if done == total or done % 16 == 0:
+        print(f"  [SPARSE] Shape bake jobs done: {done}/{total}")
+
 def _patch_ini_dispatches(mod_root, rzm):
     import re
     ini_path = os.path.join(mod_root, "mod.ini")
@@ -1487,7 +1581,7 @@ def _patch_ini_dispatches(mod_root, rzm):
 class RZM_OT_PuppetMasterBake(bpy.types.Operator):
     bl_idname     = "rzm.puppet_master_bake"
     bl_label      = "Bake Puppet Master Shapes"
-    bl_description = "Bake shape keys using strictly RZMenu Shape Configs"
+    bl_description = "Bake shape keys using strictly RZMenu Shape Configs. Blocks Blender until done; cannot be cancelled from the UI (only Ctrl+C in the system console)"
     full_export_mode: bpy.props.BoolProperty(default=False)
 
     def execute(self, context):
@@ -1519,24 +1613,41 @@ class RZM_OT_PuppetMasterBake(bpy.types.Operator):
                 mod_dir = os.path.dirname(dp) if dp.lower().endswith("hash.json") else dp
                 mod_name = os.path.basename(mod_dir)
 
-        for base_name, objs in components.items():
-            # Get component metadata for classifications
-            comp_cache = cache.get('components', {}).get(base_name, {})
-            classifications = []
-            if is_xxmi and comp_cache:
-                obj_names = [o.get('name') for o in comp_cache.get('objects', [])]
-                pass
-
-            # [REWORK] Resolve dynamic orientation and mirror per component
-            with measure(f"puppet.component.{base_name}.resolve_transform"):
-                orient_mat, mirror_enabled = _resolve_component_transform(
-                    context, is_xxmi, game, mod_name, base_name, classifications
-                )
-
-            with measure(f"puppet.component.{base_name}.total"):
-                bake_component_shapes(context, base_name, objs, mod_root, limit,
-                                       full_export_mode=self.full_export_mode,
-                                       orient_mat=orient_mat, mirror_enabled=mirror_enabled)
+        # Компоненты извлекаются из Blender по очереди, а упаковка и запись
+        # буферов предыдущих компонентов идут в общем пуле параллельно
+        pool = ShapeBakePool()
+        wm = context.window_manager
+        wm.progress_begin(0, len(components) + 1)
+        try:
+            for done, (base_name, objs) in enumerate(components.items()):
+                # Get component metadata for classifications
+                comp_cache = cache.get('components', {}).get(base_name, {})
+                classifications = []
+                if is_xxmi and comp_cache:
+                    obj_names = [o.get('name') for o in comp_cache.get('objects', [])]
+                    pass
+
+                # [REWORK] Resolve dynamic orientation and mirror per component
+                with measure(f"puppet.component.{base_name}.resolve_transform"):
+                    orient_mat, mirror_enabled = _resolve_component_transform(
+                        context, is_xxmi, game, mod_name, base_name, classifications
+                    )
+
+                with measure(f"puppet.component.{base_name}.total"):
+                    bake_component_shapes(context, base_name, objs, mod_root, limit,
+                                           full_export_mode=self.full_export_mode,
+                                           orient_mat=orient_mat, mirror_enabled=mirror_enabled, pool=pool)
+                wm.progress_update(done + 1)
+            with measure("puppet.write_shape_buffers"):
+                pool.drain(progress=_print_write_progress)
+            wm.progress_update(len(components) + 1)
+        except KeyboardInterrupt:
+            pool.cancel()
+            self.report({'WARNING'}, "Puppet Master bake cancelled; shape buffers may be incomplete.")
+            return {'CANCELLED'}
+        finally:
+            wm.progress_end()
+            pool.close()
         with measure("puppet.patch_ini_dispatches"):
             _patch_ini_dispatches(mod_root, context.scene.rzm)
         return {'FINISHED'}
@@ -1545,7 +1656,7 @@ class RZM_OT_PuppetMasterBake(bpy.types.Operator):
 class RZM_OT_PuppetMasterBakeSingle(bpy.types.Operator):
     bl_idname     = "rzm.puppet_master_bake_single"
     bl_label      = "Bake Selected Shape Key"
-    bl_description = "Bake the active shape regardless of whitelist"
+    bl_description = "Bake the active shape regardless of whitelist. Blocks Blender until done; cannot be cancelled from the UI (only Ctrl+C in the system console)"
 
     def execute(self, context):
         from .export_manager import get_target_path
@@ -1574,22 +1685,36 @@ class RZM_OT_PuppetMasterBakeSingle(bpy.types.Operator):
                 mod_dir = os.path.dirname(dp) if dp.lower().endswith("hash.json") else dp
                 mod_name = os.path.basename(mod_dir)
 
-        for base_name, objs in components.items():
-            # Get component metadata for classifications
-            comp_cache = cache.get('components', {}).get(base_name, {})
-            classifications = []
-            if is_xxmi and comp_cache:
-                # obj_names = [o.get('name') for o in comp_cache.get('objects', [])]
-                pass
-
-            # [REWORK] Resolve dynamic orientation and mirror per component
-            orient_mat, mirror_enabled = _resolve_component_transform(
-                context, is_xxmi, game, mod_name, base_name, classifications
-            )
+        pool = ShapeBakePool()
+        wm = context.window_manager
+        wm.progress_begin(0, len(components) + 1)
+        try:
+            for done, (base_name, objs) in enumerate(components.items()):
+                # Get component metadata for classifications
+                comp_cache = cache.get('components', {}).get(base_name, {})
+                classifications = []
+                if is_xxmi and comp_cache:
+                    # obj_names = [o.get('name') for o in comp_cache.get('objects', [])]
+                    pass
+
+                # [REWORK] Resolve dynamic orientation and mirror per component
+                orient_mat, mirror_enabled = _resolve_component_transform(
+                    context, is_xxmi, game, mod_name, base_name, classifications
+                )
 
-            bake_component_shapes(context, base_name, objs, mod_root, limit,
-                                   single_shape_name=target_shape,
-                                   orient_mat=orient_mat, mirror_enabled=mirror_enabled)
+                bake_component_shapes(context, base_name, objs, mod_root, limit,
+                                       single_shape_name=target_shape,
+                                       orient_mat=orient_mat, mirror_enabled=mirror_enabled, pool=pool)
+                wm.progress_update(done + 1)
+            pool.drain(progress=_print_write_progress)
+            wm.progress_update(len(components) + 1)
+        except KeyboardInterrupt:
+            pool.cancel()
+            self.report({'WARNING'}, "Shape bake cancelled; shape buffers may be incomplete.")
+            return {'CANCELLED'}
+        finally:
+            wm.progress_end()
+            pool.close()
         _patch_ini_dispatches(mod_root, context.scene.rzm)
         return {'FINISHED'}
 
@@ -13,6 +13,27 @@ class RZM_OT_QuickExportMenu(bpy.types.Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
+        from ..utils.export_timing import ExportProfiler, set_current_profiler, save_history
+
+        target_dir = get_target_path(context)
+        profiler = ExportProfiler(
+            "RZM Quick Update",
+            output_root=target_dir or None,
+            trace_memory=getattr(context.scene.rzm.addons, "export_profile_memory", False),
+        )
+        set_current_profiler(profiler)
+        try:
+            with profiler.measure("quick_update.total"):
+                return self.execute_internal(context)
+        finally:
+            profiler.report()
+            set_current_profiler(None)
+            profiler.finish()
+            save_history(profiler, target_dir)
+
+    def execute_internal(self, context):
+        from ..utils.export_timing import measure, count_written
+
         target_dir = get_target_path(context)
         if not target_dir or not os.path.exists(target_dir):
             self.report({'ERROR'}, "Export path not set or invalid! Set it in Export Manager first.")
@@ -23,8 +44,10 @@ class RZM_OT_QuickExportMenu(bpy.types.Operator):
         if settings.quick_update_resources:
             print("RZMenu Quick Update: Exporting resources (Atlas & Fonts)...")
             try:
-                bpy.ops.rzm.export_atlas()
-                bpy.ops.rzm.export_fonts()
+                with measure("quick_update.export_atlas"):
+                    bpy.ops.rzm.export_atlas()
+                with measure("quick_update.export_fonts"):
+                    bpy.ops.rzm.export_fonts()
             except Exception as e:
                 self.report({'WARNING'}, f"Resource export failed: {e}")
 
@@ -65,8 +88,9 @@ class RZM_OT_QuickExportMenu(bpy.types.Operator):
 
         # 5. Write back to file
         try:
-            with open(ini_path, 'w', encoding='utf-8') as f:
+            with measure("quick_update.write_ini"), open(ini_path, 'w', encoding='utf-8') as f:
                 f.write(final_ini)
+                count_written(f.tell())
         except Exception as e:
             self.report({'ERROR'}, f"Failed to write .ini file: {e}")
             return {'CANCELLED'}
@@ -76,7 +100,8 @@ class RZM_OT_QuickExportMenu(bpy.types.Operator):
         # 6. Post-Export Scripts
         if settings.quick_update_run_scripts:
             print("RZMenu Quick Update: Executing post-export scripts...")
-            run_custom_scripts(context, target_dir)
+            with measure("quick_update.custom_scripts"):
+                run_custom_scripts(context, target_dir)
 
         return {'FINISHED'}
 
@@ -125,9 +125,14 @@ class RZM_OT_FullExport(bpy.types.Operator):
 
     def execute(self, context):
         from ..utils.safe_export import SafeExport
-        from ..utils.export_timing import ExportProfiler, set_current_profiler
+        from ..utils.export_timing import ExportProfiler, set_current_profiler, save_history
 
-        profiler = ExportProfiler("RZM Full Export")
+        target_path = get_target_path(context)
+        profiler = ExportProfiler(
+            "RZM Full Export",
+            output_root=target_path or None,
+            trace_memory=getattr(context.scene.rzm.addons, "export_profile_memory", False),
+        )
         set_current_profiler(profiler)
         try:
             with profiler.measure("safe_export.total"):
@@ -136,6 +141,8 @@ class RZM_OT_FullExport(bpy.types.Operator):
         finally:
             profiler.report()
             set_current_profiler(None)
+            profiler.finish()
+            save_history(profiler, target_path)
 
     def execute_internal(self, context):
         from ..utils.export_timing import measure
@@ -220,43 +227,47 @@ class RZM_OT_FullExport(bpy.types.Operator):
             from ..core.element_blacklist import export_element_blacklist
             from ..core.element_default_props import export_element_default_props
             from ..core.element_draw_data import build_element_draw_data, export_element_draw_data
-            with measure("full_export.pack_project_text"):
-                text_mapping = pack_project_text(context.scene, target_path)
-            with measure("full_export.pack_project_images"):
-                image_mapping = pack_project_images(context.scene, target_path)
-            with measure("full_export.pack_styles"):
-                pack_styles(context.scene, target_path)
+            from ..core.element_index import shared_element_index
+            # Один индекс элементов на упаковку текстов и буферов элементов
+            with shared_element_index(context.scene.rzm) as element_idx:
+                with measure("full_export.pack_project_text"):
+                    text_mapping = pack_project_text(context.scene, target_path)
+                with measure("full_export.pack_project_images"):
+                    image_mapping = pack_project_images(context.scene, target_path)
+                with measure("full_export.pack_styles"):
+                    pack_styles(context.scene, target_path)
             
-            if context.scene.rzm and context.scene.rzm.elements:
-                draw_data = build_element_draw_data(
-                    context.scene.rzm.elements,
-                    text_mapping,
-                    image_mapping,
-                )
-                export_element_draw_data(draw_data, os.path.join(target_path, "res"))
-                static_map_path = os.path.join(target_path, "res", "element_static_map.buf")
-                with measure("full_export.export_element_static_map"):
-                    flags_map = export_element_static_map(
-                        context.scene.rzm.elements,
-                        static_map_path,
-                        image_mapping,
+                if context.scene.rzm and context.scene.rzm.elements:
+                    draw_data = build_element_draw_data(
+                        element_idx.elements,
                         text_mapping,
-                        draw_data,
-                    )
-                context.scene.rzm["elem_static_flags"] = flags_map
-                blacklist_path = os.path.join(target_path, "res", "element_blacklist.buf")
-                with measure("full_export.export_element_blacklist"):
-                    export_element_blacklist(
-                        context.scene.rzm.elements,
-                        blacklist_path,
                         image_mapping,
-                        text_mapping,
-                        draw_data,
                     )
-                default_props_path = os.path.join(target_path, "res", "element_default_props.buf")
-                with measure("full_export.export_element_default_props"):
-                    default_flags = export_element_default_props(context.scene.rzm.elements, default_props_path)
-                context.scene.rzm["elem_default_flags"] = default_flags
+                    with measure("full_export.export_element_draw_data"):
+                        export_element_draw_data(draw_data, os.path.join(target_path, "res"))
+                    static_map_path = os.path.join(target_path, "res", "element_static_map.buf")
+                    with measure("full_export.export_element_static_map"):
+                        flags_map = export_element_static_map(
+                            element_idx.elements,
+                            static_map_path,
+                            image_mapping,
+                            text_mapping,
+                            draw_data,
+                        )
+                    context.scene.rzm["elem_static_flags"] = flags_map
+                    blacklist_path = os.path.join(target_path, "res", "element_blacklist.buf")
+                    with measure("full_export.export_element_blacklist"):
+                        export_element_blacklist(
+                            element_idx.elements,
+                            blacklist_path,
+                            image_mapping,
+                            text_mapping,
+                            draw_data,
+                        )
+                    default_props_path = os.path.join(target_path, "res", "element_default_props.buf")
+                    with measure("full_export.export_element_default_props"):
+                        default_flags = export_element_default_props(element_idx.elements, default_props_path)
+                    context.scene.rzm["elem_default_flags"] = default_flags
                 
             print("[RZM Full Export] Resource buffers packed (images.bin, anim_frames.bin, styles.bin, element_static_map.buf, element_blacklist.buf, element_default_props.buf).")
         except Exception as e:
@@ -390,37 +401,40 @@ class RZM_OT_BatchExport(bpy.types.Operator):
             from ..core.element_blacklist import export_element_blacklist
             from ..core.element_default_props import export_element_default_props
             from ..core.element_draw_data import build_element_draw_data, export_element_draw_data
-            text_mapping = pack_project_text(context.scene, target_path)
-            image_mapping = pack_project_images(context.scene, target_path)
-            pack_styles(context.scene, target_path)
+            from ..core.element_index import shared_element_index
+            # Один индекс элементов на упаковку текстов и буферов элементов
+            with shared_element_index(context.scene.rzm) as element_idx:
+                text_mapping = pack_project_text(context.scene, target_path)
+                image_mapping = pack_project_images(context.scene, target_path)
+                pack_styles(context.scene, target_path)
             
-            if context.scene.rzm and context.scene.rzm.elements:
-                draw_data = build_element_draw_data(
-                    context.scene.rzm.elements,
-                    text_mapping,
-                    image_mapping,
-                )
-                export_element_draw_data(draw_data, os.path.join(target_path, "res"))
-                static_map_path = os.path.join(target_path, "res", "element_static_map.buf")
-                flags_map = export_element_static_map(
-                    context.scene.rzm.elements,
-                    static_map_path,
-                    image_mapping,
-                    text_mapping,
-                    draw_data,
-                )
-                context.scene.rzm["elem_static_flags"] = flags_map
-                blacklist_path = os.path.join(target_path, "res", "element_blacklist.buf")
-                export_element_blacklist(
-                    context.scene.rzm.elements,
-                    blacklist_path,
-                    image_mapping,
-                    text_mapping,
-                    draw_data,
-                )
-                default_props_path = os.path.join(target_path, "res", "element_default_props.buf")
-                default_flags = export_element_default_props(context.scene.rzm.elements, default_props_path)
-                context.scene.rzm["elem_default_flags"] = default_flags
+                if context.scene.rzm and context.scene.rzm.elements:
+                    draw_data = build_element_draw_data(
+                        element_idx.elements,
+                        text_mapping,
+                        image_mapping,
+                    )
+                    export_element_draw_data(draw_data, os.path.join(target_path, "res"))
+                    static_map_path = os.path.join(target_path, "res", "element_static_map.buf")
+                    flags_map = export_element_static_map(
+                        element_idx.elements,
+                        static_map_path,
+                        image_mapping,
+                        text_mapping,
+                        draw_data,
+                    )
+                    context.scene.rzm["elem_static_flags"] = flags_map
+                    blacklist_path = os.path.join(target_path, "res", "element_blacklist.buf")
+                    export_element_blacklist(
+                        element_idx.elements,
+                        blacklist_path,
+                        image_mapping,
+                        text_mapping,
+                        draw_data,
+                    )
+                    default_props_path = os.path.join(target_path, "res", "element_default_props.buf")
+                    default_flags = export_element_default_props(element_idx.elements, default_props_path)
+                    context.scene.rzm["elem_default_flags"] = default_flags
                 
             print("[RZM Batch] Resource buffers packed (images.bin, anim_frames.bin, styles.bin, element_static_map.buf, element_blacklist.buf, element_default_props.buf).")
         except Exception as e:
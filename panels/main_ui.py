@@ -1069,8 +1069,10 @@ class VIEW3D_PT_RZM_ExportManager(bpy.types.Panel):
         atlas_box = layout.box()
         atlas_box.label(text="Atlas Export Format:", icon='IMAGE_DATA')
         atlas_box.prop(settings, "atlas_format", text="Format")
+        atlas_box.prop(settings, "atlas_packer", text="Packer")
         if settings.atlas_format == 'DDS':
             atlas_box.prop(settings, "dds_profile", text="Profile")
+            atlas_box.prop(settings, "dds_encoder", text="Encoder")
         else:
             atlas_box.prop(settings, "icc_profile", text="Profile")
         
@@ -1227,7 +1229,8 @@ def draw_export_cache_info_ui(context, layout):
         for obj_index, obj_data in enumerate(objects[:4]):
             vb_offset = obj_data.get("vb_offset", "?")
             vb_count = obj_data.get("vb_count", "?")
-            has_map = bool(obj_data.get("vertex_map"))
+            vertex_map = obj_data.get("vertex_map")
+            has_map = vertex_map is not None and len(vertex_map) > 0
             icon = 'CHECKMARK' if has_map else 'ERROR'
             cbox.label(
                 text=f"[{vb_offset} + {vb_count}] {obj_data.get('name', '<unnamed>')}",
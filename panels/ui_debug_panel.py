@@ -204,6 +204,7 @@ class VIEW3D_PT_RZConstructorDebugPanel(bpy.types.Panel):
         
         self.draw_global_mod_settings(layout, rzm)
         self.draw_addons_settings(layout, rzm)
+        self.draw_export_timing(layout, rzm, context)
         self.draw_tex_works_config(layout, rzm, context)
         self.draw_special_variables(layout, rzm)
         self.draw_ux_sandbox(layout, rzm)
@@ -397,6 +398,45 @@ class VIEW3D_PT_RZConstructorDebugPanel(bpy.types.Panel):
         row.prop(addons, "legacy_sk_ui")
         box.separator()
 
+    def draw_export_timing(self, layout, rzm, context):
+        from ..operators.export_manager import get_target_path
+        from ..utils.export_timing import load_history, find_regressions, REGRESSION_FACTOR
+
+        layout.separator()
+        box = layout.box()
+        box.label(text="Export Timing:", icon='TIME')
+        box.prop(rzm.addons, "export_profile_memory", text="Track Peak Memory (slower)")
+        history = load_history(get_target_path(context))
+        if not history:
+            box.label(text="No timing history. Run Full Export or Quick Update.", icon='INFO')
+            return
+
+        last = history[-1]
+        box.label(text=f"{last.get('title', '?')}: {last.get('wall', 0.0):.2f}s wall, "
+                       f"{last.get('cpu', 0.0):.2f}s CPU ({len(history)} runs saved)")
+        if last.get("output_bytes"):
+            box.label(text=f"Mod folder files changed: {last['output_bytes'] / (1024 * 1024):.1f} MB")
+
+        regressions = find_regressions(history)
+        if regressions:
+            warn = box.box()
+            warn.alert = True
+            warn.label(text=f"Slower than {REGRESSION_FACTOR:.1f}x rolling median:", icon='ERROR')
+            for reg in regressions[:6]:
+                warn.label(text=f"{reg['name']}: {reg['wall']:.2f}s vs {reg['median']:.2f}s (x{reg['ratio']:.1f})")
+        else:
+            box.label(text="No stage regressed against the rolling median.", icon='CHECKMARK')
+
+        stages = sorted(last.get("stages", ()), key=lambda st: st.get("wall") or 0.0, reverse=True)
+        col = box.column(align=True)
+        for stage in stages[:8]:
+            text = f"{stage.get('name')}: {stage.get('wall') or 0.0:.2f}s"
+            if stage.get("peak_mem") is not None:
+                text += f" | peak {stage['peak_mem'] / (1024 * 1024):.1f} MB"
+            if stage.get("bytes_written"):
+                text += f" | wrote {stage['bytes_written'] / (1024 * 1024):.1f} MB"
+            col.label(text=text)
+
     def draw_tex_works_config(self, layout, rzm, context):
         layout.separator()
         main_box = layout.box()
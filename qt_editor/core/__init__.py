@@ -10,6 +10,7 @@ from . import props
 from . import clipboard
 from . import blender_bridge
 from . import maths
+from . import revision
 
 from .signals import SIGNALS, IS_UPDATING_FROM_QT
 from .maths import to_qt_coords, to_blender_delta, to_blender_coords, get_global_pos, get_local_pos_from_global
@@ -19,6 +20,7 @@ from .read import (
     get_all_elements_list,
     get_selection_details,
     get_viewport_data,
+    get_viewport_delta,
     get_structure_signature, # Stubs
     get_element_signature,
     get_viewport_signature,
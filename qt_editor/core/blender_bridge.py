@@ -4,6 +4,7 @@ from pathlib import Path
 import os
 import bpy
 from ...core.serialization import RZTemplateEngine
+from . import revision
 
 def get_stable_context():
     if bpy.context.area and bpy.context.area.type == 'VIEW_3D':
@@ -273,6 +274,8 @@ def update_asset_property(asset_id, prop_name, value):
     if hasattr(img, blender_prop):
         try:
             setattr(img, blender_prop, value)
+            # Данные изображений входят во все элементы вьюпорта, которые на них ссылаются
+            revision.invalidate_all()
             print(f"[Bridge] Updated asset {asset_id}: {blender_prop} = {value}")
         except Exception as e:
             print(f"[Bridge] Error updating {blender_prop}: {e}")
@@ -3,6 +3,7 @@ import bpy
 from . import structure
 from . import signals
 from . import blender_bridge
+from . import revision
 
 _INTERNAL_CLIPBOARD = []
 _STYLE_CLIPBOARD = None
@@ -122,6 +123,7 @@ def paste_style(target_ids):
                 changed_count += 1
 
         if changed_count:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push("RZM: Paste Style")
             signals.SIGNALS.data_changed.emit()
             signals.SIGNALS.structure_changed.emit()
@@ -492,6 +494,7 @@ def paste_elements(target_x=None, target_y=None, offset=20, parent_id=-1, mode='
             
             new_ids.append(new_id)
             
+        revision.touch_structure(new_ids)
         blender_bridge.safe_undo_push("RZM: Paste")
         signals.SIGNALS.structure_changed.emit()
         signals.SIGNALS.transform_changed.emit()
@@ -5,6 +5,7 @@ from PySide6 import QtWidgets, QtCore
 from .. import window
 from . import signals
 from . import perf
+from . import revision
 
 try:
     from PySide6 import QtWidgets, QtCore
@@ -49,9 +50,11 @@ class IntegrationManager:
         if signals.IS_UPDATING_FROM_QT:
             return
 
-        # Если изменение внешнее - просим окно перечитать данные
+        # Если изменение внешнее - просим окно перечитать данные.
+        # ID из depsgraph.updates отличают эхо наших записей от внешних правок
         if cls._window and cls._window.isVisible():
-            cls._window.sync_from_blender()
+            updated_ids = [revision.id_key(update.id) for update in depsgraph.updates] if depsgraph else None
+            cls._window.sync_from_blender(updated_ids)
 
     @classmethod
     @bpy.app.handlers.persistent
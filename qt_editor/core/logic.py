@@ -2,198 +2,370 @@
 import re
 import bpy
 import math
+from functools import lru_cache
 from . import perf
 
+# Element geometry fields, in the order the legacy multi-pass solver evaluated them
+_W, _H, _X, _Y = range(4)
+# Variable suffix -> field. "$PositionX" alone means the parent's value.
+_LOCAL_FIELDS = {'sizex': _W, 'sizey': _H, 'positionx': _X, 'positiony': _Y}
+_STATIC_KEYS = ('width', 'height', 'pos_x', 'pos_y')
+_FORMULA_KEYS = ('formula_w', 'formula_h', 'formula_x', 'formula_y')
+
+_NO_BUILTINS = {"__builtins__": {}}
+# Compiled formulas kept in memory: enough for every formula of a large layout,
+# while sources left behind by edits are evicted
+FORMULA_CACHE_SIZE = 4096
+_NAME_RE = re.compile(r'[^a-zA-Z0-9_]')
+
+# Node kinds
+_STATIC, _RELATIVE, _FORMULA = range(3)
+# Binding kinds for formula names
+_B_NODE, _B_GLOBAL, _B_CONST, _B_OWN = range(4)
+
+
+class CompiledFormula:
+    """A formula parsed once: code object + every name it reads."""
+    __slots__ = ('code', 'names')
+
+    def __init__(self, code, names):
+        self.code = code
+        self.names = names
+
+
+def _code_names(code):
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if hasattr(const, 'co_names'):
+            names |= _code_names(const)
+    return names
+
+
+def compile_formula(expression):
+    """
+    "$Button1PositionX + 20" -> CompiledFormula, cached by source string.
+    Returns None for empty or unparsable formulas (the caller keeps its default).
+    """
+    if not expression or not isinstance(expression, str):
+        return None
+    return _compile_formula_cached(expression)
+
+
+@lru_cache(maxsize=FORMULA_CACHE_SIZE)
+def _compile_formula_cached(expression):
+    clean_expr = expression.lower().replace('$', '').replace('@', '').replace('#', '')
+    try:
+        code = compile(clean_expr, '<rzm formula>', 'eval')
+        compiled = CompiledFormula(code, tuple(sorted(_code_names(code))))
+    except (SyntaxError, ValueError):
+        compiled = None
+    return compiled
+
+
+class LayoutGraph:
+    """
+    Dependency graph over element geometry. One node per (element, field);
+    formula names are bound once to the nodes/values they read. Nodes are
+    grouped into strongly connected components in topological order, so a
+    change re-evaluates only its downstream closure, and cycles are isolated
+    into bounded iterations instead of slowing down the whole layout.
+    """
+
+    MAX_PASSES = 5
+
+    def __init__(self, elements_data, global_names):
+        n_el = len(elements_data)
+        self.ids = [el['id'] for el in elements_data]
+        self.names_safe = [_NAME_RE.sub('', el['name']).lower() for el in elements_data]
+        pos_of = {rid: i for i, rid in enumerate(self.ids)}
+        self.parent = [pos_of.get(el['parent_id'], -1) if el['parent_id'] != -1 else -1 for el in elements_data]
+
+        # "$Button1PositionX" -> node; later elements with the same name win
+        var_nodes = {}
+        for i, name in enumerate(self.names_safe):
+            if name:
+                for suffix, field in _LOCAL_FIELDS.items():
+                    var_nodes[name + suffix] = i * 4 + field
+
+        n = n_el * 4
+        self.kind = [_STATIC] * n
+        self.formula = [None] * n
+        self.bindings = [()] * n
+        self.deps = [()] * n
+        self.global_users = {}
+        for i, el in enumerate(elements_data):
+            p = self.parent[i]
+            for field in range(4):
+                node = i * 4 + field
+                is_formula = el['size_is_formula'] if field < _X else el['pos_is_formula']
+                if is_formula:
+                    self.kind[node] = _FORMULA
+                    compiled = compile_formula(el[_FORMULA_KEYS[field]])
+                    self.formula[node] = compiled
+                    if compiled is None:
+                        continue
+                    bindings = []
+                    deps = set()
+                    for name in compiled.names:
+                        local_field = _LOCAL_FIELDS.get(name)
+                        if local_field is not None:
+                            if p != -1:
+                                bindings.append((name, _B_NODE, p * 4 + local_field))
+                                deps.add(p * 4 + local_field)
+                            else:
+                                bindings.append((name, _B_OWN, local_field))
+                        elif name in global_names:
+                            bindings.append((name, _B_GLOBAL, name))
+                            self.global_users.setdefault(name, []).append(node)
+                        elif name in var_nodes:
+                            bindings.append((name, _B_NODE, var_nodes[name]))
+                            deps.add(var_nodes[name])
+                        else:
+                            # Unknown names evaluate to 0.0, like the legacy NameError retry
+                            bindings.append((name, _B_CONST, FormulaEvaluator.SAFE_MATH.get(name, 0.0)))
+                    self.bindings[node] = tuple(bindings)
+                    self.deps[node] = tuple(deps)
+                elif field >= _X and p != -1:
+                    # Static position is relative to the parent's global position
+                    self.kind[node] = _RELATIVE
+                    self.deps[node] = (p * 4 + field,)
+
+        self.dependents = [[] for _ in range(n)]
+        for node, deps in enumerate(self.deps):
+            for dep in deps:
+                self.dependents[dep].append(node)
+        self._build_components()
+
+    def _build_components(self):
+        """Iterative Tarjan: components come out dependencies-first."""
+        n = len(self.deps)
+        index = [-1] * n
+        low = [0] * n
+        on_stack = [False] * n
+        stack = []
+        components = []
+        counter = 0
+        for root in range(n):
+            if index[root] != -1:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, edge = work[-1]
+                if edge == 0:
+                    index[node] = low[node] = counter
+                    counter += 1
+                    stack.append(node)
+                    on_stack[node] = True
+                deps = self.deps[node]
+                if edge < len(deps):
+                    work[-1] = (node, edge + 1)
+                    dep = deps[edge]
+                    if index[dep] == -1:
+                        work.append((dep, 0))
+                    elif on_stack[dep]:
+                        low[node] = min(low[node], index[dep])
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    comp = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        comp.append(member)
+                        if member == node:
+                            break
+                    comp.sort()
+                    components.append(comp)
+
+        self.components = components
+        self.component_of = [0] * n
+        for c, comp in enumerate(components):
+            for node in comp:
+                self.component_of[node] = c
+        self.cyclic = [len(comp) > 1 or comp[0] in self.deps[comp[0]] for comp in components]
+
+    def downstream_components(self, dirty_nodes):
+        """Component ids reachable from dirty_nodes, in evaluation order."""
+        seen = set(dirty_nodes)
+        pending = list(seen)
+        while pending:
+            node = pending.pop()
+            for nxt in self.dependents[node]:
+                if nxt not in seen:
+                    seen.add(nxt)
+                    pending.append(nxt)
+        return sorted({self.component_of[node] for node in seen})
+
+
+class LayoutSolver:
+    """Keeps the graph and the last solution between viewport refreshes."""
+
+    def __init__(self):
+        self.graph = None
+        self._structure = None
+        self._statics = []
+        self._globals = {}
+        self.values = []
+        self.result = {}
+
+    @staticmethod
+    def _structure_key(elements_data, global_values):
+        return (
+            tuple(
+                (el['id'], el['name'], el['parent_id'], el['pos_is_formula'], el['size_is_formula'],
+                 el['formula_w'], el['formula_h'], el['formula_x'], el['formula_y'])
+                for el in elements_data
+            ),
+            tuple(global_values),
+        )
+
+    def solve(self, elements_data, global_values):
+        structure = self._structure_key(elements_data, global_values)
+        statics = [tuple(el[key] for key in _STATIC_KEYS) for el in elements_data]
+
+        if structure != self._structure:
+            self.graph = LayoutGraph(elements_data, global_values)
+            self._structure = structure
+            graph = self.graph
+            self.values = [0.0] * len(graph.deps)
+            self.result = {
+                rid: {'x': 0.0, 'y': 0.0, 'w': 0.0, 'h': 0.0, 'name_safe': graph.names_safe[i]}
+                for i, rid in enumerate(graph.ids)
+            }
+            components = range(len(graph.components))
+        else:
+            graph = self.graph
+            dirty = []
+            for i, (old, new) in enumerate(zip(self._statics, statics)):
+                if old != new:
+                    dirty.extend(range(i * 4, i * 4 + 4))
+            for name, value in global_values.items():
+                if self._globals.get(name) != value:
+                    dirty.extend(graph.global_users.get(name, ()))
+            if not dirty:
+                return dict(self.result)
+            components = graph.downstream_components(dirty)
+
+        self._statics = statics
+        self._globals = dict(global_values)
+        for c in components:
+            if graph.cyclic[c]:
+                self._solve_cycle(graph.components[c], statics, global_values)
+            else:
+                node = graph.components[c][0]
+                self.values[node] = self._eval_node(node, statics, global_values)
+
+        values = self.values
+        for i, rid in enumerate(graph.ids):
+            state = self.result[rid]
+            base = i * 4
+            state['w'] = values[base + _W]
+            state['h'] = values[base + _H]
+            state['x'] = values[base + _X]
+            state['y'] = values[base + _Y]
+        return dict(self.result)
+
+    def _solve_cycle(self, members, statics, global_values):
+        """Circular formulas: start from static values and iterate a bounded number of passes."""
+        values = self.values
+        for node in members:
+            values[node] = statics[node // 4][node % 4]
+        for _ in range(LayoutGraph.MAX_PASSES):
+            # Each pass reads the previous pass's values, like the legacy flat context
+            new_values = [self._eval_node(node, statics, global_values) for node in members]
+            if all(values[node] == value for node, value in zip(members, new_values)):
+                break
+            for node, value in zip(members, new_values):
+                values[node] = value
+
+    def _eval_node(self, node, statics, global_values):
+        graph = self.graph
+        el_pos, field = divmod(node, 4)
+        static = statics[el_pos][field]
+        kind = graph.kind[node]
+        if kind == _STATIC:
+            return static
+        if kind == _RELATIVE:
+            return static + self.values[graph.deps[node][0]]
+
+        compiled = graph.formula[node]
+        if compiled is None:
+            return static
+        values = self.values
+        local_vars = {}
+        for name, binding, payload in graph.bindings[node]:
+            if binding == _B_NODE:
+                local_vars[name] = values[payload]
+            elif binding == _B_GLOBAL:
+                local_vars[name] = global_values[payload]
+            elif binding == _B_OWN:
+                local_vars[name] = statics[el_pos][payload]
+            else:
+                local_vars[name] = payload
+        try:
+            return float(eval(compiled.code, _NO_BUILTINS, local_vars))
+        except Exception:
+            return static
+
+
 class FormulaEvaluator:
     """
     Handles parsing and evaluation of element formulas (e.g., "$Button1PositionX + 20").
     Supports flat 3DMigoto style variables and Hierarchy logic.
     """
-    
+
     SAFE_MATH = {
-        'min': min, 'max': max, 'abs': abs, 'round': round, 
-        'sin': math.sin, 'cos': math.cos, 'tan': math.tan, 
+        'min': min, 'max': max, 'abs': abs, 'round': round,
+        'sin': math.sin, 'cos': math.cos, 'tan': math.tan,
         'pi': math.pi, 'int': int, 'float': float
     }
 
+    # PERF: the graph and the last solution survive between refresh ticks,
+    # so an unchanged layout costs one structure comparison.
+    _solver = LayoutSolver()
+
     @staticmethod
     def resolve_layout(elements_data):
         """
-        Iterative resolution of elements.
+        Resolves element geometry in dependency order.
         elements_data: list of dicts (from get_viewport_data).
-        Returns: Dict {id: {final_x, final_y, final_w, final_h}} in GLOBAL coordinates.
+        Returns: Dict {id: {x, y, w, h, name_safe}} in GLOBAL coordinates.
         """
         with perf.scope("logic.resolve_layout", f"items={len(elements_data)}"):
-            return FormulaEvaluator._resolve_layout_impl(elements_data)
-
-    @staticmethod
-    def _resolve_layout_impl(elements_data):
-        # 1. Build Lookup Map by ID
-        id_map = {el['id']: el for el in elements_data}
-        
-        # State holds current FINAL GLOBAL calculated values. x,y are global.
-        resolved_state = {} 
-
-        for el in elements_data:
-            # Clean name for variable usage and normalize to lowercase
-            safe_name = re.sub(r'[^a-zA-Z0-9_]', '', el['name']).lower()
-            
-            # Initial guess: treat Blender local as global for start
-            resolved_state[el['id']] = {
-                'x': el['pos_x'],
-                'y': el['pos_y'],
-                'w': el['width'],
-                'h': el['height'],
-                'name_safe': safe_name
-            }
-
-        # 2. Iterative Resolution (Multi-pass)
-        MAX_PASSES = 5
-
-        for _ in range(MAX_PASSES):
-            changes_made = False
-
-            # Context for eval() - rebuilt every pass to get latest global values
-            eval_context = FormulaEvaluator._build_flat_context(resolved_state)
-
-            for el in elements_data:
-                rid = el['id']
-                state = resolved_state[rid]
-                parent_id = el['parent_id']
-
-                # Prepare Local Variable Context for this element
-                # If has parent -> use parent global values. If no parent -> use static local values.
-                local_vars = {}
-                if parent_id != -1 and parent_id in resolved_state:
-                    p_state = resolved_state[parent_id]
-                    local_vars['positionx'] = p_state['x']
-                    local_vars['positiony'] = p_state['y']
-                    local_vars['sizex'] = p_state['w']
-                    local_vars['sizey'] = p_state['h']
-                else:
-                    # Fallback to own static data
-                    local_vars['positionx'] = el['pos_x']
-                    local_vars['positiony'] = el['pos_y']
-                    local_vars['sizex'] = el['width']
-                    local_vars['sizey'] = el['height']
-                
-                # Merge local vars into local_context for this element's evaluation
-                local_eval_context = {**eval_context, **local_vars}
-
-                # --- A. Size Calculation ---
-                new_w, new_h = state['w'], state['h']
-                if el['size_is_formula']:
-                    new_w = FormulaEvaluator._eval_safe(el['formula_w'], local_eval_context, el['width'])
-                    new_h = FormulaEvaluator._eval_safe(el['formula_h'], local_eval_context, el['height'])
-
-                if new_w != state['w'] or new_h != state['h']:
-                    state['w'] = new_w
-                    state['h'] = new_h
-                    changes_made = True
-
-                # --- B. Position Calculation (Hierarchy vs Absolute) ---
-                local_x, local_y = el['pos_x'], el['pos_y']
-
-                if el['pos_is_formula']:
-                    # Formula is treated as ABSOLUTE (defines global position)
-                    calc_x = FormulaEvaluator._eval_safe(el['formula_x'], local_eval_context, local_x)
-                    calc_y = FormulaEvaluator._eval_safe(el['formula_y'], local_eval_context, local_y)
-                    
-                    final_x, final_y = calc_x, calc_y
-                else:
-                    # If NO formula, coords are relative to parent's global pos
-                    final_x, final_y = local_x, local_y
-                    if parent_id != -1 and parent_id in resolved_state:
-                        parent_state = resolved_state[parent_id]
-                        final_x += parent_state['x']
-                        final_y += parent_state['y']
-
-                if final_x != state['x'] or final_y != state['y']:
-                    state['x'] = final_x
-                    state['y'] = final_y
-                    changes_made = True
-
-            if not changes_made:
-                break
-
-        return resolved_state
+            return FormulaEvaluator._solver.solve(elements_data, FormulaEvaluator._global_values())
 
     @staticmethod
-    def _build_flat_context(resolved_state):
+    def _global_values():
         """
-        Creates a dictionary of flattened, lowercase variables.
-        $Button1PositionX -> mapped to Button1's current global X.
+        Project-level names visible to formulas: values ($), toggles (@), shapes (#).
+        They take precedence over element variables with the same name.
         """
-        ctx = FormulaEvaluator.SAFE_MATH.copy()
-
-        for rid, data in resolved_state.items():
-            name = data['name_safe']
-            if not name: continue
-            
-        # Inject keys normalized to lowercase
-            ctx[f"{name}positionx"] = data['x']
-            ctx[f"{name}positiony"] = data['y']
-            ctx[f"{name}sizex"] = data['w']
-            ctx[f"{name}sizey"] = data['h']
-
-        # Add Global RZM Values, Toggles, and Shapes
+        ctx = {}
         if bpy.context and bpy.context.scene:
             rzm = bpy.context.scene.rzm
-            
+
             # Values ($)
             for val in rzm.rzm_values:
                 # Value names like "$MyVar" -> "myvar"
-                clean_name = val.value_name.lower().replace('$','')
+                clean_name = val.value_name.lower().replace('$', '')
                 if val.value_type == 'INT':
                     ctx[clean_name] = val.int_value
                 else:
                     ctx[clean_name] = val.float_value
-            
-            # Toggles (@) - Map to 1.0 (True) or 0.0 (False) if we had state. 
+
+            # Toggles (@) - Map to 1.0 (True) or 0.0 (False) if we had state.
             # For now mapping to 0.0 as default existence for layout resolution.
             # Real runtime value comes from game engine, but here we just need valid parsing.
             for toggle in rzm.toggle_definitions:
                 clean_name = toggle.toggle_name.lower().replace('@', '')
                 ctx[clean_name] = 0.0
-                
+
             # Shapes (#)
             for shape in rzm.shapes:
                 clean_name = shape.shape_name.lower().replace('#', '')
                 ctx[clean_name] = 0.0
 
         return ctx
-
-    @staticmethod
-    def _eval_safe(expression, context, default_val):
-        """
-        Parses string, handles case-insensitivity, flattening, and eval.
-        """
-        if not expression or not isinstance(expression, str):
-            return default_val
-
-        try:
-            # 1. Normalize expression to lowercase
-            expr_lower = expression.lower()
-
-            # 2. Remove '$', '@', '#' signs
-            clean_expr = expr_lower.replace('$', '').replace('@', '').replace('#', '')
-
-            # 3. Eval with recursive resolution for unknown names
-            while True:
-                try:
-                    res = eval(clean_expr, {"__builtins__": {}}, context)
-                    return float(res)
-                except NameError as ne:
-                    # e.g. name 'w23' is not defined
-                    parts = str(ne).split("'")
-                    if len(parts) >= 2:
-                        missing_name = parts[1]
-                        if missing_name in context: 
-                            raise ne
-                        context[missing_name] = 0.0
-                        continue
-                    raise ne
-                except Exception:
-                    return default_val
-        except Exception:
-            return default_val
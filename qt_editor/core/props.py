@@ -1,6 +1,7 @@
 import bpy
 from . import signals
 from . import blender_bridge
+from . import revision
 from .read import get_element_by_id
 from ..utils.string_utils import find_common_pattern, apply_pattern_change
 
@@ -157,6 +158,7 @@ def add_element_tier(target_ids, tier_id: str):
                     t.tier_id = tier_id
                     changed = True
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push(f"RZM: Add Tier {tier_id}")
             signals.SIGNALS.data_changed.emit()
 
@@ -176,6 +178,7 @@ def remove_element_tier(target_ids, tier_id: str):
                         changed = True
                         break
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push(f"RZM: Remove Tier {tier_id}")
             signals.SIGNALS.data_changed.emit()
 
@@ -240,6 +243,7 @@ def update_property_multi(target_ids, prop_name, value, sub_index=None, fast_mod
                     changed = True
 
         if changed:
+            revision.touch_elements(target_ids)
             if not fast_mode: 
                 blender_bridge.safe_undo_push(f"RZM: Change {prop_name}")
             
@@ -268,6 +272,7 @@ def toggle_editor_flag(target_ids, flag_name):
                 changed = True
         
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push(f"RZM: Toggle {flag_name}")
             signals.SIGNALS.data_changed.emit()
             signals.SIGNALS.structure_changed.emit()
@@ -284,6 +289,7 @@ def add_conditional_image(target_ids):
                 changed = True
         
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push("RZM: Add Conditional Image")
             signals.SIGNALS.data_changed.emit()
 
@@ -298,6 +304,7 @@ def remove_conditional_image(target_ids, index):
                 changed = True
         
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push("RZM: Remove Conditional Image")
             signals.SIGNALS.data_changed.emit()
 
@@ -316,6 +323,7 @@ def update_conditional_image(target_ids, index, field, value):
                         changed = True
         
         if changed:
+            revision.touch_elements(target_ids)
             # We don't always want undo push for every keystroke if it's text
             # But for simplicity here we do it.
             blender_bridge.safe_undo_push(f"RZM: Update CI {field}")
@@ -331,6 +339,7 @@ def reorder_conditional_image(target_ids, old_index, new_index):
                 elem.conditional_images.move(old_index, new_index)
                 changed = True
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push("RZM: Reorder Conditional Images")
             signals.SIGNALS.data_changed.emit()
 
@@ -345,6 +354,7 @@ def add_conditional_text(target_ids):
                 changed = True
         
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push("RZM: Add Conditional Text")
             signals.SIGNALS.data_changed.emit()
 
@@ -359,6 +369,7 @@ def remove_conditional_text(target_ids, index):
                 changed = True
         
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push("RZM: Remove Conditional Text")
             signals.SIGNALS.data_changed.emit()
 
@@ -377,6 +388,7 @@ def update_conditional_text(target_ids, index, field, value):
                         changed = True
         
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push(f"RZM: Update CT {field}")
             signals.SIGNALS.data_changed.emit()
 
@@ -390,6 +402,7 @@ def reorder_conditional_text(target_ids, old_index, new_index):
                 elem.conditional_texts.move(old_index, new_index)
                 changed = True
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push("RZM: Reorder Conditional Texts")
             signals.SIGNALS.data_changed.emit()
 
@@ -404,6 +417,7 @@ def add_localized_text(target_ids):
                 changed = True
         
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push("RZM: Add Localized Text")
             signals.SIGNALS.data_changed.emit()
 
@@ -418,6 +432,7 @@ def remove_localized_text(target_ids, index):
                 changed = True
         
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push("RZM: Remove Localized Text")
             signals.SIGNALS.data_changed.emit()
 
@@ -436,6 +451,7 @@ def update_localized_text(target_ids, index, field, value):
                         changed = True
         
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push(f"RZM: Update LT {field}")
             signals.SIGNALS.data_changed.emit()
 
@@ -449,6 +465,7 @@ def add_localized_text_to_ct(target_ids, ct_index):
                 elem.conditional_texts[ct_index].localized_texts.add()
                 changed = True
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push("RZM: Add CT Localized Text")
             signals.SIGNALS.data_changed.emit()
 
@@ -464,6 +481,7 @@ def remove_localized_text_from_ct(target_ids, ct_index, index):
                     ct.localized_texts.remove(index)
                     changed = True
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push("RZM: Remove CT Localized Text")
             signals.SIGNALS.data_changed.emit()
 
@@ -482,6 +500,7 @@ def update_localized_text_in_ct(target_ids, ct_index, index, field, value):
                             setattr(item, field, value)
                             changed = True
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push(f"RZM: Update CT LT {field}")
             signals.SIGNALS.data_changed.emit()
 
@@ -497,6 +516,7 @@ def add_value_link(target_ids):
                 changed = True
         
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push("RZM: Add Value Link")
             signals.SIGNALS.data_changed.emit()
 
@@ -514,6 +534,7 @@ def add_value_link_with_name(target_ids, var_name):
             changed = True
         
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push(f"RZM: Add Link {var_name}")
             signals.SIGNALS.data_changed.emit()
 
@@ -528,6 +549,7 @@ def remove_value_link(target_ids, index):
                 changed = True
         
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push("RZM: Remove Value Link")
             signals.SIGNALS.data_changed.emit()
 
@@ -546,6 +568,7 @@ def update_value_link(target_ids, index, field, value):
                         changed = True
         
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push(f"RZM: Update VL {field}")
             signals.SIGNALS.data_changed.emit()
 
@@ -560,6 +583,7 @@ def add_fx(target_ids):
                 changed = True
         
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push("RZM: Add FX")
             signals.SIGNALS.data_changed.emit()
 
@@ -574,6 +598,7 @@ def remove_fx(target_ids, index):
                 changed = True
         
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push("RZM: Remove FX")
             signals.SIGNALS.data_changed.emit()
 
@@ -587,6 +612,7 @@ def reorder_fx(target_ids, old_index, new_index):
                 elem.fx.move(old_index, new_index)
                 changed = True
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push("RZM: Reorder FX")
             signals.SIGNALS.data_changed.emit()
 
@@ -605,6 +631,7 @@ def update_fx(target_ids, index, value):
                     changed = True
         
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push(f"RZM: Update FX {value}")
             signals.SIGNALS.data_changed.emit()
             
@@ -619,6 +646,7 @@ def add_fn(target_ids):
                 changed = True
         
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push("RZM: Add Function")
             signals.SIGNALS.data_changed.emit()
 
@@ -633,6 +661,7 @@ def remove_fn(target_ids, index):
                 changed = True
         
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push("RZM: Remove Function")
             signals.SIGNALS.data_changed.emit()
 
@@ -646,6 +675,7 @@ def reorder_fn(target_ids, old_index, new_index):
                 elem.fn.move(old_index, new_index)
                 changed = True
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push("RZM: Reorder Functions")
             signals.SIGNALS.data_changed.emit()
 
@@ -662,6 +692,7 @@ def update_fn(target_ids, index, value):
                     changed = True
         
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push(f"RZM: Update Function {value}")
             signals.SIGNALS.data_changed.emit()
 
@@ -737,6 +768,7 @@ def add_preset_id(target_ids, preset_data):
                             changed = True
         
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push("RZM: Add Preset")
             signals.SIGNALS.data_changed.emit()
 
@@ -751,6 +783,7 @@ def remove_preset_id(target_ids, index):
                 changed = True
         
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push("RZM: Remove Preset")
             signals.SIGNALS.data_changed.emit()
 
@@ -766,6 +799,7 @@ def reorder_preset_id(target_ids, old_index, new_index):
                     changed = True
         
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push("RZM: Reorder Presets")
             signals.SIGNALS.data_changed.emit()
 
@@ -826,6 +860,7 @@ def add_underlayer_preset_id(target_ids, preset_data):
                             changed = True
         
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push("RZM: Add Underlayer Preset")
             signals.SIGNALS.data_changed.emit()
 
@@ -840,6 +875,7 @@ def remove_underlayer_preset_id(target_ids, index):
                 changed = True
         
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push("RZM: Remove Underlayer Preset")
             signals.SIGNALS.data_changed.emit()
 
@@ -855,6 +891,7 @@ def reorder_underlayer_preset_id(target_ids, old_index, new_index):
                     changed = True
         
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push("RZM: Reorder Underlayer Presets")
             signals.SIGNALS.data_changed.emit()
 
@@ -919,6 +956,7 @@ def add_helper_id(target_ids, helper_data):
                             changed = True
         
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push("RZM: Add Helper")
             signals.SIGNALS.data_changed.emit()
 
@@ -934,6 +972,7 @@ def remove_helper_id(target_ids, index):
                 changed = True
         
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push("RZM: Remove Helper")
             signals.SIGNALS.data_changed.emit()
 
@@ -950,45 +989,58 @@ def reorder_helper_id(target_ids, old_index, new_index):
                     changed = True
         
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push("RZM: Reorder Helpers")
             signals.SIGNALS.data_changed.emit()
 
 
 def perform_math_operation(target_ids, prop_name, op_str, sub_index=None):
+    """
+    Relative edit on every target: "+=10", "*=2", "-=$Value/2" ...
+    The operand is compiled once and evaluated per element ($Value = current value).
+    """
     if not target_ids: return
+    from ..utils.evaluation import compile_expression, safe_eval_many
 
     mapping = PROP_MAP.get(prop_name)
     bl_prop = mapping[0] if mapping else prop_name
     bl_idx = mapping[1] if mapping and mapping[1] is not None else sub_index
     
     op = op_str[:2]
-    try: val = float(op_str[2:])
-    except ValueError: return
+    if op not in ("+=", "-=", "*=", "/="): return
+    operand = op_str[2:]
+    if compile_expression(operand) is None: return
 
     with signals.qt_update_guard():
         elements = bpy.context.scene.rzm.elements
-        changed = False
+        targets = []
         for elem in elements:
             if elem.id in target_ids and hasattr(elem, bl_prop):
                 current_obj = getattr(elem, bl_prop)
                 try:
                     curr_val = current_obj[bl_idx] if bl_idx is not None else float(current_obj)
                 except: continue
+                targets.append((elem, current_obj, curr_val))
 
-                if op == "+=": new_val = curr_val + val
-                elif op == "-=": new_val = curr_val - val
-                elif op == "*=": new_val = curr_val * val
-                elif op == "/=": new_val = curr_val / val if val != 0 else curr_val
-                else: continue
+        values = safe_eval_many(operand, [{"$Value": curr_val} for _, _, curr_val in targets])
+        changed = False
+        for (elem, current_obj, curr_val), val in zip(targets, values):
+            if not isinstance(val, (int, float)): continue
 
-                if bl_idx is not None:
-                    current_obj[bl_idx] = int(new_val) if isinstance(curr_val, int) else new_val
-                    setattr(elem, bl_prop, current_obj)
-                else:
-                    setattr(elem, bl_prop, int(new_val) if isinstance(current_obj, int) else new_val)
-                changed = True
+            if op == "+=": new_val = curr_val + val
+            elif op == "-=": new_val = curr_val - val
+            elif op == "*=": new_val = curr_val * val
+            else: new_val = curr_val / val if val != 0 else curr_val
+
+            if bl_idx is not None:
+                current_obj[bl_idx] = int(new_val) if isinstance(curr_val, int) else new_val
+                setattr(elem, bl_prop, current_obj)
+            else:
+                setattr(elem, bl_prop, int(new_val) if isinstance(current_obj, int) else new_val)
+            changed = True
 
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push(f"RZM: Math {op_str} on {prop_name}")
             signals.SIGNALS.transform_changed.emit()
             signals.SIGNALS.data_changed.emit()
@@ -1075,6 +1127,7 @@ def update_property_multi_pattern(target_ids, prop_name, new_pattern, sub_index=
                     changed = True
 
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push(f"RZM: Pattern Rename {prop_name}")
             signals.SIGNALS.data_changed.emit()
             if sig_type == 'S':
@@ -1133,6 +1186,7 @@ def update_value_link_multi_pattern(target_ids, index, field, new_pattern, origi
                 changed = True
         
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push(f"RZM: Pattern Rename VL {field}")
             signals.SIGNALS.data_changed.emit()
 def update_element_id(old_id, new_id):
@@ -1144,6 +1198,7 @@ def update_element_id(old_id, new_id):
     try:
         # We use direct operator call because it handles complex hierarchy logic
         bpy.ops.rzm.update_element_id(old_id=old_id, new_id=new_id)
+        revision.invalidate_all()
         
         # Structure changed is emitted by the operator itself, 
         # but we re-emit just in case to ensure UI full refresh
@@ -1188,6 +1243,7 @@ def reset_element_ratio(target_ids):
                 changed = True
         
         if changed:
+            revision.touch_elements(target_ids)
             blender_bridge.safe_undo_push("RZM: Reset Ratio")
             signals.SIGNALS.transform_changed.emit()
             signals.SIGNALS.data_changed.emit()
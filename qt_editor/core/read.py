@@ -1,6 +1,7 @@
 # RZMenu/qt_editor/core/read.py
 import bpy
 from . import perf
+from . import revision
 import re
 from ..utils.image_cache import ImageCache
 from ..utils.string_utils import find_common_pattern
@@ -545,16 +546,25 @@ def _get_selection_details_impl(selected_ids, active_id):
     return None
 
 def get_viewport_data():
+    """Full element list (base + virtual preset/helper copies), served from the revision snapshot."""
     with perf.scope("read.get_viewport_data"):
-        return _get_viewport_data_impl()
+        return list(_SNAPSHOT.sync())
 
 
-def _get_viewport_data_impl():
-    results = []
-    if not bpy.context or not bpy.context.scene: return results
+def get_viewport_delta(since_revision=-1):
+    """
+    Changes since since_revision (a 'revision' returned by an earlier call):
+    {'revision', 'full', 'changed': [item dicts], 'removed': [ids], 'elements': [all items]}.
+    Only elements touched through core write paths are re-read from RNA;
+    'full' is True after an untracked change or for a stale since_revision.
+    The item dicts are shared with the snapshot and must not be mutated.
+    """
+    with perf.scope("read.get_viewport_delta"):
+        _SNAPSHOT.sync()
+        return _SNAPSHOT.delta(since_revision)
 
-    rzm = bpy.context.scene.rzm
 
+def _read_image_lookup(rzm):
     # PERF: Build image lookup once per call (O(M)) instead of running a
     # linear search through rzm.images for every element (was O(N×M)).
     # With 147 images and 158 elements this was ~23k iterations per 16ms tick.
@@ -563,89 +573,112 @@ def _get_viewport_data_impl():
     for img in rzm.images:
         _img_source_type[img.id]  = getattr(img, 'source_type', 'STATIC')
         _img_svg_preserve[img.id] = getattr(img, 'svg_preserve_color', True)
+    return _img_source_type, _img_svg_preserve
+
+
+def _read_element_item(elem, idx, image_lookup):
+    _img_source_type, _img_svg_preserve = image_lookup
+    color_list = None
+    if hasattr(elem, "color"):
+        color_list = list(elem.color)
+        if len(color_list) == 3: color_list.append(1.0)
+
+    # Prepare basic data
+    item = {
+        "id": elem.id,
+        "order": idx,  # Array index for Z-ordering
+        "name": elem.element_name,
+        "class_type": elem.elem_class,
+        "parent_id": getattr(elem, "parent_id", -1),
+
+        # Static geometry (defaults)
+        "pos_x": elem.position[0],
+        "pos_y": elem.position[1],
+        "width": elem.size[0],
+        "height": elem.size[1],
+        "rotation": elem.rotation,
+
+        # Formula flags
+        "pos_is_formula": getattr(elem, "position_is_formula", False),
+        "size_is_formula": getattr(elem, "size_is_formula", False),
+        "rotation_is_formula": getattr(elem, "rotation_is_formula", False),
+        "transform_is_formula": getattr(elem, "transform_is_formula", False),
+
+        # Formula strings (Important: sanitize/default to empty string)
+        "formula_x": getattr(elem, "position_formula_x", ""),
+        "formula_y": getattr(elem, "position_formula_y", ""),
+        "formula_w": getattr(elem, "size_formula_x", ""),
+        "formula_h": getattr(elem, "size_formula_y", ""),
+        "transform_is_formula": getattr(elem, "transform_is_formula", False),
+        "transform_formula": getattr(elem, "transform_formula", ""),
+        "disable_export": getattr(elem, "disable_export", False),
+        "trackable": getattr(elem, "trackable", False),
+
+
+        # Visuals
+        "image_id": elem.image_id,
+        "hover_image_id": getattr(elem, "hover_image_id", -1),
+        "image_blending_mode": getattr(elem, "image_blending_mode", 'NONE'),
+        "image_source_type": _img_source_type.get(elem.image_id, 'STATIC') if elem.image_id != -1 else 'NONE',
+        "svg_preserve_color": _img_svg_preserve.get(elem.image_id, True) if elem.image_id != -1 else True,
+        "svg_scale": getattr(elem, "svg_scale", 1.0),
+        "svg_offset_x": getattr(elem, "svg_offset", [0, 0])[0],
+        "svg_offset_y": getattr(elem, "svg_offset", [0, 0])[1],
+        "font_slot": getattr(elem, "font_slot", 0),
+        "flip_x": getattr(elem, "flip_x", False),
+        "flip_y": getattr(elem, "flip_y", False),
+        "text_id": getattr(elem, "text_id", ""),
+        "color": color_list,
+        "is_hidden": getattr(elem, "qt_hide", False),
+        "is_selectable": getattr(elem, "qt_selectable", True),
+        "is_locked_pos": getattr(elem, "qt_lock_pos", False),
+        "is_locked_size": getattr(elem, "qt_lock_size", False),
+        "qt_lock_ratio": getattr(elem, "qt_lock_ratio", False),
+        "alignment": getattr(elem, "alignment", "BOTTOM_LEFT"),
+        "text_align": getattr(elem, "text_align", "LEFT"),
+
+        # Formula Logic (Color / Logic)
+        "color_is_formula": getattr(elem, "color_is_formula", False),
+        "color_formula_r": getattr(elem, "color_formula_r", "1"),
+        "color_formula_g": getattr(elem, "color_formula_g", "1"),
+        "color_formula_b": getattr(elem, "color_formula_b", "1"),
+        "color_formula_a": getattr(elem, "color_formula_a", "1"),
+        "value_link_is_formula": getattr(elem, "value_link_is_formula", False),
+        "value_link_formula": getattr(elem, "value_link_formula", ""),
+
+        "is_tab_container": getattr(elem, "is_tab_container", False),
+        "page_color": list(getattr(elem, "page_color", [0.5, 0.5, 0.5, 1.0])),
+        "qt_preset_hide": getattr(elem, "qt_preset_hide", False),
+        "is_helper": getattr(elem, "is_helper", False),
+        "is_template_prefab": getattr(elem, "is_template_prefab", False),
+        
+        # Grid props
+        "grid_cell_size": getattr(elem, "grid_cell_size", 50),
+        "grid_cols": getattr(elem, "grid_min_cells", [1,1])[0],
+        "style_id": getattr(elem, "style_id", -1)
+    }
+    return item
 
-    for idx, elem in enumerate(rzm.elements):
-        color_list = None
-        if hasattr(elem, "color"):
-            color_list = list(elem.color)
-            if len(color_list) == 3: color_list.append(1.0)
 
-        # Prepare basic data
-        item = {
-            "id": elem.id,
-            "order": idx,  # Array index for Z-ordering
-            "name": elem.element_name,
-            "class_type": elem.elem_class,
-            "parent_id": getattr(elem, "parent_id", -1),
-
-            # Static geometry (defaults)
-            "pos_x": elem.position[0],
-            "pos_y": elem.position[1],
-            "width": elem.size[0],
-            "height": elem.size[1],
-            "rotation": elem.rotation,
-
-            # Formula flags
-            "pos_is_formula": getattr(elem, "position_is_formula", False),
-            "size_is_formula": getattr(elem, "size_is_formula", False),
-            "rotation_is_formula": getattr(elem, "rotation_is_formula", False),
-            "transform_is_formula": getattr(elem, "transform_is_formula", False),
-
-            # Formula strings (Important: sanitize/default to empty string)
-            "formula_x": getattr(elem, "position_formula_x", ""),
-            "formula_y": getattr(elem, "position_formula_y", ""),
-            "formula_w": getattr(elem, "size_formula_x", ""),
-            "formula_h": getattr(elem, "size_formula_y", ""),
-            "transform_is_formula": getattr(elem, "transform_is_formula", False),
-            "transform_formula": getattr(elem, "transform_formula", ""),
-            "disable_export": getattr(elem, "disable_export", False),
-            "trackable": getattr(elem, "trackable", False),
-
-
-            # Visuals
-            "image_id": elem.image_id,
-            "hover_image_id": getattr(elem, "hover_image_id", -1),
-            "image_blending_mode": getattr(elem, "image_blending_mode", 'NONE'),
-            "image_source_type": _img_source_type.get(elem.image_id, 'STATIC') if elem.image_id != -1 else 'NONE',
-            "svg_preserve_color": _img_svg_preserve.get(elem.image_id, True) if elem.image_id != -1 else True,
-            "svg_scale": getattr(elem, "svg_scale", 1.0),
-            "svg_offset_x": getattr(elem, "svg_offset", [0, 0])[0],
-            "svg_offset_y": getattr(elem, "svg_offset", [0, 0])[1],
-            "font_slot": getattr(elem, "font_slot", 0),
-            "flip_x": getattr(elem, "flip_x", False),
-            "flip_y": getattr(elem, "flip_y", False),
-            "text_id": getattr(elem, "text_id", ""),
-            "color": color_list,
-            "is_hidden": getattr(elem, "qt_hide", False),
-            "is_selectable": getattr(elem, "qt_selectable", True),
-            "is_locked_pos": getattr(elem, "qt_lock_pos", False),
-            "is_locked_size": getattr(elem, "qt_lock_size", False),
-            "qt_lock_ratio": getattr(elem, "qt_lock_ratio", False),
-            "alignment": getattr(elem, "alignment", "BOTTOM_LEFT"),
-            "text_align": getattr(elem, "text_align", "LEFT"),
-
-            # Formula Logic (Color / Logic)
-            "color_is_formula": getattr(elem, "color_is_formula", False),
-            "color_formula_r": getattr(elem, "color_formula_r", "1"),
-            "color_formula_g": getattr(elem, "color_formula_g", "1"),
-            "color_formula_b": getattr(elem, "color_formula_b", "1"),
-            "color_formula_a": getattr(elem, "color_formula_a", "1"),
-            "value_link_is_formula": getattr(elem, "value_link_is_formula", False),
-            "value_link_formula": getattr(elem, "value_link_formula", ""),
+def _read_element_refs(elem):
+    """Preset/helper links of an element; None where the collection does not exist."""
+    def ref_ids(collection_name, attr):
+        collection = getattr(elem, collection_name, None)
+        if collection is None:
+            return None
+        return tuple(getattr(ref, attr) for ref in collection)
 
-            "is_tab_container": getattr(elem, "is_tab_container", False),
-            "page_color": list(getattr(elem, "page_color", [0.5, 0.5, 0.5, 1.0])),
-            "qt_preset_hide": getattr(elem, "qt_preset_hide", False),
-            "is_helper": getattr(elem, "is_helper", False),
-            "is_template_prefab": getattr(elem, "is_template_prefab", False),
-            
-            # Grid props
-            "grid_cell_size": getattr(elem, "grid_cell_size", 50),
-            "grid_cols": getattr(elem, "grid_min_cells", [1,1])[0],
-            "style_id": getattr(elem, "style_id", -1)
-        }
-        results.append(item)
+    return {
+        'is_preset': getattr(elem, "is_preset", False),
+        'is_helper': getattr(elem, "is_helper", False),
+        'qt_preset_hide': getattr(elem, "qt_preset_hide", False),
+        'preset_ids': ref_ids("preset_ids", "preset_id"),
+        'underlayer_preset_ids': ref_ids("underlayer_preset_ids", "preset_id"),
+        'helper_ids': ref_ids("helper_ids", "helper_id"),
+    }
 
+
+def _inject_virtual_elements(results, refs_by_id):
     # --- PRESET LOGIC: VIRTUAL ELEMENT INJECTION ---
     # 1. Create a map of ID -> Element Data for fast lookup of preset sources
     # We can use the results list we just built, but we need to index it.
@@ -657,30 +690,23 @@ def _get_viewport_data_impl():
     virtual_elements = []
     
     for host_item in results:
-        # Check if host uses presets
-        # We need to access the Blender object to iterate the collection properly because
-        # our simple dict 'host_item' doesn't contain the full collection of presets yet.
-        # We need to re-access the blender element.
-        # It's inefficient to assume index matches, so let's use ID or re-find.
-        # Optimization: We are iterating 'results' which came from 'rzm.elements' in order.
-        # So 'bpy.context.scene.rzm.elements[idx]' matches results[idx] if no deletions happened during this loop (safe).
-        # Wait, 'results' has 'order' == loop index.
-        
-        host_elem = bpy.context.scene.rzm.elements[host_item['order']] 
+        # Check if host uses presets.
+        # Preset/helper collections are read together with the element (_read_element_refs),
+        # so injection works on plain dicts and never touches RNA.
+        host_refs = refs_by_id[host_item['id']]
         
-        if getattr(host_elem, "is_preset", False):
+        if host_refs['is_preset']:
             # Presets themselves cannot have presets (to avoid infinite recursion for now)
             continue
             
-        if getattr(host_elem, "qt_preset_hide", False):
+        if host_refs['qt_preset_hide']:
             continue
             
-        if not hasattr(host_elem, "preset_ids"): continue # Safety if property not added yet
+        if host_refs['preset_ids'] is None: continue # Safety if property not added yet
         
         # Iterate underlayers assigned to this element (UNDERNEATH)
-        if hasattr(host_elem, "underlayer_preset_ids"):
-            for p_ref in host_elem.underlayer_preset_ids:
-                preset_id = p_ref.preset_id
+        if host_refs['underlayer_preset_ids'] is not None:
+            for preset_id in host_refs['underlayer_preset_ids']:
                 preset_source = elem_map.get(preset_id)
                 if not preset_source: continue
                 
@@ -703,14 +729,11 @@ def _get_viewport_data_impl():
                 virtual_elements.append(v_item)
 
         # Iterate standard presets assigned to this element
-        for p_ref in host_elem.preset_ids:
+        for preset_id in host_refs['preset_ids']:
 
-            preset_id = p_ref.preset_id
             preset_source = elem_map.get(preset_id)
             
             if not preset_source: 
-                source_bl = get_element_by_id(preset_id)
-                if not source_bl: continue
                 continue 
             
             # Create Virtual Element
@@ -812,18 +835,17 @@ def _get_viewport_data_impl():
 
     # --- HELPER LOGIC: Virtual element injection (same as presets, but flagged as helper) ---
     for host_item in results:
-        host_elem = bpy.context.scene.rzm.elements[host_item['order']]
+        host_refs = refs_by_id[host_item['id']]
 
-        if getattr(host_elem, "is_preset", False) or getattr(host_elem, "is_helper", False):
+        if host_refs['is_preset'] or host_refs['is_helper']:
             continue
 
-        if getattr(host_elem, "qt_preset_hide", False):
+        if host_refs['qt_preset_hide']:
             continue
 
-        if not hasattr(host_elem, "helper_ids"): continue
+        if host_refs['helper_ids'] is None: continue
 
-        for h_ref in host_elem.helper_ids:
-            helper_id = h_ref.helper_id
+        for helper_id in host_refs['helper_ids']:
             helper_source = elem_map.get(helper_id)
             if not helper_source:
                 continue
@@ -868,10 +890,155 @@ def _get_viewport_data_impl():
                     collect_helper_children_recursive(child_item['id'], child_virtual_id, depth + 1)
 
             collect_helper_children_recursive(helper_id, virtual_id)
+    return virtual_elements
 
-    results.extend(virtual_elements)
 
-    return results
+class ViewportSnapshot:
+    """
+    Cached viewport items kept in sync with rzm.elements through revision.py.
+    A tracked edit re-reads only the touched elements; add/remove/reorder
+    re-reads the id order (one int per element) plus the touched elements.
+    """
+
+    def __init__(self):
+        self.revision = -1
+        self.base_revision = -1  # revision of the last full rebuild
+        self.items = []          # base items in collection order
+        self.by_id = {}
+        self.refs = {}
+        self.virtual = {}        # virtual id -> item, in injection order
+        self.elements = []
+        self.changed_at = {}     # id -> snapshot revision of its last change
+        self.removed_at = {}
+        self._images = ({}, {})
+
+    def sync(self):
+        if not bpy.context or not bpy.context.scene:
+            self.__init__()
+            return self.elements
+        rzm = bpy.context.scene.rzm
+        rev = revision.current()
+        if rev == self.revision:
+            if len(rzm.elements) == len(self.items):
+                return self.elements
+            # Count changed behind our back: treat like any other untracked change
+            revision.invalidate_all()
+            rev = revision.current()
+
+        full, structure, dirty = revision.changes_since(self.revision)
+        if full or self.revision < 0:
+            self._rebuild(rzm, rev)
+        elif not self._update(rzm, rev, structure, dirty):
+            self._rebuild(rzm, rev)
+        self.revision = rev
+        return self.elements
+
+    def _rebuild(self, rzm, rev):
+        self._images = _read_image_lookup(rzm)
+        old_ids = set(self.by_id) | set(self.virtual)
+        self.items = [_read_element_item(elem, idx, self._images) for idx, elem in enumerate(rzm.elements)]
+        self.refs = {}
+        for elem in rzm.elements:
+            self.refs[elem.id] = _read_element_refs(elem)
+        self.by_id = {item['id']: item for item in self.items}
+        self.virtual = {item['id']: item for item in _inject_virtual_elements(self.items, self.refs)}
+        self.elements = self.items + list(self.virtual.values())
+        self.changed_at = {item['id']: rev for item in self.elements}
+        self.removed_at = {}
+        for uid in old_ids - set(self.changed_at):
+            self.removed_at[uid] = rev
+        self.base_revision = rev
+
+    def _update(self, rzm, rev, structure, dirty):
+        """Applies tracked changes. Returns False when a full rebuild is needed."""
+        elements = rzm.elements
+        changed = set()
+        refs_changed = False
+        if structure:
+            self._images = _read_image_lookup(rzm)
+            ids = [elem.id for elem in elements]
+            index_of = {uid: i for i, uid in enumerate(ids)}
+            if len(index_of) != len(ids):
+                return False  # duplicate ids: let the full path sort it out
+            reread = {uid for uid in dirty if uid in index_of}
+            reread.update(uid for uid in ids if uid not in self.by_id)
+            for uid in list(self.by_id):
+                if uid not in index_of:
+                    del self.by_id[uid]
+                    self.refs.pop(uid, None)
+                    self.removed_at[uid] = rev
+            items = []
+            for i, uid in enumerate(ids):
+                item = self.by_id.get(uid)
+                if uid in reread:
+                    elem = elements[i]
+                    refs_changed |= self._reread_refs(uid, elem)
+                    new_item = _read_element_item(elem, i, self._images)
+                    if new_item != item:
+                        item = new_item
+                        changed.add(uid)
+                elif item['order'] != i:
+                    item = dict(item, order=i)
+                    changed.add(uid)
+                self.by_id[uid] = item
+                items.append(item)
+            self.items = items
+        else:
+            if len(elements) != len(self.items):
+                return False
+            for uid in dirty:
+                elem = get_element_by_id(uid)
+                if elem is None:
+                    if uid in self.by_id:
+                        return False  # removed without a structure touch
+                    continue
+                idx = ID_CACHE[uid]
+                old_item = self.by_id.get(uid)
+                if old_item is None or old_item['order'] != idx:
+                    return False
+                refs_changed |= self._reread_refs(uid, elem)
+                new_item = _read_element_item(elem, idx, self._images)
+                if new_item != old_item:
+                    self.items[idx] = self.by_id[uid] = new_item
+                    changed.add(uid)
+
+        if changed or structure or refs_changed:
+            virtual = {item['id']: item for item in _inject_virtual_elements(self.items, self.refs)}
+            for uid, item in virtual.items():
+                if self.virtual.get(uid) != item:
+                    changed.add(uid)
+            for uid in self.virtual:
+                if uid not in virtual:
+                    self.removed_at[uid] = rev
+            self.virtual = virtual
+            self.elements = self.items + list(virtual.values())
+        for uid in changed:
+            self.changed_at[uid] = rev
+            self.removed_at.pop(uid, None)
+        return True
+
+    def _reread_refs(self, uid, elem):
+        refs = _read_element_refs(elem)
+        if self.refs.get(uid) == refs:
+            return False
+        self.refs[uid] = refs
+        return True
+
+    def delta(self, since_revision):
+        if since_revision < self.base_revision:
+            return {'revision': self.revision, 'full': True, 'changed': list(self.elements),
+                    'removed': [], 'elements': self.elements}
+        changed_ids = {uid for uid, rev in self.changed_at.items() if rev > since_revision}
+        return {
+            'revision': self.revision,
+            'full': False,
+            'changed': [item for item in self.elements if item['id'] in changed_ids],
+            'removed': [uid for uid, rev in self.removed_at.items() if rev > since_revision],
+            'elements': self.elements,
+        }
+
+
+_SNAPSHOT = ViewportSnapshot()
 
 # Stubs for legacy calls
 def get_structure_signature(): return 0
@@ -0,0 +1,88 @@
+# RZMenu/qt_editor/core/revision.py
+"""Revision counters for the viewport snapshot (see read.get_viewport_delta).
+
+Core write paths (props, transform, structure, clipboard) report which
+elements they touched. Everything else — Blender UI edits, undo/redo,
+drivers — arrives through the depsgraph handler and invalidates the whole
+snapshot, so an untracked write can cost a full re-read but never leave
+the viewport stale.
+
+A tracked write registers the IDs it wrote (expect_echo). The next depsgraph
+update is dropped as its echo only if it reports nothing but those IDs; any
+other update, or an update with no echo pending, invalidates.
+"""
+
+_revision = 0
+_element_revisions = {}   # element id -> revision of its last tracked write
+_structure_revision = 0   # add/remove/reorder: element order must be re-read
+_full_revision = 0        # untracked change: everything must be re-read
+_expected_echo = set()    # keys of IDs written by tracked writes since the last depsgraph update
+
+
+def current():
+    return _revision
+
+
+def _bump():
+    global _revision
+    _revision += 1
+    return _revision
+
+
+def touch_elements(element_ids):
+    """Marks elements whose RNA data was written by a core function."""
+    if not element_ids:
+        return
+    rev = _bump()
+    for uid in element_ids:
+        _element_revisions[uid] = rev
+
+
+def touch_structure(element_ids=()):
+    """Elements were added, removed or reordered; element_ids are re-read as well."""
+    global _structure_revision
+    touch_elements(element_ids)
+    _structure_revision = _bump()
+
+
+def invalidate_all():
+    """Untracked change: the next snapshot sync re-reads everything."""
+    global _full_revision, _revision
+    _revision += 1
+    _full_revision = _revision
+    _element_revisions.clear()
+    _expected_echo.clear()
+
+
+def id_key(id_data):
+    """Key of an ID block; evaluated copies map to their original."""
+    return getattr(id_data, "original", id_data).as_pointer()
+
+
+def expect_echo(id_keys):
+    """A tracked write changed these IDs: Blender will report them back once."""
+    _expected_echo.update(id_keys)
+
+
+def note_external_change(updated_ids=None):
+    """
+    Called from the depsgraph handler with the keys of depsgraph.updates IDs.
+    Returns False when the update is exactly the echo of tracked Qt writes
+    (nothing to do), True after invalidating. Blender evaluates all writes
+    made since the last update at once, so one update consumes every
+    pending echo.
+    """
+    expected = set(_expected_echo)
+    _expected_echo.clear()
+    if expected and updated_ids and set(updated_ids) <= expected:
+        return False
+    invalidate_all()
+    return True
+
+
+def changes_since(revision):
+    """(full, structure, element ids) changed after revision."""
+    if revision < _full_revision:
+        return True, True, ()
+    ids = [uid for uid, rev in _element_revisions.items() if rev > revision]
+    return False, revision < _structure_revision, ids
@@ -1,6 +1,8 @@
 # RZMenu/qt_editor/core/signals.py
+import bpy
 from PySide6.QtCore import QObject, Signal
 from contextlib import contextmanager
+from . import revision
 
 class RZSignalManager(QObject):
     structure_changed = Signal()  # List changed (Outliner)
@@ -29,7 +31,14 @@ IS_UPDATING_FROM_QT = False
 def qt_update_guard():
     global IS_UPDATING_FROM_QT
     IS_UPDATING_FROM_QT = True
+    start = revision.current()
     try:
         yield
     finally:
         IS_UPDATING_FROM_QT = False
+        # A write that did not report its elements makes the viewport re-read everything
+        if revision.current() == start:
+            revision.invalidate_all()
+        else:
+            # Tracked writes go to scene.rzm: the next depsgraph update reporting only the scene is their echo
+            revision.expect_echo((revision.id_key(bpy.context.scene),))
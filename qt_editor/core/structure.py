@@ -2,6 +2,7 @@
 import bpy
 from . import signals
 from . import blender_bridge
+from . import revision
 from .maths import get_global_pos, get_local_pos_from_global
 from ..conf import get_config
 
@@ -63,6 +64,7 @@ def create_element(class_type, pos_x, pos_y, parent_id=-1):
 
         if parent_id != -1: new_element.parent_id = parent_id
             
+        revision.touch_structure((new_id,))
         blender_bridge.safe_undo_push(f"RZM: Create {class_type}")
         
         signals.SIGNALS.structure_changed.emit()
@@ -79,6 +81,7 @@ def delete_elements(target_ids):
         to_del = [i for i, e in enumerate(elements) if e.id in target_ids]
         for idx in sorted(to_del, reverse=True):
             elements.remove(idx)
+        revision.touch_structure()
             
         blender_bridge.safe_undo_push("RZM: Delete Elements")
         signals.SIGNALS.structure_changed.emit()
@@ -112,6 +115,7 @@ def reorder_elements(target_id, insert_after_id, silent=False):
         
         if target_idx != to_index:
             elements.move(target_idx, to_index)
+            revision.touch_structure()
             if not silent:
                 blender_bridge.safe_undo_push("RZM: Reorder")
                 signals.SIGNALS.structure_changed.emit()
@@ -138,6 +142,7 @@ def reparent_element(child_id, new_parent_id, silent=False):
             # 4. Apply
             target.position[0] = int(new_local_x)
             target.position[1] = int(new_local_y)
+            revision.touch_elements((child_id,))
             
             blender_bridge.safe_undo_push("RZM: Reparent")
             
@@ -275,6 +280,7 @@ def duplicate_elements(target_ids, offset=20):
 
             new_ids.append(new_id)
 
+        revision.touch_structure(new_ids)
         blender_bridge.safe_undo_push("RZM: Duplicate")
         signals.SIGNALS.structure_changed.emit()
         signals.SIGNALS.transform_changed.emit()
@@ -329,6 +335,7 @@ def import_image_from_path(filepath):
                 break
         
         if new_img:
+            revision.touch_structure()
             signals.SIGNALS.structure_changed.emit()
             return new_img['id'], new_img['name']
             
@@ -387,6 +394,7 @@ def create_element_with_image(image_id, x, y):
         new_element.image_id = image_id
         new_element.position = (int(x), int(y))
         
+        revision.touch_structure((new_id,))
         blender_bridge.safe_undo_push(f"RZM: Create Image Element")
         signals.SIGNALS.structure_changed.emit()
         signals.SIGNALS.transform_changed.emit()
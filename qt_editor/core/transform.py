@@ -2,6 +2,7 @@
 import bpy
 from . import signals
 from . import blender_bridge
+from . import revision
 from .maths import get_local_pos_from_global
 
 def resize_element(elem_id, x, y, w, h, silent=False):
@@ -17,6 +18,7 @@ def resize_element(elem_id, x, y, w, h, silent=False):
             target.position[1] = int(y)
             target.size[0] = int(w)
             target.size[1] = int(h)
+            revision.touch_elements((elem_id,))
             
             if not silent:
                 signals.SIGNALS.transform_changed.emit()
@@ -47,6 +49,7 @@ def set_element_position(elem_id, x, y, mode='GLOBAL', silent=False):
                 # Direct Local Set
                 target.position[0] = int(x)
                 target.position[1] = int(y)
+            revision.touch_elements((elem_id,))
             
             if not silent:
                 signals.SIGNALS.transform_changed.emit()
@@ -83,6 +86,8 @@ def set_multiple_element_positions(pos_data, mode='GLOBAL', silent=False):
                     target.position[1] = int(y)
                 changed = True
                 
+        if changed:
+            revision.touch_elements(pos_data.keys())
         if changed and not silent:
             signals.SIGNALS.transform_changed.emit()
             signals.SIGNALS.data_changed.emit()
@@ -121,6 +126,8 @@ def move_elements_delta(target_ids, delta_x, delta_y, silent=False):
                 elem.position[1] += int(delta_y)
                 changed = True
         
+        if changed:
+            revision.touch_elements(root_target_ids)
         if changed and not silent:
              signals.SIGNALS.transform_changed.emit()
              signals.SIGNALS.data_changed.emit()
@@ -158,6 +165,7 @@ def align_elements(target_ids, mode):
             center = (max_y + min_b) / 2
             for e in selection: e.position[1] = int(center + e.size[1] / 2)
 
+        revision.touch_elements(target_ids)
         blender_bridge.safe_undo_push(f"RZM: Align {mode}")
         signals.SIGNALS.transform_changed.emit()
         signals.SIGNALS.data_changed.emit()
@@ -178,6 +186,7 @@ def swap_elements(target_ids):
             p2 = list(e2.position)
             e1.position = p2
             e2.position = p1
+            revision.touch_elements(target_ids)
 
             blender_bridge.safe_undo_push("RZM: Swap Positions")
             signals.SIGNALS.transform_changed.emit()
@@ -198,6 +207,7 @@ def distribute_elements(target_ids, mode):
         # Operator takes comma-separated string
         ids_str = ",".join(map(str, target_ids))
         bpy.ops.rzm.distribute_elements(target_ids=ids_str, mode=mode)
+        revision.touch_elements(target_ids)
         
         signals.SIGNALS.transform_changed.emit()
         signals.SIGNALS.data_changed.emit()
@@ -1,7 +1,9 @@
 # RZMenu/qt_editor/utils/evaluation.py
 import re
+import ast
 import math
 import logging
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
@@ -19,83 +21,143 @@ SAFE_NAMES = {
     'pow': pow,
 }
 
-def safe_eval(expr, context=None):
+# Compiled expressions kept in memory (live previews re-evaluate on every keystroke)
+CACHE_SIZE = 512
+
+_EVAL_GLOBALS = {"__builtins__": {}, **SAFE_NAMES}
+
+# $Value / @Toggle / #Shape -> a slot that is filled from the context by its full key
+_SIGIL_RE = re.compile(r'[$@#][A-Za-z0-9_]+')
+_SLOT_PREFIX = '__rzm_'
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load,
+    ast.Constant, ast.Attribute, ast.Tuple,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+    ast.UAdd, ast.USub,
+)
+
+
+class CompiledExpression:
     """
-    Very primitive and safer-than-plain-eval evaluation for math formulas.
-    Supports basic arithmetic and white-listed math functions.
+    One formula, parsed and validated once. Names are bound to slots at compile
+    time: sigil variables ($, @, #) read the context by their full key and must
+    be present; bare names read the context, then SAFE_NAMES, and fall back to 0.0.
     """
-    if not expr: return None
-    if context is None: context = {}
-    
-    # Sanitize: only allow numbers, operators, dots, underscores, and alphanumeric names
-    # Also allow $, @, # for our variables, and ^, % for math
-    cleaned_expr = str(expr).strip()
-    if not cleaned_expr: return None
-    
-    if not re.match(r'^[a-zA-Z0-9_\.\s\+\-\*\/\(\)\,\$@#%^]+$', cleaned_expr):
-        logger.warning(f"safe_eval: Invalid characters in expression: {cleaned_expr}")
-        return None
+    __slots__ = ('source', 'code', 'slots')
 
-    try:
-        # Create a restricted environment
-        eval_globals = {"__builtins__": {}}
-        eval_globals.update(SAFE_NAMES)
-        
-        # Inject context variables
+    def __init__(self, source, code, slots):
+        self.source = source
+        self.code = code
+        self.slots = slots  # ((local name, context key, required), ...)
+
+    def evaluate(self, context=None):
+        """Result of the expression for one context, or None on any error."""
+        if context is None: context = {}
         eval_locals = {}
-        for k, v in context.items():
-            # Ensure keys are safe
-            safe_k = re.sub(r'[^a-zA-Z0-9_]', '_', str(k))
-            eval_locals[safe_k] = v
-            
-        processed_expr = str(expr)
-        
-        # Power Alias: Replace ^ with ** (common for math users)
-        processed_expr = processed_expr.replace('^', '**')
-        
-        # Sort keys by length DESC to avoid partial replacement (e.g. $var1 vs $var)
-        sorted_keys = sorted(context.keys(), key=len, reverse=True)
-        for k in sorted_keys:
-            safe_k = re.sub(r'[^a-zA-Z0-9_]', '_', str(k))
-            # Use regex to match only full variable names (avoid matching $v in $v1)
-            pattern = re.escape(k) + r'(?![a-zA-Z0-9_])'
-            processed_expr = re.sub(pattern, safe_k, processed_expr)
-
-        # RECURSIVE NAME RESOLUTION:
-        # If eval fails because of NameError, we inject that name as 0.0 and retry.
-        while True:
-            try:
-                result = eval(processed_expr, eval_globals, eval_locals)
-                return result
-            except NameError as ne:
-                # Extract the undefined name from the error message
-                # NameError: name 'w23' is not defined
-                missing_name = str(ne).split("'")[1]
-                if missing_name in eval_locals: # Prevent infinite loop
-                    raise ne
-                eval_locals[missing_name] = 0.0
-                # Continue loop to try again
-            except Exception as e:
-                # Other errors (syntax, zero division etc) just return None
-                logger.error(f"safe_eval: Error evaluating '{expr}': {e}")
+        for name, key, required in self.slots:
+            if key in context:
+                eval_locals[name] = context[key]
+            elif required:
                 return None
-    except Exception as e:
-        logger.error(f"safe_eval: Unexpected critical error: {e}")
+            elif name not in _EVAL_GLOBALS:
+                eval_locals[name] = 0.0
+        try:
+            return eval(self.code, _EVAL_GLOBALS, eval_locals)
+        except Exception as e:
+            # Zero division, bad argument types etc.
+            logger.error(f"safe_eval: Error evaluating '{self.source}': {e}")
+            return None
+
+
+def _validate(tree):
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"{type(node).__name__} is not allowed")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+            raise ValueError("only numeric constants are allowed")
+        if isinstance(node, ast.Name) and node.id.startswith('__') and not node.id.startswith(_SLOT_PREFIX):
+            raise ValueError(f"name '{node.id}' is not allowed")
+        if isinstance(node, ast.Attribute):
+            # Only math.<function>
+            if not (isinstance(node.value, ast.Name) and node.value.id == 'math') or node.attr.startswith('_'):
+                raise ValueError("only math.<name> attributes are allowed")
+        if isinstance(node, ast.Call) and node.keywords:
+            raise ValueError("keyword arguments are not allowed")
+
+
+def normalize_expression(expr):
+    """Cache key: the stripped text with the ^ power alias resolved."""
+    return str(expr).strip().replace('^', '**')
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _compile_normalized(text):
+    sigils = {}
+
+    def to_slot(match):
+        key = match.group(0)
+        if key not in sigils:
+            sigils[key] = f"{_SLOT_PREFIX}{len(sigils)}"
+        return sigils[key]
+
+    try:
+        tree = ast.parse(_SIGIL_RE.sub(to_slot, text), mode='eval')
+        _validate(tree)
+        code = compile(tree, '<rzm expression>', 'eval')
+    except (SyntaxError, ValueError) as e:
+        logger.warning(f"safe_eval: Invalid expression: {text} ({e})")
         return None
 
+    slots = [(slot, key, True) for key, slot in sigils.items()]
+    bare = {node.id for node in ast.walk(tree) if isinstance(node, ast.Name)}
+    slots.extend((name, name, False) for name in sorted(bare) if not name.startswith(_SLOT_PREFIX))
+    return CompiledExpression(text, code, tuple(slots))
+
+
+def compile_expression(expr):
+    """CompiledExpression for expr (LRU-cached by normalized text), or None if it is empty or invalid."""
+    if expr is None: return None
+    text = normalize_expression(expr)
+    if not text: return None
+    return _compile_normalized(text)
+
+
+def safe_eval(expr, context=None):
+    """
+    Safer-than-plain-eval evaluation for math formulas.
+    Supports basic arithmetic and white-listed math functions.
+    """
+    if not expr: return None
+    compiled = compile_expression(expr)
+    if compiled is None: return None
+    return compiled.evaluate(context)
+
+
+def safe_eval_many(expr, contexts):
+    """
+    Evaluates one formula against many contexts (multi-selection, previews).
+    The expression is compiled once; returns one result (or None) per context.
+    """
+    compiled = compile_expression(expr) if expr else None
+    if compiled is None:
+        return [None] * len(contexts)
+    return [compiled.evaluate(context) for context in contexts]
+
+
 def get_formula_preview(expr, active_element_data=None):
     """
     High-level helper to get a preview result for a formula.
     Integrates with RZMenu element context.
     """
     if not expr: return ""
-    
+
     # 1. Build context from active element and general scene info
     context = {
         "$WindowWidth": 1920, # Default stubs or real view size
         "$WindowHeight": 1080,
     }
-    
+
     if active_element_data:
         # Inject active element properties as variables
         # $ParentWidth, $ParentHeight, $X, $Y, etc.
@@ -107,8 +169,10 @@ def get_formula_preview(expr, active_element_data=None):
             "$X": active_element_data.get('pos_x', 0),
             "$Y": active_element_data.get('pos_y', 0),
         })
-        
+
     res = safe_eval(expr, context)
+    if res is None:
+        return ""
     if isinstance(res, (int, float)):
         # Format nicely
         if isinstance(res, float):
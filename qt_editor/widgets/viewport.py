@@ -1491,8 +1491,53 @@ class RZViewportScene(QtWidgets.QGraphicsScene):
                 self._resolve_positioning(elements_data, resolved_layout)
             with perf.scope("viewport.refresh_layout_engines"):
                 self._refresh_layout_engines()
+            self._last_geometry = self._layout_geometry(resolved_layout)
+            self._last_selected_ids = set(selected_ids)
             self.update()
 
+    def apply_delta(self, elements_data, changed_data, selected_ids, active_id):
+        """
+        Incremental update_scene for tracked edits (see core.get_viewport_delta).
+        Only changed items get set_data_state; positions are re-applied where the
+        resolved layout moved and for their children. The caller guarantees that
+        no items were added or removed since the last update_scene.
+        """
+        with perf.scope("viewport.apply_delta", f"changed={len(changed_data)}"):
+            if self._is_user_interaction: return
+            cache = ImageCache.instance()
+            for data in changed_data:
+                if data.get('image_id', -1) != -1: cache.pre_cache_image(data['image_id'])
+            resolved_layout = FormulaEvaluator.resolve_layout(elements_data)
+            self._update_items_state(changed_data, resolved_layout, selected_ids, active_id)
+            self._rebuild_hierarchy(changed_data)
+
+            geometry = self._layout_geometry(resolved_layout)
+            old_geometry = getattr(self, '_last_geometry', {})
+            moved = {uid for uid, geo in geometry.items() if old_geometry.get(uid) != geo}
+            for uid in moved:
+                item = self._items_map.get(uid)
+                if item and shiboken6.isValid(item):
+                    item.update_size(geometry[uid][2], geometry[uid][3])
+            moved.update(data['id'] for data in changed_data)
+            # Child items are positioned relative to their parent item
+            for uid in list(moved):
+                item = self._items_map.get(uid)
+                if item and shiboken6.isValid(item):
+                    moved.update(c.uid for c in item.childItems() if isinstance(c, RZElementItem))
+            if moved:
+                self._resolve_positioning([d for d in elements_data if d['id'] in moved], resolved_layout)
+            self._last_geometry = geometry
+
+            if changed_data or moved:
+                self._refresh_layout_engines()
+            self.update_selection_visuals(selected_ids, active_id)
+            self.update()
+
+    @staticmethod
+    def _layout_geometry(resolved_layout):
+        # The solver reuses its result dicts between calls: keep plain tuples
+        return {uid: (l['x'], l['y'], l['w'], l['h']) for uid, l in resolved_layout.items()}
+
     def _sync_items_pool(self, elements_data):
         incoming_ids = {d['id'] for d in elements_data}
         current_ids = set(self._items_map.keys())
@@ -2416,105 +2461,110 @@ class RZViewportPanel(RZEditorPanel):
         with perf.scope("viewport.refresh_font_config"):
             RZFontManager.instance().refresh_font_config()
 
-        data = core.get_viewport_data()
+        scene = self.view.rz_scene
+        delta = core.get_viewport_delta(getattr(self, '_last_revision', -1))
+        data = delta['elements']
         ctx = RZContextManager.get_instance().get_snapshot()
+        active_tab_uid = RZContextManager.get_instance().isolated_tab_id
 
-        # --- PERF: Data hash guard ---
-        # core.get_viewport_data() reads from bpy — cheap but not free.
-        # update_scene() is expensive: it calls set_data_state on every element
-        # (158 in the test scene) even when nothing changed. We hash a compact
-        # fingerprint of the data + selection + active state and skip the full
-        # update if nothing changed since the last tick.
-        # Hash is intentionally lightweight: we only fingerprint element IDs,
-        # positions, and a few key fields — not the entire data dict.
-        try:
-            from ..utils.image_cache import ImageCache
-            img_cache = ImageCache.instance()
-            _fp_parts = []
-            for e in data:
-                img_id = e.get('image_id', -1)
-                fit_mode = img_cache.get_fit_mode(img_id) if img_id != -1 else 'FILL'
-                _fp_parts.append((
-                    e.get('id'), e.get('pos_x'), e.get('pos_y'),
-                    e.get('width'), e.get('height'),
-                    img_id, e.get('is_hidden'),
-                    e.get('color'), e.get('rotation', 0),
-                    e.get('image_source_type'),
-                    e.get('svg_preserve_color'),
-                    fit_mode
-                ))
-            _fingerprint = hash((
-                tuple(_fp_parts),
-                tuple(sorted(ctx.selected_ids)),
-                ctx.active_id
-            ))
-        except Exception:
-            _fingerprint = None  # On any error, skip the guard
-
-        if _fingerprint is not None and _fingerprint == getattr(self, '_last_data_fingerprint', None):
+        # --- PERF: Revision guard ---
+        # The snapshot in core knows which elements were written since our last
+        # tick, so an unchanged scene costs one revision comparison and a small
+        # edit touches only its own items instead of set_data_state on all of them.
+        selection = (frozenset(ctx.selected_ids), ctx.active_id)
+        view_state = (selection, active_tab_uid)
+        if (delta['revision'] == getattr(self, '_last_revision', -1)
+                and view_state == getattr(self, '_last_view_state', None)
+                and scene._items_map):
             return  # Data unchanged — nothing to repaint
-        self._last_data_fingerprint = _fingerprint
 
-        # VIEWPORT TAB ISOLATION FILTERING
-        active_tab_uid = RZContextManager.get_instance().isolated_tab_id
-        
         # Update Viewport Tab Bar (Overlay)
         if hasattr(self.view, 'iso_tab_bar'):
-            tab_bar = self.view.iso_tab_bar
-            # Block signals during update to avoid recursion
-            tab_bar.blockSignals(True)
-            
-            # Fetch tab containers from all data
-            tab_containers = [e for e in data if e.get('is_tab_container')]
-            
-            # Rebuild tabs (Fixing 'clear' crash by using loop)
-            while tab_bar.count() > 0:
-                tab_bar.removeTab(0)
-            
-            # Always add "ALL"
-            tab_bar.addTab("ALL")
-            tab_bar.setTabData(0, -1)
-            
-            current_idx = 0
-            for i, tc in enumerate(tab_containers):
-                tab_bar.addTab(tc['name'])
-                tab_bar.setTabData(i + 1, tc['id'])
-                
-                # Apply Page Color to tab text
-                col = tc.get('page_color', [0.5, 0.5, 0.5, 1.0])
-                qcol = QtGui.QColor.fromRgbF(col[0], col[1], col[2], 1.0)
-                tab_bar.setTabTextColor(i + 1, qcol)
-                
-                if tc['id'] == active_tab_uid:
-                    current_idx = i + 1
-            
-            tab_bar.setCurrentIndex(current_idx)
-            tab_bar.blockSignals(False)
-            self.view.iso_container.adjustSize()
-
-        if active_tab_uid != -1:
-            descendants = set([active_tab_uid])
-            parent_map = {}
-            for e in data:
-                parent_map.setdefault(e.get('parent_id', -1), []).append(e['id'])
-                
-            def gather_descendants(pid):
-                for child_id in parent_map.get(pid, []):
-                    descendants.add(child_id)
-                    gather_descendants(child_id)
-                    
-            gather_descendants(active_tab_uid)
-            
-            # Remove anything not in descendants and force root visibility
-            new_data = []
-            for e in data:
-                if e['id'] in descendants:
-                    if e['id'] == active_tab_uid:
-                        e['is_hidden'] = False # Force root to be visible
-                    new_data.append(e)
-            data = new_data
-
-        self.view.rz_scene.update_scene(data, ctx.selected_ids, ctx.active_id)
+            self._update_tab_bar(data, active_tab_uid)
+
+        incremental = (
+            not delta['full']
+            and not delta['removed']
+            and active_tab_uid == -1
+            and getattr(self, '_last_view_state', (None, -1))[1] == -1
+            and scene._items_map
+            and all(e['id'] in scene._items_map for e in delta['changed'])
+        )
+        if incremental:
+            scene.apply_delta(data, delta['changed'], ctx.selected_ids, ctx.active_id)
+        else:
+            # VIEWPORT TAB ISOLATION FILTERING
+            if active_tab_uid != -1:
+                data = self._isolate_tab(data, active_tab_uid)
+            scene.update_scene(data, ctx.selected_ids, ctx.active_id)
+
+        if not scene._is_user_interaction:
+            self._last_revision = delta['revision']
+            self._last_view_state = view_state
+
+    def _update_tab_bar(self, data, active_tab_uid):
+        tab_containers = [e for e in data if e.get('is_tab_container')]
+        signature = (
+            tuple((tc['id'], tc['name'], tuple(tc.get('page_color', ()))) for tc in tab_containers),
+            active_tab_uid,
+        )
+        if signature == getattr(self, '_last_tab_signature', None):
+            return
+        self._last_tab_signature = signature
+
+        tab_bar = self.view.iso_tab_bar
+        # Block signals during update to avoid recursion
+        tab_bar.blockSignals(True)
+
+        # Rebuild tabs (Fixing 'clear' crash by using loop)
+        while tab_bar.count() > 0:
+            tab_bar.removeTab(0)
+
+        # Always add "ALL"
+        tab_bar.addTab("ALL")
+        tab_bar.setTabData(0, -1)
+
+        current_idx = 0
+        for i, tc in enumerate(tab_containers):
+            tab_bar.addTab(tc['name'])
+            tab_bar.setTabData(i + 1, tc['id'])
+
+            # Apply Page Color to tab text
+            col = tc.get('page_color', [0.5, 0.5, 0.5, 1.0])
+            qcol = QtGui.QColor.fromRgbF(col[0], col[1], col[2], 1.0)
+            tab_bar.setTabTextColor(i + 1, qcol)
+
+            if tc['id'] == active_tab_uid:
+                current_idx = i + 1
+
+        tab_bar.setCurrentIndex(current_idx)
+        tab_bar.blockSignals(False)
+        self.view.iso_container.adjustSize()
+
+    @staticmethod
+    def _isolate_tab(data, active_tab_uid):
+        """Keeps the isolated tab container and its descendants."""
+        descendants = set([active_tab_uid])
+        parent_map = {}
+        for e in data:
+            parent_map.setdefault(e.get('parent_id', -1), []).append(e['id'])
+
+        def gather_descendants(pid):
+            for child_id in parent_map.get(pid, []):
+                descendants.add(child_id)
+                gather_descendants(child_id)
+
+        gather_descendants(active_tab_uid)
+
+        # Remove anything not in descendants and force root visibility.
+        # Snapshot items are shared with core: copy instead of mutating.
+        new_data = []
+        for e in data:
+            if e['id'] in descendants:
+                if e['id'] == active_tab_uid:
+                    e = dict(e, is_hidden=False)
+                new_data.append(e)
+        return new_data
     
     def _on_global_selection_changed(self):
         """Update selection visuals when global selection changes."""
@@ -119,7 +119,7 @@ class RZMEditorWindow(QtWidgets.QWidget):
         PanelFactory.register(styles_manager.RZMStylesPanel)
 
     def _trigger_initial_refresh(self):
-        SIGNALS.structure_changed.emit()
+        self.full_refresh()
 
     def _get_all_areas(self):
         if self.splitter:
@@ -135,8 +135,10 @@ class RZMEditorWindow(QtWidgets.QWidget):
     def _on_selection_changed(self):
         self.action_manager.update_ui_state()
 
-    def sync_from_blender(self):
+    def sync_from_blender(self, updated_ids=None):
         if not self.isVisible(): return
+        # Echo of our own tracked write: the viewport snapshot is already current
+        if not core.revision.note_external_change(updated_ids): return
         for area in self._get_all_areas():
             panel = area.get_current_panel()
             if panel and hasattr(panel, 'rz_scene'):
@@ -144,6 +146,7 @@ class RZMEditorWindow(QtWidgets.QWidget):
         SIGNALS.structure_changed.emit()
 
     def full_refresh(self):
+        core.revision.invalidate_all()
         SIGNALS.structure_changed.emit()
 
     def apply_layout(self, layout_name):
@@ -1,33 +1,102 @@
+import json
+import os
 import time
+import tracemalloc
 from contextlib import contextmanager
 
 
 _current_profiler = None
 
+# История запусков лежит рядом с бинарным кэшем экспорта
+HISTORY_DIR = '.rzm_cache'
+HISTORY_FILE = 'export_timing.jsonl'
+HISTORY_LIMIT = 200
+# Стадия считается регрессией, если медленнее медианы прошлых запусков в REGRESSION_FACTOR раз
+REGRESSION_WINDOW = 10
+REGRESSION_FACTOR = 1.5
+# Короткие стадии шумят сильнее, чем меняются
+REGRESSION_MIN_SECONDS = 0.05
+
+_history_memo = {}
+
 
 class ExportProfiler:
-    """Lightweight console profiler for Blender export operators."""
+    """Lightweight console profiler for Blender export operators.
+
+    Every stage records wall time, CPU time, peak Python memory (only when
+    trace_memory is on: tracemalloc slows allocation-heavy code noticeably)
+    and the bytes reported through count_written while it was running (a
+    nested stage's bytes are included in its parents, like its time).
+    Writers outside the add-on (XXMI tools, image.save) don't report; the
+    run record carries the size of all files under output_root changed
+    during the run, from a single walk in finish().
+    """
 
-    def __init__(self, title="RZM Export Timing"):
+    def __init__(self, title="RZM Export Timing", output_root=None, trace_memory=False):
         self.title = title
+        self.output_root = output_root
+        self.trace_memory = trace_memory
         self._events = []
         self._start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        self._started_at = time.time()
+        self._started_ns = time.time_ns()
+        self._written = 0
+        self.output_bytes = None
         self._stack = []
+        self._owns_tracemalloc = False
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
 
     @contextmanager
     def measure(self, name):
-        start = time.perf_counter()
-        self._stack.append(name)
+        frame = {"name": name, "peak": 0, "mem_start": 0}
+        if self.trace_memory and tracemalloc.is_tracing():
+            # Пик общий на процесс: перед сбросом отдаём его родительской стадии
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                parent = self._stack[-1]
+                parent["peak"] = max(parent["peak"], peak)
+            tracemalloc.reset_peak()
+            frame["mem_start"] = current
+        self._stack.append(frame)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        written_start = self._written
         try:
             yield
         finally:
-            elapsed = time.perf_counter() - start
-            self._events.append((name, elapsed))
+            elapsed = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
             self._stack.pop()
+            peak_mem = None
+            if self.trace_memory and tracemalloc.is_tracing():
+                peak = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+                peak_mem = max(peak - frame["mem_start"], 0)
+                if self._stack:
+                    parent = self._stack[-1]
+                    parent["peak"] = max(parent["peak"], peak)
+            bytes_written = self._written - written_start
+            self._events.append({
+                "name": name,
+                "wall": elapsed,
+                "cpu": cpu,
+                "peak_mem": peak_mem,
+                "bytes_written": bytes_written,
+                "depth": len(self._stack),
+            })
             print(f"[RZM Timing] {name}: {elapsed:.3f}s")
 
     def add(self, name, elapsed):
-        self._events.append((name, float(elapsed)))
+        self._events.append({
+            "name": name,
+            "wall": float(elapsed),
+            "cpu": None,
+            "peak_mem": None,
+            "bytes_written": None,
+            "depth": len(self._stack),
+        })
         print(f"[RZM Timing] {name}: {float(elapsed):.3f}s")
 
     def report(self):
@@ -38,14 +107,167 @@ class ExportProfiler:
         if not self._events:
             print("[RZM Timing] No timed phases were recorded.")
         else:
-            width = max(len(name) for name, _elapsed in self._events)
-            for name, elapsed in sorted(self._events, key=lambda x: x[1], reverse=True):
+            width = max(len(event["name"]) for event in self._events)
+            for event in sorted(self._events, key=lambda e: e["wall"], reverse=True):
+                elapsed = event["wall"]
                 share = (elapsed / total * 100.0) if total > 0 else 0.0
-                print(f"[RZM Timing] {name:<{width}}  {elapsed:8.3f}s  {share:5.1f}%")
+                print(f"[RZM Timing] {event['name']:<{width}}  {elapsed:8.3f}s  {share:5.1f}%")
         print(f"[RZM Timing] {'TOTAL':<24}  {total:8.3f}s  100.0%")
         print("[RZM Timing] ===============================")
         print("")
 
+    def record(self):
+        """Структурированная запись запуска для истории."""
+        return {
+            "title": self.title,
+            "started_at": self._started_at,
+            "wall": time.perf_counter() - self._start,
+            "cpu": time.process_time() - self._cpu_start,
+            "trace_memory": self.trace_memory,
+            "bytes_written": self._written,
+            "output_bytes": self.output_bytes,
+            "stages": list(self._events),
+        }
+
+    def finish(self):
+        if self.output_bytes is None:
+            self.output_bytes = _bytes_changed_since(self.output_root, self._started_ns)
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+
+def _bytes_changed_since(root, since_ns):
+    """Сумма размеров файлов под root, изменённых после since_ns (один обход на запуск)."""
+    if not root or not os.path.isdir(root):
+        return None
+    total = 0
+    pending = [root]
+    while pending:
+        try:
+            entries = os.scandir(pending.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                        continue
+                    stat = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                if stat.st_mtime_ns >= since_ns:
+                    total += stat.st_size
+    return total
+
+
+def history_path(mod_root):
+    return os.path.join(mod_root, HISTORY_DIR, HISTORY_FILE)
+
+
+def save_history(profiler, mod_root, limit=HISTORY_LIMIT):
+    """Дописывает запуск в JSON-lines историю мода. Файл обрезается до последних limit строк."""
+    if not mod_root or not os.path.isdir(mod_root):
+        return None
+    path = history_path(mod_root)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        line = json.dumps(profiler.record(), ensure_ascii=False)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(line + "\n")
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+        if len(lines) > limit:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.writelines(lines[-limit:])
+    except OSError as e:
+        print(f"[RZM Timing] Failed to save timing history: {e}")
+        return None
+    _history_memo.pop(path, None)
+    return path
+
+
+def load_history(mod_root):
+    """Список записей истории (старые первыми). Кэшируется по mtime, чтобы UI не читал файл на каждой перерисовке."""
+    if not mod_root:
+        return []
+    path = history_path(mod_root)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return []
+    memo = _history_memo.get(path)
+    if memo is not None and memo[0] == mtime:
+        return memo[1]
+    runs = []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    runs.append(json.loads(line))
+                except ValueError:
+                    continue  # оборванная строка после падения Blender
+    except OSError:
+        return []
+    _history_memo[path] = (mtime, runs)
+    return runs
+
+
+def _median(values):
+    ordered = sorted(values)
+    n = len(ordered)
+    mid = n // 2
+    return ordered[mid] if n % 2 else (ordered[mid - 1] + ordered[mid]) * 0.5
+
+
+def find_regressions(history, window=REGRESSION_WINDOW, factor=REGRESSION_FACTOR, min_seconds=REGRESSION_MIN_SECONDS):
+    """
+    Сравнивает последний запуск со скользящей медианой window предыдущих по каждой стадии.
+    Возвращает список dict(name, wall, median, ratio) по убыванию ratio.
+    Стадия, которая в одном запуске встречается несколько раз, суммируется.
+    Сравниваются только запуски с тем же title (Full Export и Quick Update отдельно).
+    """
+    if len(history) < 2:
+        return []
+    title = history[-1].get("title")
+    history = [run for run in history if run.get("title") == title]
+
+    def stage_totals(run):
+        totals = {}
+        for stage in run.get("stages", ()):
+            name = stage.get("name")
+            wall = stage.get("wall")
+            if name is None or wall is None:
+                continue
+            totals[name] = totals.get(name, 0.0) + float(wall)
+        return totals
+
+    latest = stage_totals(history[-1])
+    previous = [stage_totals(run) for run in history[-window - 1:-1]]
+    regressions = []
+    for name, wall in latest.items():
+        samples = [totals[name] for totals in previous if name in totals]
+        if not samples:
+            continue
+        median = _median(samples)
+        if wall < min_seconds or wall <= median * factor:
+            continue
+        ratio = wall / median if median > 0 else float('inf')
+        regressions.append({"name": name, "wall": wall, "median": median, "ratio": ratio})
+    regressions.sort(key=lambda r: r["ratio"], reverse=True)
+    return regressions
+
+
+def count_written(nbytes):
+    """Писатели файлов сообщают записанные байты; их получают открытые стадии текущего профайлера."""
+    profiler = _current_profiler
+    if profiler is not None and nbytes:
+        profiler._written += int(nbytes)
+
 
 def set_current_profiler(profiler):
     global _current_profiler
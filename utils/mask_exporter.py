@@ -4,6 +4,8 @@ import os
 import struct
 import json
 
+from .export_timing import count_written
+
 def get_mesh_attribute_values(mesh, attr_name):
     """
     Extracts float values of a custom attribute on the POINT domain.
@@ -159,7 +161,7 @@ def export_masks(context, cache):
 
             # Map values to buffer topology (with inversion: 1.0 - val)
             mapped_values = []
-            if v_map:
+            if v_map is not None and len(v_map) > 0:
                 for idx in v_map:
                     if 0 <= idx < len(attr_values):
                         mapped_values.append(1.0 - float(attr_values[idx]))
@@ -199,6 +201,7 @@ def export_masks(context, cache):
                     # Element 1..N: [firstIndex, indexCount, mode, 0]
                     for idx_off, ib_cnt, h_val in hover_entries:
                         f.write(struct.pack('<ffff', idx_off, ib_cnt, h_val, 0.0))
+                    count_written(f.tell())
                 print(f"[RZM-MASK] Exported COMPONENT ObjectMap for '{comp_name}' ({obj_count} entries) to {object_map_path}")
             except Exception as e:
                 print(f"[RZM-MASK] [ERROR] Failed to write ObjectMap buffer '{object_map_path}': {e}")
@@ -214,6 +217,7 @@ def export_masks(context, cache):
                 with open(buf_file_path, 'wb') as f:
                     for val in component_mask:
                         f.write(struct.pack('<f', val))
+                    count_written(f.tell())
             except Exception as e:
                 print(f"[RZM-MASK] [ERROR] Failed to write binary buffer '{buf_file_path}': {e}")
                 continue
@@ -0,0 +1,175 @@
+# RZMenu/utils/spatial_index.py
+# Пакетный поиск ближайшей точки для маппинга вершин буфера на вершины Blender.
+# scipy.spatial.cKDTree, если он есть; иначе равномерная сетка на NumPy:
+# точки сортируются по ключу ячейки, запросы проверяют 3x3x3 соседних ячеек,
+# а нерешённые запросы уходят на более крупную сетку. Результат точный.
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree as _cKDTree
+except ImportError:
+    _cKDTree = None
+
+# Средняя заполненность ячейки самой мелкой сетки
+_POINTS_PER_CELL = 2.0
+# Число ячеек самой мелкой сетки по длинной оси
+_FINE_CELLS = 1024.0
+# Во сколько раз растёт ячейка на каждом следующем уровне
+_LEVEL_GROWTH = 4.0
+_MAX_CELL = 1e30
+# Ограничение на число пар (запрос, точка) за один векторный проход
+_PAIR_CHUNK = 1 << 22
+
+_OFFSETS = np.array([(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)], dtype=np.int64)
+
+
+class _GridLevel:
+    """Одна сетка: точки, отсортированные по ячейке, и границы ячеек."""
+
+    def __init__(self, points: np.ndarray, origin: np.ndarray, cell: float):
+        self.cell = cell
+        self.origin = origin
+        cells = np.floor((points - origin) / cell).astype(np.int64)
+        self.dims = cells.max(axis=0) + 1
+        keys = self._keys(cells)
+        self.order = np.argsort(keys, kind='stable')
+        self.sorted_keys = keys[self.order]
+        self.sorted_points = points[self.order]
+
+    def _keys(self, cells):
+        return (cells[:, 0] * self.dims[1] + cells[:, 1]) * self.dims[2] + cells[:, 2]
+
+    def query(self, queries: np.ndarray, best_d2: np.ndarray, best_idx: np.ndarray):
+        """Обновляет best_* по точкам из 27 соседних ячеек. Возвращает маску решённых запросов."""
+        local = (queries - self.origin) / self.cell
+        q_cells = np.floor(local).astype(np.int64)
+        # Сначала только своя ячейка: совпавший запрос ближе к точке, чем к границе ячейки,
+        # и соседей можно не смотреть
+        self._scan_offset(queries, q_cells, np.arange(len(queries)), _OFFSETS[13], best_d2, best_idx)
+        frac = local - q_cells
+        margin = np.minimum(frac, 1.0 - frac).min(axis=1) * self.cell
+        rest = np.nonzero(best_d2 > margin * margin)[0]
+        if rest.size:
+            for offset in np.delete(_OFFSETS, 13, axis=0):
+                self._scan_offset(queries, q_cells, rest, offset, best_d2, best_idx)
+        # Всё, что ближе одной ячейки, гарантированно попало в 3x3x3 окрестность
+        return best_d2 <= self.cell * self.cell
+
+    def _scan_offset(self, queries, q_cells, q_ids, offset, best_d2, best_idx):
+        nb = q_cells[q_ids] + offset
+        inside = np.all((nb >= 0) & (nb < self.dims), axis=1)
+        q_ids, nb = q_ids[inside], nb[inside]
+        if q_ids.size == 0:
+            return
+        keys = self._keys(nb)
+        start = np.searchsorted(self.sorted_keys, keys, side='left')
+        count = np.searchsorted(self.sorted_keys, keys, side='right') - start
+        has = count > 0
+        q_ids, start, count = q_ids[has], start[has], count[has]
+        if q_ids.size == 0:
+            return
+        # Пары (запрос, точка) порциями, чтобы не раздувать память на плотных ячейках
+        bounds = np.cumsum(count)
+        lo = 0
+        while lo < q_ids.size:
+            base = bounds[lo - 1] if lo else 0
+            hi = max(int(np.searchsorted(bounds, base + _PAIR_CHUNK, side='right')), lo + 1)
+            self._scan(queries, q_ids[lo:hi], start[lo:hi], count[lo:hi], best_d2, best_idx)
+            lo = hi
+
+    def _scan(self, queries, q_ids, start, count, best_d2, best_idx):
+        total = int(count.sum())
+        run_start = np.cumsum(count) - count
+        pair_q = np.repeat(q_ids, count)
+        pair_p = np.arange(total, dtype=np.int64) - np.repeat(run_start - start, count)
+        diff = self.sorted_points[pair_p] - queries[pair_q]
+        d2 = np.einsum('ij,ij->i', diff, diff)
+        # Пары одного запроса идут подряд: минимум и первая точка с ним через reduceat
+        run_min = np.minimum.reduceat(d2, run_start)
+        hit = np.where(d2 == np.repeat(run_min, count), np.arange(total), total)
+        first = np.minimum.reduceat(hit, run_start)
+        better = run_min < best_d2[q_ids]
+        best_d2[q_ids[better]] = run_min[better]
+        best_idx[q_ids[better]] = self.order[pair_p[first[better]]]
+
+
+class PointIndex:
+    """
+    Переиспользуемый индекс по набору точек (N, 3) для поиска ближайшей точки
+    (cKDTree или уровни сетки, которые строятся лениво и кэшируются).
+    """
+
+    def __init__(self, points: np.ndarray):
+        self.points = np.ascontiguousarray(points, dtype=np.float64).reshape(-1, 3)
+        self._tree = None
+        self._levels = {}
+        n = len(self.points)
+        if n:
+            self.origin = self.points.min(axis=0)
+            extent = np.maximum(self.points.max(axis=0) - self.origin, 1e-9)
+            # Стартовая ячейка мелкая: вершины меша лежат на поверхности, а не в объёме,
+            # и почти все запросы совпадают с точкой. Редкие дальние запросы поднимаются
+            # на более крупные уровни.
+            cell = (float(np.prod(extent)) * _POINTS_PER_CELL / n) ** (1.0 / 3.0)
+            self.fine_cell = max(min(cell, float(extent.max()) / _FINE_CELLS), 1e-9)
+
+    def __len__(self):
+        return len(self.points)
+
+    def _level(self, cell):
+        level = self._levels.get(cell)
+        if level is None:
+            level = self._levels[cell] = _GridLevel(self.points, self.origin, cell)
+        return level
+
+    def nearest(self, queries: np.ndarray, max_dist: float | None = None):
+        """
+        Для каждой точки queries (M, 3) возвращает индекс ближайшей точки индекса
+        и расстояние до неё: (idx int32 (M,), dist float64 (M,)).
+
+        max_dist: если задан, запросы дальше max_dist от любой точки получают idx = -1
+        и dist = inf, а поиск для них прекращается как только это доказано.
+        """
+        queries = np.ascontiguousarray(queries, dtype=np.float64).reshape(-1, 3)
+        m = len(queries)
+        if len(self.points) == 0 or m == 0:
+            return np.full(m, -1, dtype=np.int32), np.full(m, np.inf)
+
+        if _cKDTree is not None:
+            if self._tree is None:
+                self._tree = _cKDTree(self.points)
+            bound = np.inf if max_dist is None else float(max_dist)
+            dist, idx = self._tree.query(queries, k=1, distance_upper_bound=bound)
+            missing = ~np.isfinite(dist)
+            idx = idx.astype(np.int32)
+            idx[missing] = -1
+            return idx, dist
+
+        best_d2 = np.full(m, np.inf)
+        best_idx = np.full(m, -1, dtype=np.int64)
+        pending = np.arange(m)
+        cell = self.fine_cell
+        while pending.size:
+            sub_d2 = best_d2[pending]
+            sub_idx = best_idx[pending]
+            solved = self._level(cell).query(queries[pending], sub_d2, sub_idx)
+            best_d2[pending] = sub_d2
+            best_idx[pending] = sub_idx
+            pending = pending[~solved]
+            if (max_dist is not None and cell >= max_dist) or cell > _MAX_CELL:
+                break  # _MAX_CELL: страховка от NaN в запросах
+            cell *= _LEVEL_GROWTH
+
+        dist = np.sqrt(best_d2)
+        if max_dist is not None:
+            # Нерешённые запросы доказанно дальше ячейки >= max_dist
+            far = dist > max_dist
+            far[pending] = True
+            best_idx[far] = -1
+            dist[far] = np.inf
+        return best_idx.astype(np.int32), dist
+
+
+def nearest_indices(points: np.ndarray, queries: np.ndarray, max_dist: float | None = None):
+    """Разовый поиск ближайших точек: PointIndex(points).nearest(queries, max_dist)."""
+    return PointIndex(points).nearest(queries, max_dist=max_dist)
@@ -1,3 +1,5 @@
+import copy
+import hashlib
 import json
 import math
 import os
@@ -6,6 +8,7 @@ import struct
 import time
 import zlib
 from array import array
+from concurrent.futures import ThreadPoolExecutor
 
 import bpy
 
@@ -16,6 +19,13 @@ try:
 except Exception:
     np = None
 
+if np is not None:
+    from ..core import atlas_algo, pixel_fill, png_encoder
+else:
+    atlas_algo = None
+    pixel_fill = None
+    png_encoder = None
+
 
 GROUP_NAME = "RZM TexWorks Material"
 MASK_GROUP_NAME = "RZM TWAA Mask Slot"
@@ -29,6 +39,16 @@ SCHEMA = 6
 KIND = "RZ_TEXWORKS_MC_MATERIAL"
 ROLE = "SEMANTIC_TEXTURE_HUB"
 DEFAULT_MAX_RASTER_PIXELS = 16 * 1024 * 1024
+# NumPy bake: rows per raster band (one thread job) and candidate pixels per batch.
+# The batch budget is shared by all band workers, so peak temporaries (~80 bytes
+# per cell) stay those of the single-threaded bake whatever the worker count.
+RASTER_TILE_ROWS = 64
+RASTER_BATCH_CELLS = 1 << 21
+RASTER_MAX_WORKERS = 4
+# zlib level of exported PNGs (1 = fastest, no row filters; 9 = smallest)
+PNG_LEVEL = 6
+# Per-material cluster cache (layout + baked slot images), kept for the Blender session
+CLUSTER_CACHE_KEY = "rzm_tw_mc_cluster_cache"
 SUBSTANCE_CLUSTER_SIZES = (128, 256, 512, 1024, 2048, 4096)
 VALID_TWAA_TEXTURE_SIZES = SUBSTANCE_CLUSTER_SIZES
 
@@ -2043,74 +2063,73 @@ def copy_texture_groups_exact(src_pixels, src_w, src_h, layout_groups, atlas_w,
 
 
 def dilate_alpha(buffer, width, height, radius):
+    """
+    Fills empty pixels (alpha <= 0) within radius of the baked islands with the nearest
+    baked color, in place. The cost does not depend on radius: one distance transform
+    from core.pixel_fill (the NumPy one the atlas bleed uses; scipy.ndimage if present).
+    """
+    radius = int(radius)
     if radius <= 0:
         return buffer
-    radius = min(int(radius), 16)
-    if np is not None:
+    if pixel_fill is not None:
         try:
             arr = np.frombuffer(buffer, dtype=np.float32).reshape(int(height), int(width), 4)
-            for _ in range(radius):
-                src = arr.copy()
-                empty = src[:, :, 3] <= 0.0
-                if not empty.any():
-                    break
-
-                fill = np.zeros(empty.shape, dtype=bool)
-                fill[:, 1:] = empty[:, 1:] & (src[:, :-1, 3] > 0.0)
-                arr[:, 1:][fill[:, 1:]] = src[:, :-1][fill[:, 1:]]
-
-                empty = arr[:, :, 3] <= 0.0
-                fill[:, :] = False
-                fill[:, :-1] = empty[:, :-1] & (src[:, 1:, 3] > 0.0)
-                arr[:, :-1][fill[:, :-1]] = src[:, 1:][fill[:, :-1]]
-
-                empty = arr[:, :, 3] <= 0.0
-                fill[:, :] = False
-                fill[1:, :] = empty[1:, :] & (src[:-1, :, 3] > 0.0)
-                arr[1:, :][fill[1:, :]] = src[:-1, :][fill[1:, :]]
-
-                empty = arr[:, :, 3] <= 0.0
-                fill[:, :] = False
-                fill[:-1, :] = empty[:-1, :] & (src[1:, :, 3] > 0.0)
-                arr[:-1, :][fill[:-1, :]] = src[1:, :][fill[:-1, :]]
+            pixel_fill.dilate_rgba(arr, radius, out=arr)
             return buffer
         except Exception as exc:
             print(f"[RZM TexWorks MC] NumPy dilation fallback: {exc}")
+    return dilate_alpha_python(buffer, int(width), int(height), radius)
+
+
+def dilate_alpha_python(buffer, width, height, radius):
+    """
+    dilate_alpha without NumPy: two raster passes propagate the nearest baked pixel
+    (8SSEDT-style, near-exact Euclidean), then holes within radius copy its color.
+    """
+    count = width * height
+    nearest = array("i", [-1]) * count
+    any_empty = False
+    for i in range(count):
+        if buffer[i * 4 + 3] > 0.0:
+            nearest[i] = i
+        else:
+            any_empty = True
+    if not any_empty or max(nearest) < 0:
+        return buffer
 
-    for _ in range(radius):
-        src = list(buffer)
-        changed = False
-        for y in range(height):
-            row = y * width
-            for x in range(width):
-                idx = (row + x) * 4
-                if src[idx + 3] > 0.0:
+    forward = ((-1, 0), (-1, -1), (0, -1), (1, -1))
+    backward = ((1, 0), (1, 1), (0, 1), (-1, 1))
+    for offsets, ys, xs in (
+        (forward, range(height), range(width)),
+        (backward, range(height - 1, -1, -1), range(width - 1, -1, -1)),
+    ):
+        for y in ys:
+            for x in xs:
+                idx = y * width + x
+                best = nearest[idx]
+                if best == idx:
                     continue
-                neighbor = None
-                if x > 0:
-                    nidx = idx - 4
-                    if src[nidx + 3] > 0.0:
-                        neighbor = src[nidx:nidx + 4]
-                if neighbor is None and x + 1 < width:
-                    nidx = idx + 4
-                    if src[nidx + 3] > 0.0:
-                        neighbor = src[nidx:nidx + 4]
-                if neighbor is None and y > 0:
-                    nidx = idx - width * 4
-                    if src[nidx + 3] > 0.0:
-                        neighbor = src[nidx:nidx + 4]
-                if neighbor is None and y + 1 < height:
-                    nidx = idx + width * 4
-                    if src[nidx + 3] > 0.0:
-                        neighbor = src[nidx:nidx + 4]
-                if neighbor:
-                    buffer[idx] = neighbor[0]
-                    buffer[idx + 1] = neighbor[1]
-                    buffer[idx + 2] = neighbor[2]
-                    buffer[idx + 3] = neighbor[3]
-                    changed = True
-        if not changed:
-            break
+                best_d = (best % width - x) ** 2 + (best // width - y) ** 2 if best >= 0 else None
+                for ox, oy in offsets:
+                    nx = x + ox
+                    ny = y + oy
+                    if nx < 0 or ny < 0 or nx >= width or ny >= height:
+                        continue
+                    cand = nearest[ny * width + nx]
+                    if cand < 0:
+                        continue
+                    d = (cand % width - x) ** 2 + (cand // width - y) ** 2
+                    if best_d is None or d < best_d:
+                        best, best_d = cand, d
+                nearest[idx] = best
+
+    limit = radius * radius
+    for idx in range(count):
+        src = nearest[idx]
+        if src < 0 or src == idx:
+            continue
+        if (src % width - idx % width) ** 2 + (src // width - idx // width) ** 2 <= limit:
+            buffer[idx * 4:idx * 4 + 4] = buffer[src * 4:src * 4 + 4]
     return buffer
 
 
@@ -2189,13 +2208,14 @@ def bake_slot_image(slot, source, faces, face_to_group, layout_groups, atlas_w,
     return dilate_alpha(buffer, atlas_w, atlas_h, margin)
 
 
-def bake_slot_image_numpy(slot, source, faces, face_to_group, layout_groups, atlas_w, atlas_h, ref_w, ref_h, margin, src_pixels, src_w, src_h, fallback):
-    group_by_index = {group["index"]: group for group in layout_groups}
-    pixel_count = int(atlas_w) * int(atlas_h)
-    buffer = array("f", [0.0]) * (pixel_count * 4)
-    dest = np.frombuffer(buffer, dtype=np.float32).reshape(int(atlas_h), int(atlas_w), 4)
-    src = np.frombuffer(src_pixels, dtype=np.float32).reshape(int(src_h), int(src_w), 4)
-
+def collect_raster_triangles(faces, face_to_group, group_by_index):
+    """
+    Triangle fans of all grouped faces in bake order.
+    Returns (group per triangle, dest uvs (n, 3, 2), source uvs (n, 3, 2)).
+    """
+    tri_groups = []
+    dest_uvs = []
+    src_uvs = []
     for face_index, face in enumerate(faces):
         base_group = face_to_group.get(face_index)
         if not base_group:
@@ -2203,44 +2223,185 @@ def bake_slot_image_numpy(slot, source, faces, face_to_group, layout_groups, atl
         group = group_by_index.get(base_group["index"])
         if not group:
             continue
-        src_triangles = list(face_triangles(face.get("source_uvs") or face["uvs"]))
-        for tri_index, (uv_a, uv_b, uv_c) in enumerate(face_triangles(face["uvs"])):
-            src_a, src_b, src_c = src_triangles[tri_index] if tri_index < len(src_triangles) else (uv_a, uv_b, uv_c)
-            pa = dest_uv_to_pixel(uv_a, group, ref_w, ref_h, margin)
-            pb = dest_uv_to_pixel(uv_b, group, ref_w, ref_h, margin)
-            pc = dest_uv_to_pixel(uv_c, group, ref_w, ref_h, margin)
-            min_x = max(0, int(math.floor(min(pa[0], pb[0], pc[0]))) - margin)
-            max_x = min(int(atlas_w) - 1, int(math.ceil(max(pa[0], pb[0], pc[0]))) + margin)
-            min_y = max(0, int(math.floor(min(pa[1], pb[1], pc[1]))) - margin)
-            max_y = min(int(atlas_h) - 1, int(math.ceil(max(pa[1], pb[1], pc[1]))) + margin)
-            if max_x < min_x or max_y < min_y:
-                continue
+        uvs = face["uvs"]
+        source = face.get("source_uvs") or uvs
+        for i in range(1, len(uvs) - 1):
+            tri = (uvs[0], uvs[i], uvs[i + 1])
+            tri_groups.append(group)
+            dest_uvs.append(tri)
+            src_uvs.append((source[0], source[i], source[i + 1]) if i + 1 < len(source) else tri)
+    return tri_groups, dest_uvs, src_uvs
+
+
+def dest_uv_to_pixel_np(u, v, group, ref_w, ref_h, margin):
+    """dest_uv_to_pixel over float64 arrays (same operations, same results)."""
+    margin = int(group.get("margin_px", margin))
+    u_min = float(group["u_min"])
+    v_min = float(group["v_min"])
+    u_max = float(group["u_max"])
+    v_max = float(group["v_max"])
+    u_span = max(1.0e-12, u_max - u_min)
+    v_span = max(1.0e-12, v_max - v_min)
+    local_u = (u - u_min) / u_span
+    local_v = (v_max - v) / v_span
+    content_w = float(group.get("packed_content_w", group.get("content_w", max(1, int(ref_w)))))
+    content_h = float(group.get("packed_content_h", group.get("content_h", max(1, int(ref_h)))))
+    rotation = int(group.get("rotation", 0) or 0)
+    if rotation == 90:
+        local_u, local_v = local_v, 1.0 - local_u
+    if group.get("flip_x", False):
+        local_u = 1.0 - local_u
+    if group.get("flip_y", False):
+        local_v = 1.0 - local_v
+    x = group["x"] + margin + local_u * content_w
+    y = group["y"] + margin + local_v * content_h
+    return x, y
 
-            denom = ((pb[1] - pc[1]) * (pa[0] - pc[0]) + (pc[0] - pb[0]) * (pa[1] - pc[1]))
-            if abs(denom) < 1.0e-8:
-                continue
 
-            xs = np.arange(min_x, max_x + 1, dtype=np.float32) + 0.5
-            bbox_w = max_x - min_x + 1
-            max_cells = 1024 * 1024
-            rows_per_chunk = max(1, min(max_y - min_y + 1, max_cells // max(1, bbox_w)))
-
-            for y_start in range(min_y, max_y + 1, rows_per_chunk):
-                y_end = min(max_y, y_start + rows_per_chunk - 1)
-                ys = np.arange(y_start, y_end + 1, dtype=np.float32) + 0.5
-                grid_x, grid_y = np.meshgrid(xs, ys)
-                w0 = ((pb[1] - pc[1]) * (grid_x - pc[0]) + (pc[0] - pb[0]) * (grid_y - pc[1])) / denom
-                w1 = ((pc[1] - pa[1]) * (grid_x - pc[0]) + (pa[0] - pc[0]) * (grid_y - pc[1])) / denom
-                w2 = 1.0 - w0 - w1
-                mask = (w0 >= -1.0e-5) & (w1 >= -1.0e-5) & (w2 >= -1.0e-5)
-                if not mask.any():
-                    continue
+def _raster_band(dest, src, src_w, src_h, tri, tris, band_y0, band_y1, batch_cells=RASTER_BATCH_CELLS):
+    """Rasterizes triangles tris (ascending bake order) into rows band_y0..band_y1 of dest."""
+    atlas_w = dest.shape[1]
+    flat = dest.reshape(-1, 4)
+    min_x = tri["min_x"][tris]
+    width = tri["max_x"][tris] - min_x + 1
+    y0 = np.maximum(tri["min_y"][tris], band_y0)
+    height = np.minimum(tri["max_y"][tris], band_y1) - y0 + 1
+    cells = width * height
+    bounds = np.cumsum(cells)
+
+    start = 0
+    while start < len(tris):
+        # Batch of whole triangles, at most batch_cells candidate pixels (one triangle at least)
+        limit = (bounds[start - 1] if start else 0) + batch_cells
+        stop = max(start + 1, int(np.searchsorted(bounds, limit, side="right")))
+        lo, start = start, stop
+        count = cells[lo:stop]
+        batch = tris[lo:stop]
+
+        def per_cell(values):
+            return np.repeat(values, count)
+
+        # Every pixel of every clipped bbox in the batch, triangle by triangle
+        offset = np.arange(int(count.sum()), dtype=np.int64) - per_cell(np.cumsum(count) - count)
+        cell_w = per_cell(width[lo:stop])
+        row = offset // cell_w
+        px = per_cell(min_x[lo:stop]) + (offset - row * cell_w)
+        py = per_cell(y0[lo:stop]) + row
+
+        # Same float32 expressions as the per-triangle meshgrid path
+        grid_x = px.astype(np.float32) + 0.5
+        grid_y = py.astype(np.float32) + 0.5
+        dx = grid_x - per_cell(tri["cx"][batch])
+        dy = grid_y - per_cell(tri["cy"][batch])
+        denom = per_cell(tri["denom"][batch])
+        w0 = (per_cell(tri["a"][batch]) * dx + per_cell(tri["b"][batch]) * dy) / denom
+        w1 = (per_cell(tri["e"][batch]) * dx + per_cell(tri["f"][batch]) * dy) / denom
+        w2 = 1.0 - w0 - w1
+        mask = (w0 >= -1.0e-5) & (w1 >= -1.0e-5) & (w2 >= -1.0e-5)
+        hit = np.flatnonzero(mask)
+        if not len(hit):
+            continue
+
+        # Later triangles overwrite earlier ones: keep the last hit per pixel
+        pixel = py[hit] * atlas_w + px[hit]
+        _, last = np.unique(pixel[::-1], return_index=True)
+        keep = len(hit) - 1 - last
+        pixel = pixel[keep]
+        hit = hit[keep]
+        t = per_cell(batch)[hit]
+        w0 = w0[hit]
+        w1 = w1[hit]
+        w2 = w2[hit]
+        src_u = tri["su"][t, 0] * w0 + tri["su"][t, 1] * w1 + tri["su"][t, 2] * w2
+        src_v = tri["sv"][t, 0] * w0 + tri["sv"][t, 1] * w1 + tri["sv"][t, 2] * w2
+        flat[pixel] = sample_bilinear_np(src, src_w, src_h, src_u, src_v)
+
+
+def bake_slot_image_numpy(slot, source, faces, face_to_group, layout_groups, atlas_w, atlas_h, ref_w, ref_h, margin, src_pixels, src_w, src_h, fallback, workers=None):
+    """
+    Batched rasterizer: triangles are binned into bands of RASTER_TILE_ROWS rows and every
+    band evaluates coverage and barycentrics for many triangles per NumPy call. Bands do
+    not share pixels, so they run on a thread pool of up to RASTER_MAX_WORKERS threads
+    that split RASTER_BATCH_CELLS between them. The result is bit-identical to
+    drawing the triangles one by one in face order.
+    """
+    group_by_index = {group["index"]: group for group in layout_groups}
+    atlas_w = int(atlas_w)
+    atlas_h = int(atlas_h)
+    buffer = array("f", [0.0]) * (atlas_w * atlas_h * 4)
+    dest = np.frombuffer(buffer, dtype=np.float32).reshape(atlas_h, atlas_w, 4)
+    src = np.frombuffer(src_pixels, dtype=np.float32).reshape(int(src_h), int(src_w), 4)
+
+    tri_groups, dest_uvs, src_uvs = collect_raster_triangles(faces, face_to_group, group_by_index)
+    if not tri_groups:
+        return dilate_alpha(buffer, atlas_w, atlas_h, margin)
+
+    dest_uvs = np.asarray(dest_uvs, dtype=np.float64)
+    src_uvs = np.asarray(src_uvs, dtype=np.float64)
+    pos = np.empty_like(dest_uvs)
+    group_slot = {}
+    slots = np.fromiter((group_slot.setdefault(id(group), len(group_slot)) for group in tri_groups), dtype=np.int64, count=len(tri_groups))
+    for group in {id(group): group for group in tri_groups}.values():
+        sel = slots == group_slot[id(group)]
+        x, y = dest_uv_to_pixel_np(dest_uvs[sel, :, 0], dest_uvs[sel, :, 1], group, ref_w, ref_h, margin)
+        pos[sel, :, 0] = x
+        pos[sel, :, 1] = y
+
+    pa, pb, pc = pos[:, 0], pos[:, 1], pos[:, 2]
+    min_x = np.maximum(0, np.floor(np.minimum(np.minimum(pa[:, 0], pb[:, 0]), pc[:, 0])).astype(np.int64) - margin)
+    max_x = np.minimum(atlas_w - 1, np.ceil(np.maximum(np.maximum(pa[:, 0], pb[:, 0]), pc[:, 0])).astype(np.int64) + margin)
+    min_y = np.maximum(0, np.floor(np.minimum(np.minimum(pa[:, 1], pb[:, 1]), pc[:, 1])).astype(np.int64) - margin)
+    max_y = np.minimum(atlas_h - 1, np.ceil(np.maximum(np.maximum(pa[:, 1], pb[:, 1]), pc[:, 1])).astype(np.int64) + margin)
+    denom = (pb[:, 1] - pc[:, 1]) * (pa[:, 0] - pc[:, 0]) + (pc[:, 0] - pb[:, 0]) * (pa[:, 1] - pc[:, 1])
+    drawn = np.flatnonzero((max_x >= min_x) & (max_y >= min_y) & ~(np.abs(denom) < 1.0e-8))
+    if not len(drawn):
+        return dilate_alpha(buffer, atlas_w, atlas_h, margin)
+
+    # Scalars of the per-triangle path, rounded to float32 the way NumPy rounds them there
+    f32 = np.float32
+    tri = {
+        "min_x": min_x, "max_x": max_x, "min_y": min_y, "max_y": max_y,
+        "a": (pb[:, 1] - pc[:, 1]).astype(f32),
+        "b": (pc[:, 0] - pb[:, 0]).astype(f32),
+        "e": (pc[:, 1] - pa[:, 1]).astype(f32),
+        "f": (pa[:, 0] - pc[:, 0]).astype(f32),
+        "cx": pc[:, 0].astype(f32),
+        "cy": pc[:, 1].astype(f32),
+        "denom": denom.astype(f32),
+        "su": src_uvs[:, :, 0].astype(f32),
+        "sv": src_uvs[:, :, 1].astype(f32),
+    }
+
+    # Bin triangles into row bands; the stable sort keeps bake order inside each band
+    first_band = min_y[drawn] // RASTER_TILE_ROWS
+    band_count = max_y[drawn] // RASTER_TILE_ROWS - first_band + 1
+    band_tris = np.repeat(drawn, band_count)
+    band_ids = np.repeat(first_band, band_count) + (np.arange(len(band_tris)) - np.repeat(np.cumsum(band_count) - band_count, band_count))
+    order = np.argsort(band_ids, kind="stable")
+    band_tris = band_tris[order]
+    band_ids = band_ids[order]
+    splits = np.flatnonzero(np.diff(band_ids)) + 1
+    jobs = [
+        (int(band_ids[lo]), band_tris[lo:hi])
+        for lo, hi in zip(np.concatenate(([0], splits)), np.concatenate((splits, [len(band_ids)])))
+    ]
+
+    if workers is None:
+        workers = min(RASTER_MAX_WORKERS, os.cpu_count() or 1)
+    workers = max(1, min(int(workers), len(jobs)))
+    batch_cells = max(1, RASTER_BATCH_CELLS // workers)
 
-                src_u = src_a[0] * w0[mask] + src_b[0] * w1[mask] + src_c[0] * w2[mask]
-                src_v = src_a[1] * w0[mask] + src_b[1] * w1[mask] + src_c[1] * w2[mask]
-                colors = sample_bilinear_np(src, int(src_w), int(src_h), src_u.astype(np.float32), src_v.astype(np.float32))
-                dest_slice = dest[y_start:y_end + 1, min_x:max_x + 1]
-                dest_slice[mask] = colors
+    def run(job):
+        band, tris = job
+        y0 = band * RASTER_TILE_ROWS
+        _raster_band(dest, src, int(src_w), int(src_h), tri, tris, y0, min(atlas_h, y0 + RASTER_TILE_ROWS) - 1, batch_cells)
+
+    if workers <= 1:
+        for job in jobs:
+            run(job)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(run, jobs))
 
     return dilate_alpha(buffer, atlas_w, atlas_h, margin)
 
@@ -2255,34 +2416,17 @@ def create_or_replace_image(name, width, height, pixels):
     return image
 
 
-def write_png_rgba8(path, width, height, pixels):
+def write_png_rgba8(path, width, height, pixels, level=PNG_LEVEL):
+    """
+    Float RGBA buffer -> 8-bit PNG. With NumPy the streaming core.png_encoder is used
+    (adaptive row filters, bands compressed on a thread pool); level trades speed for size.
+    """
     width = int(width)
     height = int(height)
-    if np is not None:
+    if png_encoder is not None:
         try:
-            floats = np.frombuffer(pixels, dtype=np.float32, count=width * height * 4)
-            rgba = np.clip(floats * 255.0 + 0.5, 0.0, 255.0).astype(np.uint8, copy=False)
-            rows = np.empty((height, width * 4 + 1), dtype=np.uint8)
-            rows[:, 0] = 0
-            rows[:, 1:] = rgba.reshape(height, width * 4)
-
-            def chunk(kind, payload):
-                return (
-                    struct.pack(">I", len(payload))
-                    + kind
-                    + payload
-                    + struct.pack(">I", zlib.crc32(kind + payload) & 0xFFFFFFFF)
-                )
-
-            ihdr = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
-            data = (
-                b"\x89PNG\r\n\x1a\n"
-                + chunk(b"IHDR", ihdr)
-                + chunk(b"IDAT", zlib.compress(rows.tobytes(), level=1))
-                + chunk(b"IEND", b"")
-            )
-            with open(path, "wb") as handle:
-                handle.write(data)
+            floats = np.frombuffer(pixels, dtype=np.float32, count=width * height * 4).reshape(height, width, 4)
+            png_encoder.write_png_rgba8(path, floats, level=level)
             return
         except Exception as exc:
             print(f"[RZM TexWorks MC] NumPy PNG writer fallback: {exc}")
@@ -2419,6 +2563,135 @@ def build_manifest(context, mat, slot_sources, objects, faces, islands, groups,
     }
 
 
+def cluster_cache():
+    """Session cache: (material_key, use_preview_uv) -> layout, slot bakes and written files."""
+    cache = bpy.app.driver_namespace.get(CLUSTER_CACHE_KEY)
+    if cache is None:
+        cache = {}
+        bpy.app.driver_namespace[CLUSTER_CACHE_KEY] = cache
+    return cache
+
+
+def clear_cluster_cache(mat_name=None):
+    cache = cluster_cache()
+    if mat_name is None:
+        cache.clear()
+        return
+    key = material_key(mat_name)
+    for entry_key in [entry_key for entry_key in cache if entry_key[0] == key]:
+        del cache[entry_key]
+
+
+def cluster_faces_digest(faces):
+    digest = hashlib.blake2b(digest_size=16)
+    for face in faces:
+        digest.update(repr(tuple(face.values())).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def cluster_settings_key(settings):
+    return (
+        settings.reference_slot,
+        int(settings.vertex_margin_px),
+        int(settings.pack_gap_px),
+        int(settings.max_atlas_size),
+        bool(settings.power_of_two_output),
+        settings.y_origin,
+        settings.output_subdir,
+        tuple(settings.default_resolution),
+    )
+
+
+def slot_source_key(source):
+    """
+    Content key of one slot source: flags, fallback color and the image pixel
+    key (packed bytes, file stamp or raw pixels, see atlas_algo.blender_image_source_key).
+    """
+    image = source.get("image")
+    image_key = None
+    if image:
+        image_key = (image.name, tuple(image.size), atlas_algo.blender_image_source_key(image))
+    return (
+        bool(source.get("enabled")),
+        bool(source.get("procedural")),
+        bool(source.get("has_flag")),
+        tuple(round(float(c), 6) for c in source.get("solid_color") or ()),
+        image_key,
+    )
+
+
+def cluster_layout_key(context, mat, faces, slot_sources, ref_size, ref_slot, use_preview_uv, extra=()):
+    """
+    Key of everything calculate_cluster reads: face UVs/topology, settings,
+    reference size and the slot structure. The Diffuse pixels are part of it
+    because texture-cut packing shrinks groups to the Diffuse alpha.
+    """
+    if atlas_algo is None:
+        return None
+    slots = []
+    for slot, source in slot_sources.items():
+        image = source.get("image")
+        slots.append((
+            slot,
+            bool(source.get("enabled")),
+            bool(source.get("procedural")),
+            image.name if image else None,
+            tuple(image.size) if image else None,
+        ))
+    diffuse = slot_sources.get("Diffuse")
+    return atlas_algo.hash_source_key(
+        SCHEMA,
+        mat.name,
+        bool(use_preview_uv),
+        cluster_faces_digest(faces),
+        cluster_settings_key(get_settings(context)),
+        tuple(ref_size),
+        ref_slot,
+        tuple(slots),
+        slot_source_key(diffuse) if diffuse and diffuse.get("image") else None,
+        extra,
+    )
+
+
+def cached_cluster(mat, layout_key, use_preview_uv, slot_sources):
+    """Cluster rebuilt from the cache entry when the layout key matches, else None."""
+    if layout_key is None:
+        return None
+    entry = cluster_cache().get((material_key(mat.name), bool(use_preview_uv)))
+    if not entry or entry["layout_key"] != layout_key:
+        return None
+    cluster = dict(entry["layout"])
+    cluster["material"] = mat
+    cluster["slot_sources"] = slot_sources
+    cluster["manifest"] = copy.deepcopy(entry["layout"]["manifest"])
+    cluster["cache_entry"] = entry
+    return cluster
+
+
+def remember_cluster_layout(cluster, layout_key, use_preview_uv):
+    if layout_key is None:
+        return
+    layout = {
+        name: cluster[name]
+        for name in (
+            "faces", "objects", "islands", "groups", "face_to_group", "layout_groups",
+            "atlas_size", "reference_size", "reference_slot",
+        )
+    }
+    layout["manifest"] = copy.deepcopy(cluster["manifest"])
+    entry = {"layout_key": layout_key, "layout": layout, "slots": {}, "files": {}}
+    cluster_cache()[(material_key(cluster["material"].name), bool(use_preview_uv))] = entry
+    cluster["cache_entry"] = entry
+
+
+def file_stamp(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
 def calculate_cluster(context, use_preview_uv=False):
     settings = get_settings(context)
     if not settings.enabled:
@@ -2447,13 +2720,24 @@ def calculate_cluster(context, use_preview_uv=False):
         if source["enabled"] and not image:
             warnings.append(f"{slot}: no image, generated from solid color at fallback/reference layout")
 
+    registered_size = None
+    if use_preview_uv:
+        registered_size = registered_cluster_size(context, mat, ref_slot if ref_slot in SLOTS else "Diffuse")
+    layout_key = cluster_layout_key(
+        context, mat, faces, slot_sources, (ref_w, ref_h), ref_slot, use_preview_uv,
+        extra=(collection_scope, repr(input_stats), registered_size),
+    )
+    cluster = cached_cluster(mat, layout_key, use_preview_uv, slot_sources)
+    if cluster is not None:
+        print(f"[RZM TexWorks MC] Layout cache hit material={mat.name!r}: skipped islands/packing")
+        return cluster
+
     margin = int(settings.vertex_margin_px)
     gap = int(settings.pack_gap_px)
     has_diffuse_texture = bool(slot_sources.get("Diffuse", {}).get("image"))
     rebuild_mode = "PREVIEW_REEXPORT" if use_preview_uv else ("TEXTURE_FACE_REPACK" if has_diffuse_texture else "NO_DIFFUSE_DENSE_PACK")
     core_diagnostics = None
     if use_preview_uv:
-        registered_size = registered_cluster_size(context, mat, ref_slot if ref_slot in SLOTS else "Diffuse")
         if registered_size is None:
             raise RuntimeError(
                 f"Cannot export preview for '{mat.name}' before a normal Rebuild has registered a cluster size. "
@@ -2564,7 +2848,7 @@ def calculate_cluster(context, use_preview_uv=False):
     }
     if use_preview_uv:
         manifest["uv_source"] = preview_uv_name_for_material(mat)
-    return {
+    cluster = {
         "material": mat,
         "slot_sources": slot_sources,
         "faces": faces,
@@ -2578,6 +2862,8 @@ def calculate_cluster(context, use_preview_uv=False):
         "reference_slot": ref_slot,
         "manifest": manifest,
     }
+    remember_cluster_layout(cluster, layout_key, use_preview_uv)
+    return cluster
 
 
 def bake_cluster_images(context, cluster):
@@ -2585,13 +2871,31 @@ def bake_cluster_images(context, cluster):
     atlas_w, atlas_h = cluster["atlas_size"]
     ref_w, ref_h = cluster["reference_size"]
     key = material_key(cluster["material"].name)
+    margin = int(settings.vertex_margin_px)
+    max_raster_pixels = int(getattr(settings, "max_raster_pixels", DEFAULT_MAX_RASTER_PIXELS))
+    entry = cluster.get("cache_entry")
     images = {}
     pixel_buffers = {}
     debug_average = {}
+    slot_keys = {}
+    slot_records = {}
+    reused = []
     for slot, source in cluster["slot_sources"].items():
         if not source["enabled"]:
             continue
         name = cluster["manifest"]["resources"][slot]
+        if entry is not None:
+            # Same layout + same source content + same bake settings -> the image from the last bake is still valid
+            slot_key = atlas_algo.hash_source_key(entry["layout_key"], slot, slot_source_key(source), margin, max_raster_pixels)
+            slot_keys[slot] = slot_key
+            record = entry["slots"].get(slot)
+            image = bpy.data.images.get(record["image"]) if record and record["key"] == slot_key else None
+            if image is not None and (int(image.size[0]), int(image.size[1])) == (atlas_w, atlas_h):
+                debug_average[slot] = record["average"]
+                images[slot] = image
+                slot_records[slot] = record
+                reused.append(slot)
+                continue
         pixels = bake_slot_image(
             slot,
             source,
@@ -2602,18 +2906,26 @@ def bake_cluster_images(context, cluster):
             atlas_h,
             ref_w,
             ref_h,
-            int(settings.vertex_margin_px),
-            int(getattr(settings, "max_raster_pixels", DEFAULT_MAX_RASTER_PIXELS)),
+            margin,
+            max_raster_pixels,
         )
         debug_average[slot] = tuple(round(v, 6) for v in pixel_average_rgba(pixels))
         pixel_buffers[slot] = pixels
         image = create_or_replace_image(name, atlas_w, atlas_h, pixels)
         set_image_colorspace(image, slot)
         images[slot] = image
+        if entry is not None:
+            slot_records[slot] = {"key": slot_keys[slot], "image": image.name, "average": debug_average[slot]}
+    if entry is not None:
+        entry["slots"] = slot_records
     cluster["images"] = images
     cluster["pixel_buffers"] = pixel_buffers
+    cluster["slot_keys"] = slot_keys
     cluster["manifest"]["debug_average_rgba"] = debug_average
-    print(f"[RZM TexWorks MC] Rebuilt '{cluster['material'].name}' {atlas_w}x{atlas_h} avg={debug_average}")
+    print(
+        f"[RZM TexWorks MC] Rebuilt '{cluster['material'].name}' {atlas_w}x{atlas_h} "
+        f"baked={sorted(pixel_buffers)} reused={reused} avg={debug_average}"
+    )
     context.scene["rzm_tw_mc_last_manifest_json"] = json.dumps(cluster["manifest"], indent=2, sort_keys=True)
     text_name = f"{RESOURCE_PREFIX}.{key}.manifest"
     text = bpy.data.texts.get(text_name) or bpy.data.texts.new(text_name)
@@ -2639,18 +2951,27 @@ def export_cluster_pngs(context, cluster, target_path=None):
     if "images" not in cluster:
         bake_cluster_images(context, cluster)
 
+    entry = cluster.get("cache_entry")
     written = {}
     for slot, image in cluster["images"].items():
         file_name = f"{cluster['manifest']['resources'][slot]}.png"
         file_path = os.path.join(out_dir, file_name)
-        pixels = cluster.get("pixel_buffers", {}).get(slot)
-        if pixels is None:
-            pixels = array("f", [0.0]) * (image.size[0] * image.size[1] * 4)
-            image.pixels.foreach_get(pixels)
-        write_png_rgba8(file_path, image.size[0], image.size[1], pixels)
+        slot_key = cluster.get("slot_keys", {}).get(slot)
+        record = entry["files"].get(slot) if entry is not None else None
+        stamp = file_stamp(file_path)
+        if not (slot_key and record and stamp and record == {"key": slot_key, "path": file_path, "stamp": stamp}):
+            pixels = cluster.get("pixel_buffers", {}).get(slot)
+            if pixels is None:
+                pixels = array("f", [0.0]) * (image.size[0] * image.size[1] * 4)
+                image.pixels.foreach_get(pixels)
+            write_png_rgba8(file_path, image.size[0], image.size[1], pixels)
+            if entry is not None and slot_key:
+                entry["files"][slot] = {"key": slot_key, "path": file_path, "stamp": file_stamp(file_path)}
         image.name = file_name
         image.filepath = file_path
         image.filepath_raw = file_path
+        if entry is not None and slot in entry["slots"]:
+            entry["slots"][slot]["image"] = image.name
         written[slot] = file_path
 
     manifest_path = os.path.join(out_dir, f"{RESOURCE_PREFIX}.{key}.manifest.json")
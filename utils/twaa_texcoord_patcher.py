@@ -4,11 +4,14 @@ import os
 import struct
 
 import bpy
+import numpy as np
+
+from .export_timing import count_written
 
 
 MANIFEST_TEXT_PREFIX = "RZAutoAtlas."
 PREVIEW_UV_NAME = "RZAutoAtlas.UV.preview"
-PATCHER_BUILD = "tw-blocks-material-slices-v15-20260619"
+PATCHER_BUILD = "tw-blocks-material-slices-v16-20261018"
 _SAMPLE_LIMIT = 192
 SOURCE_UV_LAYER_NAME = "TEXCOORD.xy"
 _UV_KEY_DIGITS = 4
@@ -25,11 +28,23 @@ def _read_pair(data, offset, storage):
     return struct.unpack_from("<ff", data, offset)
 
 
-def _write_pair(data, offset, u, v, storage):
-    if storage == "f16":
-        struct.pack_into("<ee", data, offset, float(u), float(v))
-    else:
-        struct.pack_into("<ff", data, offset, float(u), float(v))
+def _texcoord_view(data, stride, layout):
+    """(vertices, 2) strided float16/float32 view of one TEXCOORD pair inside the buffer.
+
+    Writes through the view land directly in ``data`` (a bytearray).
+    """
+    dtype = np.dtype("<f2" if layout["storage"] == "f16" else "<f4")
+    offset = int(layout["offset"])
+    if offset < 0 or offset + 2 * dtype.itemsize > stride:
+        return np.empty((0, 2), dtype=dtype)
+    total_vertices = len(data) // stride
+    return np.ndarray(
+        shape=(total_vertices, 2),
+        dtype=dtype,
+        buffer=data,
+        offset=offset,
+        strides=(stride, dtype.itemsize),
+    )
 
 
 def _format_byte_width(fmt):
@@ -229,22 +244,29 @@ def _sample_vertices(start, end, limit=_SAMPLE_LIMIT):
     return sorted({start + int(round(index * step)) for index in range(limit)})
 
 
-def _manifest_source_distance(manifest, u, v):
-    best = None
+def _manifest_group_bounds(manifest):
+    bounds = []
     for group in manifest.get("groups", []):
-        bounds = group.get("source_uv_bounds") or [0.0, 0.0, 1.0, 1.0]
         try:
-            u_min, v_min, u_max, v_max = [float(value) for value in bounds]
+            bounds.append([float(value) for value in (group.get("source_uv_bounds") or [0.0, 0.0, 1.0, 1.0])][:4])
         except Exception:
             continue
-        u_span = max(1.0e-6, abs(u_max - u_min))
-        v_span = max(1.0e-6, abs(v_max - v_min))
-        du = 0.0 if u_min <= u <= u_max else min(abs(u - u_min), abs(u - u_max)) / u_span
-        dv = 0.0 if v_min <= v <= v_max else min(abs(v - v_min), abs(v - v_max)) / v_span
-        distance = du + dv
-        if best is None or distance < best:
-            best = distance
-    return 0.0 if best is None else best
+    return np.asarray([item for item in bounds if len(item) == 4], dtype=np.float64).reshape(-1, 4)
+
+
+def _manifest_source_distances(manifest, us, vs):
+    """Per-point distance (in group spans) to the nearest manifest source_uv_bounds; 0 inside."""
+    us = np.asarray(us, dtype=np.float64)
+    vs = np.asarray(vs, dtype=np.float64)
+    bounds = _manifest_group_bounds(manifest)
+    if not len(bounds) or not len(us):
+        return np.zeros(len(us), dtype=np.float64)
+    u_min, v_min, u_max, v_max = (bounds[:, i, None] for i in range(4))
+    u_span = np.maximum(1.0e-6, np.abs(u_max - u_min))
+    v_span = np.maximum(1.0e-6, np.abs(v_max - v_min))
+    du = np.where((u_min <= us) & (us <= u_max), 0.0, np.minimum(np.abs(us - u_min), np.abs(us - u_max)) / u_span)
+    dv = np.where((v_min <= vs) & (vs <= v_max), 0.0, np.minimum(np.abs(vs - v_min), np.abs(vs - v_max)) / v_span)
+    return (du + dv).min(axis=0)
 
 
 def _fract(value):
@@ -348,7 +370,6 @@ def _score_primary_candidate(data, stride, start, end, storage, offset, manifest
     finite = 0
     sane = 0
     uv_sized = 0
-    source_hits = 0
     meaningful = 0
     pairs = set()
     us = []
@@ -374,10 +395,9 @@ def _score_primary_candidate(data, stride, start, end, storage, offset, manifest
             uv_sized += 1
         if abs(u) > 1.0e-7 or abs(v) > 1.0e-7:
             meaningful += 1
-        if _manifest_source_distance(manifest, u, v) <= 1.0e-4:
-            source_hits += 1
         if len(pairs) < 64:
             pairs.add((round(u, 5), round(v, 5)))
+    source_hits = int(np.count_nonzero(_manifest_source_distances(manifest, us, vs) <= 1.0e-4))
 
     sample_count = len(vertices)
     finite_ratio = finite / float(sample_count)
@@ -865,19 +885,33 @@ def _classify_vertex_material_from_lookup(vertex_index, u, v, by_vertex_uv, by_v
 
 
 def _compact_ranges(indices):
-    ordered = sorted({int(index) for index in indices})
-    if not ordered:
+    ordered = np.unique(np.asarray(indices, dtype=np.int64))
+    if not len(ordered):
         return []
-    ranges = []
-    start = prev = ordered[0]
-    for index in ordered[1:]:
-        if index == prev + 1:
-            prev = index
-            continue
-        ranges.append([start, prev + 1])
-        start = prev = index
-    ranges.append([start, prev + 1])
-    return ranges
+    breaks = np.flatnonzero(np.diff(ordered) != 1)
+    starts = np.concatenate(([ordered[0]], ordered[breaks + 1]))
+    ends = np.concatenate((ordered[breaks], [ordered[-1]])) + 1
+    return [[int(first), int(last)] for first, last in zip(starts, ends)]
+
+
+def _blender_vertex_indices(vertex_map, count):
+    """Buffer-local vertex -> Blender vertex index; -1 where the map entry is unusable.
+
+    Vertices past the end of the map keep their local index (legacy behaviour).
+    """
+    local = np.arange(count, dtype=np.int64)
+    if vertex_map is None or not len(vertex_map):
+        return local
+    mapped = min(count, len(vertex_map))
+    try:
+        local[:mapped] = np.asarray(vertex_map[:mapped], dtype=np.int64)
+    except Exception:
+        for index in range(mapped):
+            try:
+                local[index] = int(vertex_map[index])
+            except Exception:
+                local[index] = -1
+    return local
 
 
 def _build_material_vertex_slices(context, obj, obj_data, data, stride, layout, start, end):
@@ -900,36 +934,37 @@ def _build_material_vertex_slices(context, obj, obj_data, data, stride, layout,
             "unmapped": 0,
         }
 
-    vertex_map = obj_data.get("vertex_map") or []
-    slices = {key: [] for key in unique_keys}
-    source_counts = {}
-    ambiguous = 0
-    unmapped = 0
     total_vertices = len(data) // stride
     end = min(int(end), total_vertices)
     start = max(0, int(start))
+    count = max(0, end - start)
+    uv = _texcoord_view(data, stride, layout)[start:start + count].astype(np.float64)
+    blender_vertices = _blender_vertex_indices(obj_data.get("vertex_map"), len(uv))
+    usable = (blender_vertices >= 0) & np.isfinite(uv).all(axis=1)
+    unmapped = int(count - np.count_nonzero(usable))
+
+    # A Blender vertex whose loops all belong to one material resolves to that
+    # material on every lookup path, whatever its buffer UV. Those are assigned
+    # in bulk; only seam vertices go through the per-vertex UV matching.
+    key_index = {key: index for index, key in enumerate(unique_keys)}
+    max_vertex = max(by_vertex.keys(), default=-1)
+    owner = np.full(max_vertex + 2, -1, dtype=np.int64)
+    for vertex_index, keys in by_vertex.items():
+        if len(keys) == 1:
+            owner[vertex_index] = key_index.get(next(iter(keys)), -1)
+    lookup = np.where((blender_vertices >= 0) & (blender_vertices <= max_vertex), blender_vertices, max_vertex + 1)
+    single = np.where(usable, owner[lookup], -1)
+
+    bulk = {key: np.flatnonzero(single == index) + start for key, index in key_index.items()}
+    slices = {}
+    source_counts = {}
+    fast_count = int(np.count_nonzero(single >= 0))
+    if fast_count:
+        source_counts["vertex-unique"] = fast_count
+    ambiguous = 0
 
-    for vertex in range(start, end):
-        local_index = vertex - start
-        if vertex_map and 0 <= local_index < len(vertex_map):
-            try:
-                blender_vertex = int(vertex_map[local_index])
-            except Exception:
-                unmapped += 1
-                continue
-        else:
-            blender_vertex = local_index
-
-        base = vertex * stride + int(layout["offset"])
-        try:
-            u, v = _read_pair(data, base, layout["storage"])
-        except Exception:
-            unmapped += 1
-            continue
-        if not (_finite(u) and _finite(v)):
-            unmapped += 1
-            continue
-
+    seam = np.flatnonzero(usable & (single < 0))
+    for local_index, blender_vertex, (u, v) in zip(seam.tolist(), blender_vertices[seam].tolist(), uv[seam].tolist()):
         key, source = _classify_vertex_material_from_lookup(
             blender_vertex,
             u,
@@ -939,7 +974,7 @@ def _build_material_vertex_slices(context, obj, obj_data, data, stride, layout,
             by_vertex_points,
         )
         if key:
-            slices.setdefault(key, []).append(vertex)
+            slices.setdefault(key, []).append(start + local_index)
             source_counts[source] = source_counts.get(source, 0) + 1
         elif source.startswith("ambiguous"):
             ambiguous += 1
@@ -947,12 +982,13 @@ def _build_material_vertex_slices(context, obj, obj_data, data, stride, layout,
             unmapped += 1
 
     result = []
-    for key, indices in sorted(slices.items()):
-        if not indices:
+    for key in sorted(set(bulk) | set(slices)):
+        indices = np.union1d(bulk.get(key, np.empty(0, dtype=np.int64)), np.asarray(slices.get(key, ()), dtype=np.int64))
+        if not len(indices):
             continue
         result.append({
             "material_key": key,
-            "indices": sorted(set(indices)),
+            "indices": indices,
             "ranges": _compact_ranges(indices),
         })
 
@@ -1053,33 +1089,41 @@ def _stride_for_texcoord(path, comp_data):
     return stride if stride >= 4 else None
 
 
+def _affine_cluster_to_buffer_uv_np(uv, pos_size, invert_x, invert_y):
+    """Bulk _affine_cluster_to_buffer_uv over an (n, 2) float64 array (same float64 arithmetic)."""
+    scale_x, scale_y, offset_x, offset_y_top = pos_size
+    atlas_u = uv[:, 0] * scale_x + offset_x
+    atlas_v_top_space = uv[:, 1] * scale_y + offset_y_top
+    out = np.empty_like(uv)
+    out[:, 0] = 1.0 - atlas_u if invert_x else atlas_u
+    out[:, 1] = atlas_v_top_space if invert_y else 1.0 - atlas_v_top_space
+    return out
+
+
+def _patch_rows(view, rows, pos_size, invert_x, invert_y):
+    """Affine-patch view[rows] in place, skipping pairs that are (or would become) non-finite."""
+    uv = view[rows].astype(np.float64)
+    out = _affine_cluster_to_buffer_uv_np(uv, pos_size, invert_x, invert_y).astype(view.dtype)
+    ok = np.isfinite(uv).all(axis=1) & np.isfinite(out).all(axis=1)
+    if isinstance(rows, slice):
+        view[rows][ok] = out[ok]
+    else:
+        view[rows[ok]] = out[ok]
+    return int(np.count_nonzero(ok))
+
+
 def _patch_vertex_indices(data, stride, layout, vertex_indices, pos_size, invert_x, invert_y):
-    patched = 0
-    total_vertices = len(data) // stride
-    offset = int(layout["offset"])
-    for vertex in vertex_indices:
-        vertex = int(vertex)
-        if vertex < 0 or vertex >= total_vertices:
-            continue
-        base = vertex * stride + offset
-        try:
-            u, v = _read_pair(data, base, layout["storage"])
-        except Exception:
-            continue
-        if not (_finite(u) and _finite(v)):
-            continue
-        out_u, out_v = _affine_cluster_to_buffer_uv(
-            float(u),
-            float(v),
-            pos_size,
-            invert_x,
-            invert_y,
-        )
-        if not (_finite(out_u) and _finite(out_v)):
-            continue
-        _write_pair(data, base, out_u, out_v, layout["storage"])
-        patched += 1
-    return patched
+    """Patch the given (unique) vertex indices of one TEXCOORD payload."""
+    view = _texcoord_view(data, stride, layout)
+    indices = np.asarray(vertex_indices, dtype=np.int64)
+    indices = indices[(indices >= 0) & (indices < len(view))]
+    return _patch_rows(view, indices, pos_size, invert_x, invert_y)
+
+
+def _patch_vertex_range(data, stride, layout, start, end, pos_size, invert_x, invert_y):
+    """Patch vertices [start, end) of one TEXCOORD payload (contiguous object range)."""
+    view = _texcoord_view(data, stride, layout)
+    return _patch_rows(view, slice(max(0, int(start)), int(end)), pos_size, invert_x, invert_y)
 
 
 def patch_exported_twaa_texcoords(context):
@@ -1306,26 +1350,7 @@ def patch_exported_twaa_texcoords(context):
             patched_layouts = []
 
             for layout in layouts:
-                layout_patched = 0
-                for vertex in range(start, end):
-                    base = vertex * stride + layout["offset"]
-                    try:
-                        u, v = _read_pair(data, base, layout["storage"])
-                    except Exception:
-                        continue
-                    if not (_finite(u) and _finite(v)):
-                        continue
-                    out_u, out_v = _affine_cluster_to_buffer_uv(
-                        float(u),
-                        float(v),
-                        pos_size,
-                        invert_x,
-                        invert_y,
-                    )
-                    if not (_finite(out_u) and _finite(out_v)):
-                        continue
-                    _write_pair(data, base, out_u, out_v, layout["storage"])
-                    layout_patched += 1
+                layout_patched = _patch_vertex_range(data, stride, layout, start, end, pos_size, invert_x, invert_y)
                 if layout_patched:
                     obj_patched_values += layout_patched
                     obj_patched_vertices = max(obj_patched_vertices, layout_patched)
@@ -1351,6 +1376,7 @@ def patch_exported_twaa_texcoords(context):
             tmp_path = f"{path}.rzm_tmp"
             with open(tmp_path, "wb") as handle:
                 handle.write(data)
+            count_written(len(data))
             os.replace(tmp_path, path)
             patched_files.add(path)
 
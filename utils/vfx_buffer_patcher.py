@@ -7,6 +7,7 @@ import math
 import numpy as np
 from mathutils import Vector, Matrix, Euler
 
+from .export_timing import count_written
 from .vfx_shapes import (
     get_vfx_local_pos,
     get_vfx_shape_counts,
@@ -17,6 +18,48 @@ from .vfx_shapes import (
 # Set to True to export giant triangles directly in the buffer coordinates for visual verification
 TEST_TRIANGLE_EXPORT = False
 
+# curve_data.buf: на каждый сплайн 8 шейпов x 32 точки + 1 запись метаданных, 40 байт на запись
+CURVE_SHAPES = 8
+CURVE_SAMPLES = 32
+CURVE_RECORDS = CURVE_SHAPES * CURVE_SAMPLES + 1
+CURVE_POINT_DTYPE = np.dtype([
+    ('position', '<f4', 3),
+    ('tangent', '<f4', 3),
+    ('normal', '<f4', 3),
+    ('radius', '<f4'),
+])
+# curve_weight_data.buf: 8 шейпов x 32 точки, 4 веса + 4 индекса кости
+CURVE_WEIGHT_DTYPE = np.dtype([('weights', '<f4', 4), ('indices', '<u4', 4)])
+# curve_uv_data.buf: одна запись на сплайн
+CURVE_UV_DTYPE = np.dtype([('dup_start', '<f4', 2), ('dup_end', '<f4', 2)])
+
+
+def _normalized_rows(vecs):
+    """Vector.normalized() для массива (..., 3): нулевой вектор остаётся нулевым."""
+    length = np.linalg.norm(vecs, axis=-1, keepdims=True)
+    return np.divide(vecs, length, out=np.zeros_like(vecs), where=length > 0.0)
+
+def curve_point_frames(points):
+    """
+    Касательные и нормали для сэмплов кривой (..., N, 3) разом.
+    Касательная — к следующей точке (у последней — от предыдущей), нормаль —
+    опорная ось (Z, либо Y для почти вертикальной касательной) минус её проекция.
+    """
+    diffs = points[..., 1:, :] - points[..., :-1, :]
+    tangents = np.concatenate((diffs, diffs[..., -1:, :]), axis=-2)
+    tangents = _normalized_rows(tangents)
+    refs = np.zeros_like(tangents)
+    vertical = np.abs(tangents[..., 2]) > 0.9
+    refs[..., 1] = vertical
+    refs[..., 2] = ~vertical
+    dots = np.einsum('...i,...i->...', tangents, refs)[..., None]
+    normals = _normalized_rows(refs - tangents * dots)
+    return tangents, normals
+
+def transform_points(matrix, points):
+    """matrix (4x4, mathutils или массив) @ точки (..., 3)."""
+    m = np.array(matrix, dtype=np.float64)
+    return points @ m[:3, :3].T + m[:3, 3]
 
 def swap_yz(vec):
     return Vector((vec.x, vec.z, vec.y))
@@ -949,6 +992,144 @@ def pack_color(color_rgba, stride):
 
 
 
+# VB0 (Position) частицы: 40 байт, как у curve_data.buf
+PARTICLE_VB0_DTYPE = np.dtype([
+    ('position', '<f4', 3),
+    ('phase', '<f4'),
+    ('speed_scale', '<f4'),
+    ('curve_idx', '<f4'),
+    ('direction', '<f4', 3),
+    ('vertex_idx', '<f4'),
+])
+
+def _byte_field(raw, offset, dtype, count):
+    """Вид на поле (N, count) внутри сырых записей raw (N, stride) uint8."""
+    size = np.dtype(dtype).itemsize * count
+    return raw[:, offset:offset + size].view(dtype)
+
+def _checked_indices(indices, dtype):
+    """
+    indices -> dtype без молчаливого переполнения: вне диапазона - та же
+    struct.error, что давал прежний struct.pack ('B' / 'I').
+    """
+    if indices.size:
+        limit = np.iinfo(dtype).max
+        if indices.min() < 0 or indices.max() > limit:
+            if dtype == np.uint8:
+                raise struct.error("ubyte format requires 0 <= number <= 255")
+            raise struct.error(f"'I' format requires 0 <= number <= {limit}")
+    return indices.astype(dtype)
+
+def pack_blend_records(weights, indices, stride):
+    """
+    Записи Blend-буфера (N, stride) uint8 для N вершин разом.
+    Раскладки по stride те же, что и раньше через struct:
+    32 = 4f+4I, 24 = 4f+4B+pad, 20 = 4f+4B, 16 = 4e+4B+pad, иначе 4f и первый индекс.
+    """
+    raw = np.zeros((len(weights), stride), dtype=np.uint8)
+    weights = np.asarray(weights, dtype=np.float32)
+    indices = np.asarray(indices, dtype=np.int64)
+    if stride == 32:
+        _byte_field(raw, 0, '<f4', 4)[:] = weights
+        _byte_field(raw, 16, '<u4', 4)[:] = _checked_indices(indices, np.uint32)
+    elif stride in (24, 20):
+        _byte_field(raw, 0, '<f4', 4)[:] = weights
+        _byte_field(raw, 16, 'u1', 4)[:] = _checked_indices(indices, np.uint8)
+    elif stride == 16:
+        _byte_field(raw, 0, '<f2', 4)[:] = weights.astype(np.float16)
+        _byte_field(raw, 8, 'u1', 4)[:] = _checked_indices(indices, np.uint8)
+    else:
+        if stride >= 16:
+            _byte_field(raw, 0, '<f4', 4)[:] = weights
+        if stride >= 20:
+            raw[:, 16] = _checked_indices(indices[:, 0], np.uint8)
+    return raw
+
+def pack_texcoord_records(uvs, stride, uv_format):
+    """
+    Записи Texcoord-буфера (N, stride) uint8: UV повторяется во всех слотах
+    (2xfloat16 или 2xfloat32), хвост, не влезающий в слот, заливается 0xFF.
+    """
+    raw = np.full((len(uvs), stride), 0xFF, dtype=np.uint8)
+    if uv_format == 'half':
+        slot_dtype, slot_bytes = '<f2', 4
+    else:
+        slot_dtype, slot_bytes = '<f4', 8
+    uvs = np.asarray(uvs, dtype=np.float64).astype(slot_dtype)
+    for slot in range(stride // slot_bytes):
+        _byte_field(raw, slot * slot_bytes, slot_dtype, 2)[:] = uvs
+    return raw
+
+def path_progress_batch(phase, tl_start, tl_mid, tl_end):
+    """get_path_progress для массива фаз."""
+    denom = max(tl_end - tl_start, 1e-5)
+    active_t = np.clip((phase - tl_start) / denom, 0.0, 1.0)
+    k = max(0.01, min(0.99, (tl_mid - tl_start) / denom))
+    A = (0.5 - k) / (k * k - k)
+    B = 1.0 - A
+    return np.clip(A * active_t * active_t + B * active_t, 0.0, 1.0)
+
+def sample_curve_batch(points, t):
+    """sample_curve_at_progress для массива t: points (32, 3) -> (len(t), 3)."""
+    last = len(points) - 1
+    t_spline = np.clip(t, 0.0, 1.0) * 31.0
+    idx0 = np.floor(t_spline).astype(np.int64)
+    idx1 = np.minimum(idx0 + 1, 31)
+    factor = (t_spline - idx0)[:, None]
+    p0 = points[np.minimum(idx0, last)]
+    p1 = points[np.minimum(idx1, last)]
+    return p0 + (p1 - p0) * factor
+
+def get_weight_reference(context, ref_mesh, ref_cache):
+    """
+    Индекс мировых позиций вершин референс-меша + данные групп, с кэшем по имени меша.
+    Возвращает (PointIndex, vg_map, bone_to_id, mesh_data, memo) или None.
+    """
+    if not ref_mesh or ref_mesh.type != 'MESH':
+        return None
+    if ref_mesh.name in ref_cache:
+        return ref_cache[ref_mesh.name]
+    try:
+        from .spatial_index import PointIndex
+        depsgraph = context.evaluated_depsgraph_get()
+        ref_data = ref_mesh.evaluated_get(depsgraph).data
+        vg_map = {vg.index: vg.name for vg in ref_mesh.vertex_groups}
+        bone_to_id = {vg.name: vg.index for vg in ref_mesh.vertex_groups}
+        ref_co = np.empty(len(ref_data.vertices) * 3, dtype=np.float32)
+        ref_data.vertices.foreach_get('co', ref_co)
+        ref_index = PointIndex(transform_points(ref_mesh.matrix_world, ref_co.reshape(-1, 3).astype(np.float64)))
+        entry = ref_cache[ref_mesh.name] = (ref_index, vg_map, bone_to_id, ref_data, {})
+        print(f"[RZM-VFX] Built weight lookup index for reference '{ref_mesh.name}' with {len(ref_data.vertices)} vertices.")
+        return entry
+    except Exception as e:
+        print(f"[RZM-VFX] [WARN] Weight lookup index failed for reference mesh: {e}")
+        ref_cache[ref_mesh.name] = None
+        return None
+
+def reference_top4_weights(ref_entry, ref_idx):
+    """Top-4 bone weights (indices, weights) of one reference vertex, memoized; None if unweighted."""
+    _, vg_map, bone_to_id, ref_data, memo = ref_entry
+    if ref_idx in memo:
+        return memo[ref_idx]
+    v = ref_data.vertices[ref_idx]
+    bone_groups = []
+    for g in v.groups:
+        if g.weight > 1e-5:
+            gname = vg_map.get(g.group)
+            if gname and gname in bone_to_id:
+                bone_groups.append((bone_to_id[gname], g.weight))
+    bone_groups.sort(key=lambda x: x[1], reverse=True)
+    bone_groups = bone_groups[:4]
+    result = None
+    if bone_groups:
+        tw = sum(w for _, w in bone_groups)
+        bone_groups = [(idx, w / tw) for idx, w in bone_groups] if tw > 0 else bone_groups
+        while len(bone_groups) < 4:
+            bone_groups.append((0, 0.0))
+        result = ([bg[0] for bg in bone_groups], [bg[1] for bg in bone_groups])
+    memo[ref_idx] = result
+    return result
+
 def find_stride_from_ini(mod_root, resource_name, default_stride):
     # Search for resource_name in any active .ini file in mod_root
     ini_path = None
@@ -1046,8 +1227,8 @@ def patch_buffers(context, cache):
                 'part_name': part_name
             })
 
-    # Let's accumulate all curve data points
-    all_curve_bytes = bytearray()
+    # Let's accumulate all curve data points into preallocated 40-byte records
+    curve_records = np.zeros(len(virtual_curves) * CURVE_RECORDS, dtype=CURVE_POINT_DTYPE)
     valid_curve_count = 0
     curve_mapping = {} # maps (curve_name, spline_idx) to index in curve_data.buf
     curve_shapes_cache = {} # maps (curve_name, spline_idx) to shapes_resampled
@@ -1062,57 +1243,32 @@ def patch_buffers(context, cache):
         profile = resolve_coordinate_remap_profile(context, profile_raw)
         
         # Sample points for all 8 shapes (returns list of 8 lists, each with 32 (pt, radius) tuples)
-        shapes_resampled = evaluate_curve_all_shapes(context, curve_obj, s_idx, num_samples=32)
+        shapes_resampled = evaluate_curve_all_shapes(context, curve_obj, s_idx, num_samples=CURVE_SAMPLES)
         if not shapes_resampled or any(len(s) < 2 for s in shapes_resampled):
             print(f"[RZM-VFX] [ERROR] Curve '{curve_obj.name}' spline {s_idx} evaluation returned insufficient points.")
             continue
             
         curve_shapes_cache[(curve_obj.name, s_idx)] = shapes_resampled
 
-        # Process each shape
-        for k in range(8):
-            resampled_data = shapes_resampled[k]
-            
-            # Remap to target mesh's local coordinates
-            local_pts = []
-            radii = []
-            for pt, r_val in resampled_data:
-                wpos = curve_obj.matrix_world @ pt
-                lpos = target_mesh.matrix_world.inverted() @ wpos
-                local_pts.append(lpos)
-                radii.append(r_val)
-
-            # Apply buffer coordinate remap
-            remapped_pts = []
-            for lpos in local_pts:
-                remap_pt = remap_curve_point_to_buffer(lpos, local_pts[0], profile)
-                remapped_pts.append(remap_pt)
-
-            # Pack 32 sampled points for this shape: 40 bytes each
-            for j in range(32):
-                pt = remapped_pts[j]
-                # Tangent
-                if j < 31:
-                    tangent = (remapped_pts[j+1] - pt).normalized()
-                else:
-                    tangent = (pt - remapped_pts[j-1]).normalized()
-                
-                # Normal
-                ref = Vector((0.0, 1.0, 0.0)) if abs(tangent.dot(Vector((0.0, 0.0, 1.0)))) > 0.9 else Vector((0.0, 0.0, 1.0))
-                normal = (ref - tangent * tangent.dot(ref)).normalized()
-                
-                # Pack local radius into the 10th float (point radius * 0.01 meters baseline)
-                r_packed = radii[j] * 0.01
-
-                # Pack
-                point_data = struct.pack(
-                    '<fffffffff',
-                    pt.x, pt.y, pt.z,
-                    tangent.x, tangent.y, tangent.z,
-                    normal.x, normal.y, normal.z
-                )
-                point_data += struct.pack('<f', r_packed)
-                all_curve_bytes.extend(point_data)
+        # All 8 shapes at once: (8, 32, 3) points and (8, 32) radii
+        pts = np.array([[tuple(pt) for pt, _ in shape] for shape in shapes_resampled], dtype=np.float64)
+        radii = np.array([[r_val for _, r_val in shape] for shape in shapes_resampled], dtype=np.float64)
+
+        # Remap to target mesh's local coordinates (one matrix for every point)
+        to_local = target_mesh.matrix_world.inverted() @ curve_obj.matrix_world
+        local_pts = transform_points(to_local, pts)
+
+        # Apply buffer coordinate remap
+        remapped_pts = remap_curve_point_to_buffer(local_pts, local_pts[:, :1, :], profile)
+        tangents, normals = curve_point_frames(remapped_pts)
+
+        base = valid_curve_count * CURVE_RECORDS
+        block = curve_records[base:base + CURVE_RECORDS - 1]
+        block['position'] = remapped_pts.reshape(-1, 3)
+        block['tangent'] = tangents.reshape(-1, 3)
+        block['normal'] = normals.reshape(-1, 3)
+        # Pack local radius into the 10th float (point radius * 0.01 meters baseline)
+        block['radius'] = (radii * 0.01).reshape(-1)
 
         # Determine number of active shape keys
         num_shapes = 0
@@ -1151,14 +1307,11 @@ def patch_buffers(context, cache):
         int_max = int(round(meta_size_rand_max * 100.0))
         packed_rand = float(int_min + int_max * 1000)
         
-        meta_data = struct.pack(
-            '<ffffffffff',
-            packed_fx_type + meta_tl_end * 0.1, meta_size_base, meta_size_start,  # position.xyz
-            meta_size_end, meta_cycle_dur, meta_dispersion,                      # tangent.xyz
-            meta_phase_rand, meta_pos_rand, packed_tls,                          # normal.xyz
-            packed_rand                                                          # u
-        )
-        all_curve_bytes.extend(meta_data)
+        meta = curve_records[base + CURVE_RECORDS - 1]
+        meta['position'] = (packed_fx_type + meta_tl_end * 0.1, meta_size_base, meta_size_start)
+        meta['tangent'] = (meta_size_end, meta_cycle_dur, meta_dispersion)
+        meta['normal'] = (meta_phase_rand, meta_pos_rand, packed_tls)
+        meta['radius'] = packed_rand
 
         curve_mapping[(curve_obj.name, s_idx)] = valid_curve_count
         valid_curve_count += 1
@@ -1169,15 +1322,15 @@ def patch_buffers(context, cache):
         return
 
     # Write the collected curve_data.buf
-    with open(curve_buf_path, 'wb') as f:
-        f.write(all_curve_bytes)
-    print(f"[RZM-VFX] Wrote {valid_curve_count} curve splines ({valid_curve_count * 257 * 40} bytes) to '{curve_buf_path}'")
+    curve_records[:valid_curve_count * CURVE_RECORDS].tofile(curve_buf_path)
+    count_written(valid_curve_count * CURVE_RECORDS * CURVE_POINT_DTYPE.itemsize)
+    print(f"[RZM-VFX] Wrote {valid_curve_count} curve splines ({valid_curve_count * CURVE_RECORDS * CURVE_POINT_DTYPE.itemsize} bytes) to '{curve_buf_path}'")
 
     # Write curve_weight_data.buf: 8 shapes × 32 points per curve, stride=32 (4xfloat + 4xuint)
     weight_buf_path = os.path.join(res_dir, "curve_weight_data.buf")
-    all_weight_bytes = bytearray()
+    weight_records = np.zeros(valid_curve_count * CURVE_SHAPES * CURVE_SAMPLES, dtype=CURVE_WEIGHT_DTYPE)
     
-    # Cache KDTree evaluations per reference mesh name to avoid redundant builds
+    # Cache spatial index + per-vertex top-4 weights per reference mesh name to avoid redundant builds
     ref_kd_cache = {}
     
     for v_curve in virtual_curves:
@@ -1193,95 +1346,56 @@ def patch_buffers(context, cache):
         fallback_idx = [int(x) if x != -1 else 0 for x in weight_indices]
         fallback_w   = [float(w) for w in weight_values]
 
-        # Build/get KDTree for weight reference
+        # Build/get spatial index for weight reference
         target_mesh = v_curve['target_mesh']
         ref_mesh = curve_obj.rzm_curve_vfx_weight_reference
         if not ref_mesh or ref_mesh.type != 'MESH':
             ref_mesh = target_mesh
-        kd_w = None; vg_map_w = {}; bone_to_id_w = {}; ref_data_w = None
-        
-        if ref_mesh and ref_mesh.type == 'MESH':
-            if ref_mesh.name in ref_kd_cache:
-                kd_w, vg_map_w, bone_to_id_w, ref_data_w = ref_kd_cache[ref_mesh.name]
-            else:
-                try:
-                    depsgraph = context.evaluated_depsgraph_get()
-                    ref_data_w = ref_mesh.evaluated_get(depsgraph).data
-                    vg_map_w   = {vg.index: vg.name for vg in ref_mesh.vertex_groups}
-                    for vg in ref_mesh.vertex_groups:
-                        bone_to_id_w[vg.name] = vg.index
-                    from mathutils.kdtree import KDTree
-                    kd_w = KDTree(len(ref_data_w.vertices))
-                    for vi, v in enumerate(ref_data_w.vertices):
-                        kd_w.insert(ref_mesh.matrix_world @ v.co, vi)
-                    kd_w.balance()
-                    # Cache it
-                    ref_kd_cache[ref_mesh.name] = (kd_w, vg_map_w, bone_to_id_w, ref_data_w)
-                except Exception as e:
-                    print(f"[RZM-VFX] [WARN] Weight KDTree failed for weight export: {e}")
-                    kd_w = None
-
-        def sample_weight_at_world_pos(wpos):
-            """Look up top-4 bone weights at a world-space position via KDTree."""
-            if not kd_w:
-                return fallback_idx, fallback_w
-            _, ref_idx, _ = kd_w.find(wpos)
-            v = ref_data_w.vertices[ref_idx]
-            bone_groups = []
-            for g in v.groups:
-                if g.weight > 1e-5:
-                    gname = vg_map_w.get(g.group)
-                    if gname and gname in bone_to_id_w:
-                        bone_groups.append((bone_to_id_w[gname], g.weight))
-            bone_groups.sort(key=lambda x: x[1], reverse=True)
-            bone_groups = bone_groups[:4]
-            if bone_groups:
-                tw = sum(w for _, w in bone_groups)
-                bone_groups = [(idx, w / tw) for idx, w in bone_groups] if tw > 0 else bone_groups
-                while len(bone_groups) < 4:
-                    bone_groups.append((0, 0.0))
-                return [bg[0] for bg in bone_groups], [bg[1] for bg in bone_groups]
-            return fallback_idx, fallback_w
-
-        # Write 8 shapes × 32 points
-        for shape_idx in range(8):
-            shape_pts = shapes_resampled[shape_idx] if shape_idx < len(shapes_resampled) else []
-            for pt_idx in range(32):
-                t = pt_idx / 31.0
-                if shape_pts and len(shape_pts) >= 2:
-                    pos_local = sample_curve_at_progress(shape_pts, t)
-                    wpos = curve_obj.matrix_world @ pos_local
-                    out_idx, out_w = sample_weight_at_world_pos(wpos)
-                else:
-                    out_idx, out_w = fallback_idx, fallback_w
-                all_weight_bytes.extend(struct.pack('<ffffIIII',
-                    out_w[0], out_w[1], out_w[2], out_w[3],
-                    out_idx[0], out_idx[1], out_idx[2], out_idx[3]))
-
-    with open(weight_buf_path, 'wb') as f:
-        f.write(all_weight_bytes)
-    print(f"[RZM-VFX] Wrote curve_weight_data.buf ({len(all_weight_bytes)} bytes, 8shapes×32pts per curve spline) to '{weight_buf_path}'")
+        ref_entry = get_weight_reference(context, ref_mesh, ref_kd_cache)
+
+        # Fill 8 shapes × 32 points; sample t = pt_idx / 31 lands exactly on the resampled points
+        base = curve_mapping[(curve_obj.name, s_idx)] * CURVE_SHAPES * CURVE_SAMPLES
+        block = weight_records[base:base + CURVE_SHAPES * CURVE_SAMPLES].reshape(CURVE_SHAPES, CURVE_SAMPLES)
+        block['weights'] = fallback_w
+        block['indices'] = np.asarray(fallback_idx, dtype=np.int64).astype(np.uint32)
+        if ref_entry is None:
+            continue
+        shape_ids = [k for k in range(CURVE_SHAPES)
+                     if k < len(shapes_resampled) and len(shapes_resampled[k]) >= 2]
+        if not shape_ids:
+            continue
+        samples = np.array([[tuple(sample_curve_at_progress(shapes_resampled[k], pt_idx / 31.0))
+                             for pt_idx in range(CURVE_SAMPLES)] for k in shape_ids], dtype=np.float64)
+        wpos = transform_points(curve_obj.matrix_world, samples)
+        ref_ids, _ = ref_entry[0].nearest(wpos.reshape(-1, 3))
+        for flat_i, ref_idx in enumerate(ref_ids.tolist()):
+            top4 = reference_top4_weights(ref_entry, ref_idx)
+            if top4 is not None:
+                rec = block[shape_ids[flat_i // CURVE_SAMPLES], flat_i % CURVE_SAMPLES]
+                rec['indices'] = top4[0]
+                rec['weights'] = top4[1]
+
+    weight_records.tofile(weight_buf_path)
+    count_written(weight_records.nbytes)
+    print(f"[RZM-VFX] Wrote curve_weight_data.buf ({weight_records.nbytes} bytes, 8shapes×32pts per curve spline) to '{weight_buf_path}'")
 
     has_any_animated_uv = any(getattr(v_curve['obj'], "rzm_curve_vfx_animated_uv", False) for v_curve in virtual_curves)
     if has_any_animated_uv:
         uv_buf_path = os.path.join(res_dir, "curve_uv_data.buf")
-        all_uv_bytes = bytearray()
+        uv_records = np.zeros(valid_curve_count, dtype=CURVE_UV_DTYPE)
         for v_curve in virtual_curves:
             curve_obj = v_curve['obj']
             s_idx = v_curve['spline_idx']
             if (curve_obj.name, s_idx) not in curve_mapping:
                 continue
             if getattr(curve_obj, "rzm_curve_vfx_animated_uv", False):
-                dup_start = list(getattr(curve_obj, "rzm_curve_vfx_uv_dup_start", (0.0, 0.0)))
-                dup_end = list(getattr(curve_obj, "rzm_curve_vfx_uv_dup_end", (0.0, 0.0)))
-            else:
-                dup_start = [0.0, 0.0]
-                dup_end = [0.0, 0.0]
-            all_uv_bytes.extend(struct.pack('<ffff', dup_start[0], dup_start[1], dup_end[0], dup_end[1]))
+                rec = uv_records[curve_mapping[(curve_obj.name, s_idx)]]
+                rec['dup_start'] = tuple(getattr(curve_obj, "rzm_curve_vfx_uv_dup_start", (0.0, 0.0)))[:2]
+                rec['dup_end'] = tuple(getattr(curve_obj, "rzm_curve_vfx_uv_dup_end", (0.0, 0.0)))[:2]
             
-        with open(uv_buf_path, 'wb') as f:
-            f.write(all_uv_bytes)
-        print(f"[RZM-VFX] Wrote curve_uv_data.buf ({len(all_uv_bytes)} bytes) to '{uv_buf_path}'")
+        uv_records.tofile(uv_buf_path)
+        count_written(uv_records.nbytes)
+        print(f"[RZM-VFX] Wrote curve_uv_data.buf ({uv_records.nbytes} bytes) to '{uv_buf_path}'")
 
         # Copy compute shader to mod modules directory
         addon_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -1523,7 +1637,6 @@ def patch_buffers(context, cache):
                     f.truncate(clean_color_size)
                     
         # IB (Indices) (already truncated in the check phase if is_ib_already_patched)
-        fmt = '<I' if stride_i == 4 else '<H'
 
         # Open files for appending
         f_vb0 = open(vb0_path, 'ab')
@@ -1531,6 +1644,8 @@ def patch_buffers(context, cache):
         f_vb1 = open(vb1_path, 'ab') if vb1_path else None
         f_color = open(color_path, 'ab') if color_path else None
         f_ib = open(ib_path, 'ab') if ib_path else None
+        # Режим 'ab' открывает в конце файла: дописанное = tell() при закрытии - tell() сейчас
+        append_starts = [(f, f.tell()) for f in (f_vb0, f_vb2, f_vb1, f_color, f_ib) if f]
 
         current_v_count = original_v_count
 
@@ -1550,79 +1665,40 @@ def patch_buffers(context, cache):
             
             v_per_particle, i_per_particle = get_vfx_shape_counts(mesh_fx_type)
                 
-            # Pre-generate particle parameters to share phase offsets between VB0 and VB2 loops
-            particles_params = []
-            for p in range(particle_count):
-                phase = random.random()
-                speed_scale = random.uniform(0.8, 1.2)
-                # Random unit direction in 3D
-                theta = random.uniform(0, 2.0 * math.pi)
-                phi = random.uniform(0, math.pi)
-                dir_x = math.sin(phi) * math.cos(theta)
-                dir_y = math.cos(phi)
-                dir_z = math.sin(phi) * math.sin(theta)
-                particles_params.append((phase, speed_scale, dir_x, dir_y, dir_z))
-
-            # Build/get KDTree for weight reference
-            ref_mesh = curve_obj.rzm_curve_vfx_weight_reference
-            if not ref_mesh or ref_mesh.type != 'MESH':
-                ref_mesh = target_mesh
-            kd = None
-            vg_map = {}
-            bone_to_id = {}
-            ref_mesh_data = None
-            if ref_mesh and ref_mesh.type == 'MESH':
-                if ref_mesh.name in ref_kd_cache:
-                    kd, vg_map, bone_to_id, ref_mesh_data = ref_kd_cache[ref_mesh.name]
-                else:
-                    try:
-                        depsgraph = context.evaluated_depsgraph_get()
-                        ref_eval = ref_mesh.evaluated_get(depsgraph)
-                        ref_mesh_data = ref_eval.data
-                        vg_map = {vg.index: vg.name for vg in ref_mesh.vertex_groups}
-                        for vg in ref_mesh.vertex_groups:
-                            bone_to_id[vg.name] = vg.index
-                                
-                        from mathutils.kdtree import KDTree
-                        kd = KDTree(len(ref_mesh_data.vertices))
-                        for v_idx, v in enumerate(ref_mesh_data.vertices):
-                            world_pos = ref_mesh.matrix_world @ v.co
-                            kd.insert(world_pos, v_idx)
-                        kd.balance()
-                        # Cache it
-                        ref_kd_cache[ref_mesh.name] = (kd, vg_map, bone_to_id, ref_mesh_data)
-                        print(f"[RZM-VFX] Built KDTree for weight reference '{ref_mesh.name}' with {len(ref_mesh_data.vertices)} vertices.")
-                    except Exception as e:
-                        print(f"[RZM-VFX] Error building KDTree for reference mesh: {e}")
-                        kd = None
+            # Pre-generate particle parameters to share phase offsets between VB0 and VB2.
+            # Seeded from the random module so random.seed() keeps exports reproducible.
+            rng = np.random.default_rng(random.getrandbits(64))
+            phase = rng.random(particle_count)
+            speed_scale = rng.uniform(0.8, 1.2, particle_count)
+            # Random unit direction in 3D
+            theta = rng.uniform(0.0, 2.0 * math.pi, particle_count)
+            phi = rng.uniform(0.0, math.pi, particle_count)
+            directions = np.stack((np.sin(phi) * np.cos(theta), np.cos(phi), np.sin(phi) * np.sin(theta)), axis=1)
+            n_new = particle_count * v_per_particle
 
             # ----------------------------------------------------------------------
             # A. Patch VB0 (Position)
             # ----------------------------------------------------------------------
-            for p in range(particle_count):
-                phase, speed_scale, dir_x, dir_y, dir_z = particles_params[p]
-                
-                for v_idx in range(v_per_particle):
-                    local_pos = get_vfx_local_pos(mesh_fx_type, v_idx, tri_aspect)
-
-                    pos_x = local_pos[0] * mesh_fx_size_base
-                    pos_y = local_pos[1] * mesh_fx_size_base
-                    pos_z = local_pos[2] * mesh_fx_size_base
-
-                    # Pack into 40-byte stride VB0
-                    v_data = struct.pack(
-                        '<fffffffff',
-                        pos_x, pos_y, pos_z,
-                        phase, speed_scale, float(curve_idx),
-                        dir_x, dir_y, dir_z
-                    )
-                    v_data += struct.pack('<f', float(v_idx))
-                    f_vb0.write(v_data)
+            shape_pos = np.array([get_vfx_local_pos(mesh_fx_type, v_idx, tri_aspect) for v_idx in range(v_per_particle)], dtype=np.float64)
+            vb0 = np.empty((particle_count, v_per_particle), dtype=PARTICLE_VB0_DTYPE)
+            vb0['position'] = shape_pos * mesh_fx_size_base
+            vb0['phase'] = phase[:, None]
+            vb0['speed_scale'] = speed_scale[:, None]
+            vb0['curve_idx'] = float(curve_idx)
+            vb0['direction'] = directions[:, None, :]
+            vb0['vertex_idx'] = np.arange(v_per_particle, dtype=np.float32)
+            f_vb0.write(vb0.tobytes())
 
             # ----------------------------------------------------------------------
             # B. Patch VB2 (Blend)
             # ----------------------------------------------------------------------
             if f_vb2:
+                # Build/get spatial index for weight reference
+                ref_mesh = curve_obj.rzm_curve_vfx_weight_reference
+                if not ref_mesh or ref_mesh.type != 'MESH':
+                    ref_mesh = target_mesh
+                ref_entry = get_weight_reference(context, ref_mesh, ref_kd_cache)
+
                 tl_start = get_curve_prop(curve_obj, "timeline_start_pos", 0.0)
                 tl_mid = get_curve_prop(curve_obj, "timeline_mid_pos", 0.5)
                 tl_end = get_curve_prop(curve_obj, "timeline_end_pos", 1.0)
@@ -1633,76 +1709,45 @@ def patch_buffers(context, cache):
                 
                 shapes_resampled = curve_shapes_cache.get((curve_obj.name, s_idx))
                 if not shapes_resampled:
-                    shapes_resampled = evaluate_curve_all_shapes(context, curve_obj, s_idx, num_samples=32)
-                
-                for p in range(particle_count):
-                    phase, speed_scale, dir_x, dir_y, dir_z = particles_params[p]
-                    
-                    if kd and shapes_resampled and len(shapes_resampled) > 0:
-                        path_progress = get_path_progress(phase, tl_start, tl_mid, tl_end)
-                        if num_shapes == 0:
-                            pos = sample_curve_at_progress(shapes_resampled[0], path_progress)
-                        else:
-                            t_scaled = path_progress * num_shapes
-                            k0 = int(math.floor(t_scaled))
-                            k1 = min(k0 + 1, num_shapes)
-                            f = t_scaled - k0
-                            pos_k0 = sample_curve_at_progress(shapes_resampled[k0], path_progress)
-                            pos_k1 = sample_curve_at_progress(shapes_resampled[k1], path_progress)
-                            pos = pos_k0.lerp(pos_k1, f)
-                            
-                        # Transform to world space
-                        wpos = curve_obj.matrix_world @ pos
-                        _, ref_idx, _ = kd.find(wpos)
-                        v = ref_mesh_data.vertices[ref_idx]
-                        
-                        # Collect all valid bone groups, sort by weight descending, take top 4
-                        bone_groups = []
-                        for g in v.groups:
-                            if g.weight > 1e-5:
-                                group_name = vg_map.get(g.group)
-                                if group_name and group_name in bone_to_id:
-                                    bone_groups.append((bone_to_id[group_name], g.weight))
-                        bone_groups.sort(key=lambda x: x[1], reverse=True)
-                        bone_groups = bone_groups[:4]
-                        
-                        if bone_groups:
-                            total_w = sum(w for _, w in bone_groups)
-                            if total_w > 0:
-                                bone_groups = [(idx, w / total_w) for idx, w in bone_groups]
-                            while len(bone_groups) < 4:
-                                bone_groups.append((0, 0.0))
-                            clean_idx = [bg[0] for bg in bone_groups]
-                            clean_w   = [bg[1] for bg in bone_groups]
-                        else:
-                            clean_idx = [int(idx) if idx != -1 else 0 for idx in weight_indices]
-                            clean_w = [float(w) for w in weight_values]
+                    shapes_resampled = evaluate_curve_all_shapes(context, curve_obj, s_idx, num_samples=CURVE_SAMPLES)
+
+                fallback_idx = [int(idx) if idx != -1 else 0 for idx in weight_indices]
+                fallback_w = [float(w) for w in weight_values]
+                clean_idx = np.tile(np.asarray(fallback_idx, dtype=np.int64), (particle_count, 1))
+                clean_w = np.tile(np.asarray(fallback_w, dtype=np.float64), (particle_count, 1))
+
+                if (ref_entry is not None and particle_count and shapes_resampled
+                        and all(len(shape) >= 2 for shape in shapes_resampled[:num_shapes + 1])):
+                    shape_arrays = [np.array([tuple(pt) for pt, _ in shape], dtype=np.float64) for shape in shapes_resampled]
+                    path_progress = path_progress_batch(phase, tl_start, tl_mid, tl_end)
+                    if num_shapes == 0:
+                        pos = sample_curve_batch(shape_arrays[0], path_progress)
                     else:
-                        clean_idx = [int(idx) if idx != -1 else 0 for idx in weight_indices]
-                        clean_w = [float(w) for w in weight_values]
-
-
-                        
-                    for v_idx in range(v_per_particle):
-                        buf = bytearray(stride_b)
-                        if stride_b == 32:
-                            struct.pack_into('<ffffIIII', buf, 0, clean_w[0], clean_w[1], clean_w[2], clean_w[3], clean_idx[0], clean_idx[1], clean_idx[2], clean_idx[3])
-                        elif stride_b == 24:
-                            struct.pack_into('<ffffBBBBxxxx', buf, 0, clean_w[0], clean_w[1], clean_w[2], clean_w[3], clean_idx[0], clean_idx[1], clean_idx[2], clean_idx[3])
-                        elif stride_b == 20:
-                            struct.pack_into('<ffffBBBB', buf, 0, clean_w[0], clean_w[1], clean_w[2], clean_w[3], clean_idx[0], clean_idx[1], clean_idx[2], clean_idx[3])
-                        elif stride_b == 16:
-                            h0 = float_to_half(clean_w[0])
-                            h1 = float_to_half(clean_w[1])
-                            h2 = float_to_half(clean_w[2])
-                            h3 = float_to_half(clean_w[3])
-                            struct.pack_into('<HHHHBBBBxxxx', buf, 0, h0, h1, h2, h3, clean_idx[0], clean_idx[1], clean_idx[2], clean_idx[3])
-                        else:
-                            if stride_b >= 16:
-                                struct.pack_into('<ffff', buf, 0, clean_w[0], clean_w[1], clean_w[2], clean_w[3])
-                            if stride_b >= 20:
-                                struct.pack_into('<B', buf, 16, clean_idx[0])
-                        f_vb2.write(buf)
+                        t_scaled = path_progress * num_shapes
+                        k0 = np.floor(t_scaled).astype(np.int64)
+                        k1 = np.minimum(k0 + 1, num_shapes)
+                        f = (t_scaled - k0)[:, None]
+                        # Each particle blends its own pair of shapes: sample every shape once
+                        per_shape = np.stack([sample_curve_batch(shape_arrays[k], path_progress)
+                                              for k in range(num_shapes + 1)])
+                        rows = np.arange(particle_count)
+                        pos_k0 = per_shape[np.minimum(k0, num_shapes), rows]
+                        pos_k1 = per_shape[k1, rows]
+                        pos = pos_k0 + (pos_k1 - pos_k0) * f
+
+                    # Transform to world space
+                    wpos = transform_points(curve_obj.matrix_world, pos)
+                    ref_ids, _ = ref_entry[0].nearest(wpos)
+                    # Collect all valid bone groups, sort by weight descending, take top 4
+                    for p, ref_idx in enumerate(ref_ids.tolist()):
+                        top4 = reference_top4_weights(ref_entry, ref_idx)
+                        if top4 is not None:
+                            clean_idx[p] = top4[0]
+                            clean_w[p] = top4[1]
+
+                blend = pack_blend_records(np.repeat(clean_w, v_per_particle, axis=0),
+                                           np.repeat(clean_idx, v_per_particle, axis=0), stride_b)
+                f_vb2.write(blend.tobytes())
 
             # ----------------------------------------------------------------------
             # C. Patch VB1 (Texcoord)
@@ -1712,62 +1757,33 @@ def patch_buffers(context, cache):
                 uv_scale = get_curve_prop(curve_obj, "uv_scale", (1.0, 1.0))
                 u_min, v_min = uv_offset[0], uv_offset[1]
                 u_max, v_max = uv_offset[0] + uv_scale[0], uv_offset[1] + uv_scale[1]
-                u_center = (u_min + u_max) * 0.5
-                v_center = (v_min + v_max) * 0.5
-                u_radius = (u_max - u_min) * 0.5
-                v_radius = (v_max - v_min) * 0.5
-
-                for p in range(particle_count):
-                    for v_idx in range(v_per_particle):
-                        buf = bytearray(stride_t)
-                        u, v = get_vfx_shape_uv(mesh_fx_type, v_idx, u_min, v_min, u_max, v_max)
-
-                        if uv_format == 'half':
-                            h_u = float_to_half(u)
-                            h_v = float_to_half(v)
-                            uv_slot_bytes = 4  # 2×float16
-                            num_slots = stride_t // uv_slot_bytes
-                            for slot in range(num_slots):
-                                if slot * uv_slot_bytes + 4 <= stride_t:
-                                    struct.pack_into('<HH', buf, slot * uv_slot_bytes, h_u, h_v)
-                            leftover_start = num_slots * uv_slot_bytes
-                        else:
-                            uv_slot_bytes = 8  # 2×float32
-                            num_slots = stride_t // uv_slot_bytes
-                            for slot in range(num_slots):
-                                if slot * uv_slot_bytes + 8 <= stride_t:
-                                    struct.pack_into('<ff', buf, slot * uv_slot_bytes, float(u), float(v))
-                            leftover_start = num_slots * uv_slot_bytes
-
-                        for byte_i in range(leftover_start, stride_t):
-                            buf[byte_i] = 0xFF
-                        f_vb1.write(buf)
+
+                # Same UVs for every particle: pack one shape and tile it
+                shape_uv = [get_vfx_shape_uv(mesh_fx_type, v_idx, u_min, v_min, u_max, v_max) for v_idx in range(v_per_particle)]
+                texcoord = pack_texcoord_records(shape_uv, stride_t, uv_format)
+                f_vb1.write(np.tile(texcoord, (particle_count, 1)).tobytes())
 
             # ----------------------------------------------------------------------
             # E. Patch Color
             # ----------------------------------------------------------------------
             if f_color:
                 color_rgba = get_curve_prop(curve_obj, "color", (1.0, 1.0, 1.0, 1.0))
-                for p in range(particle_count):
-                    for v_idx in range(v_per_particle):
-                        buf = pack_color(color_rgba, stride_c)
-                        f_color.write(buf)
+                f_color.write(bytes(pack_color(color_rgba, stride_c)) * n_new)
 
             # ----------------------------------------------------------------------
             # D. Patch IB (Indices)
             # ----------------------------------------------------------------------
             if f_ib:
-                for p in range(particle_count):
-                    v_start = current_v_count + p * v_per_particle
-                    idx_list = get_vfx_shape_indices(mesh_fx_type, v_start)
-                    
-                    for idx_val in idx_list:
-                        f_ib.write(struct.pack(fmt, idx_val))
+                shape_indices = np.asarray(get_vfx_shape_indices(mesh_fx_type, 0), dtype=np.int64)
+                v_starts = current_v_count + np.arange(particle_count, dtype=np.int64) * v_per_particle
+                indices = v_starts[:, None] + shape_indices[None, :]
+                f_ib.write(indices.astype('<u4' if stride_i == 4 else '<u2').tobytes())
 
             # Move current_v_count forward for the next curve in this part
             current_v_count += particle_count * v_per_particle
 
         # Close all files
+        count_written(sum(f.tell() - start for f, start in append_starts))
         f_vb0.close()
         if f_vb2: f_vb2.close()
         if f_vb1: f_vb1.close()
@@ -0,0 +1,350 @@
+# RZMenu/utils/zip_packer.py
+# Упаковка сборок Mod Producer в zip.
+# Метод сжатия выбирается по файлу: уже сжатые форматы (png, jpg, видео) и
+# высокоэнтропийные данные (BC-сжатые DDS) идут как STORED, остальное - DEFLATE.
+# Сжатые потоки лежат в кэше по хэшу содержимого, поэтому буферы, общие для всех
+# профилей, и неизменившиеся файлы между пересборками сжимаются один раз.
+# zipfile не умеет писать готовый сжатый поток, поэтому архив собирается здесь
+# (локальные заголовки, центральный каталог, ZIP64 для больших файлов).
+import hashlib
+import json
+import os
+import shutil
+import stat
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+STORED = 0
+DEFLATED = 8
+
+# Форматы, которые deflate не уменьшает
+STORED_EXTENSIONS = {
+    '.png', '.jpg', '.jpeg', '.gif', '.webp',
+    '.zip', '.7z', '.rar', '.gz',
+    '.mp3', '.ogg', '.mp4', '.webm', '.mkv', '.mov',
+}
+# Пробное сжатие: столько выборок по SAMPLE_SIZE байт; если выигрыш меньше
+# STORE_RATIO, файл пишется без сжатия
+PROBE_SAMPLES = 4
+SAMPLE_SIZE = 64 * 1024
+STORE_RATIO = 0.97
+CHUNK = 1 << 20
+
+INDEX_FILE = 'index.json'
+
+# Поля, не влезающие в 32/16 бит, пишутся как 0xFFFFFFFF/0xFFFF + ZIP64
+_MAX32 = 0xFFFFFFFF
+_MAX16 = 0xFFFF
+_ZIP64_LIMIT = _MAX32
+_ZIP16_LIMIT = _MAX16
+
+
+class ZipEntry:
+    """Сжатое (или нет) содержимое одного файла: всё, что нужно для записи в архив."""
+    __slots__ = ('digest', 'method', 'crc', 'size', 'csize', 'payload')
+
+    def __init__(self, digest, method, crc, size, csize, payload=None):
+        self.digest = digest
+        self.method = method
+        self.crc = crc
+        self.size = size
+        self.csize = csize
+        self.payload = payload  # путь к сжатому потоку в кэше (None для STORED)
+
+    def to_json(self):
+        return {'method': self.method, 'crc': self.crc, 'size': self.size, 'csize': self.csize}
+
+
+def choose_method(path, size):
+    """STORED или DEFLATED по расширению и пробному сжатию выборок из файла."""
+    if size == 0 or os.path.splitext(path)[1].lower() in STORED_EXTENSIONS:
+        return STORED
+    if size <= SAMPLE_SIZE * PROBE_SAMPLES:
+        return DEFLATED  # маленький файл: решит само сжатие (csize >= size -> STORED)
+    raw = 0
+    packed = 0
+    step = (size - SAMPLE_SIZE) // (PROBE_SAMPLES - 1)
+    with open(path, 'rb') as f:
+        for i in range(PROBE_SAMPLES):
+            f.seek(i * step)
+            sample = f.read(SAMPLE_SIZE)
+            raw += len(sample)
+            packed += len(zlib.compress(sample, 1))
+    return STORED if packed >= raw * STORE_RATIO else DEFLATED
+
+
+class ZipPacker:
+    """
+    Общий на весь батч упаковщик: пул потоков для сжатия (zlib отпускает GIL)
+    и кэш сжатых потоков по хэшу содержимого в cache_dir.
+    close() сохраняет индекс и удаляет записи, не использованные в этом запуске.
+    """
+
+    def __init__(self, cache_dir=None, level=6, max_workers=None):
+        self.level = level
+        self._own_cache = cache_dir is None
+        self.cache_dir = cache_dir or tempfile.mkdtemp(prefix='rzm_zip_')
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 1)
+        self._lock = threading.Lock()
+        self._pending = {}   # digest -> _SharedResult этого запуска
+        self._digests = {}   # (dev, ino, size, mtime) -> (digest, crc)
+        self._used = set()
+        self._index = self._load_index()
+        self.stats = {'compressed': 0, 'reused': 0, 'stored': 0}
+
+    def _load_index(self):
+        try:
+            with open(os.path.join(self.cache_dir, INDEX_FILE), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data.get(f'deflate-{self.level}', {}) if isinstance(data, dict) else {}
+
+    def _payload_path(self, digest):
+        return os.path.join(self.cache_dir, digest + '.deflate')
+
+    def _digest(self, path):
+        """blake2b и crc32 за одно чтение; хардлинки одного файла хэшируются один раз."""
+        st = os.stat(path)
+        ident = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+        with self._lock:
+            known = self._digests.get(ident)
+        if known is not None and st.st_ino:
+            return known
+        h = hashlib.blake2b(digest_size=20)
+        crc = 0
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(CHUNK)
+                if not chunk:
+                    break
+                h.update(chunk)
+                crc = zlib.crc32(chunk, crc)
+        result = (h.hexdigest(), crc)
+        with self._lock:
+            self._digests[ident] = result
+        return result
+
+    def _cached(self, digest):
+        meta = self._index.get(digest)
+        if not meta:
+            return None
+        payload = None
+        if meta['method'] == DEFLATED:
+            payload = self._payload_path(digest)
+            try:
+                if os.path.getsize(payload) != meta['csize']:
+                    return None
+            except OSError:
+                return None
+        return ZipEntry(digest, meta['method'], meta['crc'], meta['size'], meta['csize'], payload)
+
+    def _compress(self, path, digest, crc):
+        size = os.path.getsize(path)
+        method = choose_method(path, size)
+        if method == DEFLATED:
+            payload = self._payload_path(digest)
+            tmp = f"{payload}.{threading.get_ident()}.tmp"
+            comp = zlib.compressobj(self.level, zlib.DEFLATED, -15)
+            csize = 0
+            with open(path, 'rb') as src, open(tmp, 'wb') as dst:
+                while True:
+                    chunk = src.read(CHUNK)
+                    if not chunk:
+                        break
+                    data = comp.compress(chunk)
+                    csize += len(data)
+                    dst.write(data)
+                data = comp.flush()
+                csize += len(data)
+                dst.write(data)
+            if csize < size:
+                os.replace(tmp, payload)
+                return ZipEntry(digest, DEFLATED, crc, size, csize, payload)
+            os.remove(tmp)
+        return ZipEntry(digest, STORED, crc, size, size)
+
+    def prepare(self, path):
+        """Future[ZipEntry]. Одинаковое содержимое сжимается один раз за запуск."""
+        return self._pool.submit(self._entry_job, path)
+
+    def _entry_job(self, path):
+        digest, crc = self._digest(path)
+        with self._lock:
+            self._used.add(digest)
+            shared = self._pending.get(digest)
+            if shared is None:
+                cached = self._cached(digest)
+                if cached is not None:
+                    self.stats['reused'] += 1
+                    return cached
+                shared = _SharedResult()
+                self._pending[digest] = shared
+                owner = True
+            else:
+                self.stats['reused'] += 1
+                owner = False
+        if not owner:
+            return shared.wait()
+        try:
+            entry = self._compress(path, digest, crc)
+        except BaseException as e:
+            shared.fail(e)
+            raise
+        with self._lock:
+            self._index[digest] = entry.to_json()
+            self.stats['compressed' if entry.method == DEFLATED else 'stored'] += 1
+        shared.set(entry)
+        return entry
+
+    def pack_folder(self, folder, zip_path, arc_prefix=''):
+        """Архивирует все файлы folder (имена в архиве: arc_prefix/относительный путь)."""
+        files = []
+        for root, _, names in os.walk(folder):
+            for name in names:
+                full = os.path.join(root, name)
+                arcname = os.path.relpath(full, folder).replace(os.sep, '/')
+                if arc_prefix:
+                    arcname = f"{arc_prefix}/{arcname}"
+                files.append((full, arcname))
+        futures = [self.prepare(full) for full, _ in files]
+        with _ZipWriter(zip_path) as writer:
+            for (full, arcname), future in zip(files, futures):
+                writer.add(arcname, full, future.result())
+        return zip_path
+
+    def close(self, prune=True):
+        self._pool.shutdown(wait=True)
+        if self._own_cache:
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+            return
+        if prune:
+            # Кэш хранит только то, что нужно последней сборке
+            for digest in list(self._index):
+                if digest not in self._used:
+                    del self._index[digest]
+            for name in os.listdir(self.cache_dir):
+                if name == INDEX_FILE:
+                    continue
+                if name.split('.', 1)[0] not in self._index or name.endswith('.tmp'):
+                    try:
+                        os.remove(os.path.join(self.cache_dir, name))
+                    except OSError:
+                        pass
+        try:
+            with open(os.path.join(self.cache_dir, INDEX_FILE), 'w', encoding='utf-8') as f:
+                json.dump({f'deflate-{self.level}': self._index}, f)
+        except OSError as e:
+            print(f"[Zip Packer] Failed to save cache index: {e}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _SharedResult:
+    """Результат сжатия, который ждут другие архивы с тем же содержимым."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._entry = None
+        self._error = None
+
+    def set(self, entry):
+        self._entry = entry
+        self._event.set()
+
+    def fail(self, error):
+        self._error = error
+        self._event.set()
+
+    def wait(self):
+        self._event.wait()
+        if self._error is not None:
+            raise self._error
+        return self._entry
+
+
+def _dos_datetime(mtime):
+    t = time.localtime(mtime)
+    if t.tm_year < 1980:
+        return 0, (1 << 5) | 1
+    return (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2), \
+        ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+
+
+class _ZipWriter:
+    """Последовательная запись zip из готовых ZipEntry (ZIP64 по необходимости)."""
+
+    def __init__(self, path):
+        self.fp = open(path, 'wb')
+        self.central = []
+
+    def add(self, arcname, source_path, entry):
+        name = arcname.encode('utf-8')
+        flags = 0x800 if not arcname.isascii() else 0
+        dos_time, dos_date = _dos_datetime(os.path.getmtime(source_path))
+        offset = self.fp.tell()
+
+        zip64 = entry.size >= _ZIP64_LIMIT or entry.csize >= _ZIP64_LIMIT
+        extra = struct.pack('<HHQQ', 1, 16, entry.size, entry.csize) if zip64 else b''
+        version = 45 if zip64 else 20
+        self.fp.write(struct.pack(
+            '<IHHHHHIIIHH', 0x04034b50, version, flags, entry.method, dos_time, dos_date,
+            entry.crc, _MAX32 if zip64 else entry.csize, _MAX32 if zip64 else entry.size,
+            len(name), len(extra)))
+        self.fp.write(name)
+        self.fp.write(extra)
+        with open(entry.payload if entry.method == DEFLATED else source_path, 'rb') as src:
+            shutil.copyfileobj(src, self.fp, CHUNK)
+        self.central.append((name, flags, dos_time, dos_date, entry, offset))
+
+    def close(self):
+        fp = self.fp
+        cd_start = fp.tell()
+        for name, flags, dos_time, dos_date, entry, offset in self.central:
+            fields = []
+            size, csize, off = entry.size, entry.csize, offset
+            if size >= _ZIP64_LIMIT:
+                fields.append(size); size = _MAX32
+            if csize >= _ZIP64_LIMIT:
+                fields.append(csize); csize = _MAX32
+            if off >= _ZIP64_LIMIT:
+                fields.append(off); off = _MAX32
+            extra = struct.pack(f'<HH{len(fields)}Q', 1, 8 * len(fields), *fields) if fields else b''
+            version = 45 if fields else 20
+            fp.write(struct.pack(
+                '<IHHHHHHIIIHHHHHII', 0x02014b50, (3 << 8) | version, version, flags, entry.method,
+                dos_time, dos_date, entry.crc, csize, size, len(name), len(extra), 0, 0, 0,
+                (stat.S_IFREG | 0o644) << 16, off))
+            fp.write(name)
+            fp.write(extra)
+        cd_end = fp.tell()
+        count = len(self.central)
+        cd_size = cd_end - cd_start
+        if count >= _ZIP16_LIMIT or cd_size >= _ZIP64_LIMIT or cd_start >= _ZIP64_LIMIT:
+            fp.write(struct.pack('<IQHHIIQQQQ', 0x06064b50, 44, 45, 45, 0, 0, count, count, cd_size, cd_start))
+            fp.write(struct.pack('<IIQI', 0x07064b50, 0, cd_end, 1))
+            count16 = _MAX16 if count >= _ZIP16_LIMIT else count
+            fp.write(struct.pack('<IHHHHIIH', 0x06054b50, 0, 0, count16, count16,
+                                 _MAX32 if cd_size >= _ZIP64_LIMIT else cd_size,
+                                 _MAX32 if cd_start >= _ZIP64_LIMIT else cd_start, 0))
+        else:
+            fp.write(struct.pack('<IHHHHIIH', 0x06054b50, 0, 0, count, count, cd_size, cd_start, 0))
+        fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.fp.close()